@@ -0,0 +1,140 @@
+"""
+Benchmark: per-object MinerEvaluation scoring vs vectorized score_evaluations.
+
+Builds a synthetic subnet sweep (one evaluation per uid, each with a spread of
+pull requests across shared repositories) and times the per-miner methods
+(calculate_metric_totals, calculate_score_total, apply_open_pr_spam_penalty)
+against score_evaluations reading each evaluation's PullRequest objects, and
+against score_evaluations reading the same pull requests from a PullRequestBatch
+(as returned by PullRequestsRepository.get_pull_request_batch_by_*), with and without
+writing the results back onto the evaluations. Results are checked to agree before
+timings are reported. No database is needed.
+
+Usage:
+    python benchmarks/bench_batch_scoring.py --uids 256 --prs-per-uid 200 --repos 500 --runs 5
+"""
+import argparse
+import copy
+import gc
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db.models import MinerEvaluation, PullRequest, PullRequestBatch  # noqa: E402
+from gittensor_db.models.scoring import SpamPenalty, score_evaluations  # noqa: E402
+
+PENALTY = SpamPenalty(threshold=10, min_weight=0.5, penalty_slope=0.02)
+
+
+def build_evaluations(uids: int, prs_per_uid: int, repos: int, seed: int):
+    rng = random.Random(seed)
+    repository_names = [f"owner-{index % 97}/repo-{index}" for index in range(repos)]
+    evaluations = []
+    for uid in range(uids):
+        evaluation = MinerEvaluation(uid=uid, hotkey=f"hotkey-{uid}", github_id=f"github-{uid}")
+        evaluation.total_open_prs = rng.randint(0, 30)
+        for number in range(rng.randint(0, 2 * prs_per_uid)):
+            evaluation.pull_requests.append(PullRequest(
+                number=number,
+                repository_full_name=rng.choice(repository_names),
+                uid=uid,
+                hotkey=evaluation.hotkey,
+                github_id=evaluation.github_id,
+                title="synthetic",
+                author_login="author",
+                merged_at=None,
+                created_at=None,
+                earned_score=rng.random() * 10,
+                additions=rng.randint(0, 800),
+                deletions=rng.randint(0, 300),
+            ))
+        evaluations.append(evaluation)
+    return evaluations
+
+
+def per_object(evaluations):
+    for evaluation in evaluations:
+        evaluation.calculate_metric_totals()
+        evaluation.calculate_score_total()
+        evaluation.apply_open_pr_spam_penalty(PENALTY.threshold, PENALTY.min_weight, PENALTY.penalty_slope)
+
+
+def vectorized(evaluations, batch):
+    return score_evaluations(evaluations, PENALTY)
+
+
+def vectorized_and_apply(evaluations, batch):
+    score_evaluations(evaluations, PENALTY).apply(evaluations)
+
+
+def from_batch(evaluations, batch):
+    return score_evaluations(evaluations, PENALTY, pull_requests=batch)
+
+
+def from_batch_and_apply(evaluations, batch):
+    score_evaluations(evaluations, PENALTY, pull_requests=batch).apply(evaluations)
+
+
+def best_of(runs: int, function, evaluations, batch) -> float:
+    timings = []
+    for _ in range(runs):
+        fresh = copy.deepcopy(evaluations)
+        gc.collect()
+        gc.disable()  # like timeit, so collections triggered by the deep copies don't land in a timing
+        try:
+            started = time.perf_counter()
+            function(fresh, batch)
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def check_agreement(evaluations, batch):
+    expected = copy.deepcopy(evaluations)
+    per_object(expected)
+    for function in (vectorized_and_apply, from_batch_and_apply):
+        actual = copy.deepcopy(evaluations)
+        function(actual, batch)
+        for want, got in zip(expected, actual):
+            assert want.total_lines_changed == got.total_lines_changed
+            assert want.unique_repos_count == got.unique_repos_count
+            assert want.unique_repos_contributed_to == got.unique_repos_contributed_to
+            assert math.isclose(want.total_score, got.total_score, rel_tol=1e-12, abs_tol=1e-12)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uids', type=int, default=256)
+    parser.add_argument('--prs-per-uid', type=int, default=200, help='mean pull requests per evaluation')
+    parser.add_argument('--repos', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    evaluations = build_evaluations(args.uids, args.prs_per_uid, args.repos, args.seed)
+    total_prs = sum(len(evaluation.pull_requests) for evaluation in evaluations)
+    batch = PullRequestBatch(pr for evaluation in evaluations for pr in evaluation.pull_requests)
+    check_agreement(evaluations, batch)
+
+    results = [
+        ('per-object methods', best_of(args.runs, lambda evaluations, _: per_object(evaluations), evaluations, batch)),
+        ('objects -> arrays', best_of(args.runs, vectorized, evaluations, batch)),
+        ('objects + apply', best_of(args.runs, vectorized_and_apply, evaluations, batch)),
+        ('batch -> arrays', best_of(args.runs, from_batch, evaluations, batch)),
+        ('batch + apply', best_of(args.runs, from_batch_and_apply, evaluations, batch)),
+    ]
+
+    print(f"{args.uids} evaluations, {total_prs} pull requests (best of {args.runs})")
+    print(f"{'method':<20} {'ms':>9} {'vs per-object':>14}")
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"{name:<20} {seconds * 1000:>9.2f} {baseline / seconds:>13.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: execute_values vs COPY FROM STDIN bulk ingest.
+
+Writes synthetic pull requests and file changes (with realistic patch sizes)
+through both bulk methods against the database configured by the DB_* environment
+variables, then deletes the synthetic rows.
+
+Usage:
+    python benchmarks/bench_bulk_ingest.py --prs 500 --files-per-pr 40 --patch-bytes 4000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db import (  # noqa: E402
+    create_database_connection,
+    MinersRepository,
+    RepositoriesRepository,
+    PullRequestsRepository,
+    FileChangesRepository,
+)
+from gittensor_db.models.domain_models import Miner, PullRequest, FileChange  # noqa: E402
+
+BENCH_OWNER = 'gittensor-bench'
+
+
+def build_dataset(repository_full_name: str, miner: Miner, prs: int, files_per_pr: int, patch_bytes: int):
+    merged_at = datetime(2024, 1, 1)
+    patch_line = "+    value = compute(value, index)  # synthetic diff line\n"
+    patch = (patch_line * (patch_bytes // len(patch_line) + 1))[:patch_bytes]
+
+    pull_requests = [
+        PullRequest(
+            number=number,
+            repository_full_name=repository_full_name,
+            uid=miner.uid,
+            hotkey=miner.hotkey,
+            github_id=miner.github_id,
+            title=f"Synthetic PR {number}",
+            author_login='bench-author',
+            merged_at=merged_at + timedelta(minutes=number),
+            created_at=merged_at,
+            earned_score=1.0,
+            additions=files_per_pr * 10,
+            deletions=files_per_pr * 2,
+            commits=3,
+        )
+        for number in range(1, prs + 1)
+    ]
+    file_changes = [
+        FileChange(
+            pr_number=pr.number,
+            repository_full_name=repository_full_name,
+            filename=f"src/module_{index}.py",
+            changes=12,
+            additions=10,
+            deletions=2,
+            status='modified',
+            patch=patch,
+        )
+        for pr in pull_requests
+        for index in range(files_per_pr)
+    ]
+    return pull_requests, file_changes
+
+
+def cleanup(db, repository_full_name: str):
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM repositories WHERE full_name = %s", (repository_full_name,))
+    db.commit()
+
+
+def run(method: str, args) -> dict:
+    db = create_database_connection()
+    if not db:
+        raise SystemExit("Could not connect to database (check DB_* environment variables)")
+
+    repository_full_name = f"{BENCH_OWNER}/ingest-{method}-{os.getpid()}"
+    miner = Miner(uid=9999, hotkey='bench-hotkey', github_id='bench-github')
+    pull_requests, file_changes = build_dataset(
+        repository_full_name, miner, args.prs, args.files_per_pr, args.patch_bytes
+    )
+
+    try:
+        MinersRepository(db).store_miners_bulk([miner])
+        RepositoriesRepository(db).store_repositories_bulk({repository_full_name})
+
+        started = time.perf_counter()
+        stored_prs = PullRequestsRepository(db).store_pull_requests_bulk(pull_requests, method=method)
+        pr_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stored_files = FileChangesRepository(db).store_file_changes_bulk(file_changes, method=method)
+        file_seconds = time.perf_counter() - started
+    finally:
+        cleanup(db, repository_full_name)
+        db.close()
+
+    return {
+        'method': method,
+        'pull_requests': stored_prs,
+        'pr_seconds': pr_seconds,
+        'file_changes': stored_files,
+        'file_seconds': file_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prs', type=int, default=500)
+    parser.add_argument('--files-per-pr', type=int, default=40)
+    parser.add_argument('--patch-bytes', type=int, default=4000)
+    args = parser.parse_args()
+
+    results = [run('values', args), run('copy', args)]
+
+    print(f"{'method':<8} {'PRs':>8} {'PR s':>9} {'files':>9} {'files s':>9} {'files/s':>11}")
+    for result in results:
+        rate = result['file_changes'] / result['file_seconds'] if result['file_seconds'] else 0.0
+        print(
+            f"{result['method']:<8} {result['pull_requests']:>8} {result['pr_seconds']:>9.3f} "
+            f"{result['file_changes']:>9} {result['file_seconds']:>9.3f} {rate:>11.0f}"
+        )
+
+    values, copy = results
+    if copy['file_seconds']:
+        print(f"\nCOPY speedup on file_changes: {values['file_seconds'] / copy['file_seconds']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: DO UPDATE on every conflicting row vs change-aware upserts.
+
+Stores synthetic pull requests, then re-syncs them several times with a small share
+of recalculated earned_scores, once through an upsert that rewrites every conflicting
+row and once through BULK_UPSERT_CHANGED_PULL_REQUESTS, which rewrites only the
+changed ones. Reports time, rows rewritten and how much the table heap grew (every
+rewritten row leaves a dead tuple behind). Runs against the database configured by the
+DB_* environment variables, then deletes the synthetic rows.
+
+Usage:
+    python benchmarks/bench_change_aware_upsert.py --prs 20000 --rounds 5 --changed 0.01
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db import (  # noqa: E402
+    create_database_connection,
+    MinersRepository,
+    RepositoriesRepository,
+    PullRequestsRepository,
+)
+from gittensor_db.models.domain_models import Miner, PullRequest  # noqa: E402
+from gittensor_db.queries import BULK_UPSERT_CHANGED_PULL_REQUESTS  # noqa: E402
+
+BENCH_OWNER = 'gittensor-bench'
+
+# The same statement without the IS DISTINCT FROM guard
+UPSERT_ALL_PULL_REQUESTS = (
+    BULK_UPSERT_CHANGED_PULL_REQUESTS.split('    WHERE (')[0]
+    + '    RETURNING' + BULK_UPSERT_CHANGED_PULL_REQUESTS.split('    RETURNING')[1]
+)
+
+
+def build_pull_requests(repository_full_name: str, miner: Miner, prs: int):
+    merged_at = datetime(2024, 1, 1)
+    return [
+        PullRequest(
+            number=number,
+            repository_full_name=repository_full_name,
+            uid=miner.uid,
+            hotkey=miner.hotkey,
+            github_id=miner.github_id,
+            title=f"Synthetic PR {number}",
+            author_login='bench-author',
+            merged_at=merged_at + timedelta(minutes=number),
+            created_at=merged_at,
+            earned_score=1.0,
+            additions=10,
+            deletions=2,
+            commits=3,
+        )
+        for number in range(1, prs + 1)
+    ]
+
+
+def heap_bytes(db) -> int:
+    with db.cursor() as cursor:
+        cursor.execute("SELECT pg_relation_size('pull_requests')")
+        size = cursor.fetchone()[0]
+    db.commit()
+    return size
+
+
+def cleanup(db, repository_full_name: str):
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM repositories WHERE full_name = %s", (repository_full_name,))
+    db.commit()
+
+
+def run(name: str, query: str, args) -> dict:
+    db = create_database_connection()
+    if not db:
+        raise SystemExit("Could not connect to database (check DB_* environment variables)")
+
+    repository_full_name = f"{BENCH_OWNER}/upsert-{name}-{os.getpid()}"
+    miner = Miner(uid=9999, hotkey='bench-hotkey', github_id='bench-github')
+    pull_requests = build_pull_requests(repository_full_name, miner, args.prs)
+    changed_every = max(1, round(1 / args.changed)) if args.changed else 0
+    repo = PullRequestsRepository(db)
+
+    try:
+        MinersRepository(db).store_miners_bulk([miner])
+        RepositoriesRepository(db).store_repositories_bulk({repository_full_name})
+        repo.upsert_pull_requests_bulk(pull_requests)
+
+        seconds = 0.0
+        rewritten = 0
+        heap_before = heap_bytes(db)
+        for round_number in range(1, args.rounds + 1):
+            if changed_every:
+                for pr in pull_requests[round_number % changed_every::changed_every]:
+                    pr.earned_score += 1.0
+            values = repo._bulk_params(pull_requests)
+
+            started = time.perf_counter()
+            with repo.transaction() as cursor:
+                counts = repo.execute_bulk_upsert(cursor, values, query)
+            seconds += time.perf_counter() - started
+            rewritten += counts.updated
+        heap_growth = heap_bytes(db) - heap_before
+    finally:
+        cleanup(db, repository_full_name)
+        db.close()
+
+    return {'name': name, 'seconds': seconds, 'rewritten': rewritten, 'heap_growth': heap_growth}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prs', type=int, default=20000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--changed', type=float, default=0.01, help='share of pull requests rescored per round')
+    args = parser.parse_args()
+
+    results = [
+        run('update-all', UPSERT_ALL_PULL_REQUESTS, args),
+        run('changed', BULK_UPSERT_CHANGED_PULL_REQUESTS, args),
+    ]
+
+    print(f"{args.prs} pull requests, {args.rounds} re-syncs, {args.changed:.1%} rescored per re-sync\n")
+    print(f"{'upsert':<12} {'seconds':>9} {'rewritten':>10} {'heap growth':>13}")
+    for result in results:
+        print(
+            f"{result['name']:<12} {result['seconds']:>9.3f} {result['rewritten']:>10} "
+            f"{result['heap_growth'] / 1024 / 1024:>10.1f} MiB"
+        )
+
+    update_all, changed = results
+    if changed['seconds']:
+        print(f"\nChange-aware speedup: {update_all['seconds'] / changed['seconds']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
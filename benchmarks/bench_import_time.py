@@ -0,0 +1,83 @@
+"""
+Benchmark: cold import cost of gittensor_db.
+
+Runs "python -X importtime -c 'import gittensor_db'" in fresh interpreters and
+reports the import time of the package (excluding interpreter startup), the
+slowest modules it pulled in, the peak RSS of the child process, and whether heavy optional dependencies
+(bittensor, numpy, psycopg2) were loaded. A second measurement imports the
+repositories, i.e. the cost paid on first real use.
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 5 --top 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+HEAVY_MODULES = ('bittensor', 'numpy', 'psycopg2')
+
+SCENARIOS = {
+    'import gittensor_db': 'import gittensor_db',
+    'first repository use': 'import gittensor_db; gittensor_db.MinersRepository',
+}
+
+
+def run_importtime(statement: str):
+    """Return ({module: (self_us, cumulative_us)}, loaded heavy modules, peak RSS in KiB) for statement"""
+    probe = (
+        f"{statement}; import resource, sys; "
+        f"print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss); "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, env=env, check=True
+    )
+
+    # Interpreter startup (site and its imports) is reported first and ends with the
+    # "site" line; everything after it was imported by the statement
+    timings = {}
+    started = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        if started:
+            timings[module.strip()] = (int(self_us), int(cumulative_us))
+        elif module.strip() == 'site':
+            started = True
+
+    peak_rss, loaded = result.stdout.splitlines()
+    return timings, [name for name in loaded.split(',') if name], int(peak_rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    for label, statement in SCENARIOS.items():
+        totals = []
+        for _ in range(args.runs):
+            timings, loaded, peak_rss = run_importtime(statement)
+            totals.append(sum(self_us for self_us, _ in timings.values()))
+        totals.sort()
+
+        print(f"{label}")
+        print(f"  total import time: median {totals[len(totals) // 2] / 1000:.1f} ms, "
+              f"min {totals[0] / 1000:.1f} ms over {args.runs} runs")
+        print(f"  peak RSS: {peak_rss / 1024:.1f} MiB")
+        print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+        print(f"  slowest modules (self time, last run):")
+        slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for module, (self_us, cumulative_us) in slowest:
+            print(f"    {self_us / 1000:>8.1f} ms  {cumulative_us / 1000:>8.1f} ms cumulative  {module}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: memory held by dataclass, slotted and columnar file changes and pull requests.
+
+Builds the same synthetic rows as plain dataclasses (FileChange, PullRequest), their
+slotted variants (SlottedFileChange, SlottedPullRequest) and the columnar containers
+(FileChangeBatch, PullRequestBatch), and reports the memory retained by each according
+to tracemalloc, along with the time taken to build it. Every row gets freshly built
+strings, as rows fetched from the database do, so string sharing is only what each
+representation does itself. No database is needed.
+
+Usage:
+    python benchmarks/bench_model_memory.py --file-changes 200000 --prs 20000 --patch-bytes 0
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db.models import (  # noqa: E402
+    FileChange,
+    PullRequest,
+    SlottedFileChange,
+    SlottedPullRequest,
+    FileChangeBatch,
+    PullRequestBatch,
+)
+
+STATUSES = ('modified', 'added', 'removed', 'renamed')
+EXTENSIONS = ('py', 'ts', 'md', 'rs', 'go')
+
+
+def file_change_rows(count: int, patch_bytes: int):
+    patch_line = "+    value = compute(value, index)  # synthetic diff line\n"
+    for index in range(count):
+        pr_number = index // 10
+        extension = EXTENSIONS[index % len(EXTENSIONS)]
+        patch = (patch_line * (patch_bytes // len(patch_line) + 1))[:patch_bytes] + str(index) if patch_bytes else None
+        yield (
+            pr_number,
+            f"owner-{pr_number % 50}/repo-{pr_number % 200}",
+            f"src/package/module_{index}.{extension}",
+            12,
+            10,
+            2,
+            ''.join(STATUSES[index % len(STATUSES)]),  # fresh copies, like strings in fetched rows
+            patch,
+            ''.join(extension),
+            index + 1,
+        )
+
+
+def pull_request_rows(count: int):
+    merged_at = datetime(2024, 1, 1)
+    for number in range(count):
+        uid = number % 256
+        yield (
+            number,
+            f"owner-{number % 50}/repo-{number % 200}",
+            uid,
+            f"5F{uid:046d}",
+            f"github-{uid}",
+            f"Synthetic pull request {number}",
+            f"author-{number % 1000}",
+            merged_at + timedelta(minutes=number),
+            merged_at,
+            1.5,
+            120,
+            30,
+            3,
+            f"maintainer-{number % 20}",
+        )
+
+
+def measure(build):
+    """Return (retained bytes, seconds) for the object returned by build()"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build()
+    seconds = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return retained, seconds
+
+
+def report(title: str, count: int, results):
+    print(f"\n{title} ({count} rows)")
+    print(f"{'representation':<20} {'MiB':>9} {'bytes/row':>10} {'build s':>9} {'vs dataclass':>13}")
+    baseline = results[0][1]
+    for name, retained, seconds in results:
+        print(
+            f"{name:<20} {retained / 2 ** 20:>9.1f} {retained / count:>10.0f} "
+            f"{seconds:>9.3f} {baseline / retained if retained else 0:>12.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--file-changes', type=int, default=200_000)
+    parser.add_argument('--prs', type=int, default=20_000)
+    parser.add_argument('--patch-bytes', type=int, default=0, help='patch size per file change (0 = metadata only)')
+    args = parser.parse_args()
+
+    def batch_of_file_changes():
+        batch = FileChangeBatch()
+        for row in file_change_rows(args.file_changes, args.patch_bytes):
+            batch.append_row(*row)
+        return batch
+
+    def batch_of_pull_requests():
+        batch = PullRequestBatch()
+        for row in pull_request_rows(args.prs):
+            batch.append_row(*row)
+        return batch
+
+    report('File changes', args.file_changes, [
+        (name, *measure(build)) for name, build in (
+            ('FileChange', lambda: [FileChange(*row) for row in file_change_rows(args.file_changes, args.patch_bytes)]),
+            ('SlottedFileChange', lambda: [
+                SlottedFileChange(*row) for row in file_change_rows(args.file_changes, args.patch_bytes)
+            ]),
+            ('FileChangeBatch', batch_of_file_changes),
+        )
+    ])
+    report('Pull requests', args.prs, [
+        (name, *measure(build)) for name, build in (
+            ('PullRequest', lambda: [PullRequest(*row) for row in pull_request_rows(args.prs)]),
+            ('SlottedPullRequest', lambda: [SlottedPullRequest(*row) for row in pull_request_rows(args.prs)]),
+            ('PullRequestBatch', batch_of_pull_requests),
+        )
+    ])
+
+
+if __name__ == '__main__':
+    main()
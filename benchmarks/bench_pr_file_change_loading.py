@@ -0,0 +1,207 @@
+"""
+Benchmark: JOIN fan-out vs two-query eager loading of PRs with file changes.
+
+Seeds a synthetic repository with many pull requests and file changes, then loads
+them with the legacy single LEFT JOIN (every PR column repeated on every file
+change row, grouped in Python) and with the batched two-query loader used by
+PullRequestsRepository.get_pull_requests_by_repository_with_file_changes.
+
+Wire bytes are measured by streaming each result set through COPY ... TO STDOUT,
+which produces the same text encoding psycopg2 receives. Query time covers
+execute + fetch; mapping time covers building the domain objects.
+
+Usage:
+    python benchmarks/bench_pr_file_change_loading.py --prs 3000 --files-per-pr 15 --patch-bytes 2000
+"""
+import argparse
+import os
+import sys
+import gc
+import time
+from datetime import datetime, timedelta
+from itertools import groupby
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db.connection.database import get_database_config  # noqa: E402
+from gittensor_db import (  # noqa: E402
+    MinersRepository,
+    RepositoriesRepository,
+    PullRequestsRepository,
+    FileChangesRepository,
+)
+from gittensor_db.models.domain_models import Miner, PullRequest, FileChange  # noqa: E402
+from gittensor_db.queries import (  # noqa: E402
+    GET_PULL_REQUESTS_BY_REPOSITORY,
+    GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY,
+    GET_FILE_CHANGES_FOR_PULL_REQUESTS,
+)
+from gittensor_db.repositories.base_repository import LOOKUP_BATCH_SIZE  # noqa: E402
+
+
+class ByteCounter:
+    """File-like sink that only counts what COPY writes to it"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+
+def wire_bytes(db, query: str, params: tuple) -> int:
+    counter = ByteCounter()
+    with db.cursor() as cursor:
+        cursor.copy_expert(f"COPY ({cursor.mogrify(query, params).decode()}) TO STDOUT", counter)
+    return counter.bytes
+
+
+def seed(db, repository_full_name: str, prs: int, files_per_pr: int, patch_bytes: int):
+    miner = Miner(uid=9998, hotkey='bench-hotkey', github_id='bench-github')
+    patch_line = "+    value = compute(value, index)  # synthetic diff line\n"
+    patch = (patch_line * (patch_bytes // len(patch_line) + 1))[:patch_bytes]
+    merged_at = datetime(2024, 1, 1)
+
+    pull_requests = [
+        PullRequest(
+            number=number,
+            repository_full_name=repository_full_name,
+            uid=miner.uid,
+            hotkey=miner.hotkey,
+            github_id=miner.github_id,
+            title=f"Synthetic PR {number} with a realistically long title for the fan-out",
+            author_login='bench-author',
+            merged_at=merged_at + timedelta(minutes=number),
+            created_at=merged_at,
+            earned_score=1.0,
+            additions=files_per_pr * 10,
+            deletions=files_per_pr * 2,
+            commits=3,
+            merged_by_login='bench-merger',
+        )
+        for number in range(1, prs + 1)
+    ]
+    file_changes = [
+        FileChange(
+            pr_number=pr.number,
+            repository_full_name=repository_full_name,
+            filename=f"src/module_{index}.py",
+            changes=12,
+            additions=10,
+            deletions=2,
+            status='modified',
+            patch=patch,
+        )
+        for pr in pull_requests
+        for index in range(files_per_pr)
+    ]
+
+    MinersRepository(db).store_miners_bulk([miner])
+    RepositoriesRepository(db).store_repositories_bulk({repository_full_name})
+    PullRequestsRepository(db).store_pull_requests_bulk(pull_requests, method='copy')
+    FileChangesRepository(db).store_file_changes_bulk(file_changes, method='copy')
+
+
+def bench_join(db, repository_full_name: str) -> dict:
+    repo = PullRequestsRepository(db)
+    params = (repository_full_name,)
+
+    started = time.perf_counter()
+    rows = repo.execute_query(GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY, params)
+    query_seconds = time.perf_counter() - started
+
+    gc.collect()
+    started = time.perf_counter()
+    pull_requests = [
+        repo._map_to_pull_request_with_file_changes(list(pr_rows))
+        for _, pr_rows in groupby(rows, key=lambda row: row['number'])
+    ]
+    map_seconds = time.perf_counter() - started
+
+    return {
+        'loader': 'join',
+        'rows': len(rows),
+        'pull_requests': len(pull_requests),
+        'bytes': wire_bytes(db, GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY, params),
+        'query_seconds': query_seconds,
+        'map_seconds': map_seconds,
+    }
+
+
+def bench_two_query(db, repository_full_name: str) -> dict:
+    repo = PullRequestsRepository(db)
+    params = (repository_full_name,)
+
+    started = time.perf_counter()
+    pr_rows = repo.execute_query(GET_PULL_REQUESTS_BY_REPOSITORY, params)
+    keys = [(row['number'], row['repository_full_name']) for row in pr_rows]
+    batches = [keys[start:start + LOOKUP_BATCH_SIZE]
+               for start in range(0, len(keys), LOOKUP_BATCH_SIZE)]
+    batch_params = [([number for number, _ in batch], [name for _, name in batch]) for batch in batches]
+    file_rows = [row for p in batch_params for row in repo.execute_query(GET_FILE_CHANGES_FOR_PULL_REQUESTS, p)]
+    query_seconds = time.perf_counter() - started
+
+    gc.collect()
+    started = time.perf_counter()
+    pull_requests = [repo._map_to_pull_request(row) for row in pr_rows]
+    by_pr = {}
+    for row in file_rows:
+        by_pr.setdefault((row['pr_number'], row['repository_full_name']), []).append(
+            repo.file_changes._map_to_file_change(row)
+        )
+    for pr in pull_requests:
+        pr.file_changes = by_pr.get((pr.number, pr.repository_full_name))
+    map_seconds = time.perf_counter() - started
+
+    total_bytes = wire_bytes(db, GET_PULL_REQUESTS_BY_REPOSITORY, params)
+    total_bytes += sum(wire_bytes(db, GET_FILE_CHANGES_FOR_PULL_REQUESTS, p) for p in batch_params)
+
+    # Sanity check: the public method returns the same shape
+    assert len(repo.get_pull_requests_by_repository_with_file_changes(repository_full_name)) == len(pull_requests)
+
+    return {
+        'loader': 'two-query',
+        'rows': len(pr_rows) + len(file_rows),
+        'pull_requests': len(pull_requests),
+        'bytes': total_bytes,
+        'query_seconds': query_seconds,
+        'map_seconds': map_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prs', type=int, default=3000)
+    parser.add_argument('--files-per-pr', type=int, default=15)
+    parser.add_argument('--patch-bytes', type=int, default=2000)
+    args = parser.parse_args()
+
+    db = psycopg2.connect(cursor_factory=RealDictCursor, **get_database_config())
+    repository_full_name = f"gittensor-bench/loading-{os.getpid()}"
+    try:
+        seed(db, repository_full_name, args.prs, args.files_per_pr, args.patch_bytes)
+        # Warm the cache once so neither loader pays for the first read of freshly written pages
+        bench_join(db, repository_full_name)
+        results = [bench_join(db, repository_full_name), bench_two_query(db, repository_full_name)]
+    finally:
+        with db.cursor() as cursor:
+            cursor.execute("DELETE FROM repositories WHERE full_name = %s", (repository_full_name,))
+        db.commit()
+        db.close()
+
+    print(f"{'loader':<10} {'PRs':>6} {'rows':>8} {'MiB':>9} {'query s':>9} {'map s':>8}")
+    for result in results:
+        print(
+            f"{result['loader']:<10} {result['pull_requests']:>6} {result['rows']:>8} "
+            f"{result['bytes'] / 2 ** 20:>9.2f} {result['query_seconds']:>9.3f} {result['map_seconds']:>8.3f}"
+        )
+
+    join, two_query = results
+    print(f"\nWire bytes saved: {1 - two_query['bytes'] / join['bytes']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: per-call latency of the hot queries with and without prepared statements.
+
+Seeds a synthetic miner, repository, pull requests and evaluations in the database
+configured by the DB_* environment variables, then runs GET_MINER_BY_UID,
+GET_PULL_REQUEST, GET_LATEST_MINER_EVALUATION and SET_FILE_CHANGES_FOR_PR through
+the repositories, first as plain queries and then as prepared statements, and
+deletes the synthetic rows.
+
+Usage:
+    python benchmarks/bench_prepared_statements.py --calls 2000 --files-per-call 5
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db.connection.database import get_database_config  # noqa: E402
+from gittensor_db import (  # noqa: E402
+    enable_prepared_statements,
+    disable_prepared_statements,
+    MinersRepository,
+    RepositoriesRepository,
+    PullRequestsRepository,
+    FileChangesRepository,
+    MinerEvaluationsRepository,
+)
+from gittensor_db.models.domain_models import Miner, PullRequest, FileChange, MinerEvaluation  # noqa: E402
+
+BENCH_OWNER = 'gittensor-bench'
+BENCH_UID = 9998
+PR_COUNT = 100
+
+
+def seed(db, repository_full_name: str, miner: Miner) -> None:
+    MinersRepository(db).store_miners_bulk([miner])
+    RepositoriesRepository(db).store_repositories_bulk({repository_full_name})
+    merged_at = datetime(2024, 1, 1)
+    PullRequestsRepository(db).store_pull_requests_bulk([
+        PullRequest(
+            number=number, repository_full_name=repository_full_name, uid=miner.uid, hotkey=miner.hotkey,
+            github_id=miner.github_id, title=f"Synthetic PR {number}", author_login='bench-author',
+            merged_at=merged_at + timedelta(minutes=number), created_at=merged_at, earned_score=1.0,
+        )
+        for number in range(1, PR_COUNT + 1)
+    ])
+    evaluations = MinerEvaluationsRepository(db)
+    for day in range(10):
+        evaluations.set_miner_evaluation(MinerEvaluation(
+            uid=miner.uid, hotkey=miner.hotkey, github_id=miner.github_id, total_score=float(day),
+            evaluation_timestamp=datetime.now() - timedelta(days=day)
+        ))
+
+
+def cleanup(db, repository_full_name: str, miner: Miner) -> None:
+    db.rollback()
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM repositories WHERE full_name = %s", (repository_full_name,))
+        cursor.execute("DELETE FROM miner_evaluations WHERE uid = %s AND hotkey = %s", (miner.uid, miner.hotkey))
+        cursor.execute("DELETE FROM miners WHERE uid = %s AND hotkey = %s", (miner.uid, miner.hotkey))
+    db.commit()
+
+
+def workloads(db, repository_full_name: str, miner: Miner, files_per_call: int):
+    """name -> callable running the query once"""
+    miners = MinersRepository(db)
+    pull_requests = PullRequestsRepository(db)
+    evaluations = MinerEvaluationsRepository(db)
+    file_changes = FileChangesRepository(db)
+    numbers = itertools.cycle(range(1, PR_COUNT + 1))
+    filenames = itertools.count()
+
+    def read(call):
+        def run():
+            call()
+            db.commit()  # end the read transaction, as a pooled caller would
+        return run
+
+    def set_file_changes():
+        number = next(numbers)
+        file_changes.set_file_changes_for_pr(number, repository_full_name, [
+            FileChange(number, repository_full_name, f"src/file_{next(filenames)}.py", 3, 2, 1, 'modified')
+            for _ in range(files_per_call)
+        ])
+
+    return {
+        'GET_MINER_BY_UID': read(lambda: miners.get_miner_by_uid(miner.uid)),
+        'GET_PULL_REQUEST': read(lambda: pull_requests.get_pull_request(next(numbers), repository_full_name)),
+        'GET_LATEST_MINER_EVALUATION': read(lambda: evaluations.get_latest_miner_evaluation(miner.uid, miner.hotkey)),
+        'SET_FILE_CHANGES_FOR_PR': set_file_changes,
+    }
+
+
+def time_calls(run, calls: int) -> float:
+    """Mean seconds per call, after a few warm-up calls"""
+    for _ in range(min(calls, 20)):
+        run()
+    started = time.perf_counter()
+    for _ in range(calls):
+        run()
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=2000, help='timed calls per query and mode')
+    parser.add_argument('--files-per-call', type=int, default=5, help='file changes per SET_FILE_CHANGES_FOR_PR call')
+    args = parser.parse_args()
+
+    db = psycopg2.connect(cursor_factory=RealDictCursor, **get_database_config())
+    repository_full_name = f"{BENCH_OWNER}/prepared-{os.getpid()}"
+    miner = Miner(uid=BENCH_UID, hotkey=f'bench-hotkey-{os.getpid()}', github_id='bench-github')
+    results = {}
+    try:
+        seed(db, repository_full_name, miner)
+        for prepared in (False, True):
+            if prepared:
+                enable_prepared_statements()
+            for name, run in workloads(db, repository_full_name, miner, args.files_per_call).items():
+                results.setdefault(name, []).append(time_calls(run, args.calls))
+            disable_prepared_statements()
+    finally:
+        disable_prepared_statements()
+        cleanup(db, repository_full_name, miner)
+        db.close()
+
+    print(f"{'query':<30} {'plain us':>10} {'prepared us':>12} {'speedup':>9}")
+    for name, (plain, prepared) in results.items():
+        print(f"{name:<30} {plain * 1e6:>10.1f} {prepared * 1e6:>12.1f} {plain / prepared:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
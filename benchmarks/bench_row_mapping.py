@@ -0,0 +1,153 @@
+"""
+Benchmark: dict-keyed row mapping vs positional RowMapper mapping.
+
+Builds synthetic pull request rows shaped like GET_PULL_REQUESTS_BY_MINER results and
+times turning them into PullRequest objects three ways: dict rows (as a RealDictCursor
+returns them) through PullRequestsRepository._map_to_pull_request, tuple rows turned
+into dicts and mapped the same way, and tuple rows through the compiled
+PULL_REQUEST_ROW mapper, which is what the repositories do for plain cursors. Results
+are checked to agree before timings are reported. No database is needed.
+
+With --database, the same rows are also generated server-side (generate_series) in the
+database configured by the DB_* environment variables and fetched end to end through
+a RealDictCursor + dict mapping and a plain cursor + positional mapping.
+
+Usage:
+    python benchmarks/bench_row_mapping.py --rows 100000 --runs 5 [--database]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db.repositories.pull_requests_repository import (  # noqa: E402
+    PULL_REQUEST_ROW,
+    PullRequestsRepository,
+)
+from gittensor_db.repositories.row_mapping import resolve_mapper  # noqa: E402
+
+COLUMNS = (
+    'number', 'repository_full_name', 'uid', 'hotkey', 'github_id', 'earned_score', 'title',
+    'merged_at', 'pr_created_at', 'additions', 'deletions', 'commits', 'author_login',
+    'merged_by_login', 'name', 'owner',
+)
+
+GENERATED_ROWS = """
+SELECT n AS number, 'owner-' || n %% 97 || '/repo-' || n %% 500 AS repository_full_name,
+       n %% 256 AS uid, 'hotkey-' || n %% 256 AS hotkey, 'github-' || n %% 256 AS github_id,
+       (n %% 1000) / 100.0 AS earned_score, 'Synthetic PR ' || n AS title,
+       TIMESTAMP '2024-01-01' + n * INTERVAL '1 minute' AS merged_at,
+       TIMESTAMP '2024-01-01' AS pr_created_at, n %% 800 AS additions, n %% 300 AS deletions,
+       n %% 20 AS commits, 'author' AS author_login, NULL::text AS merged_by_login,
+       'repo-' || n %% 500 AS name, 'owner-' || n %% 97 AS owner
+FROM generate_series(1, %s) AS n
+"""
+
+
+def build_rows(count: int):
+    merged_at = datetime(2024, 1, 1)
+    return [
+        (
+            number, f"owner-{number % 97}/repo-{number % 500}", number % 256, f"hotkey-{number % 256}",
+            f"github-{number % 256}", (number % 1000) / 100.0, f"Synthetic PR {number}",
+            merged_at + timedelta(minutes=number), merged_at, number % 800, number % 300, number % 20,
+            'author', None, f"repo-{number % 500}", f"owner-{number % 97}",
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def best_of(runs: int, function) -> float:
+    timings = []
+    for _ in range(runs):
+        gc.collect()
+        gc.disable()  # like timeit, so collections triggered by the new objects don't land in a timing
+        try:
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return min(timings)
+
+
+def in_memory(args, map_to_pull_request):
+    tuple_rows = build_rows(args.rows)
+    dict_rows = [dict(zip(COLUMNS, row)) for row in tuple_rows]
+    positional = PULL_REQUEST_ROW.compile(COLUMNS)
+
+    def dict_mapping():
+        return [map_to_pull_request(row) for row in dict_rows]
+
+    def tuple_to_dict_mapping():
+        return [map_to_pull_request(dict(zip(COLUMNS, row))) for row in tuple_rows]
+
+    def positional_mapping():
+        return [positional(row) for row in tuple_rows]
+
+    assert dict_mapping() == tuple_to_dict_mapping() == positional_mapping()
+    return [
+        ('dict rows -> _map_to_*', best_of(args.runs, dict_mapping)),
+        ('tuples -> dict -> _map_to_*', best_of(args.runs, tuple_to_dict_mapping)),
+        ('tuples -> RowMapper', best_of(args.runs, positional_mapping)),
+    ]
+
+
+def end_to_end(args, map_to_pull_request):
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+    from gittensor_db.connection.database import get_database_config
+
+    dict_db = psycopg2.connect(cursor_factory=RealDictCursor, **get_database_config())
+    tuple_db = psycopg2.connect(**get_database_config())
+
+    def fetch(db):
+        with db.cursor() as cursor:
+            cursor.execute(GENERATED_ROWS, (args.rows,))
+            rows = cursor.fetchall()
+            description = cursor.description
+        db.rollback()
+        mapper = resolve_mapper(map_to_pull_request, description, rows[0])
+        return [mapper(row) for row in rows]
+
+    try:
+        assert fetch(dict_db) == fetch(tuple_db)
+        return [
+            ('RealDictCursor + _map_to_*', best_of(args.runs, lambda: fetch(dict_db))),
+            ('tuple cursor + RowMapper', best_of(args.runs, lambda: fetch(tuple_db))),
+        ]
+    finally:
+        dict_db.close()
+        tuple_db.close()
+
+
+def report(title: str, rows: int, results) -> None:
+    print(title)
+    print(f"{'method':<30} {'ms':>9} {'ns/row':>8} {'vs first':>9}")
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"{name:<30} {seconds * 1000:>9.2f} {seconds * 1e9 / rows:>8.0f} {baseline / seconds:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--database', action='store_true', help='also fetch the rows from the configured database')
+    args = parser.parse_args()
+
+    # The mapping methods don't touch the connection
+    map_to_pull_request = PullRequestsRepository(None)._map_to_pull_request
+
+    report(f"{args.rows} rows, mapping only (best of {args.runs})", args.rows, in_memory(args, map_to_pull_request))
+    if args.database:
+        print()
+        report(f"{args.rows} rows, fetch + mapping (best of {args.runs})", args.rows, end_to_end(args, map_to_pull_request))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: list-based ingest vs the streaming IngestPipeline.
+
+Generates synthetic GitHub payloads (GraphQL pull request pages with closing issues
+and REST /pulls/{number}/files pages with patches) and writes them to the database
+configured by the DB_* environment variables two ways: fetching every page, parsing
+all of it into lists and calling the store_*_bulk methods (the current path), and
+streaming the pages through IngestPipeline. Reports wall time and the peak Python
+heap (tracemalloc) of each, then deletes the synthetic rows.
+
+Usage:
+    python benchmarks/bench_streaming_ingest.py --prs 2000 --files-per-pr 20 --patch-bytes 2000 --max-rows 2000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gittensor_db import (  # noqa: E402
+    create_database_connection,
+    MinersRepository,
+    RepositoriesRepository,
+    PullRequestsRepository,
+    IssuesRepository,
+    FileChangesRepository,
+    IngestPipeline,
+)
+from gittensor_db.models.domain_models import Miner, PullRequest, FileChange  # noqa: E402
+
+BENCH_OWNER = 'gittensor-bench'
+PAGE_SIZE = 100
+
+
+def pr_pages(repository: str, prs: int):
+    """GraphQL pull request pages, built on demand like a paginated fetch"""
+    for start in range(1, prs + 1, PAGE_SIZE):
+        yield {'data': {'node': {'pullRequests': {'nodes': [
+            {
+                'number': number, 'title': f"Synthetic PR {number}", 'author': {'login': 'bench-author'},
+                'repository': {'name': repository, 'owner': {'login': BENCH_OWNER}},
+                'mergedAt': '2024-01-02T00:00:00Z', 'createdAt': '2024-01-01T00:00:00Z',
+                'additions': 10, 'deletions': 2, 'commits': {'totalCount': 3}, 'mergedBy': None,
+                'closingIssuesReferences': {'nodes': [{
+                    'number': number, 'title': f"Synthetic issue {number}",
+                    'createdAt': '2024-01-01T00:00:00Z', 'closedAt': '2024-01-02T00:00:00Z',
+                }]},
+            }
+            for number in range(start, min(start + PAGE_SIZE, prs + 1))
+        ]}}}}
+
+
+def file_pages(pr_number: int, files_per_pr: int, patch_bytes: int):
+    """REST file pages of one pull request (patches differ per file)"""
+    for start in range(0, files_per_pr, PAGE_SIZE):
+        yield [
+            {
+                'filename': f"src/module_{index}.py", 'changes': 12, 'additions': 10, 'deletions': 2,
+                'status': 'modified', 'patch': f"+ pr {pr_number} file {index}\n".ljust(patch_bytes, '+'),
+            }
+            for index in range(start, min(start + PAGE_SIZE, files_per_pr))
+        ]
+
+
+def ingest_lists(db, miner: Miner, repository: str, args) -> None:
+    pages = list(pr_pages(repository, args.prs))
+    pull_requests = [
+        PullRequest.from_graphql_response(node, miner.uid, miner.hotkey, miner.github_id)
+        for page in pages for node in page['data']['node']['pullRequests']['nodes']
+    ]
+    file_changes = [
+        FileChange.from_github_response(pr.number, pr.repository_full_name, file_diff)
+        for pr in pull_requests
+        for page in list(file_pages(pr.number, args.files_per_pr, args.patch_bytes))
+        for file_diff in page
+    ]
+    MinersRepository(db).store_miners_bulk([miner])
+    RepositoriesRepository(db).store_repositories_bulk({pr.repository_full_name for pr in pull_requests})
+    PullRequestsRepository(db).store_pull_requests_bulk(pull_requests)
+    IssuesRepository(db).store_issues_bulk([issue for pr in pull_requests for issue in pr.issues])
+    FileChangesRepository(db).store_file_changes_bulk(file_changes)
+
+
+def ingest_pipeline(db, miner: Miner, repository: str, args) -> None:
+    full_name = f"{BENCH_OWNER}/{repository}"
+    with IngestPipeline(db, max_rows=args.max_rows, max_bytes=args.max_bytes) as pipeline:
+        pipeline.ingest_pull_request_pages(pr_pages(repository, args.prs), miner.uid, miner.hotkey, miner.github_id)
+        for number in range(1, args.prs + 1):
+            pipeline.ingest_file_change_pages(file_pages(number, args.files_per_pr, args.patch_bytes), number, full_name)
+    assert pipeline.written['file_changes'] == args.prs * args.files_per_pr, pipeline.failed
+
+
+def cleanup(db, repository_full_name: str) -> None:
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM repositories WHERE full_name = %s", (repository_full_name,))
+    db.commit()
+
+
+def measure(ingest, args) -> tuple:
+    db = create_database_connection()
+    if not db:
+        raise SystemExit("Could not connect to database (check DB_* environment variables)")
+    repository = f"ingest-{ingest.__name__}-{os.getpid()}"
+    miner = Miner(uid=9999, hotkey='bench-hotkey', github_id='bench-github')
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        ingest(db, miner, repository, args)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with db.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM file_changes WHERE repository_full_name = %s", (f"{BENCH_OWNER}/{repository}",))
+            stored = cursor.fetchone()[0]
+        return elapsed, peak, stored
+    finally:
+        cleanup(db, f"{BENCH_OWNER}/{repository}")
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prs', type=int, default=2000)
+    parser.add_argument('--files-per-pr', type=int, default=20)
+    parser.add_argument('--patch-bytes', type=int, default=2000)
+    parser.add_argument('--max-rows', type=int, default=2000, help='IngestPipeline rows per table per flush')
+    parser.add_argument('--max-bytes', type=int, default=8 * 1024 * 1024, help='IngestPipeline bytes per flush')
+    args = parser.parse_args()
+
+    print(f"{args.prs} pull requests x {args.files_per_pr} files, {args.patch_bytes} byte patches")
+    print(f"{'method':<12} {'seconds':>9} {'peak MiB':>10} {'file rows':>10}")
+    for ingest in (ingest_lists, ingest_pipeline):
+        elapsed, peak, stored = measure(ingest, args)
+        print(f"{ingest.__name__[7:]:<12} {elapsed:>9.2f} {peak / 2 ** 20:>10.1f} {stored:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,30 +2,97 @@
 GitTensor Database Layer
 
 A shared database abstraction layer for GitTensor validator and API services.
-"""
 
-from .connection.database import create_database_connection, test_database_connection
-from .migrations.migrator import DatabaseMigrator
-from .repositories import (
-    BaseRepository,
-    MinersRepository,
-    RepositoriesRepository,
-    PullRequestsRepository,
-    IssuesRepository,
-    FileChangesRepository,
-    MinerEvaluationsRepository,
-)
+Exports are imported lazily on first attribute access (PEP 562), so
+"import gittensor_db" stays cheap for CLI jobs, API cold starts and test
+collection; psycopg2 and the repositories load only when first used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
-__all__ = [
-    "create_database_connection",
-    "test_database_connection",
-    "BaseRepository",
-    "DatabaseMigrator",
-    "MinersRepository",
-    "RepositoriesRepository",
-    "PullRequestsRepository",
-    "IssuesRepository",
-    "FileChangesRepository",
-    "MinerEvaluationsRepository",
-]
\ No newline at end of file
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "create_database_connection": ".connection.database",
+    "test_database_connection": ".connection.database",
+    "create_connection_pool": ".connection.pool",
+    "ConnectionPool": ".connection.pool",
+    "PoolStats": ".connection.pool",
+    "PoolTimeoutError": ".connection.pool",
+    "add_query_hook": ".instrumentation",
+    "remove_query_hook": ".instrumentation",
+    "QueryEvent": ".instrumentation",
+    "QueryStatsRecorder": ".instrumentation",
+    "enable_prepared_statements": ".prepared_statements",
+    "disable_prepared_statements": ".prepared_statements",
+    "invalidate_prepared_statements": ".prepared_statements",
+    "set_logger": ".log",
+    "BaseRepository": ".repositories",
+    "UpsertCounts": ".repositories",
+    "DatabaseMigrator": ".migrations.migrator",
+    "MinersRepository": ".repositories",
+    "RepositoriesRepository": ".repositories",
+    "PullRequestsRepository": ".repositories",
+    "IssuesRepository": ".repositories",
+    "FileChangesRepository": ".repositories",
+    "MinerEvaluationsRepository": ".repositories",
+    "EvaluationUnitOfWork": ".repositories",
+    "IngestPipeline": ".repositories",
+    "WatermarksRepository": ".repositories",
+    "CachedMinersRepository": ".repositories",
+    "CachedRepositoriesRepository": ".repositories",
+    "PartitionsRepository": ".repositories",
+    "Page": ".repositories",
+    "InvalidPageTokenError": ".repositories",
+    "score_evaluations": ".models.scoring",
+    "SpamPenalty": ".models.scoring",
+    "EvaluationScores": ".models.scoring",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .connection.database import create_database_connection, test_database_connection
+    from .connection.pool import ConnectionPool, PoolStats, PoolTimeoutError, create_connection_pool
+    from .instrumentation import QueryEvent, QueryStatsRecorder, add_query_hook, remove_query_hook
+    from .log import set_logger
+    from .prepared_statements import (
+        disable_prepared_statements,
+        enable_prepared_statements,
+        invalidate_prepared_statements,
+    )
+    from .migrations.migrator import DatabaseMigrator
+    from .models.scoring import EvaluationScores, SpamPenalty, score_evaluations
+    from .repositories import (
+        BaseRepository,
+        UpsertCounts,
+        MinersRepository,
+        RepositoriesRepository,
+        PullRequestsRepository,
+        IssuesRepository,
+        FileChangesRepository,
+        MinerEvaluationsRepository,
+        EvaluationUnitOfWork,
+        IngestPipeline,
+        WatermarksRepository,
+        CachedMinersRepository,
+        CachedRepositoriesRepository,
+        PartitionsRepository,
+        Page,
+        InvalidPageTokenError,
+    )
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Asyncio repository layer
+
+Async mirrors of the repositories in gittensor_db.repositories, running on
+psycopg 3 and psycopg_pool. They share the SQL in gittensor_db.queries and the
+row mappers and domain models of their sync counterparts.
+
+Requires the optional dependencies: pip install gittensor-db[async]
+"""
+
+from .pool import create_async_connection_pool, get_async_connection_kwargs, ASYNC_POSTGRES_AVAILABLE
+from .base_repository import BaseRepository
+from .miners_repository import MinersRepository
+from .repositories_repository import RepositoriesRepository
+from .pull_requests_repository import PullRequestsRepository
+from .file_changes_repository import FileChangesRepository
+from .miner_evaluations_repository import MinerEvaluationsRepository
+from .issues_repository import IssuesRepository
+
+__all__ = [
+    'create_async_connection_pool',
+    'get_async_connection_kwargs',
+    'ASYNC_POSTGRES_AVAILABLE',
+    'BaseRepository',
+    'MinersRepository',
+    'RepositoriesRepository',
+    'PullRequestsRepository',
+    'FileChangesRepository',
+    'MinerEvaluationsRepository',
+    'IssuesRepository'
+]
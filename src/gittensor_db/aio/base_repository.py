@@ -0,0 +1,406 @@
+"""
+Async base repository mirroring repositories.base_repository.BaseRepository.
+
+Accepts either a psycopg AsyncConnection or an AsyncConnectionPool; with a pool a
+connection is borrowed per operation. Rows are expected as dictionaries
+(psycopg.rows.dict_row) so the sync mappers can be shared.
+"""
+
+from typing import Optional, List, Dict, Any, TypeVar, Callable, AsyncIterator, Hashable, Iterable
+from contextlib import asynccontextmanager
+import itertools
+import logging
+
+from .pool import AsyncConnectionPool
+from .. import prepared_statements
+from ..instrumentation import (
+    instrument,
+    map_rows,
+    record_rows,
+    OPERATION_BULK,
+    OPERATION_COMMAND,
+    OPERATION_SELECT,
+)
+from ..repositories.base_repository import (
+    BULK_METHOD_VALUES,
+    BULK_METHOD_COPY,
+    BULK_METHODS,
+    DEFAULT_ITERSIZE,
+    LOOKUP_BATCH_SIZE,
+    UpsertCounts,
+)
+
+T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
+
+# Rows per multi-row INSERT, matching execute_values' page_size in the sync repositories
+VALUES_PAGE_SIZE = 100
+
+_stream_cursor_ids = itertools.count(1)
+
+
+def expand_values_query(query: str, row_width: int, row_count: int) -> str:
+    """
+    Expand an execute_values style "VALUES %s" query into explicit row placeholders.
+
+    Args:
+        query: Query containing a single "VALUES %s"
+        row_width: Number of columns per row
+        row_count: Number of rows in the page
+
+    Returns:
+        Query with "VALUES (%s, ...), (%s, ...)" for row_count rows
+    """
+    row_placeholder = '(' + ', '.join(['%s'] * row_width) + ')'
+    return query.replace('VALUES %s', 'VALUES ' + ', '.join([row_placeholder] * row_count), 1)
+
+
+async def _execute(cursor, query: str, params: tuple) -> None:
+    """cursor.execute, asking psycopg to prepare the query server-side if prepared_statements enables it"""
+    if prepared_statements.is_prepared(query):
+        await cursor.execute(query, params, prepare=True)
+    else:
+        await cursor.execute(query, params)
+
+
+class BaseRepository:
+    """
+    Async base repository class that handles database connections and provides
+    clean query execution methods.
+    """
+
+    def __init__(self, db_connection):
+        """
+        Args:
+            db_connection: A psycopg AsyncConnection, or an AsyncConnectionPool to
+                borrow a connection from for each operation
+        """
+        self.db = db_connection
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Async context manager yielding the connection to use for one operation.
+        Pooled connections are returned to the pool when the block exits.
+        """
+        if AsyncConnectionPool is not None and isinstance(self.db, AsyncConnectionPool):
+            async with self.db.connection() as connection:
+                yield connection
+        else:
+            yield self.db
+
+    @asynccontextmanager
+    async def get_cursor(self):
+        """
+        Async context manager for database cursor operations.
+        Automatically handles cursor cleanup.
+        """
+        async with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            finally:
+                await cursor.close()
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Async context manager yielding a cursor whose work is committed when the
+        block exits cleanly and rolled back (then re-raised) on error.
+        """
+        async with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+            finally:
+                await cursor.close()
+
+    async def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query and return results.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+
+        Returns:
+            List of result dictionaries
+        """
+        with instrument(query, OPERATION_SELECT) as event:
+            async with self.get_cursor() as cursor:
+                await _execute(cursor, query, params)
+                rows = await cursor.fetchall()
+            record_rows(event, rows)
+            return rows
+
+    async def execute_single_query(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+        """
+        Execute a SELECT query and return single result.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+
+        Returns:
+            Single result dictionary or None
+        """
+        with instrument(query, OPERATION_SELECT) as event:
+            async with self.get_cursor() as cursor:
+                await _execute(cursor, query, params)
+                row = await cursor.fetchone()
+            if row is not None:
+                record_rows(event, (row,))
+            return row
+
+    async def execute_command(self, query: str, params: tuple = ()) -> bool:
+        """
+        Execute an INSERT, UPDATE, or DELETE command.
+
+        Args:
+            query: SQL command string
+            params: Query parameters tuple
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with instrument(query, OPERATION_COMMAND) as event:
+                async with self.transaction() as cursor:
+                    await _execute(cursor, query, params)
+                    if event is not None:
+                        event.rows = cursor.rowcount
+            return True
+        except Exception as e:
+            self.logger.error(f"Error executing command: {e}")
+            return False
+
+    async def iter_query(
+        self,
+        query: str,
+        params: tuple = (),
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query through a named server-side cursor and yield rows lazily.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            itersize: Rows fetched from the server per round trip
+
+        Yields:
+            Result rows
+        """
+        async with self.connection() as connection:
+            cursor = connection.cursor(name=f"gittensor_async_stream_{next(_stream_cursor_ids)}")
+            cursor.itersize = itersize
+            try:
+                await cursor.execute(query, params)
+                async for row in cursor:
+                    yield row
+            finally:
+                await cursor.close()
+
+    async def execute_bulk(
+        self,
+        cursor,
+        values: List[tuple],
+        values_query: str,
+        staging_queries: Optional[tuple] = None,
+        method: str = BULK_METHOD_VALUES
+    ) -> None:
+        """
+        Write rows in bulk on an open cursor using the selected strategy.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            values: Row tuples to write
+            values_query: INSERT ... VALUES %s query
+            staging_queries: (create staging, COPY into staging, INSERT from staging)
+                queries used by the COPY strategy
+            method: BULK_METHOD_VALUES or BULK_METHOD_COPY
+        """
+        if method not in BULK_METHODS:
+            raise ValueError(f"Unknown bulk method {method!r}, expected one of {BULK_METHODS}")
+
+        with instrument(values_query, OPERATION_BULK) as event:
+            if method == BULK_METHOD_COPY:
+                if staging_queries is None:
+                    raise ValueError("COPY bulk method requires staging queries")
+                create_staging, copy_staging, insert_from_staging = staging_queries
+                await cursor.execute(create_staging)
+                async with cursor.copy(copy_staging) as copy:
+                    for row in values:
+                        await copy.write_row(row)
+                await cursor.execute(insert_from_staging)
+            else:
+                for start in range(0, len(values), VALUES_PAGE_SIZE):
+                    page = values[start:start + VALUES_PAGE_SIZE]
+                    query = expand_values_query(values_query, len(page[0]), len(page))
+                    await cursor.execute(query, [param for row in page for param in row])
+            if event is not None:
+                event.rows = len(values)
+
+    async def execute_bulk_upsert(
+        self,
+        cursor,
+        values: List[tuple],
+        values_query: str,
+        staging_queries: Optional[tuple] = None,
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Write rows with a change-aware upsert on an open cursor and count what happened.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            values: Row tuples to write, at most one per conflict key
+            values_query: WITH upserted AS (INSERT ... VALUES %s ...) query
+            staging_queries: (create staging, COPY into staging, upsert from staging)
+                queries used by the COPY strategy
+            method: BULK_METHOD_VALUES or BULK_METHOD_COPY
+
+        Returns:
+            UpsertCounts for the rows
+        """
+        if method not in BULK_METHODS:
+            raise ValueError(f"Unknown bulk method {method!r}, expected one of {BULK_METHODS}")
+
+        counts = UpsertCounts()
+        rows = []
+        with instrument(values_query, OPERATION_BULK) as event:
+            if method == BULK_METHOD_COPY:
+                if staging_queries is None:
+                    raise ValueError("COPY bulk method requires staging queries")
+                create_staging, copy_staging, upsert_from_staging = staging_queries
+                await cursor.execute(create_staging)
+                async with cursor.copy(copy_staging) as copy:
+                    for row in values:
+                        await copy.write_row(row)
+                await cursor.execute(upsert_from_staging)
+                rows.append(await cursor.fetchone())
+            else:
+                for start in range(0, len(values), VALUES_PAGE_SIZE):
+                    page = values[start:start + VALUES_PAGE_SIZE]
+                    query = expand_values_query(values_query, len(page[0]), len(page))
+                    await cursor.execute(query, [param for row in page for param in row])
+                    rows.append(await cursor.fetchone())
+
+            for row in rows:
+                counts.inserted += row['inserted']
+                counts.updated += row['updated']
+            counts.unchanged = len(values) - counts.written
+            if event is not None:
+                event.rows = counts.written
+        return counts
+
+    async def query_single(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T]) -> Optional[T]:
+        """
+        Execute query and map single result to domain object.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            mapper: Function to map result dict to domain object
+
+        Returns:
+            Mapped domain object or None
+        """
+        result = await self.execute_single_query(query, params)
+        if result:
+            return mapper(result)
+        return None
+
+    async def query_multiple(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T]) -> List[T]:
+        """
+        Execute query and map multiple results to domain objects.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            mapper: Function to map result dict to domain object
+
+        Returns:
+            List of mapped domain objects
+        """
+        with instrument(query, OPERATION_SELECT) as event:
+            async with self.get_cursor() as cursor:
+                await _execute(cursor, query, params)
+                results = await cursor.fetchall()
+            record_rows(event, results)
+            return map_rows(event, results, mapper)
+
+    async def query_grouped(
+        self,
+        query: str,
+        keys: Iterable[K],
+        row_key: Callable[[Dict[str, Any]], K],
+        mapper: Callable[[Dict[str, Any]], T],
+        batch_size: int = LOOKUP_BATCH_SIZE
+    ) -> Dict[K, List[T]]:
+        """
+        Look up all domain objects belonging to each key with one query per batch of keys.
+
+        Args:
+            query: SQL query taking the keys as array parameters
+            keys: Keys to look up (duplicates are fetched once)
+            row_key: Function extracting the lookup key from a result row
+            mapper: Function to map result dict to domain object
+            batch_size: Keys per query
+
+        Returns:
+            Mapped domain objects per input key in query order, an empty list for keys without rows
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        results: Dict[K, List[T]] = {key: [] for key in unique_keys}
+        for start in range(0, len(unique_keys), batch_size):
+            batch = unique_keys[start:start + batch_size]
+            if isinstance(batch[0], tuple):
+                params = tuple(list(column) for column in zip(*batch))
+            else:
+                params = (batch,)
+            for row in await self.execute_query(query, params):
+                key = row_key(row)
+                if key in results:
+                    results[key].append(mapper(row))
+        return results
+
+    async def stream_multiple(
+        self,
+        query: str,
+        params: tuple,
+        mapper: Callable[[Dict[str, Any]], T],
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> AsyncIterator[T]:
+        """
+        Execute query through a server-side cursor and lazily map each row.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            mapper: Function to map result dict to domain object
+            itersize: Rows fetched from the server per round trip
+
+        Yields:
+            Mapped domain objects
+        """
+        async for row in self.iter_query(query, params, itersize):
+            yield mapper(row)
+
+    async def set_entity(self, query: str, params: tuple) -> bool:
+        """
+        Insert or update an entity using the provided query.
+
+        Args:
+            query: SQL INSERT/UPDATE query
+            params: Query parameters tuple
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return await self.execute_command(query, params)
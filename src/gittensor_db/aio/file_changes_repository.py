@@ -0,0 +1,186 @@
+"""
+Async repository for handling database operations for FileChange entities
+"""
+from typing import Optional, List, Dict, Iterable, Tuple, Union
+from ..models.domain_models import FileChange
+from ..models.batches import FileChangeBatch
+from ..repositories.base_repository import BULK_METHOD_VALUES, LOOKUP_BATCH_SIZE, UpsertCounts, unique_rows
+from ..repositories.file_changes_repository import FileChangesRepository as SyncFileChangesRepository
+from .base_repository import BaseRepository
+from ..queries import (
+    GET_FILE_CHANGE,
+    GET_FILE_CHANGES_BY_PR,
+    GET_FILE_CHANGES_FOR_PULL_REQUESTS,
+    SET_FILE_CHANGES_FOR_PR,
+    BULK_UPSERT_FILE_CHANGES,
+    BULK_UPSERT_CHANGED_FILE_CHANGES,
+    CREATE_FILE_CHANGES_STAGING,
+    COPY_FILE_CHANGES_STAGING,
+    INSERT_FILE_CHANGES_FROM_STAGING,
+    UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING,
+    GET_EXISTING_PATCH_HASHES,
+    BULK_INSERT_PATCH_BLOBS
+)
+
+
+class FileChangesRepository(BaseRepository):
+    """Async counterpart of repositories.FileChangesRepository"""
+
+    _map_to_file_change = SyncFileChangesRepository._map_to_file_change
+    _file_change_params = SyncFileChangesRepository._file_change_params
+    _bulk_params = SyncFileChangesRepository._bulk_params
+    _patch_blob_rows = staticmethod(SyncFileChangesRepository._patch_blob_rows)
+
+    async def write_patch_blobs(self, cursor, patches: Dict[bytes, bytes]) -> int:
+        """Store the patches that patch_blobs doesn't have yet, on an open cursor"""
+        if not patches:
+            return 0
+        await cursor.execute(GET_EXISTING_PATCH_HASHES, (list(patches),))
+        rows = self._patch_blob_rows(patches, (row['hash'] for row in await cursor.fetchall()))
+        if rows:
+            await self.execute_bulk(cursor, rows, BULK_INSERT_PATCH_BLOBS)
+        return len(rows)
+
+    async def get_file_change(self, file_change_id: int) -> Optional[FileChange]:
+        """Get a file change by its ID"""
+        return await self.query_single(GET_FILE_CHANGE, (file_change_id,), self._map_to_file_change)
+
+    async def get_file_changes_by_pr(self, pr_number: int, repository_full_name: str) -> List[FileChange]:
+        """Get all file changes for a specific pull request"""
+        return await self.query_multiple(
+            GET_FILE_CHANGES_BY_PR, (pr_number, repository_full_name), self._map_to_file_change
+        )
+
+    async def get_file_changes_for_pull_requests(
+        self,
+        pr_keys: Iterable[Tuple[int, str]],
+        batch_size: int = LOOKUP_BATCH_SIZE
+    ) -> Dict[Tuple[int, str], List[FileChange]]:
+        """
+        Get the file changes of many pull requests with one query per batch of PRs
+
+        Args:
+            pr_keys: (pr_number, repository_full_name) pairs
+            batch_size: Pull requests per query
+
+        Returns:
+            File changes ordered by filename per input (pr_number, repository_full_name),
+            an empty list for pull requests without file changes
+        """
+        return await self.query_grouped(
+            GET_FILE_CHANGES_FOR_PULL_REQUESTS,
+            pr_keys,
+            lambda row: (row['pr_number'], row['repository_full_name']),
+            self._map_to_file_change,
+            batch_size
+        )
+
+    async def set_file_changes_for_pr(
+        self,
+        pr_number: int,
+        repository_full_name: str,
+        file_changes: List[FileChange]
+    ) -> bool:
+        """
+        Set file changes for a specific pull request in a single transaction.
+
+        Args:
+            pr_number: Pull request number
+            repository_full_name: Repository full name
+            file_changes: List of FileChange objects to store
+
+        Returns:
+            True if all file changes were stored successfully, False otherwise
+        """
+        if not file_changes:
+            return True
+
+        patches = {}
+        rows = [
+            self._file_change_params(pr_number, repository_full_name, file_change, patches)
+            for file_change in file_changes
+        ]
+
+        try:
+            async with self.transaction() as cursor:
+                await self.write_patch_blobs(cursor, patches)
+                await cursor.executemany(SET_FILE_CHANGES_FOR_PR, rows)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error storing file changes for PR {pr_number} in {repository_full_name}: {e}")
+            return False
+
+    async def set_file_change(self, pr_number: int, repository_full_name: str, file_change: FileChange) -> bool:
+        """Set a single file change for a pull request"""
+        return await self.set_file_changes_for_pr(pr_number, repository_full_name, [file_change])
+
+    async def store_file_changes_bulk(
+        self,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> int:
+        """
+        Bulk insert file changes
+
+        Args:
+            file_changes: FileChange objects or a FileChangeBatch to store (must include pr_number and repository_full_name)
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of successfully stored file changes
+        """
+        if not file_changes:
+            return 0
+
+        patches = {}
+        values = self._bulk_params(file_changes, patches)
+
+        try:
+            async with self.transaction() as cursor:
+                await self.write_patch_blobs(cursor, patches)
+                await self.execute_bulk(
+                    cursor,
+                    values,
+                    BULK_UPSERT_FILE_CHANGES,
+                    (CREATE_FILE_CHANGES_STAGING, COPY_FILE_CHANGES_STAGING, INSERT_FILE_CHANGES_FROM_STAGING),
+                    method
+                )
+            return len(values)
+        except Exception as e:
+            self.logger.error(f"Error in bulk file change storage: {e}")
+            return 0
+
+    async def upsert_file_changes_bulk(
+        self,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Bulk insert file changes and update stored ones whose values or patch changed
+
+        Args:
+            file_changes: FileChange objects or a FileChangeBatch to store (must include pr_number and repository_full_name)
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (all zero if the transaction failed)
+        """
+        if not file_changes:
+            return UpsertCounts()
+
+        patches = {}
+        values = unique_rows(self._bulk_params(file_changes, patches), 3)
+
+        try:
+            async with self.transaction() as cursor:
+                await self.write_patch_blobs(cursor, patches)
+                return await self.execute_bulk_upsert(
+                    cursor,
+                    values,
+                    BULK_UPSERT_CHANGED_FILE_CHANGES,
+                    (CREATE_FILE_CHANGES_STAGING, COPY_FILE_CHANGES_STAGING, UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING),
+                    method
+                )
+        except Exception as e:
+            self.logger.error(f"Error in bulk file change upsert: {e}")
+            return UpsertCounts()
@@ -0,0 +1,97 @@
+"""
+Async repository for handling database operations for Issue entities
+"""
+from typing import Optional, List
+from ..models.domain_models import Issue
+from ..repositories.base_repository import BULK_METHOD_VALUES, UpsertCounts
+from ..repositories.issues_repository import IssuesRepository as SyncIssuesRepository
+from .base_repository import BaseRepository
+from ..queries import (
+    GET_ISSUE,
+    GET_ISSUES_BY_REPOSITORY,
+    SET_ISSUE,
+    BULK_UPSERT_ISSUES,
+    BULK_UPSERT_CHANGED_ISSUES,
+    CREATE_ISSUES_STAGING,
+    COPY_ISSUES_STAGING,
+    INSERT_ISSUES_FROM_STAGING,
+    UPSERT_CHANGED_ISSUES_FROM_STAGING
+)
+
+
+class IssuesRepository(BaseRepository):
+    """Async counterpart of repositories.IssuesRepository"""
+
+    _map_to_issue = SyncIssuesRepository._map_to_issue
+    _issue_params = SyncIssuesRepository._issue_params
+
+    async def get_issue(self, number: int, repository_full_name: str) -> Optional[Issue]:
+        """Get an issue by its number and repository"""
+        return await self.query_single(GET_ISSUE, (number, repository_full_name), self._map_to_issue)
+
+    async def get_issues_by_repository(self, repository_full_name: str) -> List[Issue]:
+        """Get all issues for a given repository"""
+        return await self.query_multiple(GET_ISSUES_BY_REPOSITORY, (repository_full_name,), self._map_to_issue)
+
+    async def set_issue(self, issue: Issue) -> bool:
+        """Insert an issue (ignore conflicts)"""
+        return await self.set_entity(SET_ISSUE, self._issue_params(issue))
+
+    async def store_issues_bulk(self, issues: List[Issue], method: str = BULK_METHOD_VALUES) -> int:
+        """
+        Bulk insert issues
+
+        Args:
+            issues: List of Issue objects to store
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of successfully stored issues
+        """
+        if not issues:
+            return 0
+
+        values = [self._issue_params(issue) for issue in issues]
+
+        try:
+            async with self.transaction() as cursor:
+                await self.execute_bulk(
+                    cursor,
+                    values,
+                    BULK_UPSERT_ISSUES,
+                    (CREATE_ISSUES_STAGING, COPY_ISSUES_STAGING, INSERT_ISSUES_FROM_STAGING),
+                    method
+                )
+            return len(values)
+        except Exception as e:
+            self.logger.error(f"Error in bulk issue storage: {e}")
+            return 0
+
+    async def upsert_issues_bulk(self, issues: List[Issue], method: str = BULK_METHOD_VALUES) -> UpsertCounts:
+        """
+        Bulk insert issues and update stored ones whose values changed
+
+        Args:
+            issues: List of Issue objects to store
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (all zero if the transaction failed)
+        """
+        if not issues:
+            return UpsertCounts()
+
+        values = list({(issue.number, issue.repository_full_name): self._issue_params(issue) for issue in issues}.values())
+
+        try:
+            async with self.transaction() as cursor:
+                return await self.execute_bulk_upsert(
+                    cursor,
+                    values,
+                    BULK_UPSERT_CHANGED_ISSUES,
+                    (CREATE_ISSUES_STAGING, COPY_ISSUES_STAGING, UPSERT_CHANGED_ISSUES_FROM_STAGING),
+                    method
+                )
+        except Exception as e:
+            self.logger.error(f"Error in bulk issue upsert: {e}")
+            return UpsertCounts()
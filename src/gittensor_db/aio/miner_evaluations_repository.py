@@ -0,0 +1,53 @@
+"""
+Async repository for handling database operations for MinerEvaluation entities
+"""
+from typing import Optional, List, AsyncIterator
+from datetime import datetime
+from ..models.domain_models import MinerEvaluation
+from ..repositories.base_repository import DEFAULT_ITERSIZE
+from ..repositories.miner_evaluations_repository import (
+    MinerEvaluationsRepository as SyncMinerEvaluationsRepository
+)
+from .base_repository import BaseRepository
+from ..queries import (
+    GET_MINER_EVALUATION,
+    GET_LATEST_MINER_EVALUATION,
+    SET_MINER_EVALUATION,
+    GET_EVALUATIONS_BY_TIMEFRAME
+)
+
+
+class MinerEvaluationsRepository(BaseRepository):
+    """Async counterpart of repositories.MinerEvaluationsRepository"""
+
+    _map_to_miner_evaluation = SyncMinerEvaluationsRepository._map_to_miner_evaluation
+    _miner_evaluation_params = SyncMinerEvaluationsRepository._miner_evaluation_params
+
+    async def get_miner_evaluation(self, evaluation_id: int) -> Optional[MinerEvaluation]:
+        """Get a miner evaluation by its ID"""
+        return await self.query_single(GET_MINER_EVALUATION, (evaluation_id,), self._map_to_miner_evaluation)
+
+    async def get_latest_miner_evaluation(self, uid: int, hotkey: str) -> Optional[MinerEvaluation]:
+        """Get the latest miner evaluation for a specific miner"""
+        return await self.query_single(GET_LATEST_MINER_EVALUATION, (uid, hotkey), self._map_to_miner_evaluation)
+
+    async def set_miner_evaluation(self, evaluation: MinerEvaluation) -> bool:
+        """Insert a new miner evaluation"""
+        return await self.set_entity(SET_MINER_EVALUATION, self._miner_evaluation_params(evaluation))
+
+    async def get_evaluations_by_timeframe(self, start_time: datetime, end_time: datetime) -> List[MinerEvaluation]:
+        """Get all miner evaluations within a specific timeframe"""
+        return await self.query_multiple(
+            GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation
+        )
+
+    def iter_evaluations_by_timeframe(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> AsyncIterator[MinerEvaluation]:
+        """Stream miner evaluations within a specific timeframe through a server-side cursor"""
+        return self.stream_multiple(
+            GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation, itersize
+        )
@@ -0,0 +1,91 @@
+"""
+Async repository for handling database operations for Miner entities
+"""
+from typing import Optional, List
+from ..models.domain_models import Miner
+from ..repositories.base_repository import BULK_METHOD_VALUES
+from ..repositories.miners_repository import MinersRepository as SyncMinersRepository
+from .base_repository import BaseRepository
+from ..queries import (
+    GET_MINER,
+    GET_MINER_BY_UID,
+    GET_MINER_BY_HOTKEY,
+    GET_MINER_BY_GITHUB_ID,
+    GET_MINER_BY_HOTKEY_AND_GITHUB_ID,
+    SET_MINER,
+    UPSERT_MINER,
+    GET_ALL_MINERS,
+    BULK_UPSERT_MINERS,
+    CREATE_MINERS_STAGING,
+    COPY_MINERS_STAGING,
+    INSERT_MINERS_FROM_STAGING
+)
+
+
+class MinersRepository(BaseRepository):
+    """Async counterpart of repositories.MinersRepository"""
+
+    _map_to_miner = SyncMinersRepository._map_to_miner
+    _miner_params = SyncMinersRepository._miner_params
+
+    async def get_miner(self, uid: int, hotkey: str, github_id: str) -> Optional[Miner]:
+        """Get a miner by their composite primary key"""
+        return await self.query_single(GET_MINER, (uid, hotkey, github_id), self._map_to_miner)
+
+    async def get_miner_by_uid(self, uid: int) -> Optional[Miner]:
+        """Get a miner by UID"""
+        return await self.query_single(GET_MINER_BY_UID, (uid,), self._map_to_miner)
+
+    async def get_miner_by_hotkey(self, hotkey: str) -> Optional[Miner]:
+        """Get a miner by hotkey"""
+        return await self.query_single(GET_MINER_BY_HOTKEY, (hotkey,), self._map_to_miner)
+
+    async def get_miner_by_github_id(self, github_id: str) -> Optional[Miner]:
+        """Get a miner by GitHub ID"""
+        return await self.query_single(GET_MINER_BY_GITHUB_ID, (github_id,), self._map_to_miner)
+
+    async def get_miner_by_hotkey_and_github_id(self, hotkey: str, github_id: str) -> Optional[Miner]:
+        """Get a miner by hotkey and GitHub ID"""
+        return await self.query_single(GET_MINER_BY_HOTKEY_AND_GITHUB_ID, (hotkey, github_id), self._map_to_miner)
+
+    async def set_miner(self, miner: Miner) -> bool:
+        """Insert a miner (ignore conflicts)"""
+        return await self.set_entity(SET_MINER, self._miner_params(miner))
+
+    async def upsert_miner(self, miner: Miner) -> bool:
+        """Insert or update a miner (updates timestamp on conflict)"""
+        return await self.set_entity(UPSERT_MINER, self._miner_params(miner))
+
+    async def get_all_miners(self) -> List[Miner]:
+        """Get all miners"""
+        return await self.query_multiple(GET_ALL_MINERS, (), self._map_to_miner)
+
+    async def store_miners_bulk(self, miners: List[Miner], method: str = BULK_METHOD_VALUES) -> int:
+        """
+        Bulk upsert miners
+
+        Args:
+            miners: List of Miner objects to store
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of successfully stored miners
+        """
+        if not miners:
+            return 0
+
+        values = [self._miner_params(miner) for miner in miners]
+
+        try:
+            async with self.transaction() as cursor:
+                await self.execute_bulk(
+                    cursor,
+                    values,
+                    BULK_UPSERT_MINERS,
+                    (CREATE_MINERS_STAGING, COPY_MINERS_STAGING, INSERT_MINERS_FROM_STAGING),
+                    method
+                )
+            return len(values)
+        except Exception as e:
+            self.logger.error(f"Error in bulk miner storage: {e}")
+            return 0
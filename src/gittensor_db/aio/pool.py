@@ -0,0 +1,84 @@
+"""
+Async database connection pool for asyncio services.
+
+Built on psycopg 3 and psycopg_pool, which bind parameters with the same %s
+placeholders as psycopg2, so the SQL in queries/queries.py is shared unchanged.
+"""
+import os
+from typing import Any, Dict, Optional
+from .. import log
+
+from ..connection.database import get_database_config
+
+try:
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+    ASYNC_POSTGRES_AVAILABLE = True
+except ImportError:
+    AsyncConnectionPool = None
+    ASYNC_POSTGRES_AVAILABLE = False
+
+
+def get_async_connection_kwargs(db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Translate psycopg2-style connection parameters into psycopg 3 keyword arguments.
+
+    Rows are returned as dictionaries so the sync repository mappers can be reused.
+
+    Args:
+        db_config: psycopg2 connection parameters (defaults to environment variables)
+
+    Returns:
+        Keyword arguments for psycopg.AsyncConnection.connect
+    """
+    config = dict(db_config if db_config is not None else get_database_config())
+    if 'database' in config:
+        config['dbname'] = config.pop('database')
+    config['row_factory'] = dict_row
+    config['autocommit'] = False
+    return config
+
+
+async def create_async_connection_pool(
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    db_config: Optional[Dict[str, Any]] = None,
+    **kwargs
+) -> Optional['AsyncConnectionPool']:
+    """
+    Create and open an async connection pool configured from environment variables.
+
+    Pool bounds default to DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE (1 and 10).
+
+    Args:
+        min_size: Connections kept open even when idle
+        max_size: Upper bound on open connections
+        db_config: psycopg2-style connection parameters (defaults to environment variables)
+        **kwargs: Additional psycopg_pool.AsyncConnectionPool options (timeout, max_idle, max_lifetime, ...)
+
+    Returns:
+        Open AsyncConnectionPool if successful, None otherwise
+    """
+    if not ASYNC_POSTGRES_AVAILABLE:
+        log.error("Cannot create async connection pool: psycopg and psycopg_pool not installed")
+        return None
+
+    if min_size is None:
+        min_size = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+    if max_size is None:
+        max_size = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+
+    try:
+        pool = AsyncConnectionPool(
+            min_size=min_size,
+            max_size=max_size,
+            kwargs=get_async_connection_kwargs(db_config),
+            open=False,
+            **kwargs
+        )
+        await pool.open(wait=True)
+        log.success(f"Created async PostgreSQL connection pool (min={min_size}, max={max_size})")
+        return pool
+    except Exception as e:
+        log.error(f"Failed to create async connection pool: {e}")
+        return None
@@ -0,0 +1,200 @@
+"""
+Async repository for handling database operations for PullRequest entities
+"""
+from typing import Optional, List, AsyncIterator, Union
+from ..models.domain_models import PullRequest, MinerAggregate
+from ..models.batches import PullRequestBatch
+from ..repositories.base_repository import BULK_METHOD_VALUES, DEFAULT_ITERSIZE, UpsertCounts, unique_rows
+from ..repositories.pull_requests_repository import PullRequestsRepository as SyncPullRequestsRepository
+from .base_repository import BaseRepository
+from .file_changes_repository import FileChangesRepository
+from ..queries import (
+    GET_PULL_REQUEST,
+    SET_PULL_REQUEST,
+    GET_PULL_REQUESTS_BY_REPOSITORY,
+    GET_PULL_REQUESTS_BY_MINER,
+    GET_MINER_AGGREGATE,
+    GET_MINER_AGGREGATES,
+    GET_PULL_REQUEST_WITH_FILE_CHANGES,
+    GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY,
+    BULK_UPSERT_PULL_REQUESTS,
+    BULK_UPSERT_CHANGED_PULL_REQUESTS,
+    CREATE_PULL_REQUESTS_STAGING,
+    COPY_PULL_REQUESTS_STAGING,
+    INSERT_PULL_REQUESTS_FROM_STAGING,
+    UPSERT_CHANGED_PULL_REQUESTS_FROM_STAGING
+)
+
+
+class PullRequestsRepository(BaseRepository):
+    """Async counterpart of repositories.PullRequestsRepository"""
+
+    _map_to_pull_request = SyncPullRequestsRepository._map_to_pull_request
+    _map_to_pull_request_with_file_changes = SyncPullRequestsRepository._map_to_pull_request_with_file_changes
+    _map_to_miner_aggregate = SyncPullRequestsRepository._map_to_miner_aggregate
+    _pull_request_params = SyncPullRequestsRepository._pull_request_params
+    _bulk_params = SyncPullRequestsRepository._bulk_params
+
+    def __init__(self, db_connection):
+        super().__init__(db_connection)
+        self.file_changes = FileChangesRepository(db_connection)
+
+    async def get_pull_request(self, pr_number: int, repository_full_name: str) -> Optional[PullRequest]:
+        """Get a pull request by its number and repository"""
+        return await self.query_single(
+            GET_PULL_REQUEST, (pr_number, repository_full_name), self._map_to_pull_request
+        )
+
+    async def set_pull_request(self, pull_request: PullRequest) -> bool:
+        """Insert a pull request (ignore conflicts)"""
+        return await self.set_entity(SET_PULL_REQUEST, self._pull_request_params(pull_request))
+
+    async def get_pull_requests_by_repository(self, repository_full_name: str) -> List[PullRequest]:
+        """Get all pull requests for a specific repository"""
+        return await self.query_multiple(
+            GET_PULL_REQUESTS_BY_REPOSITORY, (repository_full_name,), self._map_to_pull_request
+        )
+
+    async def get_pull_requests_by_miner(self, uid: int, hotkey: str, github_id: str) -> List[PullRequest]:
+        """Get all pull requests for a specific miner"""
+        return await self.query_multiple(
+            GET_PULL_REQUESTS_BY_MINER, (uid, hotkey, github_id), self._map_to_pull_request
+        )
+
+    async def get_miner_aggregate(self, uid: int, hotkey: str, github_id: str) -> MinerAggregate:
+        """Get a miner's pull request totals computed by the database (zeros if it has none)"""
+        aggregate = await self.query_single(
+            GET_MINER_AGGREGATE, (uid, hotkey, github_id), self._map_to_miner_aggregate
+        )
+        return aggregate or MinerAggregate(uid, hotkey, github_id, 0, 0, 0, 0.0)
+
+    async def get_miner_aggregates(self) -> List[MinerAggregate]:
+        """Get the pull request totals of every miner with pull requests in one GROUP BY query"""
+        return await self.query_multiple(GET_MINER_AGGREGATES, (), self._map_to_miner_aggregate)
+
+    async def get_pull_request_with_file_changes(
+        self,
+        pr_number: int,
+        repository_full_name: str
+    ) -> Optional[PullRequest]:
+        """Get a pull request with its associated file changes"""
+        results = await self.execute_query(GET_PULL_REQUEST_WITH_FILE_CHANGES, (pr_number, repository_full_name))
+        return self._map_to_pull_request_with_file_changes(results)
+
+    async def iter_pull_requests_by_repository_with_file_changes(
+        self,
+        repository_full_name: str,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> AsyncIterator[PullRequest]:
+        """
+        Stream pull requests for a repository with their file changes, one PR at a time.
+
+        Args:
+            repository_full_name: Full repository name
+            itersize: Rows fetched from the server per round trip
+
+        Yields:
+            PullRequest objects with nested file changes
+        """
+        pr_rows = []
+        rows = self.iter_query(GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY, (repository_full_name,), itersize)
+        async for row in rows:
+            if pr_rows and row['number'] != pr_rows[0]['number']:
+                yield self._map_to_pull_request_with_file_changes(pr_rows)
+                pr_rows = []
+            pr_rows.append(row)
+        if pr_rows:
+            yield self._map_to_pull_request_with_file_changes(pr_rows)
+
+    async def get_pull_requests_by_repository_with_file_changes(self, repository_full_name: str) -> List[PullRequest]:
+        """
+        Get all pull requests for a repository with their associated file changes.
+
+        Pull requests are fetched once and their file changes are fetched in batched
+        follow-up queries, so PR columns are not repeated on every file change row.
+        """
+        pull_requests = await self.get_pull_requests_by_repository(repository_full_name)
+        return await self.load_file_changes(pull_requests)
+
+    async def load_file_changes(self, pull_requests: List[PullRequest]) -> List[PullRequest]:
+        """
+        Eager load file changes onto already fetched pull requests.
+
+        Returns:
+            The same PullRequest objects; file_changes is left as None for PRs without any
+        """
+        file_changes = await self.file_changes.get_file_changes_for_pull_requests(
+            (pr.number, pr.repository_full_name) for pr in pull_requests
+        )
+        for pr in pull_requests:
+            pr_file_changes = file_changes.get((pr.number, pr.repository_full_name))
+            if pr_file_changes:
+                pr.file_changes = pr_file_changes
+        return pull_requests
+
+    async def store_pull_requests_bulk(
+        self,
+        pull_requests: Union[List[PullRequest], PullRequestBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> int:
+        """
+        Bulk insert pull requests
+
+        Args:
+            pull_requests: PullRequest objects or a PullRequestBatch to store
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of successfully stored pull requests
+        """
+        if not pull_requests:
+            return 0
+
+        values = self._bulk_params(pull_requests)
+
+        try:
+            async with self.transaction() as cursor:
+                await self.execute_bulk(
+                    cursor,
+                    values,
+                    BULK_UPSERT_PULL_REQUESTS,
+                    (CREATE_PULL_REQUESTS_STAGING, COPY_PULL_REQUESTS_STAGING, INSERT_PULL_REQUESTS_FROM_STAGING),
+                    method
+                )
+            return len(values)
+        except Exception as e:
+            self.logger.error(f"Error in bulk pull request storage: {e}")
+            return 0
+
+    async def upsert_pull_requests_bulk(
+        self,
+        pull_requests: Union[List[PullRequest], PullRequestBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Bulk insert pull requests and update stored ones whose values changed
+
+        Args:
+            pull_requests: PullRequest objects or a PullRequestBatch to store
+            method: 'values' (multi-row INSERT) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (all zero if the transaction failed)
+        """
+        if not pull_requests:
+            return UpsertCounts()
+
+        values = unique_rows(self._bulk_params(pull_requests), 2)
+
+        try:
+            async with self.transaction() as cursor:
+                return await self.execute_bulk_upsert(
+                    cursor,
+                    values,
+                    BULK_UPSERT_CHANGED_PULL_REQUESTS,
+                    (CREATE_PULL_REQUESTS_STAGING, COPY_PULL_REQUESTS_STAGING, UPSERT_CHANGED_PULL_REQUESTS_FROM_STAGING),
+                    method
+                )
+        except Exception as e:
+            self.logger.error(f"Error in bulk pull request upsert: {e}")
+            return UpsertCounts()
@@ -0,0 +1,58 @@
+"""
+Async repository for handling database operations for Repository entities
+"""
+from typing import Optional, List, Set
+from ..models.domain_models import Repository
+from ..repositories.repositories_repository import RepositoriesRepository as SyncRepositoriesRepository
+from .base_repository import BaseRepository
+from ..queries import (
+    GET_REPOSITORY,
+    SET_REPOSITORY,
+    GET_ALL_REPOSITORIES,
+    BULK_UPSERT_REPOSITORIES
+)
+
+
+class RepositoriesRepository(BaseRepository):
+    """Async counterpart of repositories.RepositoriesRepository"""
+
+    _map_to_repository = SyncRepositoriesRepository._map_to_repository
+    _repository_params = SyncRepositoriesRepository._repository_params
+    _repository_values = SyncRepositoriesRepository._repository_values
+
+    async def get_repository(self, repository_full_name: str) -> Optional[Repository]:
+        """Get a repository by its full name"""
+        return await self.query_single(GET_REPOSITORY, (repository_full_name,), self._map_to_repository)
+
+    async def set_repository(self, repository: Repository) -> bool:
+        """Insert a repository (ignore conflicts)"""
+        return await self.set_entity(SET_REPOSITORY, self._repository_params(repository))
+
+    async def get_all_repositories(self) -> List[Repository]:
+        """Get all repositories"""
+        return await self.query_multiple(GET_ALL_REPOSITORIES, (), self._map_to_repository)
+
+    async def store_repositories_bulk(self, repository_full_names: Set[str]) -> int:
+        """
+        Bulk insert repositories given their full names as strings
+
+        Args:
+            repository_full_names: Set of strings like {"owner/repo", "other/owner"}
+
+        Returns:
+            Count of successfully stored repositories
+        """
+        if not repository_full_names:
+            return 0
+
+        values = self._repository_values(repository_full_names)
+        if not values:
+            return 0
+
+        try:
+            async with self.transaction() as cursor:
+                await self.execute_bulk(cursor, values, BULK_UPSERT_REPOSITORIES)
+            return len(values)
+        except Exception as e:
+            self.logger.error(f"Error in bulk repository storage: {e}")
+            return 0
@@ -2,16 +2,31 @@
 Database connection utility for validator storage operations.
 """
 import os
-from typing import Optional
-import bittensor as bt
+from typing import Any, Dict, Optional
+from .. import log
 
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
-    bt.logging.warning("psycopg2 not installed. Database storage features will be disabled.")
+    log.warning("psycopg2 not installed. Database storage features will be disabled.")
+
+
+def get_database_config() -> Dict[str, Any]:
+    """
+    Build psycopg2 connection keyword arguments from environment variables.
+
+    Returns:
+        Dictionary of connection parameters
+    """
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 5432)),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'database': os.getenv('DB_NAME', 'gittensor_validator'),
+    }
 
 
 def create_database_connection() -> Optional[object]:
@@ -22,28 +37,21 @@ def create_database_connection() -> Optional[object]:
         Database connection if successful, None otherwise
     """
     if not POSTGRES_AVAILABLE:
-        bt.logging.error("Cannot create database connection: psycopg2 not installed")
+        log.error("Cannot create database connection: psycopg2 not installed")
         return None
 
     try:
-        db_config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'port': int(os.getenv('DB_PORT', 5432)),
-            'user': os.getenv('DB_USER', 'postgres'),
-            'password': os.getenv('DB_PASSWORD', ''),
-            'database': os.getenv('DB_NAME', 'gittensor_validator'),
-        }
-
+        db_config = get_database_config()
         connection = psycopg2.connect(**db_config)
         connection.autocommit = False
-        bt.logging.success("Successfully connected to PostgreSQL database for validation result storage")
+        log.success("Successfully connected to PostgreSQL database for validation result storage")
         return connection
 
     except psycopg2.Error as e:
-        bt.logging.error(f"Failed to connect to database: {e}")
+        log.error(f"Failed to connect to database: {e}")
         return None
     except Exception as e:
-        bt.logging.error(f"Unexpected error connecting to database: {e}")
+        log.error(f"Unexpected error connecting to database: {e}")
         return None
 
 
@@ -60,6 +68,6 @@ def test_database_connection() -> bool:
             connection.close()
             return True
         except Exception as e:
-            bt.logging.error(f"Error closing test connection: {e}")
+            log.error(f"Error closing test connection: {e}")
             return False
     return False
\ No newline at end of file
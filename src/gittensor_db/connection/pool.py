@@ -0,0 +1,436 @@
+"""
+Thread-safe PostgreSQL connection pool for validator and API workers.
+
+Repositories accept either a single connection or a ConnectionPool. When given a
+pool they borrow a connection for each operation and hand it back afterwards, so
+concurrent workers share a bounded set of already-authenticated connections.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+from .. import log
+
+from .database import POSTGRES_AVAILABLE, get_database_config
+
+if POSTGRES_AVAILABLE:
+    import psycopg2
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+class PoolError(Exception):
+    """Base error raised by the connection pool"""
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection became available within the checkout timeout"""
+
+
+class PoolClosedError(PoolError):
+    """Raised when checking out from a pool that has been closed"""
+
+
+@dataclass
+class PoolStats:
+    """Point-in-time snapshot of pool usage"""
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+    checkouts: int = 0
+    timeouts: int = 0
+    connections_created: int = 0
+    connections_closed: int = 0
+    health_check_failures: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def avg_wait_time(self) -> float:
+        """Average seconds a checkout waited for a connection"""
+        return self.total_wait_time / self.checkouts if self.checkouts else 0.0
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of max_size currently checked out (1.0 means fully saturated)"""
+        return self.in_use / self.max_size if self.max_size else 0.0
+
+
+class _PooledConnection:
+    """Bookkeeping wrapper for a pooled connection"""
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of PostgreSQL connections.
+
+    Connections are health-checked on checkout when they have sat idle for longer
+    than health_check_interval, recycled once older than max_lifetime, and reaped
+    once idle for longer than max_idle (never dropping below min_size).
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: Optional[float] = 600.0,
+        max_lifetime: Optional[float] = 3600.0,
+        health_check_interval: Optional[float] = 30.0,
+        db_config: Optional[Dict[str, Any]] = None,
+        connection_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Args:
+            min_size: Connections kept open even when idle
+            max_size: Upper bound on open connections
+            timeout: Default seconds to wait for a connection on checkout
+            max_idle: Seconds an idle connection may live above min_size (None disables reaping)
+            max_lifetime: Seconds before a connection is recycled (None disables recycling)
+            health_check_interval: Idle seconds after which a connection is pinged on
+                checkout (0 checks every time, None disables the ping)
+            db_config: psycopg2 connection parameters (defaults to environment variables)
+            connection_factory: Callable returning a new connection (overrides db_config)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self._db_config = db_config if db_config is not None else get_database_config()
+        self._connection_factory = connection_factory or self._connect
+
+        self._cond = threading.Condition()
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0  # idle + in use + being opened
+        self._waiting = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._health_check_failures = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        self._fill_to_min()
+
+    def _connect(self):
+        """Open a new connection; repositories map its tuple rows by column position"""
+        connection = psycopg2.connect(**self._db_config)
+        connection.autocommit = False
+        return connection
+
+    def _open(self) -> _PooledConnection:
+        """Open a connection for a slot already reserved in _size"""
+        try:
+            connection = self._connection_factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return _PooledConnection(connection)
+
+    def _fill_to_min(self) -> None:
+        """Open connections until the pool holds at least min_size"""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            entry = self._open()
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def _is_expired(self, entry: _PooledConnection, now: float) -> bool:
+        return self.max_lifetime is not None and now - entry.created_at >= self.max_lifetime
+
+    def _is_healthy(self, entry: _PooledConnection, now: float) -> bool:
+        """Cheap liveness check, pinging the server only after a long idle period"""
+        connection = entry.connection
+        if connection.closed:
+            return False
+        if self.health_check_interval is None or now - entry.last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+            connection.rollback()
+            return True
+        except Exception as e:
+            log.warning(f"Discarding pooled connection that failed health check: {e}")
+            return False
+
+    def _close_entries(self, entries: List[_PooledConnection]) -> None:
+        """Close connections that have already been removed from the pool"""
+        for entry in entries:
+            try:
+                entry.connection.close()
+            except Exception:
+                pass
+        if entries:
+            with self._cond:
+                self._discarded += len(entries)
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Check out a connection, waiting up to timeout seconds for one to free up.
+
+        Args:
+            timeout: Seconds to wait (defaults to the pool timeout)
+
+        Returns:
+            A live database connection that must be returned with putconn()
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+            PoolClosedError: If the pool has been closed
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            entry = None
+            stale = []
+            try:
+                with self._cond:
+                    while True:
+                        if self._closed:
+                            raise PoolClosedError("Connection pool is closed")
+                        now = time.monotonic()
+                        while self._idle and entry is None:
+                            candidate = self._idle.pop()  # LIFO keeps hot connections busy
+                            if self._is_expired(candidate, now):
+                                self._size -= 1
+                                stale.append(candidate)
+                            else:
+                                entry = candidate
+                        if entry is not None or self._size < self.max_size:
+                            break
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeoutError(
+                                f"Timed out after {timeout:.2f}s waiting for a database connection "
+                                f"(max_size={self.max_size})"
+                            )
+                        self._waiting += 1
+                        try:
+                            self._cond.wait(remaining)
+                        finally:
+                            self._waiting -= 1
+                    if entry is None:
+                        self._size += 1
+            finally:
+                self._close_entries(stale)
+
+            if entry is None:
+                entry = self._open()
+            elif not self._is_healthy(entry, time.monotonic()):
+                with self._cond:
+                    self._size -= 1
+                    self._health_check_failures += 1
+                    self._cond.notify()
+                self._close_entries([entry])
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(entry.connection)] = entry
+                self._checkouts += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            return entry.connection
+
+    def putconn(self, connection, discard: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back so the next borrower starts clean.
+
+        Args:
+            connection: Connection previously obtained from getconn()
+            discard: Close the connection instead of reusing it
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            raise PoolError("Connection does not belong to this pool")
+
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception as e:
+                log.warning(f"Discarding pooled connection that failed to reset: {e}")
+                discard = True
+
+        now = time.monotonic()
+        with self._cond:
+            discard = discard or connection.closed or self._closed or self._is_expired(entry, now)
+            if discard:
+                self._size -= 1
+            else:
+                entry.last_used = now
+                self._idle.append(entry)
+            self._cond.notify()
+
+        if discard:
+            self._close_entries([entry])
+        self.reap()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """
+        Context manager that borrows a connection for the duration of the block.
+
+        Args:
+            timeout: Seconds to wait for a connection (defaults to the pool timeout)
+        """
+        connection = self.getconn(timeout)
+        try:
+            yield connection
+        finally:
+            self.putconn(connection)
+
+    def reap(self) -> int:
+        """
+        Close idle connections past max_idle or max_lifetime.
+
+        Idle reaping never shrinks the pool below min_size; connections recycled
+        for lifetime are replaced to keep min_size open.
+
+        Returns:
+            Number of connections closed
+        """
+        stale = []
+        with self._cond:
+            now = time.monotonic()
+            kept: Deque[_PooledConnection] = deque()
+            # Oldest-returned connections sit at the left of the deque
+            while self._idle:
+                entry = self._idle.popleft()
+                idle_too_long = (
+                    self.max_idle is not None
+                    and now - entry.last_used >= self.max_idle
+                    and self._size > self.min_size
+                )
+                if idle_too_long or self._is_expired(entry, now):
+                    self._size -= 1
+                    stale.append(entry)
+                else:
+                    kept.append(entry)
+            self._idle = kept
+
+        self._close_entries(stale)
+        if stale:
+            try:
+                self._fill_to_min()
+            except Exception as e:
+                log.warning(f"Failed to replenish connection pool: {e}")
+        return len(stale)
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of pool size, saturation and checkout wait times"""
+        with self._cond:
+            return PoolStats(
+                min_size=self.min_size,
+                max_size=self.max_size,
+                size=self._size,
+                idle=len(self._idle),
+                in_use=len(self._in_use),
+                waiting=self._waiting,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                connections_created=self._created,
+                connections_closed=self._discarded,
+                health_check_failures=self._health_check_failures,
+                total_wait_time=self._total_wait,
+                max_wait_time=self._max_wait,
+            )
+
+    def close(self) -> None:
+        """Close idle connections and refuse new checkouts; in-use ones close on return"""
+        with self._cond:
+            self._closed = True
+            stale = list(self._idle)
+            self._idle.clear()
+            self._size -= len(stale)
+            self._cond.notify_all()
+        self._close_entries(stale)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def create_connection_pool(
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    **kwargs
+) -> Optional[ConnectionPool]:
+    """
+    Create a connection pool configured from environment variables.
+
+    Pool bounds default to DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE (1 and 10).
+
+    Args:
+        min_size: Connections kept open even when idle
+        max_size: Upper bound on open connections
+        **kwargs: Additional ConnectionPool options
+
+    Returns:
+        ConnectionPool if successful, None otherwise
+    """
+    if not POSTGRES_AVAILABLE:
+        log.error("Cannot create connection pool: psycopg2 not installed")
+        return None
+
+    if min_size is None:
+        min_size = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+    if max_size is None:
+        max_size = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+
+    try:
+        pool = ConnectionPool(min_size=min_size, max_size=max_size, **kwargs)
+        log.success(f"Created PostgreSQL connection pool (min={min_size}, max={max_size})")
+        return pool
+    except psycopg2.Error as e:
+        log.error(f"Failed to create connection pool: {e}")
+        return None
+    except Exception as e:
+        log.error(f"Unexpected error creating connection pool: {e}")
+        return None
@@ -0,0 +1,281 @@
+"""
+Query instrumentation hooks.
+
+Repositories report every query they run as a QueryEvent to the registered hooks:
+the query's name in queries/queries.py, latency, rows returned or affected, an
+estimate of bytes fetched and the time spent mapping rows to domain objects.
+
+A hook is any callable taking a QueryEvent. QueryStatsRecorder keeps in-process
+latency histograms per query name and PrometheusQueryHook exports the same data
+through prometheus_client. With no hooks registered the repositories skip timing
+entirely, so the disabled cost is a single truthiness check per query.
+
+    recorder = add_query_hook(QueryStatsRecorder())
+    ...
+    for name, stats in recorder.snapshot().items():
+        print(name, stats.count, stats.quantile(0.99))
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Operation labels reported in QueryEvent.operation
+OPERATION_SELECT = 'select'
+OPERATION_STREAM = 'stream'
+OPERATION_COMMAND = 'command'
+OPERATION_BULK = 'bulk'
+
+# Latency histogram bucket upper bounds in seconds
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QueryHook = Callable[['QueryEvent'], None]
+
+
+@dataclass
+class QueryEvent:
+    """One executed query as reported to hooks"""
+    query_name: str
+    operation: str
+    duration: float = 0.0        # seconds spent executing and fetching
+    rows: int = 0                # rows returned, or affected for commands and bulk writes
+    bytes_fetched: int = 0       # estimated payload of fetched rows (0 unless a hook asked for it)
+    mapping_time: float = 0.0    # seconds spent mapping rows to domain objects
+    error: Optional[str] = None  # exception class name if the query failed
+
+
+# Copy-on-write so the hot path reads the tuple without locking
+_hooks: Tuple[QueryHook, ...] = ()
+_byte_hooks: Tuple[QueryHook, ...] = ()
+_hooks_lock = threading.Lock()
+_query_names: Optional[Dict[str, str]] = None
+_DISABLED = nullcontext()
+
+
+def add_query_hook(hook: QueryHook, measure_bytes: bool = True) -> QueryHook:
+    """
+    Register a hook to receive a QueryEvent for every repository query.
+
+    Args:
+        hook: Callable taking a QueryEvent; exceptions it raises are logged and ignored
+        measure_bytes: Whether this hook needs bytes_fetched, which costs a pass over
+            every fetched row
+
+    Returns:
+        The hook, so registration can be used inline
+    """
+    global _hooks, _byte_hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+        if measure_bytes:
+            _byte_hooks = _byte_hooks + (hook,)
+    return hook
+
+
+def remove_query_hook(hook: QueryHook) -> None:
+    """Unregister a hook added with add_query_hook"""
+    global _hooks, _byte_hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h is not hook)
+        _byte_hooks = tuple(h for h in _byte_hooks if h is not hook)
+
+
+def instrumentation_enabled() -> bool:
+    """True if at least one hook is registered"""
+    return bool(_hooks)
+
+
+def query_name(query: str) -> str:
+    """Name of a query constant from queries/queries.py, or its first words if it isn't one"""
+    global _query_names
+    if _query_names is None:
+        from . import queries
+        _query_names = {getattr(queries, name): name for name in queries.__all__}
+    name = _query_names.get(query)
+    if name is None:
+        name = ' '.join(query.split())[:60]
+    return name
+
+
+def estimate_row_bytes(rows: Iterable[Any]) -> int:
+    """Approximate payload size of fetched rows: text/binary lengths plus 8 bytes per other non-null value"""
+    total = 0
+    for row in rows:
+        values = row.values() if isinstance(row, dict) else row
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                total += len(value)
+            else:
+                total += 8
+    return total
+
+
+def _emit(event: QueryEvent) -> None:
+    for hook in _hooks:
+        try:
+            hook(event)
+        except Exception as e:
+            logger.warning(f"Query hook {hook!r} failed: {e}")
+
+
+@contextmanager
+def _record(query: str, operation: str):
+    event = QueryEvent(query_name=query_name(query), operation=operation)
+    started = time.perf_counter()
+    try:
+        yield event
+    except BaseException as e:
+        event.error = type(e).__name__
+        raise
+    finally:
+        event.duration = time.perf_counter() - started - event.mapping_time
+        _emit(event)
+
+
+def instrument(query: str, operation: str):
+    """
+    Context manager timing one query. Yields a QueryEvent for the caller to fill in
+    (rows, bytes_fetched, mapping_time), or None when no hooks are registered.
+
+    Args:
+        query: SQL query string (a queries/queries.py constant)
+        operation: One of the OPERATION_* labels
+    """
+    if not _hooks:
+        return _DISABLED
+    return _record(query, operation)
+
+
+def record_rows(event: Optional[QueryEvent], rows: Sequence[Any]) -> None:
+    """Fill in row count and (if any hook wants it) bytes fetched for a list of rows"""
+    if event is None:
+        return
+    event.rows += len(rows)
+    if _byte_hooks:
+        event.bytes_fetched += estimate_row_bytes(rows)
+
+
+def map_rows(event: Optional[QueryEvent], rows: Sequence[Any], mapper: Callable[[Any], Any]) -> List[Any]:
+    """Map rows with mapper, charging the time to event.mapping_time when instrumented"""
+    if event is None:
+        return [mapper(row) for row in rows]
+    started = time.perf_counter()
+    mapped = [mapper(row) for row in rows]
+    event.mapping_time += time.perf_counter() - started
+    return mapped
+
+
+@dataclass
+class QueryStats:
+    """Aggregated measurements for one query name"""
+    buckets: Sequence[float]
+    bucket_counts: List[int] = field(default_factory=list)
+    count: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    bytes_fetched: int = 0
+    mapping_time: float = 0.0
+
+    def __post_init__(self):
+        if not self.bucket_counts:
+            # One count per bucket plus a final +Inf bucket
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-quantile latency (max_time for the +Inf bucket)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max_time)
+        return self.max_time
+
+
+class QueryStatsRecorder:
+    """In-process hook keeping latency histograms, rows, bytes and mapping time per query name"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._stats: Dict[str, QueryStats] = {}
+
+    def __call__(self, event: QueryEvent) -> None:
+        with self._lock:
+            stats = self._stats.get(event.query_name)
+            if stats is None:
+                stats = self._stats[event.query_name] = QueryStats(buckets=self.buckets)
+            stats.count += 1
+            stats.bucket_counts[bisect_left(self.buckets, event.duration)] += 1
+            stats.total_time += event.duration
+            stats.max_time = max(stats.max_time, event.duration)
+            stats.rows += event.rows
+            stats.bytes_fetched += event.bytes_fetched
+            stats.mapping_time += event.mapping_time
+            if event.error:
+                stats.errors += 1
+
+    def snapshot(self) -> Dict[str, QueryStats]:
+        """Copy of the stats per query name, most total time first"""
+        with self._lock:
+            ordered = sorted(self._stats.items(), key=lambda item: item[1].total_time, reverse=True)
+            return {
+                name: QueryStats(**{**stats.__dict__, 'bucket_counts': list(stats.bucket_counts)})
+                for name, stats in ordered
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class PrometheusQueryHook:
+    """Hook exporting query metrics through prometheus_client (pip install prometheus-client)"""
+
+    def __init__(self, registry=None, namespace: str = 'gittensor_db', buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        try:
+            from prometheus_client import REGISTRY, Counter, Histogram
+        except ImportError as e:
+            raise ImportError("PrometheusQueryHook requires prometheus-client (pip install gittensor-db[metrics])") from e
+
+        registry = registry if registry is not None else REGISTRY
+        labels = ('query', 'operation')
+        self.duration = Histogram(
+            'query_duration_seconds', 'Query execution and fetch latency', labels,
+            namespace=namespace, buckets=buckets, registry=registry
+        )
+        self.mapping = Histogram(
+            'query_mapping_seconds', 'Time mapping rows to domain objects', labels,
+            namespace=namespace, buckets=buckets, registry=registry
+        )
+        self.rows = Counter('query_rows', 'Rows returned or affected', labels, namespace=namespace, registry=registry)
+        self.bytes = Counter(
+            'query_fetched_bytes', 'Estimated bytes fetched', labels, namespace=namespace, registry=registry
+        )
+        self.errors = Counter('query_errors', 'Failed queries', labels, namespace=namespace, registry=registry)
+
+    def __call__(self, event: QueryEvent) -> None:
+        labels = (event.query_name, event.operation)
+        self.duration.labels(*labels).observe(event.duration)
+        if event.mapping_time:
+            self.mapping.labels(*labels).observe(event.mapping_time)
+        self.rows.labels(*labels).inc(event.rows)
+        if event.bytes_fetched:
+            self.bytes.labels(*labels).inc(event.bytes_fetched)
+        if event.error:
+            self.errors.labels(*labels).inc()
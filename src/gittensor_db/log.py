@@ -0,0 +1,94 @@
+"""
+Pluggable logging backend for gittensor_db.
+
+Connection and pool messages go through this module instead of importing bittensor
+directly. By default they are sent to bt.logging if bittensor has already been
+imported by the host process (validators), and to the stdlib "gittensor_db" logger
+otherwise (API services, CLI jobs, tests), so importing gittensor_db never pays for
+importing bittensor.
+
+    from gittensor_db.log import set_logger
+    set_logger(my_structlog_logger)  # any object with debug/info/warning/error
+"""
+import logging
+import sys
+from typing import Any, Optional
+
+SUCCESS = 25  # between INFO and WARNING, like bittensor's success level
+
+
+class StdlibLogger:
+    """Adapter giving a stdlib logging.Logger the bittensor-style success() method"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def debug(self, message: str) -> None:
+        self.logger.debug(message)
+
+    def info(self, message: str) -> None:
+        self.logger.info(message)
+
+    def success(self, message: str) -> None:
+        self.logger.log(SUCCESS, message)
+
+    def warning(self, message: str) -> None:
+        self.logger.warning(message)
+
+    def error(self, message: str) -> None:
+        self.logger.error(message)
+
+
+_stdlib_logger = StdlibLogger(logging.getLogger('gittensor_db'))
+_logger: Optional[Any] = None
+
+
+def set_logger(logger: Optional[Any]) -> None:
+    """
+    Route gittensor_db log messages to logger.
+
+    Args:
+        logger: Object with debug/info/warning/error methods (success is optional and
+            falls back to info), a stdlib logging.Logger, or None to restore the default
+    """
+    global _logger
+    if isinstance(logger, logging.Logger):
+        logger = StdlibLogger(logger)
+    _logger = logger
+
+
+def use_bittensor_logging() -> None:
+    """Route gittensor_db log messages to bt.logging (imports bittensor)"""
+    import bittensor as bt
+    set_logger(bt.logging)
+
+
+def get_logger() -> Any:
+    """Return the active logging backend"""
+    if _logger is not None:
+        return _logger
+    bittensor = sys.modules.get('bittensor')
+    if bittensor is not None and hasattr(bittensor, 'logging'):
+        return bittensor.logging
+    return _stdlib_logger
+
+
+def debug(message: str) -> None:
+    get_logger().debug(message)
+
+
+def info(message: str) -> None:
+    get_logger().info(message)
+
+
+def success(message: str) -> None:
+    logger = get_logger()
+    getattr(logger, 'success', logger.info)(message)
+
+
+def warning(message: str) -> None:
+    get_logger().warning(message)
+
+
+def error(message: str) -> None:
+    get_logger().error(message)
@@ -1,82 +1,524 @@
 # src/gittensor_db/migrations/migrator.py
 """
 Database migration system for gittensor-db
+
+Migrations are the files in migrations/sql named NNNN_description.sql and are
+applied in version order. Each applied version is recorded in the
+schema_migrations ledger with a checksum of its SQL, so startup only runs
+versions that are new, in one ledger query, and refuses to continue if an
+applied file was edited afterwards. A session-level advisory lock serialises
+replicas that boot at the same time.
+
+A migration whose leading comments contain the line
+
+    -- migrate: no-transaction
+
+runs in autocommit mode, one statement at a time, so it can use
+CREATE INDEX CONCURRENTLY on populated tables without blocking writes. Its
+statements must be safe to re-run (IF NOT EXISTS): the ledger row is written
+after the last statement, and an index left INVALID by an interrupted build is
+dropped and built again on the next run.
 """
+import hashlib
 import os
 import logging
-from typing import List, Optional
-import pkg_resources
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..prepared_statements import invalidate_prepared_statements
+from .sql_parser import split_sql_statements, strip_sql_comments
+
+try:
+    from importlib.resources import files as resource_files
+except ImportError:  # Python 3.8
+    resource_files = None
+
+# Arbitrary application-wide key for pg_advisory_lock ("gtdb" in ASCII)
+MIGRATION_LOCK_ID = 0x67746462
+
+MIGRATION_FILENAME = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+NO_TRANSACTION_DIRECTIVE = re.compile(r'^\s*--\s*migrate:\s*no-transaction\s*$', re.IGNORECASE)
+
+CONCURRENT_INDEX_BUILD = re.compile(
+    r'^\s*CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?"?([A-Za-z_][\w$]*)"?',
+    re.IGNORECASE
+)
+
+# Seconds between pg_stat_progress_create_index polls while an index builds
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+CREATE_SCHEMA_MIGRATIONS = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version      INTEGER      PRIMARY KEY,
+    name         VARCHAR(255) NOT NULL,
+    checksum     CHAR(64)     NOT NULL,
+    applied_at   TIMESTAMP    DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+    execution_ms INTEGER
+)
+"""
+
+GET_APPLIED_MIGRATIONS = "SELECT version, name, checksum FROM schema_migrations ORDER BY version"
+
+RECORD_MIGRATION = """
+INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+VALUES (%s, %s, %s, %s)
+"""
+
+GET_INVALID_INDEXES = """
+SELECT c.relname AS index_name, t.relname AS table_name
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_class t ON t.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE NOT i.indisvalid
+  AND n.nspname = current_schema()
+ORDER BY c.relname
+"""
+
+GET_INDEX_BUILD_PROGRESS = """
+SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+FROM pg_stat_progress_create_index
+WHERE pid = %s
+"""
+
+
+class MigrationError(Exception):
+    """Raised when migrations cannot be applied safely"""
+
+
+@dataclass
+class Migration:
+    """One versioned migration file"""
+    version: int
+    name: str
+    filename: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the file contents, used to detect edits to applied migrations"""
+        return hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    @property
+    def statements(self) -> List[str]:
+        return split_sql_statements(self.sql)
+
+    @property
+    def transactional(self) -> bool:
+        """False if the leading comments contain the "-- migrate: no-transaction" directive"""
+        for line in self.sql.splitlines():
+            if NO_TRANSACTION_DIRECTIVE.match(line):
+                return False
+            if line.strip() and not line.lstrip().startswith('--'):
+                break
+        return True
+
+
+@dataclass
+class IndexBuildProgress:
+    """A pg_stat_progress_create_index sample for an index being built"""
+    index_name: str
+    phase: str
+    blocks_done: int = 0
+    blocks_total: int = 0
+    tuples_done: int = 0
+    tuples_total: int = 0
+
+    @property
+    def percent(self) -> Optional[float]:
+        """Completion of the current phase, or None if the phase has no known total"""
+        if self.blocks_total:
+            return 100.0 * self.blocks_done / self.blocks_total
+        if self.tuples_total:
+            return 100.0 * self.tuples_done / self.tuples_total
+        return None
+
+
+class _IndexBuildMonitor:
+    """Polls pg_stat_progress_create_index for one backend from a second connection"""
+
+    def __init__(self, connection, backend_pid: int, index_name: str,
+                 callback: Callable[[IndexBuildProgress], None], interval: float):
+        self.connection = connection
+        self.backend_pid = backend_pid
+        self.index_name = index_name
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"index-build-{index_name}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(GET_INDEX_BUILD_PROGRESS, (self.backend_pid,))
+                row = cursor.fetchone()
+                self.connection.rollback()
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Stopped reporting progress for {self.index_name}: {e}")
+                return
+            finally:
+                cursor.close()
+            if row is None:
+                continue
+            if isinstance(row, dict):
+                row = (row['phase'], row['blocks_done'], row['blocks_total'], row['tuples_done'], row['tuples_total'])
+            self.callback(IndexBuildProgress(self.index_name, *row))
 
 
 class DatabaseMigrator:
     """Handle database schema migrations"""
-    
-    def __init__(self, db_connection):
+
+    def __init__(
+        self,
+        db_connection,
+        progress_connection=None,
+        on_progress: Optional[Callable[[IndexBuildProgress], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL
+    ):
+        """
+        Args:
+            db_connection: Connection the migrations run on
+            progress_connection: Optional second connection used to poll the progress of
+                concurrent index builds; without it only the start and end of each build
+                are reported
+            on_progress: Called with an IndexBuildProgress sample every progress_interval
+                seconds during a concurrent index build (defaults to logging it)
+            progress_interval: Seconds between progress samples
+        """
         self.db = db_connection
         self.logger = logging.getLogger(__name__)
-        
+        self.progress_connection = progress_connection
+        self.on_progress = on_progress or self._log_progress
+        self.progress_interval = progress_interval
+
+    def _list_sql_files(self) -> List[str]:
+        """Names of the files in the migrations/sql directory"""
+        try:
+            return [entry.name for entry in (resource_files(__package__) / 'sql').iterdir()]
+        except Exception:
+            # Fallback to file system
+            return os.listdir(os.path.join(os.path.dirname(__file__), 'sql'))
+
     def get_migration_files(self) -> List[str]:
-        """Get list of SQL migration files in order"""
-        migration_order = [
-            'repositories.sql',
-            'miners.sql',
-            'miner_evaluations.sql',
-            'pull_requests.sql',
-            'issues.sql',
-            'file_changes.sql'
-        ]
-        return migration_order
-    
+        """Get list of SQL migration files in version order"""
+        versioned = []
+        for filename in self._list_sql_files():
+            match = MIGRATION_FILENAME.match(filename)
+            if match:
+                versioned.append((int(match.group(1)), filename))
+        versioned.sort()
+
+        versions = [version for version, _ in versioned]
+        if len(versions) != len(set(versions)):
+            raise MigrationError(f"Duplicate migration versions in {[f for _, f in versioned]}")
+        return [filename for _, filename in versioned]
+
     def read_migration_file(self, filename: str) -> str:
         """Read migration SQL from package resources"""
         try:
             # Try to read from package resources first
-            sql_content = pkg_resources.resource_string(
-                'gittensor_db', f'migrations/sql/{filename}'
-            ).decode('utf-8')
+            sql_content = (resource_files(__package__) / 'sql' / filename).read_text(encoding='utf-8')
             return sql_content
         except Exception:
             # Fallback to file system
             migration_path = os.path.join(
                 os.path.dirname(__file__), 'sql', filename
             )
-            with open(migration_path, 'r') as f:
+            with open(migration_path, 'r', encoding='utf-8') as f:
                 return f.read()
-    
+
+    def load_migration(self, filename: str) -> Migration:
+        """Build a Migration from a NNNN_description.sql file"""
+        match = MIGRATION_FILENAME.match(filename)
+        if not match:
+            raise MigrationError(f"Migration file {filename} is not named NNNN_description.sql")
+        return Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            filename=filename,
+            sql=self.read_migration_file(filename),
+        )
+
+    def get_migrations(self) -> List[Migration]:
+        """All migrations shipped with the package, in version order"""
+        return [self.load_migration(filename) for filename in self.get_migration_files()]
+
+    def get_applied_migrations(self) -> Dict[int, Dict[str, str]]:
+        """Ledger rows keyed by version (creates the ledger table if needed)"""
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(CREATE_SCHEMA_MIGRATIONS)
+            cursor.execute(GET_APPLIED_MIGRATIONS)
+            rows = cursor.fetchall()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        applied = {}
+        for row in rows:
+            version, name, checksum = (row['version'], row['name'], row['checksum']) if isinstance(row, dict) else row
+            applied[version] = {'name': name, 'checksum': checksum}
+        return applied
+
+    def get_pending_migrations(self) -> List[Migration]:
+        """
+        Migrations not yet recorded in the ledger.
+
+        Raises:
+            MigrationError: If an applied migration's checksum no longer matches its file
+        """
+        applied = self.get_applied_migrations()
+        pending = []
+        for migration in self.get_migrations():
+            record = applied.get(migration.version)
+            if record is None:
+                pending.append(migration)
+            elif record['checksum'] != migration.checksum:
+                raise MigrationError(
+                    f"Migration {migration.filename} was modified after it was applied "
+                    f"(ledger checksum {record['checksum'][:12]}, file {migration.checksum[:12]}); "
+                    f"add a new migration instead of editing an applied one"
+                )
+        return pending
+
+    def apply_migration(self, migration: Migration) -> None:
+        """Run one migration and record it in the ledger in a single transaction"""
+        if not migration.transactional:
+            self._apply_non_transactional(migration)
+            return
+
+        started = time.perf_counter()
+        cursor = self.db.cursor()
+        try:
+            for statement in migration.statements:
+                cursor.execute(statement)
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            cursor.execute(RECORD_MIGRATION, (migration.version, migration.name, migration.checksum, elapsed_ms))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            cursor.close()
+        self.logger.info(f"Applied migration {migration.filename} in {elapsed_ms} ms")
+
+    def _apply_non_transactional(self, migration: Migration) -> None:
+        """Run each statement in autocommit mode, then record the migration"""
+        started = time.perf_counter()
+        statements = migration.statements
+        previous_autocommit = self.db.autocommit
+        self.db.autocommit = True
+        try:
+            for position, statement in enumerate(statements, 1):
+                match = CONCURRENT_INDEX_BUILD.match(strip_sql_comments(statement))
+                if match:
+                    self.logger.info(
+                        f"{migration.filename} [{position}/{len(statements)}]: building index {match.group(1)} concurrently"
+                    )
+                    self._build_index_concurrently(match.group(1), statement)
+                else:
+                    self._execute(statement)
+        finally:
+            self.db.autocommit = previous_autocommit
+
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(RECORD_MIGRATION, (migration.version, migration.name, migration.checksum, elapsed_ms))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            cursor.close()
+        self.logger.info(f"Applied migration {migration.filename} in {elapsed_ms} ms (no transaction)")
+
+    def _execute(self, statement: str, params=None) -> None:
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(statement, params)
+        finally:
+            cursor.close()
+
+    def _build_index_concurrently(self, index_name: str, statement: str) -> None:
+        """Run a CREATE INDEX CONCURRENTLY, first dropping an INVALID index left by an earlier failed build"""
+        if index_name in self.get_invalid_indexes():
+            self.logger.warning(f"Index {index_name} is INVALID from an interrupted build; dropping and rebuilding")
+            self._execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+        started = time.perf_counter()
+        if self.progress_connection is not None:
+            monitor = _IndexBuildMonitor(
+                self.progress_connection, self.db.get_backend_pid(), index_name,
+                self.on_progress, self.progress_interval
+            )
+            with monitor:
+                self._execute(statement)
+        else:
+            self._execute(statement)
+        self.logger.info(f"Built index {index_name} in {time.perf_counter() - started:.1f}s")
+
+    def _log_progress(self, progress: IndexBuildProgress) -> None:
+        percent = progress.percent
+        detail = f" {percent:.1f}%" if percent is not None else ""
+        self.logger.info(f"Index {progress.index_name}: {progress.phase}{detail}")
+
+    def get_invalid_indexes(self) -> Dict[str, str]:
+        """
+        INVALID indexes in the current schema, usually left behind by a failed
+        CREATE INDEX CONCURRENTLY or REINDEX CONCURRENTLY.
+
+        Returns:
+            Mapping of index name to table name
+        """
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(GET_INVALID_INDEXES)
+            rows = cursor.fetchall()
+            self.db.commit()
+        finally:
+            cursor.close()
+        return {
+            (row['index_name'] if isinstance(row, dict) else row[0]): (row['table_name'] if isinstance(row, dict) else row[1])
+            for row in rows
+        }
+
+    def rebuild_invalid_indexes(self) -> List[str]:
+        """
+        Rebuild every INVALID index in the current schema with REINDEX INDEX CONCURRENTLY.
+
+        Leftover *_ccnew / *_ccold copies from an interrupted REINDEX CONCURRENTLY
+        are dropped instead, since the original index is still in place.
+
+        Returns:
+            Names of the indexes rebuilt or dropped
+        """
+        invalid = self.get_invalid_indexes()
+        if not invalid:
+            return []
+
+        repaired = []
+        previous_autocommit = self.db.autocommit
+        self.db.autocommit = True
+        try:
+            for index_name, table_name in invalid.items():
+                try:
+                    if re.search(r'_cc(new|old)\d*$', index_name):
+                        self.logger.info(f"Dropping leftover index {index_name} on {table_name}")
+                        self._execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+                    else:
+                        self.logger.info(f"Rebuilding INVALID index {index_name} on {table_name}")
+                        self._execute(f'REINDEX INDEX CONCURRENTLY "{index_name}"')
+                    repaired.append(index_name)
+                except Exception as e:
+                    self.logger.error(f"Failed to repair index {index_name}: {e}")
+        finally:
+            self.db.autocommit = previous_autocommit
+        return repaired
+
+    def ensure_partitions(self) -> None:
+        """Create the upcoming monthly partitions of the time-partitioned tables"""
+        from ..repositories.partitions_repository import PartitionsRepository
+
+        try:
+            for table, result in PartitionsRepository(self.db).maintain_partitions().items():
+                if result['created']:
+                    self.logger.info(f"Created {table} partitions: {', '.join(result['created'])}")
+        except Exception as e:
+            self.logger.error(f"Partition maintenance failed: {e}")
+
+    def _advisory_lock(self) -> None:
+        cursor = self.db.cursor()
+        try:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+            row = cursor.fetchone()
+            acquired = list(row.values())[0] if isinstance(row, dict) else row[0]
+            if not acquired:
+                self.logger.info("Waiting for another process to finish migrating")
+                cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+            # Session-level lock: it survives this commit and is released explicitly
+            self.db.commit()
+        finally:
+            cursor.close()
+
+    def _advisory_unlock(self) -> None:
+        cursor = self.db.cursor()
+        try:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            self.db.commit()
+        finally:
+            cursor.close()
+
     def run_migration(self, filename: str) -> bool:
-        """Run a single migration file"""
+        """Run a single migration file unless the ledger says it was already applied"""
         try:
-            sql_content = self.read_migration_file(filename)
-            
-            with self.db.cursor() as cursor:
-                # Split on semicolons and execute each statement
-                statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                
-                for statement in statements:
-                    if statement:
-                        cursor.execute(statement)
-                
-                self.db.commit()
-                self.logger.info(f"Successfully ran migration: {filename}")
+            migration = self.load_migration(filename)
+            if migration.version in self.get_applied_migrations():
+                self.logger.info(f"Migration {filename} already applied")
                 return True
-                
+            self.apply_migration(migration)
+            return True
         except Exception as e:
-            self.db.rollback()
             self.logger.error(f"Failed to run migration {filename}: {e}")
             return False
-    
+
     def migrate(self) -> bool:
-        """Run all migrations in order"""
-        migration_files = self.get_migration_files()
-        
-        for filename in migration_files:
-            if not self.run_migration(filename):
-                self.logger.error(f"Migration failed at {filename}")
-                return False
-        
-        self.logger.info("All migrations completed successfully")
-        return True
-    
+        """Apply all pending migrations in version order while holding the migration lock"""
+        try:
+            self._advisory_lock()
+        except Exception as e:
+            self.db.rollback()
+            self.logger.error(f"Could not acquire migration lock: {e}")
+            return False
+
+        try:
+            pending = self.get_pending_migrations()
+            if not pending:
+                self.logger.info("Database schema is up to date")
+                self.ensure_partitions()
+                return True
+
+            for migration in pending:
+                try:
+                    self.apply_migration(migration)
+                except Exception as e:
+                    self.logger.error(f"Migration failed at {migration.filename}: {e}")
+                    return False
+
+            self.logger.info(f"Applied {len(pending)} migrations successfully")
+            invalidate_prepared_statements()  # statements prepared against the old schema
+            invalid = self.get_invalid_indexes()
+            if invalid:
+                self.logger.warning(
+                    f"INVALID indexes present: {', '.join(sorted(invalid))}; run rebuild_invalid_indexes()"
+                )
+            self.ensure_partitions()
+            return True
+        except Exception as e:
+            self.logger.error(f"Migration failed: {e}")
+            return False
+        finally:
+            try:
+                self._advisory_unlock()
+            except Exception as e:
+                self.logger.error(f"Failed to release migration lock: {e}")
+
     def create_tables(self) -> bool:
         """Create all tables (alias for migrate)"""
         return self.migrate()
@@ -0,0 +1,17 @@
+-- Pagination indexes
+-- Composite indexes matching the ORDER BY keys of the keyset-paginated listings,
+-- so each page is a single index range scan instead of a sort over the whole set.
+-- Expressions must stay identical to the *_PAGE queries in queries/queries.py.
+
+CREATE INDEX IF NOT EXISTS idx_pull_requests_repository_page
+    ON pull_requests (repository_full_name, (COALESCE(merged_at, 'infinity'::timestamp)) DESC, number DESC);
+
+CREATE INDEX IF NOT EXISTS idx_pull_requests_miner_page
+    ON pull_requests (uid, hotkey, github_id, (COALESCE(earned_score, 0)) DESC,
+                      (COALESCE(merged_at, 'infinity'::timestamp)) DESC, repository_full_name DESC, number DESC);
+
+CREATE INDEX IF NOT EXISTS idx_issues_repository_page
+    ON issues (repository_full_name, (COALESCE(created_at, 'infinity'::timestamp)) DESC, number DESC);
+
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_timeframe_page
+    ON miner_evaluations (evaluation_timestamp DESC, (COALESCE(total_score, 0)) DESC, id DESC);
\ No newline at end of file
@@ -0,0 +1,95 @@
+-- Range-partition miner_evaluations by month on evaluation_timestamp
+-- Time-window reads (GET_EVALUATIONS_BY_TIMEFRAME, GET_LATEST_MINER_EVALUATION) only
+-- touch the months in range, and expired months are detached or dropped whole instead
+-- of being deleted row by row. Monthly partitions are named miner_evaluations_pYYYYMM;
+-- PartitionsRepository.ensure_partitions creates future months (the migrator runs it
+-- on every migrate) and rows outside every month land in miner_evaluations_default.
+--
+-- The partition key must be part of every unique constraint, so the primary key
+-- becomes (id, evaluation_timestamp); id values and the sequence are preserved.
+
+ALTER TABLE miner_evaluations RENAME TO miner_evaluations_unpartitioned;
+ALTER TABLE miner_evaluations_unpartitioned RENAME CONSTRAINT miner_evaluations_pkey TO miner_evaluations_unpartitioned_pkey;
+ALTER TABLE miner_evaluations_unpartitioned RENAME CONSTRAINT unique_evaluation TO unique_evaluation_unpartitioned;
+ALTER SEQUENCE miner_evaluations_id_seq OWNED BY NONE;
+
+DROP INDEX IF EXISTS idx_miner_evaluations_uid;
+DROP INDEX IF EXISTS idx_miner_evaluations_hotkey;
+DROP INDEX IF EXISTS idx_miner_evaluations_github_id;
+DROP INDEX IF EXISTS idx_miner_evaluations_evaluation_timestamp;
+DROP INDEX IF EXISTS idx_miner_evaluations_timeframe_page;
+
+CREATE TABLE miner_evaluations (
+    id                   BIGINT           NOT NULL DEFAULT nextval('miner_evaluations_id_seq'),
+    uid                  INTEGER          NOT NULL,
+    hotkey               VARCHAR(255)     NOT NULL,
+    github_id            VARCHAR(255)     NOT NULL,
+    failed_reason        TEXT,
+    total_score          DECIMAL(15,6)    DEFAULT 0.0,
+    total_lines_changed  INTEGER          DEFAULT 0,
+    total_open_prs       INTEGER          DEFAULT 0,
+    total_prs            INTEGER          DEFAULT 0,
+    unique_repos_count   INTEGER          DEFAULT 0,
+
+    -- Metadata with automatic timestamps (evaluation_timestamp is the partition key)
+    evaluation_timestamp TIMESTAMP        NOT NULL DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+    created_at           TIMESTAMP        DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+    updated_at           TIMESTAMP        DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+
+    PRIMARY KEY (id, evaluation_timestamp),
+
+    -- Foreign key constraint to miners table
+    FOREIGN KEY (uid, hotkey, github_id)
+        REFERENCES miners(uid, hotkey, github_id)
+            ON DELETE CASCADE,
+
+    -- Unique constraint to prevent duplicate evaluations
+    CONSTRAINT unique_evaluation
+        UNIQUE (uid, hotkey, evaluation_timestamp)
+) PARTITION BY RANGE (evaluation_timestamp);
+
+CREATE TABLE miner_evaluations_default PARTITION OF miner_evaluations DEFAULT;
+
+-- One partition per month from the oldest existing evaluation through three months ahead
+DO $$
+DECLARE
+    month_start TIMESTAMP;
+    last_month  TIMESTAMP := date_trunc('month', CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago') + INTERVAL '3 months';
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN(COALESCE(evaluation_timestamp, created_at)), CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'))
+      INTO month_start
+      FROM miner_evaluations_unpartitioned;
+    month_start := LEAST(month_start, last_month);
+
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF miner_evaluations FOR VALUES FROM (%L) TO (%L)',
+            'miner_evaluations_p' || to_char(month_start, 'YYYYMM'),
+            month_start,
+            month_start + INTERVAL '1 month'
+        );
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+END
+$$;
+
+INSERT INTO miner_evaluations (
+    id, uid, hotkey, github_id, failed_reason, total_score, total_lines_changed,
+    total_open_prs, total_prs, unique_repos_count, evaluation_timestamp, created_at, updated_at
+)
+SELECT id, uid, hotkey, github_id, failed_reason, total_score, total_lines_changed,
+       total_open_prs, total_prs, unique_repos_count,
+       COALESCE(evaluation_timestamp, created_at, CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+       created_at, updated_at
+FROM miner_evaluations_unpartitioned;
+
+ALTER SEQUENCE miner_evaluations_id_seq OWNED BY miner_evaluations.id;
+DROP TABLE miner_evaluations_unpartitioned;
+
+-- Indexes for performance (created on every partition, including future ones)
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_uid                     ON miner_evaluations (uid);
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_hotkey                  ON miner_evaluations (hotkey);
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_github_id               ON miner_evaluations (github_id);
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_evaluation_timestamp    ON miner_evaluations (evaluation_timestamp);
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_timeframe_page
+    ON miner_evaluations (evaluation_timestamp DESC, (COALESCE(total_score, 0)) DESC, id DESC);
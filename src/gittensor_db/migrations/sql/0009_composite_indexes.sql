@@ -0,0 +1,44 @@
+-- migrate: no-transaction
+-- Composite and covering indexes matched to the query shapes in queries/queries.py
+-- Built CONCURRENTLY so populated tables keep accepting writes; single-column
+-- indexes made redundant by a composite (or only ever used as its leading column)
+-- are dropped afterwards. Checked by tests/test_query_plans.py.
+
+-- Miners: one covering index per lookup, so GET_MINER_BY_UID / _BY_HOTKEY /
+-- _BY_GITHUB_ID / _BY_HOTKEY_AND_GITHUB_ID (and their batched forms) are index-only
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_miners_uid_covering
+    ON miners (uid) INCLUDE (hotkey, github_id, created_at, updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_miners_hotkey_github_id_covering
+    ON miners (hotkey, github_id) INCLUDE (uid, created_at, updated_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_miners_github_id_covering
+    ON miners (github_id) INCLUDE (uid, hotkey, created_at, updated_at);
+
+-- GET_PULL_REQUESTS_BY_MINER: filter (uid, hotkey, github_id), ORDER BY earned_score DESC, merged_at DESC;
+-- also serves the ON DELETE CASCADE lookup from miners
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pull_requests_miner
+    ON pull_requests (uid, hotkey, github_id, earned_score DESC, merged_at DESC);
+
+-- GET_PULL_REQUESTS_BY_REPOSITORY (and the _WITH_FILE_CHANGES variant): filter repository, ORDER BY merged_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pull_requests_repository
+    ON pull_requests (repository_full_name, merged_at DESC, number);
+
+-- GET_ISSUES_BY_REPOSITORY: filter repository, ORDER BY created_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_repository_created_at
+    ON issues (repository_full_name, created_at DESC);
+
+-- ON DELETE CASCADE lookup from pull_requests (number, repository_full_name)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_pull_request
+    ON issues (pr_number, repository_full_name);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_miners_uid;
+DROP INDEX CONCURRENTLY IF EXISTS idx_miners_hotkey;
+DROP INDEX CONCURRENTLY IF EXISTS idx_miners_github_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_pull_requests_uid;
+DROP INDEX CONCURRENTLY IF EXISTS idx_pull_requests_hotkey;
+DROP INDEX CONCURRENTLY IF EXISTS idx_pull_requests_github_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_issues_repository;
+DROP INDEX CONCURRENTLY IF EXISTS idx_issues_pr_number;
+
+-- file_changes lookups by pull request use the unique_file_change constraint
+-- (pr_number, repository_full_name, filename), which already returns rows in filename order
+DROP INDEX CONCURRENTLY IF EXISTS idx_file_changes_pr_number;
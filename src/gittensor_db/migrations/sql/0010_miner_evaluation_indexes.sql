@@ -0,0 +1,17 @@
+-- Composite indexes for miner_evaluations matched to the query shapes in queries/queries.py
+-- Runs in a transaction: CREATE INDEX CONCURRENTLY is not supported on partitioned
+-- tables, and each monthly partition is small enough to index under a brief lock.
+
+-- GET_LATEST_MINER_EVALUATION: filter (uid, hotkey), ORDER BY evaluation_timestamp DESC, id DESC LIMIT 1;
+-- also serves the ON DELETE CASCADE lookup from miners
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_latest
+    ON miner_evaluations (uid, hotkey, evaluation_timestamp DESC, id DESC);
+
+-- GET_EVALUATIONS_BY_TIMEFRAME: range on evaluation_timestamp, ORDER BY evaluation_timestamp DESC, total_score DESC
+CREATE INDEX IF NOT EXISTS idx_miner_evaluations_timeframe
+    ON miner_evaluations (evaluation_timestamp DESC, total_score DESC);
+
+DROP INDEX IF EXISTS idx_miner_evaluations_uid;
+DROP INDEX IF EXISTS idx_miner_evaluations_hotkey;
+DROP INDEX IF EXISTS idx_miner_evaluations_github_id;
+DROP INDEX IF EXISTS idx_miner_evaluations_evaluation_timestamp;
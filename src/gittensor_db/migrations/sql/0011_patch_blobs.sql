@@ -0,0 +1,42 @@
+-- migrate: no-transaction
+-- Content-addressed, compressed patch storage
+-- Each distinct patch is stored once in patch_blobs, keyed by the SHA-256 of its UTF-8
+-- text (see utils/patch_codec.py), and file_changes.patch_hash references it. Rows
+-- written before this migration keep their inline file_changes.patch until
+-- FileChangesRepository.backfill_patch_blobs moves them; readers accept either.
+
+CREATE TABLE IF NOT EXISTS patch_blobs (
+    hash             BYTEA            PRIMARY KEY,
+    compression      VARCHAR(16)      NOT NULL,   -- 'zlib' or 'none'
+    size             INTEGER          NOT NULL,   -- uncompressed bytes
+    data             BYTEA            NOT NULL,
+
+    created_at       TIMESTAMP        DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+
+    CONSTRAINT chk_patch_blobs_hash   CHECK (octet_length(hash) = 32),
+    CONSTRAINT chk_patch_blobs_size   CHECK (size >= 0)
+);
+
+-- Blobs are already compressed: store out of line without a second pglz pass
+ALTER TABLE patch_blobs ALTER COLUMN data SET STORAGE EXTERNAL;
+
+ALTER TABLE file_changes ADD COLUMN IF NOT EXISTS patch_hash BYTEA;
+
+-- Added NOT VALID and validated separately so file_changes keeps accepting writes
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'fk_file_changes_patch_blob' AND conrelid = 'file_changes'::regclass
+    ) THEN
+        ALTER TABLE file_changes
+            ADD CONSTRAINT fk_file_changes_patch_blob
+                FOREIGN KEY (patch_hash) REFERENCES patch_blobs(hash) NOT VALID;
+    END IF;
+END
+$$;
+
+ALTER TABLE file_changes VALIDATE CONSTRAINT fk_file_changes_patch_blob;
+
+-- Lets delete_orphaned_patch_blobs check references without scanning file_changes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_changes_patch_hash ON file_changes (patch_hash);
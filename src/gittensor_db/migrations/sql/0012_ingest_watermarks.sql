@@ -0,0 +1,30 @@
+-- Ingest watermarks
+-- The newest merged pull request ingested for each miner and repository, ordered by
+-- (merged_at, number). Ingest skips pull requests at or below the watermark (and their
+-- issues and file changes) instead of re-sending rows that are already stored.
+
+CREATE TABLE IF NOT EXISTS ingest_watermarks (
+    uid                  INTEGER          NOT NULL,
+    hotkey               VARCHAR(255)     NOT NULL,
+    github_id            VARCHAR(255)     NOT NULL,
+    repository_full_name VARCHAR(255)     NOT NULL,
+    last_merged_at       TIMESTAMPTZ      NOT NULL,
+    last_pr_number       INTEGER          NOT NULL,
+
+    updated_at           TIMESTAMP        DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'),
+
+    -- Leading miner columns serve the per-miner lookup
+    PRIMARY KEY (uid, hotkey, github_id, repository_full_name),
+
+    -- Foreign key constraints
+    FOREIGN KEY (uid, hotkey, github_id)
+        REFERENCES miners(uid, hotkey, github_id)
+            ON DELETE CASCADE,
+
+    FOREIGN KEY (repository_full_name)
+        REFERENCES repositories(full_name)
+            ON DELETE CASCADE
+);
+
+-- Serves ON DELETE CASCADE from repositories
+CREATE INDEX IF NOT EXISTS idx_ingest_watermarks_repository ON ingest_watermarks (repository_full_name);
@@ -0,0 +1,6 @@
+-- Row update timestamp for issues
+-- pull_requests and file_changes already have updated_at; the change-aware upserts
+-- (BULK_UPSERT_CHANGED_*) set it whenever they rewrite a row. (issues.created_at is the
+-- GitHub creation time, not row metadata.)
+
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago');
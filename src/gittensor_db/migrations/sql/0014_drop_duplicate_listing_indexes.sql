@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- Drop listing indexes that duplicate the 0007 pagination indexes
+-- GET_ISSUES_BY_REPOSITORY and GET_EVALUATIONS_BY_TIMEFRAME now order by the same
+-- COALESCE keys as their *_PAGE variants, so idx_issues_repository_page and
+-- idx_miner_evaluations_timeframe_page serve both. Checked by tests/test_query_plans.py.
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_issues_repository_created_at;
+
+-- DROP INDEX CONCURRENTLY is not supported on partitioned tables
+DROP INDEX IF EXISTS idx_miner_evaluations_timeframe;
@@ -0,0 +1,141 @@
+"""
+Split PostgreSQL scripts into individual statements.
+
+Semicolons only end a statement at the top level: not inside '...' / E'...' string
+literals, "..." identifiers, $tag$...$tag$ dollar-quoted bodies (functions, DO
+blocks), -- line comments or /* ... */ block comments (which may nest).
+"""
+import re
+from typing import List
+
+_DOLLAR_TAG = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)?\$')
+
+
+def _is_blank(statement: str) -> bool:
+    """True if statement holds nothing but whitespace and comments"""
+    return not strip_sql_comments(statement).strip()
+
+
+def strip_sql_comments(sql: str) -> str:
+    """Remove -- and /* */ comments outside of quoted text"""
+    out = []
+    for kind, text in _tokens(sql):
+        if kind != 'comment':
+            out.append(text)
+    return ''.join(out)
+
+
+def split_sql_statements(sql: str) -> List[str]:
+    """
+    Split a SQL script on top-level semicolons.
+
+    Args:
+        sql: Script containing one or more statements
+
+    Returns:
+        Statements without their trailing semicolon, stripped of surrounding
+        whitespace; statements consisting only of comments are dropped
+    """
+    statements = []
+    current = []
+    for kind, text in _tokens(sql):
+        if kind == 'semicolon':
+            statement = ''.join(current).strip()
+            if not _is_blank(statement):
+                statements.append(statement)
+            current = []
+        else:
+            current.append(text)
+    statement = ''.join(current).strip()
+    if not _is_blank(statement):
+        statements.append(statement)
+    return statements
+
+
+def _tokens(sql: str):
+    """Yield (kind, text) chunks where kind is 'text', 'quoted', 'comment' or 'semicolon'"""
+    i = 0
+    length = len(sql)
+    start = 0
+    while i < length:
+        char = sql[i]
+        if char == ';':
+            if start < i:
+                yield 'text', sql[start:i]
+            yield 'semicolon', char
+            i += 1
+            start = i
+            continue
+
+        end = None
+        kind = None
+        if char == '-' and sql.startswith('--', i):
+            newline = sql.find('\n', i)
+            end = length if newline == -1 else newline
+            kind = 'comment'
+        elif char == '/' and sql.startswith('/*', i):
+            end = _block_comment_end(sql, i)
+            kind = 'comment'
+        elif char == "'":
+            # E'...' strings allow backslash escapes
+            escaped = i > 0 and sql[i - 1] in 'eE' and (i == 1 or not (sql[i - 2].isalnum() or sql[i - 2] == '_'))
+            end = _quoted_end(sql, i, "'", escaped)
+            kind = 'quoted'
+        elif char == '"':
+            end = _quoted_end(sql, i, '"', False)
+            kind = 'quoted'
+        elif char == '$':
+            match = _DOLLAR_TAG.match(sql, i)
+            # A $n positional parameter or an identifier containing $ is not a dollar quote
+            if match and not (i > 0 and (sql[i - 1].isalnum() or sql[i - 1] == '_')):
+                closing = sql.find(match.group(0), match.end())
+                end = length if closing == -1 else closing + len(match.group(0))
+                kind = 'quoted'
+
+        if end is None:
+            i += 1
+            continue
+        if start < i:
+            yield 'text', sql[start:i]
+        yield kind, sql[i:end]
+        i = start = end
+
+    if start < length:
+        yield 'text', sql[start:]
+
+
+def _quoted_end(sql: str, i: int, quote: str, backslash_escapes: bool) -> int:
+    """Index just past the quoted literal starting at i; doubled quotes are escapes"""
+    j = i + 1
+    length = len(sql)
+    while j < length:
+        char = sql[j]
+        if backslash_escapes and char == '\\':
+            j += 2
+            continue
+        if char == quote:
+            if j + 1 < length and sql[j + 1] == quote:
+                j += 2
+                continue
+            return j + 1
+        j += 1
+    return length
+
+
+def _block_comment_end(sql: str, i: int) -> int:
+    """Index just past the (possibly nested) block comment starting at i"""
+    depth = 0
+    j = i
+    length = len(sql)
+    while j < length:
+        if sql.startswith('/*', j):
+            depth += 1
+            j += 2
+        elif sql.startswith('*/', j):
+            depth -= 1
+            j += 2
+            if depth == 0:
+                return j
+        else:
+            j += 1
+    return length
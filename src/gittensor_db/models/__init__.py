@@ -6,16 +6,37 @@ from .domain_models import (
     Miner,
     Repository,
     FileChange,
+    LazyFileChange,
     Issue,
     PullRequest,
-    MinerEvaluation
+    MinerEvaluation,
+    MinerAggregate,
+    IngestWatermark,
+    SlottedMiner,
+    SlottedFileChange,
+    SlottedIssue,
+    SlottedPullRequest,
+    SlottedMinerEvaluation,
+    slotted
 )
+from .batches import FileChangeBatch, PullRequestBatch
 
 __all__ = [
     'Miner',
     'Repository',
     'FileChange',
+    'LazyFileChange',
     'Issue',
     'PullRequest',
-    'MinerEvaluation'
+    'MinerEvaluation',
+    'MinerAggregate',
+    'IngestWatermark',
+    'SlottedMiner',
+    'SlottedFileChange',
+    'SlottedIssue',
+    'SlottedPullRequest',
+    'SlottedMinerEvaluation',
+    'slotted',
+    'FileChangeBatch',
+    'PullRequestBatch'
 ]
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+Columnar containers for large numbers of file changes and pull requests.
+
+A FileChangeBatch or PullRequestBatch keeps one column per field instead of one
+object per row: integer and float columns are stdlib arrays (4 or 8 bytes per value),
+and repeated strings (repository names, hotkeys, statuses, extensions) are interned
+so every row shares a single str object. Rows are only materialized as FileChange /
+PullRequest objects when indexed or iterated.
+
+Bulk repository methods accept these containers in place of lists, and the
+get_*_batch methods return them without building per-row objects.
+"""
+from array import array
+from numbers import Integral
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from .domain_models import FileChange, PullRequest
+
+# ids are BIGSERIAL (>= 1), so 0 marks a row that has not been stored yet
+_NO_ID = 0
+
+
+class _Interner:
+    """Returns one shared object per distinct value"""
+    __slots__ = ('_values',)
+
+    def __init__(self):
+        self._values: Dict[Any, Any] = {}
+
+    def __call__(self, value):
+        if value is None:
+            return None
+        return self._values.setdefault(value, value)
+
+
+class FileChangeBatch:
+    """File changes stored column by column (see module docstring)"""
+
+    __slots__ = (
+        'pr_numbers', 'repository_full_names', 'filenames', 'changes', 'additions',
+        'deletions', 'statuses', 'patches', 'file_extensions', 'ids', '_intern'
+    )
+
+    def __init__(self, file_changes: Iterable[FileChange] = ()):
+        self.pr_numbers = array('i')
+        self.repository_full_names: List[str] = []
+        self.filenames: List[str] = []
+        self.changes = array('i')
+        self.additions = array('i')
+        self.deletions = array('i')
+        self.statuses: List[str] = []
+        self.patches: List[Optional[str]] = []
+        self.file_extensions: List[str] = []
+        self.ids = array('q')
+        self._intern = _Interner()
+        self.extend(file_changes)
+
+    def __len__(self) -> int:
+        return len(self.pr_numbers)
+
+    def append_row(
+        self,
+        pr_number: int,
+        repository_full_name: str,
+        filename: str,
+        changes: int,
+        additions: int,
+        deletions: int,
+        status: str,
+        patch: Optional[str] = None,
+        file_extension: Optional[str] = None,
+        id: Optional[int] = None
+    ) -> None:
+        """Append one file change given its field values"""
+        if file_extension is None:
+            file_extension = filename.split(".")[-1].lower() if "." in filename else ""
+        self.pr_numbers.append(pr_number)
+        self.repository_full_names.append(self._intern(repository_full_name))
+        self.filenames.append(filename)
+        self.changes.append(changes or 0)
+        self.additions.append(additions or 0)
+        self.deletions.append(deletions or 0)
+        self.statuses.append(self._intern(status))
+        self.patches.append(patch)
+        self.file_extensions.append(self._intern(file_extension))
+        self.ids.append(id or _NO_ID)
+
+    def append(self, file_change: FileChange) -> None:
+        self.append_row(
+            file_change.pr_number,
+            file_change.repository_full_name,
+            file_change.filename,
+            file_change.changes,
+            file_change.additions,
+            file_change.deletions,
+            file_change.status,
+            file_change.patch,
+            file_change.file_extension,
+            file_change.id
+        )
+
+    def extend(self, file_changes: Iterable[FileChange]) -> None:
+        for file_change in file_changes:
+            self.append(file_change)
+
+    def row(self, index: int, model: Type[FileChange] = FileChange) -> FileChange:
+        """Materialize one row as model (FileChange or SlottedFileChange)"""
+        return model(
+            pr_number=self.pr_numbers[index],
+            repository_full_name=self.repository_full_names[index],
+            filename=self.filenames[index],
+            changes=self.changes[index],
+            additions=self.additions[index],
+            deletions=self.deletions[index],
+            status=self.statuses[index],
+            patch=self.patches[index],
+            file_extension=self.file_extensions[index],
+            id=self.ids[index] or None
+        )
+
+    def __getitem__(self, index: int) -> FileChange:
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[FileChange]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_file_changes(self, model: Type[FileChange] = FileChange) -> List[FileChange]:
+        return [self.row(index, model) for index in range(len(self))]
+
+    def iter_values(self) -> Iterator[Tuple]:
+        """
+        Rows as (pr_number, repository_full_name, filename, changes, additions,
+        deletions, status, patch, file_extension) tuples, the column order of the
+        file change bulk writes
+        """
+        return zip(
+            self.pr_numbers, self.repository_full_names, self.filenames, self.changes, self.additions,
+            self.deletions, self.statuses, self.patches, self.file_extensions
+        )
+
+    def pr_keys(self) -> List[Tuple[int, str]]:
+        """Distinct (pr_number, repository_full_name) pairs in first-seen order"""
+        return list(dict.fromkeys(zip(self.pr_numbers, self.repository_full_names)))
+
+
+class PullRequestBatch:
+    """Pull requests stored column by column (see module docstring)"""
+
+    __slots__ = (
+        'numbers', 'repository_full_names', 'uids', 'hotkeys', 'github_ids', 'titles',
+        'author_logins', 'merged_at', 'created_at', 'earned_scores', 'additions',
+        'deletions', 'commits', 'merged_by_logins', '_intern'
+    )
+
+    def __init__(self, pull_requests: Iterable[PullRequest] = ()):
+        self.numbers = array('i')
+        self.repository_full_names: List[str] = []
+        self.uids = array('i')
+        self.hotkeys: List[str] = []
+        self.github_ids: List[str] = []
+        self.titles: List[str] = []
+        self.author_logins: List[str] = []
+        self.merged_at: List[Any] = []
+        self.created_at: List[Any] = []
+        self.earned_scores = array('d')
+        self.additions = array('i')
+        self.deletions = array('i')
+        self.commits = array('i')
+        self.merged_by_logins: List[Optional[str]] = []
+        self._intern = _Interner()
+        self.extend(pull_requests)
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def append_row(
+        self,
+        number: int,
+        repository_full_name: str,
+        uid: int,
+        hotkey: str,
+        github_id: str,
+        title: str,
+        author_login: str,
+        merged_at: Any,
+        created_at: Any,
+        earned_score: float = 0.0,
+        additions: int = 0,
+        deletions: int = 0,
+        commits: int = 0,
+        merged_by_login: Optional[str] = None
+    ) -> None:
+        """Append one pull request given its field values"""
+        # uid can arrive as a numpy integer (numbers.Integral but not int)
+        if not isinstance(uid, int) and isinstance(uid, Integral):
+            uid = int(uid)
+        self.numbers.append(number)
+        self.repository_full_names.append(self._intern(repository_full_name))
+        self.uids.append(uid)
+        self.hotkeys.append(self._intern(hotkey))
+        self.github_ids.append(self._intern(github_id))
+        self.titles.append(title)
+        self.author_logins.append(self._intern(author_login))
+        self.merged_at.append(merged_at)
+        self.created_at.append(created_at)
+        self.earned_scores.append(float(earned_score or 0.0))
+        self.additions.append(additions or 0)
+        self.deletions.append(deletions or 0)
+        self.commits.append(commits or 0)
+        self.merged_by_logins.append(self._intern(merged_by_login))
+
+    def append(self, pull_request: PullRequest) -> None:
+        self.append_row(
+            pull_request.number,
+            pull_request.repository_full_name,
+            pull_request.uid,
+            pull_request.hotkey,
+            pull_request.github_id,
+            pull_request.title,
+            pull_request.author_login,
+            pull_request.merged_at,
+            pull_request.created_at,
+            pull_request.earned_score,
+            pull_request.additions,
+            pull_request.deletions,
+            pull_request.commits,
+            pull_request.merged_by_login
+        )
+
+    def extend(self, pull_requests: Iterable[PullRequest]) -> None:
+        for pull_request in pull_requests:
+            self.append(pull_request)
+
+    def row(self, index: int, model: Type[PullRequest] = PullRequest) -> PullRequest:
+        """Materialize one row as model (PullRequest or SlottedPullRequest), without file changes"""
+        return model(
+            number=self.numbers[index],
+            repository_full_name=self.repository_full_names[index],
+            uid=self.uids[index],
+            hotkey=self.hotkeys[index],
+            github_id=self.github_ids[index],
+            title=self.titles[index],
+            author_login=self.author_logins[index],
+            merged_at=self.merged_at[index],
+            created_at=self.created_at[index],
+            earned_score=self.earned_scores[index],
+            additions=self.additions[index],
+            deletions=self.deletions[index],
+            commits=self.commits[index],
+            merged_by_login=self.merged_by_logins[index]
+        )
+
+    def __getitem__(self, index: int) -> PullRequest:
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[PullRequest]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_pull_requests(self, model: Type[PullRequest] = PullRequest) -> List[PullRequest]:
+        return [self.row(index, model) for index in range(len(self))]
+
+    def iter_values(self) -> Iterator[Tuple]:
+        """Rows in the column order of the pull request bulk writes"""
+        return zip(
+            self.numbers, self.repository_full_names, self.uids, self.hotkeys, self.github_ids,
+            self.earned_scores, self.titles, self.merged_at, self.created_at, self.additions,
+            self.deletions, self.commits, self.author_logins, self.merged_by_logins
+        )
+
+    def keys(self) -> List[Tuple[int, str]]:
+        """(number, repository_full_name) of every row"""
+        return list(zip(self.numbers, self.repository_full_names))
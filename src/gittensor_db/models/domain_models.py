@@ -2,8 +2,8 @@
 Domain models for GitTensor database operations.
 These mirror your gittensor.classes but are self-contained.
 """
-from dataclasses import dataclass, field
-from typing import DefaultDict, Optional, List, Set, Callable
+from dataclasses import dataclass, field, fields
+from typing import DefaultDict, Optional, List, Set, Callable, Protocol
 from datetime import datetime
 from ..utils.utils import parse_github_timestamp
 
@@ -66,6 +66,48 @@ class FileChange:
             status=file_diff['status'],
             patch=file_diff.get('patch')
         )
+
+
+class PatchLoader(Protocol):
+    """Fills in the patches of a group of LazyFileChanges"""
+    def load(self) -> None: ...
+
+
+class LazyFileChange(FileChange):
+    """
+    FileChange fetched without its diff. The patch is loaded on first access by
+    patch_loader, which loads the patches of every file change it shares (one pull
+    request's) in the same query. Assigning patch replaces the lazy value.
+    """
+
+    def __init__(self, *args, patch_loader: Optional[PatchLoader] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._patch_loader = patch_loader
+
+    @property
+    def patch(self) -> Optional[str]:
+        if self._patch_loader is not None:
+            self._patch_loader.load()
+        return self._patch
+
+    @patch.setter
+    def patch(self, value: Optional[str]) -> None:
+        self._patch = value
+        self._patch_loader = None
+
+    @property
+    def patch_loaded(self) -> bool:
+        return self._patch_loader is None
+
+    def __repr__(self) -> str:
+        if self.patch_loaded:
+            return super().__repr__()
+        return (
+            f"LazyFileChange(pr_number={self.pr_number!r}, repository_full_name={self.repository_full_name!r}, "
+            f"filename={self.filename!r}, status={self.status!r}, patch=<not loaded>, id={self.id!r})"
+        )
+
+
 @dataclass
 class Issue:
     """Represents an issue that belongs to a pull request"""
@@ -215,3 +257,86 @@ class MinerEvaluation:
             print(reason)
             print("*" * 50)
         self.failed_reason = reason
+
+
+@dataclass
+class MinerAggregate:
+    """
+    Pull request totals of one miner, computed by the database instead of from the
+    loaded PullRequests. The repository names themselves are not fetched, only their count.
+    """
+    __slots__ = ('uid', 'hotkey', 'github_id', 'pr_count', 'total_lines_changed', 'unique_repos_count', 'total_score')
+    uid: int
+    hotkey: str
+    github_id: str
+    pr_count: int
+    total_lines_changed: int
+    unique_repos_count: int
+    total_score: float
+
+    def apply_to(self, evaluation: MinerEvaluation) -> None:
+        """
+        Store the totals on evaluation as calculate_metric_totals and calculate_score_total
+        would (metric totals are left alone when the miner has no pull requests). The spam
+        penalty is not applied.
+        """
+        evaluation.stored_total_prs = self.pr_count
+        evaluation.total_score = self.total_score
+        if self.pr_count:
+            evaluation.total_lines_changed = self.total_lines_changed
+            evaluation.unique_repos_count = self.unique_repos_count
+
+
+@dataclass
+class IngestWatermark:
+    """
+    Newest merged pull request ingested for a miner in one repository, ordered by
+    (merged_at, number). Pull requests at or below it are already stored.
+    """
+    uid: int
+    hotkey: str
+    github_id: str
+    repository_full_name: str
+    last_merged_at: datetime
+    last_pr_number: int
+
+    def covers(self, pr: PullRequest) -> bool:
+        """
+        Whether pr was ingested up to this watermark (unmerged pull requests never are).
+        When only one of the timestamps has a time zone, both are compared as wall-clock
+        times, the way Postgres reads a naive value in the session time zone.
+        """
+        merged_at, last_merged_at = pr.merged_at, self.last_merged_at
+        if merged_at is None:
+            return False
+        if merged_at.tzinfo is None and last_merged_at.tzinfo is not None:
+            last_merged_at = last_merged_at.replace(tzinfo=None)
+        elif merged_at.tzinfo is not None and last_merged_at.tzinfo is None:
+            merged_at = merged_at.replace(tzinfo=None)
+        return (merged_at, pr.number) <= (last_merged_at, self.last_pr_number)
+
+
+def slotted(cls):
+    """
+    Copy of dataclass cls that keeps its fields in __slots__ instead of a per-instance
+    __dict__, like dataclass(slots=True) on Python 3.10+. Instances take about a third
+    less memory but can't be given attributes outside the dataclass fields.
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    namespace = {
+        name: value for name, value in cls.__dict__.items()
+        if name not in field_names and name not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = field_names
+    slotted_cls = type(cls)(f"Slotted{cls.__name__}", cls.__bases__, namespace)
+    slotted_cls.__qualname__ = slotted_cls.__name__
+    return slotted_cls
+
+
+# Slotted variants for holding large numbers of objects in memory; same fields,
+# defaults and methods as the classes above
+SlottedMiner = slotted(Miner)
+SlottedFileChange = slotted(FileChange)
+SlottedIssue = slotted(Issue)
+SlottedPullRequest = slotted(PullRequest)
+SlottedMinerEvaluation = slotted(MinerEvaluation)
@@ -0,0 +1,191 @@
+"""
+Vectorized scoring of many MinerEvaluations at once.
+
+score_evaluations puts the pull requests of every evaluation into NumPy arrays
+(owning evaluation, additions, deletions, earned_score, repository id) and computes
+the per-evaluation totals with grouped reductions instead of looping in Python per
+miner. The results match MinerEvaluation.calculate_metric_totals,
+calculate_score_total and apply_open_pr_spam_penalty: integer totals exactly, and
+scores up to float rounding (they are added in the same order as sum(), which is
+bit-for-bit equal before Python 3.12 switched sum() to compensated summation).
+
+Reading attributes off PullRequest objects costs about as much as the per-object
+methods themselves, so the large win comes from passing the pull requests as a
+PullRequestBatch (PullRequestsRepository.get_pull_request_batch_by_*), whose numeric
+columns are used without copying.
+
+This module imports NumPy, so it is not imported by gittensor_db.models; use
+gittensor_db.score_evaluations or import it from gittensor_db.models.scoring.
+"""
+from array import array
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .batches import PullRequestBatch
+from .domain_models import MinerEvaluation
+
+
+@dataclass
+class SpamPenalty:
+    """Parameters of MinerEvaluation.apply_open_pr_spam_penalty"""
+    threshold: int
+    min_weight: float
+    penalty_slope: float
+
+
+@dataclass
+class EvaluationScores:
+    """Per-evaluation results of score_evaluations, aligned with the input order"""
+    uids: np.ndarray                  # int64
+    total_scores: np.ndarray          # float64, after the spam penalty if one was given
+    total_lines_changed: np.ndarray   # int64
+    unique_repos_counts: np.ndarray   # int64
+    penalty_weights: np.ndarray       # float64, 1.0 where no penalty applied
+    pr_counts: np.ndarray             # int64, pull requests scored per evaluation
+    repository_names: List[str]       # repository id -> full name
+    repository_ids: List[np.ndarray]  # per evaluation, sorted ids of the repositories contributed to
+
+    def apply(self, evaluations: Sequence[MinerEvaluation]) -> None:
+        """
+        Write the results back onto the evaluations they were computed from, as
+        calculate_metric_totals, calculate_score_total and apply_open_pr_spam_penalty
+        would have. Metric totals of evaluations without pull requests are left as
+        they are, like calculate_metric_totals does.
+        """
+        for index, evaluation in enumerate(evaluations):
+            if self.pr_counts[index]:
+                evaluation.total_lines_changed = int(self.total_lines_changed[index])
+                evaluation.unique_repos_contributed_to = {
+                    self.repository_names[repo_id] for repo_id in self.repository_ids[index]
+                }
+                evaluation.unique_repos_count = int(self.unique_repos_counts[index])
+            evaluation.total_score = float(self.total_scores[index])
+
+
+_ADDITIONS = attrgetter('additions')
+_DELETIONS = attrgetter('deletions')
+_EARNED_SCORE = attrgetter('earned_score')
+_REPOSITORY = attrgetter('repository_full_name')
+
+
+def _factorize(names: List[str]):
+    """(ids array, distinct names in first-seen order) for a list of strings"""
+    index: Dict[str, int] = {name: position for position, name in enumerate(dict.fromkeys(names))}
+    ids = np.frombuffer(array('q', map(index.__getitem__, names)), dtype=np.int64)
+    return ids, list(index)
+
+
+def _rows_from_evaluations(evaluations: Sequence[MinerEvaluation]):
+    """Flatten evaluation.pull_requests into (owners, additions, deletions, scores, repo ids, repo names)"""
+    pr_lists = list(map(attrgetter('pull_requests'), evaluations))
+    pr_counts = np.frombuffer(array('q', map(len, pr_lists)), dtype=np.int64)
+    owners = np.repeat(np.arange(len(pr_lists), dtype=np.int64), pr_counts)
+
+    # Columns are filled one evaluation at a time so its pull requests stay in cache across
+    # the attribute reads; map/attrgetter keep the reads themselves out of Python bytecode
+    additions, deletions, earned_scores, names = array('q'), array('q'), array('d'), []
+    for pull_requests in pr_lists:
+        additions.extend(map(_ADDITIONS, pull_requests))
+        deletions.extend(map(_DELETIONS, pull_requests))
+        earned_scores.extend(map(_EARNED_SCORE, pull_requests))
+        names.extend(map(_REPOSITORY, pull_requests))
+    repo_ids, repository_names = _factorize(names)
+    additions = np.frombuffer(additions, dtype=np.int64)
+    deletions = np.frombuffer(deletions, dtype=np.int64)
+    earned_scores = np.frombuffer(earned_scores, dtype=np.float64)
+    return owners, additions, deletions, earned_scores, repo_ids, repository_names
+
+
+def _rows_from_batch(evaluations: Sequence[MinerEvaluation], batch: PullRequestBatch):
+    """
+    Assign the rows of a PullRequestBatch to evaluations by (uid, hotkey), dropping
+    rows that belong to no evaluation
+    """
+    uids = np.frombuffer(batch.uids, dtype=np.int32).astype(np.int64)
+    hotkey_ids, hotkeys = _factorize(batch.hotkeys)
+
+    # (uid, hotkey id) -> evaluation index through a dense lookup table
+    hotkey_index = {hotkey: position for position, hotkey in enumerate(hotkeys)}
+    max_uid = max(int(uids.max(initial=0)), max((e.uid for e in evaluations), default=0))
+    lookup = np.full((max_uid + 1, len(hotkeys) + 1), -1, dtype=np.int64)
+    for position, evaluation in enumerate(evaluations):
+        lookup[evaluation.uid, hotkey_index.get(evaluation.hotkey, len(hotkeys))] = position
+    owners = lookup[uids, hotkey_ids]
+
+    keep = owners >= 0
+    repo_ids, repository_names = _factorize(batch.repository_full_names)
+    return (
+        owners[keep],
+        np.frombuffer(batch.additions, dtype=np.int32).astype(np.int64)[keep],
+        np.frombuffer(batch.deletions, dtype=np.int32).astype(np.int64)[keep],
+        np.frombuffer(batch.earned_scores, dtype=np.float64)[keep],
+        repo_ids[keep],
+        repository_names
+    )
+
+
+def score_evaluations(
+    evaluations: Sequence[MinerEvaluation],
+    spam_penalty: Optional[SpamPenalty] = None,
+    pull_requests: Optional[PullRequestBatch] = None
+) -> EvaluationScores:
+    """
+    Compute lines changed, unique repositories, total score and (optionally) the
+    open PR spam penalty for every evaluation in one pass
+
+    Args:
+        evaluations: Evaluations to score (one per uid/hotkey)
+        spam_penalty: Apply the open PR spam penalty with these parameters
+        pull_requests: Score these pull requests, matched to evaluations by (uid, hotkey),
+            instead of each evaluation's pull_requests list
+
+    Returns:
+        EvaluationScores aligned with evaluations; call .apply(evaluations) to store
+        the results on the objects
+    """
+    count = len(evaluations)
+    if pull_requests is None:
+        owners, additions, deletions, earned_scores, repo_ids, repository_names = _rows_from_evaluations(evaluations)
+    else:
+        owners, additions, deletions, earned_scores, repo_ids, repository_names = _rows_from_batch(
+            evaluations, pull_requests
+        )
+
+    pr_counts = np.bincount(owners, minlength=count).astype(np.int64)
+
+    # bincount adds the weights in input order, the same order sum() uses per evaluation
+    # Without any pull requests bincount ignores the weights and returns int64
+    total_scores = np.bincount(owners, weights=earned_scores, minlength=count).astype(np.float64)
+    total_lines_changed = np.zeros(count, dtype=np.int64)
+    np.add.at(total_lines_changed, owners, additions + deletions)
+
+    # Distinct (evaluation, repository) pairs, sorted by evaluation
+    repo_count = max(len(repository_names), 1)
+    pairs = np.sort(owners * repo_count + repo_ids)
+    if len(pairs):
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    unique_repos_counts = np.bincount(pairs // repo_count, minlength=count).astype(np.int64)
+    repository_ids = np.split(pairs % repo_count, np.cumsum(unique_repos_counts)[:-1]) if count else []
+
+    penalty_weights = np.ones(count, dtype=np.float64)
+    if spam_penalty is not None:
+        open_prs = np.fromiter(map(attrgetter('total_open_prs'), evaluations), dtype=np.int64, count=count)
+        penalized = open_prs > spam_penalty.threshold
+        penalty_weights[penalized] = np.maximum(
+            spam_penalty.min_weight, 1.0 - open_prs[penalized] * spam_penalty.penalty_slope
+        )
+        total_scores[penalized] = penalty_weights[penalized] * total_scores[penalized]
+
+    return EvaluationScores(
+        uids=np.fromiter(map(attrgetter('uid'), evaluations), dtype=np.int64, count=count),
+        total_scores=total_scores,
+        total_lines_changed=total_lines_changed,
+        unique_repos_counts=unique_repos_counts,
+        penalty_weights=penalty_weights,
+        pr_counts=pr_counts,
+        repository_names=repository_names,
+        repository_ids=repository_ids
+    )
@@ -0,0 +1,212 @@
+"""
+Server-side prepared statements for the hot queries in queries/queries.py.
+
+Once enabled, the sync repositories PREPARE a registered query on each connection the
+first time it runs there and send only EXECUTE name (params) afterwards, so Postgres
+skips parsing and planning from the second call on. Statements are tracked per
+connection (weakly, so closed connections drop out) and per backend process, so a
+reconnect re-prepares them. Postgres re-plans prepared statements after schema changes
+by itself; when a statement went stale anyway (deallocated, or its result columns
+changed) it is prepared again and, if it was the first statement of its transaction,
+retried. The async repositories hand the same queries to psycopg 3 with prepare=True,
+which keeps its own per-connection statement cache.
+
+Prepared statements live in the server session, so leave this disabled behind a
+transaction-pooling proxy (PgBouncer pool_mode=transaction).
+
+    enable_prepared_statements()  # DEFAULT_PREPARED_QUERIES
+    enable_prepared_statements([GET_MINER_BY_UID, GET_PULL_REQUEST])
+"""
+import itertools
+import logging
+import re
+import threading
+import weakref
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from .queries import (
+    GET_MINER_BY_UID,
+    GET_PULL_REQUEST,
+    GET_LATEST_MINER_EVALUATION,
+    SET_FILE_CHANGES_FOR_PR,
+)
+
+logger = logging.getLogger(__name__)
+
+# Queries run thousands of times per validation cycle
+DEFAULT_PREPARED_QUERIES = (
+    GET_MINER_BY_UID,
+    GET_PULL_REQUEST,
+    GET_LATEST_MINER_EVALUATION,
+    SET_FILE_CHANGES_FOR_PR,
+)
+
+# SQLSTATEs of an EXECUTE whose statement no longer exists or no longer fits its plan
+_STALE_STATEMENT_CODES = (
+    '26000',  # invalid_sql_statement_name: deallocated (DISCARD ALL, server-side reset)
+    '0A000',  # feature_not_supported: "cached plan must not change result type" after DDL
+)
+
+# psycopg2.extensions.TRANSACTION_STATUS_* (not imported so psycopg2 stays optional)
+_TRANSACTION_IDLE = 0
+_TRANSACTION_INTRANS = 2
+
+_PLACEHOLDER = re.compile(r'%(.)')
+
+_enabled: FrozenSet[str] = frozenset()
+_unpreparable: Set[str] = set()
+_statement_ids = itertools.count(1)
+_registries: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+_registries_lock = threading.Lock()
+
+
+class _ConnectionStatements:
+    """Statements prepared on one connection: query text -> EXECUTE command"""
+    __slots__ = ('backend_pid', 'statements')
+
+    def __init__(self, backend_pid: int):
+        self.backend_pid = backend_pid
+        self.statements: Dict[str, str] = {}
+
+
+def enable_prepared_statements(queries: Iterable[str] = DEFAULT_PREPARED_QUERIES) -> None:
+    """
+    Run the given queries as server-side prepared statements from now on
+
+    Args:
+        queries: Query strings from queries/queries.py (replaces any previously enabled set)
+    """
+    global _enabled
+    _enabled = frozenset(queries)
+
+
+def disable_prepared_statements() -> None:
+    """Stop preparing queries and forget the statements prepared so far"""
+    global _enabled
+    _enabled = frozenset()
+    invalidate_prepared_statements()
+
+
+def invalidate_prepared_statements(connection=None) -> None:
+    """
+    Forget prepared statements so they are prepared again on next use, e.g. after
+    migrations. Names are never reused, so the old server-side statements don't
+    conflict and are released when their session ends.
+
+    Args:
+        connection: Only forget the statements of this connection (default: all)
+    """
+    with _registries_lock:
+        if connection is None:
+            _registries.clear()
+        else:
+            _registries.pop(connection, None)
+
+
+def is_prepared(query: str) -> bool:
+    """Whether query is enabled for preparation"""
+    return query in _enabled and query not in _unpreparable
+
+
+def to_positional(query: str) -> Optional[Tuple[str, int]]:
+    """
+    Rewrite a psycopg2 query for PREPARE
+
+    Returns:
+        (query with $1..$n placeholders, n), or None if it uses placeholders PREPARE
+        can't express (named %(name)s parameters)
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group(1) == 's':
+            count += 1
+            return f"${count}"
+        if match.group(1) == '%':
+            return '%'
+        raise ValueError(match.group(0))
+
+    try:
+        return _PLACEHOLDER.sub(replace, query), count
+    except ValueError:
+        return None
+
+
+def _statements_for(connection) -> _ConnectionStatements:
+    backend_pid = connection.get_backend_pid()
+    registry = _registries.get(connection)
+    if registry is None or registry.backend_pid != backend_pid:
+        with _registries_lock:
+            registry = _registries[connection] = _ConnectionStatements(backend_pid)
+    return registry
+
+
+def _prepare(cursor, registry: _ConnectionStatements, query: str) -> Optional[str]:
+    """PREPARE query on the cursor's connection, returning its EXECUTE command or None"""
+    connection = cursor.connection
+    status = connection.get_transaction_status()
+    if status not in (_TRANSACTION_IDLE, _TRANSACTION_INTRANS):
+        return None  # aborted transaction: let the plain query report the error
+
+    rewritten = to_positional(query)
+    if rewritten is None:
+        _unpreparable.add(query)
+        return None
+    positional, count = rewritten
+    name = f"gittensor_{next(_statement_ids)}"
+
+    # A failed PREPARE aborts the transaction, so guard the caller's open one
+    in_transaction = status == _TRANSACTION_INTRANS
+    if in_transaction:
+        cursor.execute("SAVEPOINT gittensor_prepare")
+    try:
+        cursor.execute(f"PREPARE {name} AS {positional}")
+    except Exception as e:
+        if in_transaction:
+            cursor.execute("ROLLBACK TO SAVEPOINT gittensor_prepare")
+        else:
+            connection.rollback()
+        logger.warning(f"Could not prepare query, running it unprepared: {e}")
+        _unpreparable.add(query)
+        return None
+    if in_transaction:
+        cursor.execute("RELEASE SAVEPOINT gittensor_prepare")
+
+    statement = f"EXECUTE {name} ({', '.join(['%s'] * count)})" if count else f"EXECUTE {name}"
+    registry.statements[query] = statement
+    return statement
+
+
+def execute(cursor, query: str, params: tuple = ()) -> None:
+    """
+    cursor.execute(query, params), through a prepared statement if query is enabled
+
+    Args:
+        cursor: psycopg2 cursor
+        query: SQL query string
+        params: Query parameters tuple
+    """
+    if query not in _enabled or query in _unpreparable:
+        cursor.execute(query, params)
+        return
+
+    connection = cursor.connection
+    registry = _statements_for(connection)
+    statement = registry.statements.get(query) or _prepare(cursor, registry, query)
+    if statement is None:
+        cursor.execute(query, params)
+        return
+
+    status = connection.get_transaction_status()
+    try:
+        cursor.execute(statement, params)
+    except Exception as e:
+        if getattr(e, 'pgcode', None) not in _STALE_STATEMENT_CODES:
+            raise
+        registry.statements.pop(query, None)
+        if status != _TRANSACTION_IDLE:
+            raise  # earlier work in the transaction is lost; the next call re-prepares
+        connection.rollback()
+        statement = _prepare(cursor, registry, query)
+        cursor.execute(statement or query, params)
@@ -11,25 +11,38 @@ __all__ = [
     'GET_MINER_BY_HOTKEY',
     'GET_MINER_BY_GITHUB_ID',
     'GET_MINER_BY_HOTKEY_AND_GITHUB_ID',
+    'GET_MINERS_BY_KEYS',
+    'GET_MINERS_BY_UIDS',
+    'GET_MINERS_BY_HOTKEYS',
+    'GET_MINERS_BY_GITHUB_IDS',
+    'GET_MINERS_BY_HOTKEYS_AND_GITHUB_IDS',
     'SET_MINER',
     'UPSERT_MINER',
     'GET_ALL_MINERS',
 
     # Repository queries
     'GET_REPOSITORY',
+    'GET_REPOSITORIES_BY_FULL_NAMES',
     'SET_REPOSITORY',
     'GET_ALL_REPOSITORIES',
 
     # Pull Request queries
     'GET_PULL_REQUEST',
+    'GET_PULL_REQUESTS_BY_KEYS',
     'SET_PULL_REQUEST',
     'GET_PULL_REQUESTS_BY_REPOSITORY',
     'GET_PULL_REQUESTS_BY_MINER',
     'GET_PULL_REQUEST_WITH_FILE_CHANGES',
+    'GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY',
+    'GET_PULL_REQUEST_WITH_FILE_CHANGE_METADATA',
 
     # File Change queries
     'GET_FILE_CHANGE',
     'GET_FILE_CHANGES_BY_PR',
+    'GET_FILE_CHANGES_FOR_PULL_REQUESTS',
+    'GET_FILE_CHANGES_BY_PR_METADATA',
+    'GET_FILE_CHANGES_FOR_PULL_REQUESTS_METADATA',
+    'GET_FILE_CHANGE_PATCHES',
     'SET_FILE_CHANGES_FOR_PR',
 
     # Miner Evaluation queries
@@ -40,6 +53,7 @@ __all__ = [
 
     # Issue queries
     'GET_ISSUE',
+    'GET_ISSUES_BY_KEYS',
     'GET_ISSUES_BY_REPOSITORY',
     'SET_ISSUE',
 
@@ -48,5 +62,64 @@ __all__ = [
     'BULK_UPSERT_REPOSITORIES',
     'BULK_UPSERT_PULL_REQUESTS',
     'BULK_UPSERT_ISSUES',
-    'BULK_UPSERT_FILE_CHANGES'
+    'BULK_UPSERT_FILE_CHANGES',
+    'BULK_UPSERT_CHANGED_PULL_REQUESTS',
+    'BULK_UPSERT_CHANGED_ISSUES',
+    'BULK_UPSERT_CHANGED_FILE_CHANGES',
+    'BULK_INSERT_MINER_EVALUATIONS',
+
+    # Keyset pagination queries
+    'GET_PULL_REQUESTS_BY_REPOSITORY_PAGE',
+    'GET_PULL_REQUESTS_BY_REPOSITORY_NEXT_PAGE',
+    'GET_PULL_REQUESTS_BY_MINER_PAGE',
+    'GET_PULL_REQUESTS_BY_MINER_NEXT_PAGE',
+    'GET_ISSUES_BY_REPOSITORY_PAGE',
+    'GET_ISSUES_BY_REPOSITORY_NEXT_PAGE',
+    'GET_EVALUATIONS_BY_TIMEFRAME_PAGE',
+    'GET_EVALUATIONS_BY_TIMEFRAME_NEXT_PAGE',
+
+    # COPY ingest queries
+    'CREATE_MINERS_STAGING',
+    'COPY_MINERS_STAGING',
+    'INSERT_MINERS_FROM_STAGING',
+    'CREATE_PULL_REQUESTS_STAGING',
+    'COPY_PULL_REQUESTS_STAGING',
+    'INSERT_PULL_REQUESTS_FROM_STAGING',
+    'CREATE_ISSUES_STAGING',
+    'COPY_ISSUES_STAGING',
+    'INSERT_ISSUES_FROM_STAGING',
+    'CREATE_FILE_CHANGES_STAGING',
+    'COPY_FILE_CHANGES_STAGING',
+    'INSERT_FILE_CHANGES_FROM_STAGING',
+    'UPSERT_CHANGED_PULL_REQUESTS_FROM_STAGING',
+    'UPSERT_CHANGED_ISSUES_FROM_STAGING',
+    'UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING',
+
+    # Patch blob queries
+    'GET_EXISTING_PATCH_HASHES',
+    'BULK_INSERT_PATCH_BLOBS',
+    'GET_INLINE_PATCHES',
+    'MOVE_INLINE_PATCHES_TO_BLOBS',
+    'DELETE_ORPHANED_PATCH_BLOBS',
+
+    # Miner aggregate queries
+    'GET_MINER_AGGREGATE',
+    'GET_MINER_AGGREGATES',
+
+    # Ingest watermark queries
+    'GET_INGEST_WATERMARK',
+    'GET_INGEST_WATERMARKS_BY_MINER',
+    'BULK_ADVANCE_INGEST_WATERMARKS',
+    'DELETE_INGEST_WATERMARKS_BY_MINER',
+
+    # Partition maintenance queries
+    'GET_PARTITIONED_TABLE',
+    'GET_PARTITIONS',
+    'GET_PARTITION_CLOCK',
+    'GET_DEFAULT_PARTITION_MONTHS',
+    'CREATE_PARTITION_TABLE',
+    'MOVE_ROWS_FROM_DEFAULT_PARTITION',
+    'ATTACH_PARTITION',
+    'DETACH_PARTITION',
+    'DROP_PARTITION'
 ]
\ No newline at end of file
@@ -29,6 +29,41 @@ FROM miners
 WHERE hotkey = %s AND github_id = %s
 """
 
+# Multi-key lookups: scalar keys are passed as one array, composite keys as parallel arrays
+GET_MINERS_BY_KEYS = """
+SELECT uid, hotkey, github_id, created_at, updated_at
+FROM miners
+WHERE (uid, hotkey, github_id) IN (
+    SELECT * FROM unnest(%s::integer[], %s::varchar[], %s::varchar[])
+)
+"""
+
+GET_MINERS_BY_UIDS = """
+SELECT uid, hotkey, github_id, created_at, updated_at
+FROM miners
+WHERE uid = ANY(%s::integer[])
+"""
+
+GET_MINERS_BY_HOTKEYS = """
+SELECT uid, hotkey, github_id, created_at, updated_at
+FROM miners
+WHERE hotkey = ANY(%s::varchar[])
+"""
+
+GET_MINERS_BY_GITHUB_IDS = """
+SELECT uid, hotkey, github_id, created_at, updated_at
+FROM miners
+WHERE github_id = ANY(%s::varchar[])
+"""
+
+GET_MINERS_BY_HOTKEYS_AND_GITHUB_IDS = """
+SELECT uid, hotkey, github_id, created_at, updated_at
+FROM miners
+WHERE (hotkey, github_id) IN (
+    SELECT * FROM unnest(%s::varchar[], %s::varchar[])
+)
+"""
+
 SET_MINER = """
 INSERT INTO miners (uid, hotkey, github_id)
 VALUES (%s, %s, %s)
@@ -57,6 +92,12 @@ FROM repositories
 WHERE full_name = %s
 """
 
+GET_REPOSITORIES_BY_FULL_NAMES = """
+SELECT full_name, name, owner
+FROM repositories
+WHERE full_name = ANY(%s::varchar[])
+"""
+
 SET_REPOSITORY = """
 INSERT INTO repositories (full_name, name, owner)
 VALUES (%s, %s, %s)
@@ -81,6 +122,18 @@ JOIN repositories r ON pr.repository_full_name = r.full_name
 WHERE pr.number = %s AND pr.repository_full_name = %s
 """
 
+GET_PULL_REQUESTS_BY_KEYS = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+WHERE (pr.number, pr.repository_full_name) IN (
+    SELECT * FROM unnest(%s::integer[], %s::varchar[])
+)
+"""
+
 SET_PULL_REQUEST = """
 INSERT INTO pull_requests (
     number, repository_full_name, uid, hotkey, github_id, earned_score,
@@ -119,31 +172,112 @@ SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
        pr.additions, pr.deletions, pr.commits, pr.author_login,
        pr.merged_by_login, r.name, r.owner,
        fc.filename, fc.changes, fc.additions as file_additions,
-       fc.deletions as file_deletions, fc.status, fc.patch, fc.file_extension
+       fc.deletions as file_deletions, fc.status, fc.patch, fc.file_extension,
+       pb.compression AS patch_compression, pb.data AS patch_data
 FROM pull_requests pr
 JOIN repositories r ON pr.repository_full_name = r.full_name
 LEFT JOIN file_changes fc ON pr.number = fc.pr_number AND pr.repository_full_name = fc.repository_full_name
+LEFT JOIN patch_blobs pb ON pb.hash = fc.patch_hash
 WHERE pr.number = %s AND pr.repository_full_name = %s
 """
 
+GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner,
+       fc.filename, fc.changes, fc.additions as file_additions,
+       fc.deletions as file_deletions, fc.status, fc.patch, fc.file_extension,
+       pb.compression AS patch_compression, pb.data AS patch_data
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+LEFT JOIN file_changes fc ON pr.number = fc.pr_number AND pr.repository_full_name = fc.repository_full_name
+LEFT JOIN patch_blobs pb ON pb.hash = fc.patch_hash
+WHERE pr.repository_full_name = %s
+ORDER BY pr.merged_at DESC, pr.number, fc.filename
+"""
+
+
+# Metadata-only variant: no patch columns, file change ids for lazy patch loading
+GET_PULL_REQUEST_WITH_FILE_CHANGE_METADATA = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner,
+       fc.id as file_change_id, fc.filename, fc.changes, fc.additions as file_additions,
+       fc.deletions as file_deletions, fc.status, fc.file_extension
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+LEFT JOIN file_changes fc ON pr.number = fc.pr_number AND pr.repository_full_name = fc.repository_full_name
+WHERE pr.number = %s AND pr.repository_full_name = %s
+ORDER BY fc.filename
+"""
+
 
 # File Change Queries
+# Patches are read from patch_blobs (see utils/patch_codec.py); fc.patch is only set on
+# rows written before patch_blobs existed
 GET_FILE_CHANGE = """
-SELECT id, pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension, created_at
-FROM file_changes
-WHERE id = %s
+SELECT fc.id, fc.pr_number, fc.repository_full_name, fc.filename, fc.changes, fc.additions, fc.deletions,
+       fc.status, fc.patch, fc.file_extension, fc.created_at,
+       pb.compression AS patch_compression, pb.data AS patch_data
+FROM file_changes fc
+LEFT JOIN patch_blobs pb ON pb.hash = fc.patch_hash
+WHERE fc.id = %s
 """
 
 GET_FILE_CHANGES_BY_PR = """
-SELECT id, pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension, created_at
+SELECT fc.id, fc.pr_number, fc.repository_full_name, fc.filename, fc.changes, fc.additions, fc.deletions,
+       fc.status, fc.patch, fc.file_extension, fc.created_at,
+       pb.compression AS patch_compression, pb.data AS patch_data
+FROM file_changes fc
+LEFT JOIN patch_blobs pb ON pb.hash = fc.patch_hash
+WHERE fc.pr_number = %s AND fc.repository_full_name = %s
+ORDER BY fc.filename
+"""
+
+GET_FILE_CHANGES_FOR_PULL_REQUESTS = """
+SELECT fc.id, fc.pr_number, fc.repository_full_name, fc.filename, fc.changes, fc.additions, fc.deletions,
+       fc.status, fc.patch, fc.file_extension, fc.created_at,
+       pb.compression AS patch_compression, pb.data AS patch_data
+FROM file_changes fc
+LEFT JOIN patch_blobs pb ON pb.hash = fc.patch_hash
+WHERE (fc.pr_number, fc.repository_full_name) IN (
+    SELECT * FROM unnest(%s::integer[], %s::varchar[])
+)
+ORDER BY fc.repository_full_name, fc.pr_number, fc.filename
+"""
+
+# Metadata-only variants: everything but the patch, which is loaded on demand with
+# GET_FILE_CHANGE_PATCHES
+GET_FILE_CHANGES_BY_PR_METADATA = """
+SELECT id, pr_number, repository_full_name, filename, changes, additions, deletions,
+       status, file_extension, created_at
 FROM file_changes
 WHERE pr_number = %s AND repository_full_name = %s
 ORDER BY filename
 """
 
+GET_FILE_CHANGES_FOR_PULL_REQUESTS_METADATA = """
+SELECT id, pr_number, repository_full_name, filename, changes, additions, deletions,
+       status, file_extension, created_at
+FROM file_changes
+WHERE (pr_number, repository_full_name) IN (
+    SELECT * FROM unnest(%s::integer[], %s::varchar[])
+)
+ORDER BY repository_full_name, pr_number, filename
+"""
+
+GET_FILE_CHANGE_PATCHES = """
+SELECT fc.id, fc.patch, pb.compression AS patch_compression, pb.data AS patch_data
+FROM file_changes fc
+LEFT JOIN patch_blobs pb ON pb.hash = fc.patch_hash
+WHERE fc.id = ANY(%s::bigint[])
+"""
+
 SET_FILE_CHANGES_FOR_PR = """
 INSERT INTO file_changes (
-    pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension
+    pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
 ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
 ON CONFLICT (pr_number, repository_full_name, filename)
 DO NOTHING
@@ -164,7 +298,7 @@ SELECT id, uid, hotkey, github_id, failed_reason, total_score,
        unique_repos_count, evaluation_timestamp
 FROM miner_evaluations
 WHERE uid = %s AND hotkey = %s
-ORDER BY evaluation_timestamp DESC NULLS LAST, id DESC
+ORDER BY evaluation_timestamp DESC, id DESC
 LIMIT 1
 """
 
@@ -181,7 +315,7 @@ SELECT id, uid, hotkey, github_id, failed_reason, total_score,
        unique_repos_count, evaluation_timestamp
 FROM miner_evaluations
 WHERE evaluation_timestamp BETWEEN %s AND %s
-ORDER BY evaluation_timestamp DESC, total_score DESC
+ORDER BY evaluation_timestamp DESC, COALESCE(total_score, 0) DESC, id DESC
 """
 
 # Issue Queries
@@ -191,11 +325,19 @@ FROM issues
 WHERE number = %s AND repository_full_name = %s
 """
 
+GET_ISSUES_BY_KEYS = """
+SELECT number, pr_number, repository_full_name, title, created_at, closed_at
+FROM issues
+WHERE (number, repository_full_name) IN (
+    SELECT * FROM unnest(%s::integer[], %s::varchar[])
+)
+"""
+
 GET_ISSUES_BY_REPOSITORY = """
 SELECT number, pr_number, repository_full_name, title, created_at, closed_at
 FROM issues
 WHERE repository_full_name = %s
-ORDER BY created_at DESC
+ORDER BY COALESCE(created_at, 'infinity'::timestamp) DESC, number DESC
 """
 
 SET_ISSUE = """
@@ -243,8 +385,586 @@ DO NOTHING
 
 BULK_UPSERT_FILE_CHANGES = """
 INSERT INTO file_changes (
-    pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension
+    pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
 ) VALUES %s
 ON CONFLICT (pr_number, repository_full_name, filename)
 DO NOTHING
-"""
\ No newline at end of file
+"""
+
+
+# Change-aware upserts: a conflicting row is rewritten only when a value differs, so
+# unchanged rows leave no dead tuples. File changes also drop the legacy inline patch
+# (a row that still has one is rewritten once) so it can't shadow patch_hash. Each statement returns one row counting the
+# inserted and updated rows (xmax = 0 marks a freshly inserted row version).
+BULK_UPSERT_CHANGED_PULL_REQUESTS = """
+WITH upserted AS (
+    INSERT INTO pull_requests (
+        number, repository_full_name, uid, hotkey, github_id, earned_score,
+        title, merged_at, pr_created_at, additions, deletions, commits,
+        author_login, merged_by_login
+    ) VALUES %s
+    ON CONFLICT (number, repository_full_name)
+    DO UPDATE SET
+        uid = EXCLUDED.uid,
+        hotkey = EXCLUDED.hotkey,
+        github_id = EXCLUDED.github_id,
+        earned_score = EXCLUDED.earned_score,
+        title = EXCLUDED.title,
+        merged_at = EXCLUDED.merged_at,
+        pr_created_at = EXCLUDED.pr_created_at,
+        additions = EXCLUDED.additions,
+        deletions = EXCLUDED.deletions,
+        commits = EXCLUDED.commits,
+        author_login = EXCLUDED.author_login,
+        merged_by_login = EXCLUDED.merged_by_login,
+        updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+    WHERE (
+        pull_requests.uid, pull_requests.hotkey, pull_requests.github_id, pull_requests.earned_score,
+        pull_requests.title, pull_requests.merged_at, pull_requests.pr_created_at, pull_requests.additions,
+        pull_requests.deletions, pull_requests.commits, pull_requests.author_login, pull_requests.merged_by_login
+    ) IS DISTINCT FROM (
+        EXCLUDED.uid, EXCLUDED.hotkey, EXCLUDED.github_id, EXCLUDED.earned_score,
+        EXCLUDED.title, EXCLUDED.merged_at, EXCLUDED.pr_created_at, EXCLUDED.additions,
+        EXCLUDED.deletions, EXCLUDED.commits, EXCLUDED.author_login, EXCLUDED.merged_by_login
+    )
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+BULK_UPSERT_CHANGED_ISSUES = """
+WITH upserted AS (
+    INSERT INTO issues (
+        number, pr_number, repository_full_name, title, created_at, closed_at
+    ) VALUES %s
+    ON CONFLICT (number, repository_full_name)
+    DO UPDATE SET
+        pr_number = EXCLUDED.pr_number,
+        title = EXCLUDED.title,
+        created_at = EXCLUDED.created_at,
+        closed_at = EXCLUDED.closed_at,
+        updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+    WHERE (issues.pr_number, issues.title, issues.created_at, issues.closed_at)
+        IS DISTINCT FROM (EXCLUDED.pr_number, EXCLUDED.title, EXCLUDED.created_at, EXCLUDED.closed_at)
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+BULK_UPSERT_CHANGED_FILE_CHANGES = """
+WITH upserted AS (
+    INSERT INTO file_changes (
+        pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
+    ) VALUES %s
+    ON CONFLICT (pr_number, repository_full_name, filename)
+    DO UPDATE SET
+        changes = EXCLUDED.changes,
+        additions = EXCLUDED.additions,
+        deletions = EXCLUDED.deletions,
+        status = EXCLUDED.status,
+        patch_hash = EXCLUDED.patch_hash,
+        patch = NULL,
+        file_extension = EXCLUDED.file_extension,
+        updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+    WHERE file_changes.patch IS NOT NULL OR (
+        file_changes.changes, file_changes.additions, file_changes.deletions,
+        file_changes.status, file_changes.patch_hash, file_changes.file_extension
+    ) IS DISTINCT FROM (
+        EXCLUDED.changes, EXCLUDED.additions, EXCLUDED.deletions,
+        EXCLUDED.status, EXCLUDED.patch_hash, EXCLUDED.file_extension
+    )
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+BULK_INSERT_MINER_EVALUATIONS = """
+INSERT INTO miner_evaluations (
+    uid, hotkey, github_id, failed_reason, total_score,
+    total_lines_changed, total_open_prs, total_prs, unique_repos_count
+) VALUES %s
+"""
+
+
+# Keyset Pagination Queries
+# Each listing has a first-page query and a next-page query that resumes after the
+# ORDER BY key of the previous page's last row. Nullable sort columns are wrapped in
+# COALESCE so row-value comparison is total; the expressions match the indexes in
+# migrations/sql/0007_pagination_indexes.sql.
+GET_PULL_REQUESTS_BY_REPOSITORY_PAGE = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+WHERE pr.repository_full_name = %s
+ORDER BY COALESCE(pr.merged_at, 'infinity'::timestamp) DESC, pr.number DESC
+LIMIT %s
+"""
+
+GET_PULL_REQUESTS_BY_REPOSITORY_NEXT_PAGE = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+WHERE pr.repository_full_name = %s
+  AND (COALESCE(pr.merged_at, 'infinity'::timestamp), pr.number)
+      < (COALESCE(%s::timestamp, 'infinity'::timestamp), %s)
+ORDER BY COALESCE(pr.merged_at, 'infinity'::timestamp) DESC, pr.number DESC
+LIMIT %s
+"""
+
+GET_PULL_REQUESTS_BY_MINER_PAGE = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+WHERE pr.uid = %s AND pr.hotkey = %s AND pr.github_id = %s
+ORDER BY COALESCE(pr.earned_score, 0) DESC, COALESCE(pr.merged_at, 'infinity'::timestamp) DESC,
+         pr.repository_full_name DESC, pr.number DESC
+LIMIT %s
+"""
+
+GET_PULL_REQUESTS_BY_MINER_NEXT_PAGE = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login, r.name, r.owner
+FROM pull_requests pr
+JOIN repositories r ON pr.repository_full_name = r.full_name
+WHERE pr.uid = %s AND pr.hotkey = %s AND pr.github_id = %s
+  AND (COALESCE(pr.earned_score, 0), COALESCE(pr.merged_at, 'infinity'::timestamp),
+       pr.repository_full_name, pr.number)
+      < (COALESCE(%s::numeric, 0), COALESCE(%s::timestamp, 'infinity'::timestamp), %s, %s)
+ORDER BY COALESCE(pr.earned_score, 0) DESC, COALESCE(pr.merged_at, 'infinity'::timestamp) DESC,
+         pr.repository_full_name DESC, pr.number DESC
+LIMIT %s
+"""
+
+GET_ISSUES_BY_REPOSITORY_PAGE = """
+SELECT number, pr_number, repository_full_name, title, created_at, closed_at
+FROM issues
+WHERE repository_full_name = %s
+ORDER BY COALESCE(created_at, 'infinity'::timestamp) DESC, number DESC
+LIMIT %s
+"""
+
+GET_ISSUES_BY_REPOSITORY_NEXT_PAGE = """
+SELECT number, pr_number, repository_full_name, title, created_at, closed_at
+FROM issues
+WHERE repository_full_name = %s
+  AND (COALESCE(created_at, 'infinity'::timestamp), number)
+      < (COALESCE(%s::timestamp, 'infinity'::timestamp), %s)
+ORDER BY COALESCE(created_at, 'infinity'::timestamp) DESC, number DESC
+LIMIT %s
+"""
+
+GET_EVALUATIONS_BY_TIMEFRAME_PAGE = """
+SELECT id, uid, hotkey, github_id, failed_reason, total_score,
+       total_lines_changed, total_open_prs, total_prs,
+       unique_repos_count, evaluation_timestamp
+FROM miner_evaluations
+WHERE evaluation_timestamp BETWEEN %s AND %s
+ORDER BY evaluation_timestamp DESC, COALESCE(total_score, 0) DESC, id DESC
+LIMIT %s
+"""
+
+GET_EVALUATIONS_BY_TIMEFRAME_NEXT_PAGE = """
+SELECT id, uid, hotkey, github_id, failed_reason, total_score,
+       total_lines_changed, total_open_prs, total_prs,
+       unique_repos_count, evaluation_timestamp
+FROM miner_evaluations
+WHERE evaluation_timestamp BETWEEN %s AND %s
+  AND (evaluation_timestamp, COALESCE(total_score, 0), id)
+      < (%s::timestamp, COALESCE(%s::numeric, 0), %s)
+ORDER BY evaluation_timestamp DESC, COALESCE(total_score, 0) DESC, id DESC
+LIMIT %s
+"""
+
+
+# COPY Ingest Queries
+# Rows are streamed into a per-transaction staging table with COPY FROM STDIN and
+# merged with a single INSERT ... SELECT. Timestamps are staged as TIMESTAMPTZ so
+# they are converted exactly as parameter binding would convert them.
+CREATE_MINERS_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS miners_staging (
+    uid       INTEGER,
+    hotkey    TEXT,
+    github_id TEXT
+) ON COMMIT DROP;
+TRUNCATE miners_staging
+"""
+
+COPY_MINERS_STAGING = """
+COPY miners_staging (uid, hotkey, github_id) FROM STDIN
+"""
+
+INSERT_MINERS_FROM_STAGING = """
+INSERT INTO miners (uid, hotkey, github_id)
+SELECT DISTINCT ON (uid, hotkey, github_id) uid, hotkey, github_id
+FROM miners_staging
+ON CONFLICT (uid, hotkey, github_id)
+DO UPDATE SET
+    updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+"""
+
+CREATE_PULL_REQUESTS_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS pull_requests_staging (
+    number               INTEGER,
+    repository_full_name TEXT,
+    uid                  INTEGER,
+    hotkey               TEXT,
+    github_id            TEXT,
+    earned_score         DECIMAL(15,6),
+    title                TEXT,
+    merged_at            TIMESTAMPTZ,
+    pr_created_at        TIMESTAMPTZ,
+    additions            INTEGER,
+    deletions            INTEGER,
+    commits              INTEGER,
+    author_login         TEXT,
+    merged_by_login      TEXT
+) ON COMMIT DROP;
+TRUNCATE pull_requests_staging
+"""
+
+COPY_PULL_REQUESTS_STAGING = """
+COPY pull_requests_staging (
+    number, repository_full_name, uid, hotkey, github_id, earned_score,
+    title, merged_at, pr_created_at, additions, deletions, commits,
+    author_login, merged_by_login
+) FROM STDIN
+"""
+
+INSERT_PULL_REQUESTS_FROM_STAGING = """
+INSERT INTO pull_requests (
+    number, repository_full_name, uid, hotkey, github_id, earned_score,
+    title, merged_at, pr_created_at, additions, deletions, commits,
+    author_login, merged_by_login
+)
+SELECT number, repository_full_name, uid, hotkey, github_id, earned_score,
+       title, merged_at, pr_created_at, additions, deletions, commits,
+       author_login, merged_by_login
+FROM pull_requests_staging
+ON CONFLICT (number, repository_full_name)
+DO NOTHING
+"""
+
+CREATE_ISSUES_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS issues_staging (
+    number               INTEGER,
+    pr_number            INTEGER,
+    repository_full_name TEXT,
+    title                TEXT,
+    created_at           TIMESTAMPTZ,
+    closed_at            TIMESTAMPTZ
+) ON COMMIT DROP;
+TRUNCATE issues_staging
+"""
+
+COPY_ISSUES_STAGING = """
+COPY issues_staging (
+    number, pr_number, repository_full_name, title, created_at, closed_at
+) FROM STDIN
+"""
+
+INSERT_ISSUES_FROM_STAGING = """
+INSERT INTO issues (
+    number, pr_number, repository_full_name, title, created_at, closed_at
+)
+SELECT number, pr_number, repository_full_name, title, created_at, closed_at
+FROM issues_staging
+ON CONFLICT (number, repository_full_name)
+DO NOTHING
+"""
+
+CREATE_FILE_CHANGES_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS file_changes_staging (
+    pr_number            INTEGER,
+    repository_full_name TEXT,
+    filename             TEXT,
+    changes              INTEGER,
+    additions            INTEGER,
+    deletions            INTEGER,
+    status               TEXT,
+    patch_hash           BYTEA,
+    file_extension       TEXT
+) ON COMMIT DROP;
+TRUNCATE file_changes_staging
+"""
+
+COPY_FILE_CHANGES_STAGING = """
+COPY file_changes_staging (
+    pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
+) FROM STDIN
+"""
+
+INSERT_FILE_CHANGES_FROM_STAGING = """
+INSERT INTO file_changes (
+    pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
+)
+SELECT pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
+FROM file_changes_staging
+ON CONFLICT (pr_number, repository_full_name, filename)
+DO NOTHING
+"""
+
+
+# Change-aware upserts from the staging tables (see BULK_UPSERT_CHANGED_*)
+UPSERT_CHANGED_PULL_REQUESTS_FROM_STAGING = """
+WITH upserted AS (
+    INSERT INTO pull_requests (
+        number, repository_full_name, uid, hotkey, github_id, earned_score,
+        title, merged_at, pr_created_at, additions, deletions, commits,
+        author_login, merged_by_login
+    )
+    SELECT number, repository_full_name, uid, hotkey, github_id, earned_score,
+           title, merged_at, pr_created_at, additions, deletions, commits,
+           author_login, merged_by_login
+    FROM pull_requests_staging
+    ON CONFLICT (number, repository_full_name)
+    DO UPDATE SET
+        uid = EXCLUDED.uid,
+        hotkey = EXCLUDED.hotkey,
+        github_id = EXCLUDED.github_id,
+        earned_score = EXCLUDED.earned_score,
+        title = EXCLUDED.title,
+        merged_at = EXCLUDED.merged_at,
+        pr_created_at = EXCLUDED.pr_created_at,
+        additions = EXCLUDED.additions,
+        deletions = EXCLUDED.deletions,
+        commits = EXCLUDED.commits,
+        author_login = EXCLUDED.author_login,
+        merged_by_login = EXCLUDED.merged_by_login,
+        updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+    WHERE (
+        pull_requests.uid, pull_requests.hotkey, pull_requests.github_id, pull_requests.earned_score,
+        pull_requests.title, pull_requests.merged_at, pull_requests.pr_created_at, pull_requests.additions,
+        pull_requests.deletions, pull_requests.commits, pull_requests.author_login, pull_requests.merged_by_login
+    ) IS DISTINCT FROM (
+        EXCLUDED.uid, EXCLUDED.hotkey, EXCLUDED.github_id, EXCLUDED.earned_score,
+        EXCLUDED.title, EXCLUDED.merged_at, EXCLUDED.pr_created_at, EXCLUDED.additions,
+        EXCLUDED.deletions, EXCLUDED.commits, EXCLUDED.author_login, EXCLUDED.merged_by_login
+    )
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+UPSERT_CHANGED_ISSUES_FROM_STAGING = """
+WITH upserted AS (
+    INSERT INTO issues (
+        number, pr_number, repository_full_name, title, created_at, closed_at
+    )
+    SELECT number, pr_number, repository_full_name, title, created_at, closed_at
+    FROM issues_staging
+    ON CONFLICT (number, repository_full_name)
+    DO UPDATE SET
+        pr_number = EXCLUDED.pr_number,
+        title = EXCLUDED.title,
+        created_at = EXCLUDED.created_at,
+        closed_at = EXCLUDED.closed_at,
+        updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+    WHERE (issues.pr_number, issues.title, issues.created_at, issues.closed_at)
+        IS DISTINCT FROM (EXCLUDED.pr_number, EXCLUDED.title, EXCLUDED.created_at, EXCLUDED.closed_at)
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING = """
+WITH upserted AS (
+    INSERT INTO file_changes (
+        pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
+    )
+    SELECT pr_number, repository_full_name, filename, changes, additions, deletions, status, patch_hash, file_extension
+    FROM file_changes_staging
+    ON CONFLICT (pr_number, repository_full_name, filename)
+    DO UPDATE SET
+        changes = EXCLUDED.changes,
+        additions = EXCLUDED.additions,
+        deletions = EXCLUDED.deletions,
+        status = EXCLUDED.status,
+        patch_hash = EXCLUDED.patch_hash,
+        patch = NULL,
+        file_extension = EXCLUDED.file_extension,
+        updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+    WHERE file_changes.patch IS NOT NULL OR (
+        file_changes.changes, file_changes.additions, file_changes.deletions,
+        file_changes.status, file_changes.patch_hash, file_changes.file_extension
+    ) IS DISTINCT FROM (
+        EXCLUDED.changes, EXCLUDED.additions, EXCLUDED.deletions,
+        EXCLUDED.status, EXCLUDED.patch_hash, EXCLUDED.file_extension
+    )
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+       COUNT(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+# Patch Blob Queries
+# Locks the blobs a write reuses so delete_orphaned_patch_blobs can't remove them
+# before the file_changes rows referencing them commit
+GET_EXISTING_PATCH_HASHES = """
+SELECT hash
+FROM patch_blobs
+WHERE hash = ANY(%s::bytea[])
+FOR KEY SHARE
+"""
+
+BULK_INSERT_PATCH_BLOBS = """
+INSERT INTO patch_blobs (hash, compression, size, data)
+VALUES %s
+ON CONFLICT (hash)
+DO NOTHING
+"""
+
+GET_INLINE_PATCHES = """
+SELECT id, patch
+FROM file_changes
+WHERE patch IS NOT NULL AND patch_hash IS NULL
+ORDER BY id
+LIMIT %s
+FOR UPDATE SKIP LOCKED
+"""
+
+MOVE_INLINE_PATCHES_TO_BLOBS = """
+UPDATE file_changes fc
+SET patch_hash = v.patch_hash, patch = NULL
+FROM (SELECT * FROM unnest(%s::bigint[], %s::bytea[])) AS v(id, patch_hash)
+WHERE fc.id = v.id
+"""
+
+DELETE_ORPHANED_PATCH_BLOBS = """
+DELETE FROM patch_blobs pb
+WHERE NOT EXISTS (SELECT 1 FROM file_changes fc WHERE fc.patch_hash = pb.hash)
+"""
+
+
+# Miner Aggregate Queries
+# Per-miner totals computed by the database, matching MinerEvaluation.calculate_metric_totals
+# and calculate_score_total over the miner's pull requests, so only one row per miner is returned
+GET_MINER_AGGREGATE = """
+SELECT pr.uid, pr.hotkey, pr.github_id,
+       COUNT(*) AS pr_count,
+       SUM(COALESCE(pr.additions, 0) + COALESCE(pr.deletions, 0)) AS total_lines_changed,
+       COUNT(DISTINCT pr.repository_full_name) AS unique_repos_count,
+       SUM(COALESCE(pr.earned_score, 0)) AS total_score
+FROM pull_requests pr
+WHERE pr.uid = %s AND pr.hotkey = %s AND pr.github_id = %s
+GROUP BY pr.uid, pr.hotkey, pr.github_id
+"""
+
+GET_MINER_AGGREGATES = """
+SELECT pr.uid, pr.hotkey, pr.github_id,
+       COUNT(*) AS pr_count,
+       SUM(COALESCE(pr.additions, 0) + COALESCE(pr.deletions, 0)) AS total_lines_changed,
+       COUNT(DISTINCT pr.repository_full_name) AS unique_repos_count,
+       SUM(COALESCE(pr.earned_score, 0)) AS total_score
+FROM pull_requests pr
+GROUP BY pr.uid, pr.hotkey, pr.github_id
+ORDER BY pr.uid, pr.hotkey, pr.github_id
+"""
+
+# Ingest Watermark Queries
+# Watermarks only move forward: an upsert older than the stored (merged_at, number) is ignored
+GET_INGEST_WATERMARK = """
+SELECT uid, hotkey, github_id, repository_full_name, last_merged_at, last_pr_number
+FROM ingest_watermarks
+WHERE uid = %s AND hotkey = %s AND github_id = %s AND repository_full_name = %s
+"""
+
+GET_INGEST_WATERMARKS_BY_MINER = """
+SELECT uid, hotkey, github_id, repository_full_name, last_merged_at, last_pr_number
+FROM ingest_watermarks
+WHERE uid = %s AND hotkey = %s AND github_id = %s
+"""
+
+BULK_ADVANCE_INGEST_WATERMARKS = """
+INSERT INTO ingest_watermarks (
+    uid, hotkey, github_id, repository_full_name, last_merged_at, last_pr_number
+) VALUES %s
+ON CONFLICT (uid, hotkey, github_id, repository_full_name)
+DO UPDATE SET
+    last_merged_at = EXCLUDED.last_merged_at,
+    last_pr_number = EXCLUDED.last_pr_number,
+    updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+WHERE (EXCLUDED.last_merged_at, EXCLUDED.last_pr_number)
+    > (ingest_watermarks.last_merged_at, ingest_watermarks.last_pr_number)
+"""
+
+DELETE_INGEST_WATERMARKS_BY_MINER = """
+DELETE FROM ingest_watermarks
+WHERE uid = %s AND hotkey = %s AND github_id = %s
+"""
+
+# Partition Maintenance Queries
+# Time-partitioned tables have one partition per month plus a DEFAULT partition. The
+# DDL templates take identifiers through psycopg2.sql ({table}, {partition}, {default},
+# {column}) and bound values through %s.
+GET_PARTITIONED_TABLE = """
+SELECT relkind = 'p' AS partitioned
+FROM pg_class
+WHERE oid = to_regclass(%s)
+"""
+
+GET_PARTITIONS = """
+SELECT c.relname AS partition_name,
+       pg_get_expr(c.relpartbound, c.oid) AS partition_bound
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = to_regclass(%s)
+ORDER BY c.relname
+"""
+
+GET_PARTITION_CLOCK = """
+SELECT (CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago') AS now
+"""
+
+GET_DEFAULT_PARTITION_MONTHS = """
+SELECT DISTINCT date_trunc('month', {column}) AS month
+FROM {default}
+WHERE {column} IS NOT NULL
+"""
+
+CREATE_PARTITION_TABLE = """
+CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+"""
+
+MOVE_ROWS_FROM_DEFAULT_PARTITION = """
+WITH moved AS (
+    DELETE FROM {default}
+    WHERE {column} >= %s AND {column} < %s
+    RETURNING *
+)
+INSERT INTO {partition}
+SELECT * FROM moved
+"""
+
+ATTACH_PARTITION = """
+ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM (%s) TO (%s)
+"""
+
+DETACH_PARTITION = """
+ALTER TABLE {table} DETACH PARTITION {partition}
+"""
+
+DROP_PARTITION = """
+DROP TABLE IF EXISTS {partition}
+"""
@@ -1,21 +1,59 @@
 """
 Repository package exports
+
+Repositories are imported on first access so importing one does not load them all.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'BaseRepository': '.base_repository',
+    'UpsertCounts': '.base_repository',
+    'MinersRepository': '.miners_repository',
+    'RepositoriesRepository': '.repositories_repository',
+    'PullRequestsRepository': '.pull_requests_repository',
+    'FileChangesRepository': '.file_changes_repository',
+    'MinerEvaluationsRepository': '.miner_evaluations_repository',
+    'IssuesRepository': '.issues_repository',
+    'EvaluationUnitOfWork': '.evaluation_unit_of_work',
+    'IngestPipeline': '.ingest_pipeline',
+    'WatermarksRepository': '.watermarks_repository',
+    'CachedMinersRepository': '.cached_repositories',
+    'CachedRepositoriesRepository': '.cached_repositories',
+    'PartitionsRepository': '.partitions_repository',
+    'Page': '.pagination',
+    'InvalidPageTokenError': '.pagination',
+    'DEFAULT_PAGE_SIZE': '.pagination'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
-from .base_repository import BaseRepository
-from .miners_repository import MinersRepository
-from .repositories_repository import RepositoriesRepository
-from .pull_requests_repository import PullRequestsRepository
-from .file_changes_repository import FileChangesRepository
-from .miner_evaluations_repository import MinerEvaluationsRepository
-from .issues_repository import IssuesRepository
-
-__all__ = [
-    'BaseRepository',
-    'MinersRepository',
-    'RepositoriesRepository',
-    'PullRequestsRepository',
-    'FileChangesRepository',
-    'MinerEvaluationsRepository',
-    'IssuesRepository'
-]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .base_repository import BaseRepository, UpsertCounts
+    from .miners_repository import MinersRepository
+    from .repositories_repository import RepositoriesRepository
+    from .pull_requests_repository import PullRequestsRepository
+    from .file_changes_repository import FileChangesRepository
+    from .miner_evaluations_repository import MinerEvaluationsRepository
+    from .issues_repository import IssuesRepository
+    from .evaluation_unit_of_work import EvaluationUnitOfWork
+    from .ingest_pipeline import IngestPipeline
+    from .watermarks_repository import WatermarksRepository
+    from .cached_repositories import CachedMinersRepository, CachedRepositoriesRepository
+    from .partitions_repository import PartitionsRepository
+    from .pagination import Page, InvalidPageTokenError, DEFAULT_PAGE_SIZE
\ No newline at end of file
@@ -5,11 +5,77 @@ This class implements a clean abstraction layer for database operations, elimina
 redundant cursor management and error handling code across repository classes.
 """
 
-from typing import Optional, List, Dict, Any, TypeVar, Callable
+from typing import Optional, List, Dict, Any, TypeVar, Callable, Iterator, Iterable, Hashable, Tuple
 from contextlib import contextmanager
+from dataclasses import dataclass
+import itertools
 import logging
 
+from .. import prepared_statements
+from ..connection.pool import ConnectionPool
+from ..instrumentation import (
+    instrument,
+    map_rows,
+    record_rows,
+    OPERATION_BULK,
+    OPERATION_COMMAND,
+    OPERATION_SELECT,
+    OPERATION_STREAM,
+)
+from ..utils.copy_stream import CopyRowStream
+from .pagination import Page, decode_page_token, encode_page_token, MAX_PAGE_SIZE
+from .row_mapping import as_dict, as_dicts, resolve_mapper
+
 T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
+
+# Rows fetched per network round trip by server-side streaming cursors
+DEFAULT_ITERSIZE = 2000
+
+_stream_cursor_ids = itertools.count(1)
+
+# Bulk write strategies accepted by the store_*_bulk methods
+BULK_METHOD_VALUES = 'values'  # multi-row INSERT ... VALUES via execute_values
+BULK_METHOD_COPY = 'copy'      # COPY FROM STDIN into a staging table, then INSERT ... SELECT
+BULK_METHODS = (BULK_METHOD_VALUES, BULK_METHOD_COPY)
+
+# Bytes handed to the server per COPY data message
+COPY_READ_SIZE = 64 * 1024
+
+# Keys sent per query by the batched multi-key lookups (query_many / query_grouped)
+LOOKUP_BATCH_SIZE = 1000
+
+
+@dataclass
+class UpsertCounts:
+    """Outcome of a change-aware bulk upsert (the upsert_*_bulk methods)"""
+    inserted: int = 0   # new rows
+    updated: int = 0    # existing rows whose values changed
+    unchanged: int = 0  # existing rows left as they were (not rewritten)
+
+    @property
+    def written(self) -> int:
+        """Rows inserted or rewritten"""
+        return self.inserted + self.updated
+
+    def __add__(self, other: 'UpsertCounts') -> 'UpsertCounts':
+        return UpsertCounts(
+            self.inserted + other.inserted, self.updated + other.updated, self.unchanged + other.unchanged
+        )
+
+
+def unique_rows(values: List[tuple], key_width: int) -> List[tuple]:
+    """
+    values with one row per key (the first key_width columns), keeping the last one
+
+    An ON CONFLICT DO UPDATE statement may not touch the same row twice.
+    """
+    return list({row[:key_width]: row for row in values}.values())
+
+
+def _as_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return row
+
 
 class BaseRepository:
     """
@@ -18,20 +84,55 @@ class BaseRepository:
     """
 
     def __init__(self, db_connection):
+        """
+        Args:
+            db_connection: A database connection, or a ConnectionPool to borrow
+                a connection from for each operation
+        """
         self.db = db_connection
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    @contextmanager
+    def connection(self):
+        """
+        Context manager yielding the connection to use for one operation.
+        Pooled connections are returned to the pool when the block exits.
+        """
+        if isinstance(self.db, ConnectionPool):
+            with self.db.connection() as connection:
+                yield connection
+        else:
+            yield self.db
+
     @contextmanager
     def get_cursor(self):
         """
         Context manager for database cursor operations.
         Automatically handles cursor cleanup.
         """
-        cursor = self.db.cursor()
-        try:
-            yield cursor
-        finally:
-            cursor.close()
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager yielding a cursor whose work is committed when the block
+        exits cleanly and rolled back (then re-raised) on error.
+        """
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield cursor
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
 
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -45,9 +146,22 @@ class BaseRepository:
         Returns:
             List of result dictionaries
         """
+        with instrument(query, OPERATION_SELECT) as event:
+            return self._fetch_all(query, params, event)
+
+    def _fetch_all(self, query: str, params: tuple, event) -> List[Dict[str, Any]]:
+        """Run query and fetch all rows as dicts, recording them on an instrumentation event if there is one"""
+        rows, description = self._fetch_rows(query, params, event)
+        return as_dicts(description, rows)
+
+    def _fetch_rows(self, query: str, params: tuple, event) -> Tuple[List[Any], Any]:
+        """Run query and fetch all rows as the cursor returns them (tuples or dicts), with cursor.description"""
         with self.get_cursor() as cursor:
-            cursor.execute(query, params)
-            return cursor.fetchall()
+            prepared_statements.execute(cursor, query, params)
+            rows = cursor.fetchall()
+            description = cursor.description
+        record_rows(event, rows)
+        return rows, description
 
     def execute_single_query(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
         """
@@ -61,9 +175,13 @@ class BaseRepository:
         Returns:
             Single result dictionary or None
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(query, params)
-            return cursor.fetchone()
+        with instrument(query, OPERATION_SELECT) as event:
+            with self.get_cursor() as cursor:
+                prepared_statements.execute(cursor, query, params)
+                row = as_dict(cursor.description, cursor.fetchone())
+            if row is not None:
+                record_rows(event, (row,))
+            return row
 
     def execute_command(self, query: str, params: tuple = ()) -> bool:
         """
@@ -77,15 +195,139 @@ class BaseRepository:
             True if successful, False otherwise
         """
         try:
-            with self.get_cursor() as cursor:
-                cursor.execute(query, params)
-                self.db.commit()
-                return True
+            with instrument(query, OPERATION_COMMAND) as event:
+                with self.transaction() as cursor:
+                    prepared_statements.execute(cursor, query, params)
+                    if event is not None:
+                        event.rows = cursor.rowcount
+            return True
         except Exception as e:
-            self.db.rollback()
             self.logger.error(f"Error executing command: {e}")
             return False
 
+    def iter_query(self, query: str, params: tuple = (), itersize: int = DEFAULT_ITERSIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query through a named server-side cursor and yield rows lazily.
+
+        Only itersize rows are held client-side at a time, so memory stays flat
+        regardless of result size. The connection is held until the iterator is
+        exhausted or closed, and committing on that connection mid-iteration
+        invalidates the cursor.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            itersize: Rows fetched from the server per round trip
+
+        Yields:
+            Result rows (as dicts)
+        """
+        return self._stream(query, params, itersize, _as_row)
+
+    def _stream(self, query: str, params: tuple, itersize: int, mapper: Callable[[Dict[str, Any]], T]) -> Iterator[T]:
+        """Map the rows of a named server-side cursor lazily (see iter_query)"""
+        # The reported duration spans the whole iteration, including the consumer's work
+        with instrument(query, OPERATION_STREAM) as event, self.connection() as connection:
+            cursor = connection.cursor(name=f"gittensor_stream_{next(_stream_cursor_ids)}")
+            cursor.itersize = itersize
+            try:
+                cursor.execute(query, params)
+                row_mapper = None
+                for row in cursor:
+                    record_rows(event, (row,))
+                    if row_mapper is None:
+                        row_mapper = resolve_mapper(mapper, cursor.description, row)
+                    yield row_mapper(row)
+            finally:
+                cursor.close()
+
+    def execute_bulk(
+        self,
+        cursor,
+        values: List[tuple],
+        values_query: str,
+        staging_queries: Optional[tuple] = None,
+        method: str = BULK_METHOD_VALUES
+    ) -> None:
+        """
+        Write rows in bulk on an open cursor using the selected strategy.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            values: Row tuples to write
+            values_query: INSERT ... VALUES %s query used by execute_values
+            staging_queries: (create staging, COPY into staging, INSERT from staging)
+                queries used by the COPY strategy
+            method: BULK_METHOD_VALUES or BULK_METHOD_COPY
+        """
+        if method not in BULK_METHODS:
+            raise ValueError(f"Unknown bulk method {method!r}, expected one of {BULK_METHODS}")
+
+        with instrument(values_query, OPERATION_BULK) as event:
+            if method == BULK_METHOD_COPY:
+                if staging_queries is None:
+                    raise ValueError("COPY bulk method requires staging queries")
+                create_staging, copy_staging, insert_from_staging = staging_queries
+                cursor.execute(create_staging)
+                cursor.copy_expert(copy_staging, CopyRowStream(values), size=COPY_READ_SIZE)
+                cursor.execute(insert_from_staging)
+            else:
+                # Use psycopg2's execute_values for efficient bulk insert
+                from psycopg2.extras import execute_values
+                execute_values(cursor, values_query, values, template=None, page_size=100)
+            if event is not None:
+                event.rows = len(values)
+
+    def execute_bulk_upsert(
+        self,
+        cursor,
+        values: List[tuple],
+        values_query: str,
+        staging_queries: Optional[tuple] = None,
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Write rows with a change-aware upsert on an open cursor and count what happened.
+
+        The queries (BULK_UPSERT_CHANGED_* and UPSERT_CHANGED_*_FROM_STAGING) return one
+        (inserted, updated) row per statement; rows that were neither are unchanged.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            values: Row tuples to write, at most one per conflict key (see unique_rows)
+            values_query: WITH upserted AS (INSERT ... VALUES %s ...) query used by execute_values
+            staging_queries: (create staging, COPY into staging, upsert from staging)
+                queries used by the COPY strategy
+            method: BULK_METHOD_VALUES or BULK_METHOD_COPY
+
+        Returns:
+            UpsertCounts for the rows
+        """
+        if method not in BULK_METHODS:
+            raise ValueError(f"Unknown bulk method {method!r}, expected one of {BULK_METHODS}")
+
+        counts = UpsertCounts()
+        with instrument(values_query, OPERATION_BULK) as event:
+            if method == BULK_METHOD_COPY:
+                if staging_queries is None:
+                    raise ValueError("COPY bulk method requires staging queries")
+                create_staging, copy_staging, upsert_from_staging = staging_queries
+                cursor.execute(create_staging)
+                cursor.copy_expert(copy_staging, CopyRowStream(values), size=COPY_READ_SIZE)
+                cursor.execute(upsert_from_staging)
+                rows = [cursor.fetchone()]
+            else:
+                from psycopg2.extras import execute_values
+                rows = execute_values(cursor, values_query, values, template=None, page_size=100, fetch=True)
+
+            for row in as_dicts(cursor.description, rows):
+                counts.inserted += row['inserted']
+                counts.updated += row['updated']
+            counts.unchanged = len(values) - counts.written
+            if event is not None:
+                event.rows = counts.written
+        return counts
+
     def query_single(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T]) -> Optional[T]:
         """
         Execute query and map single result to domain object.
@@ -98,10 +340,15 @@ class BaseRepository:
         Returns:
             Mapped domain object or None
         """
-        result = self.execute_single_query(query, params)
-        if result:
-            return mapper(result)
-        return None
+        with instrument(query, OPERATION_SELECT) as event:
+            with self.get_cursor() as cursor:
+                prepared_statements.execute(cursor, query, params)
+                result = cursor.fetchone()
+                description = cursor.description
+            if result:
+                record_rows(event, (result,))
+                return map_rows(event, (result,), resolve_mapper(mapper, description, result))[0]
+            return None
 
     def query_multiple(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T]) -> List[T]:
         """
@@ -115,8 +362,162 @@ class BaseRepository:
         Returns:
             List of mapped domain objects
         """
-        results = self.execute_query(query, params)
-        return [mapper(result) for result in results]
+        with instrument(query, OPERATION_SELECT) as event:
+            results, description = self._fetch_rows(query, params, event)
+            if not results:
+                return []
+            return map_rows(event, results, resolve_mapper(mapper, description, results[0]))
+
+    def _iter_lookup_rows(self, query: str, keys: List[K], batch_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Run a multi-key lookup query once per batch of keys and yield its rows.
+
+        Scalar keys are passed as one array parameter (for "= ANY(%s)"); tuple keys are
+        transposed into one array per component (for "IN (SELECT * FROM unnest(...))").
+        """
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            if isinstance(batch[0], tuple):
+                params = tuple(list(column) for column in zip(*batch))
+            else:
+                params = (batch,)
+            yield from self.execute_query(query, params)
+
+    def query_many(
+        self,
+        query: str,
+        keys: Iterable[K],
+        row_key: Callable[[Dict[str, Any]], K],
+        mapper: Callable[[Dict[str, Any]], T],
+        batch_size: int = LOOKUP_BATCH_SIZE
+    ) -> Dict[K, Optional[T]]:
+        """
+        Look up one domain object per key with one query per batch of keys.
+
+        Args:
+            query: SQL query taking the keys as array parameters
+            keys: Keys to look up (duplicates are fetched once)
+            row_key: Function extracting the lookup key from a result row
+            mapper: Function to map result dict to domain object
+            batch_size: Keys per query
+
+        Returns:
+            Mapped domain object per input key, None for keys that were not found.
+            If several rows share a key the first one returned wins, like query_single.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        results: Dict[K, Optional[T]] = dict.fromkeys(unique_keys)
+        for row in self._iter_lookup_rows(query, unique_keys, batch_size):
+            key = row_key(row)
+            if key in results and results[key] is None:
+                results[key] = mapper(row)
+        return results
+
+    def query_grouped(
+        self,
+        query: str,
+        keys: Iterable[K],
+        row_key: Callable[[Dict[str, Any]], K],
+        mapper: Callable[[Dict[str, Any]], T],
+        batch_size: int = LOOKUP_BATCH_SIZE
+    ) -> Dict[K, List[T]]:
+        """
+        Look up all domain objects belonging to each key with one query per batch of keys.
+
+        Args:
+            query: SQL query taking the keys as array parameters
+            keys: Keys to look up (duplicates are fetched once)
+            row_key: Function extracting the lookup key from a result row
+            mapper: Function to map result dict to domain object
+            batch_size: Keys per query
+
+        Returns:
+            Mapped domain objects per input key in query order, an empty list for keys without rows
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        results: Dict[K, List[T]] = {key: [] for key in unique_keys}
+        for row in self._iter_lookup_rows(query, unique_keys, batch_size):
+            key = row_key(row)
+            if key in results:
+                results[key].append(mapper(row))
+        return results
+
+    def stream_multiple(
+        self,
+        query: str,
+        params: tuple,
+        mapper: Callable[[Dict[str, Any]], T],
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> Iterator[T]:
+        """
+        Execute query through a server-side cursor and lazily map each row.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            mapper: Function to map result dict to domain object
+            itersize: Rows fetched from the server per round trip
+
+        Yields:
+            Mapped domain objects
+        """
+        return self._stream(query, params, itersize, mapper)
+
+    def query_page(
+        self,
+        first_page_query: str,
+        next_page_query: str,
+        params: tuple,
+        key_columns: tuple,
+        mapper: Callable[[Dict[str, Any]], T],
+        page_size: int,
+        page_token: Optional[str] = None
+    ) -> Page[T]:
+        """
+        Execute a keyset-paginated query and map one page of results.
+
+        Both queries take params followed by LIMIT; next_page_query additionally takes
+        the key of the last row of the previous page (between params and LIMIT) and
+        must only return rows strictly after it in ORDER BY order.
+
+        Args:
+            first_page_query: Query for the first page
+            next_page_query: Query for pages after a page token
+            params: Filter parameters shared by both queries
+            key_columns: Result columns forming the ORDER BY key, in order
+            mapper: Function to map result dict to domain object
+            page_size: Maximum number of items per page
+            page_token: Token from the previous page, or None for the first page
+
+        Returns:
+            Page of mapped domain objects with the token for the next page
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+        # Token scope ties a token to the listing that issued it
+        scope = f"{self.__class__.__name__}:{key_columns}"
+        if page_token is None:
+            query = first_page_query
+            query_params = params + (page_size + 1,)
+        else:
+            key = decode_page_token(page_token, scope, len(key_columns))
+            query = next_page_query
+            query_params = params + tuple(key) + (page_size + 1,)
+
+        with instrument(query, OPERATION_SELECT) as event:
+            rows, description = self._fetch_rows(query, query_params, event)
+
+            # One extra row tells us whether another page exists without a COUNT query
+            next_page_token = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                last_row = as_dict(description, rows[-1])
+                next_page_token = encode_page_token(scope, [last_row[column] for column in key_columns])
+
+            if rows:
+                mapper = resolve_mapper(mapper, description, rows[0])
+            return Page(items=map_rows(event, rows, mapper), next_page_token=next_page_token)
 
     def set_entity(self, query: str, params: tuple) -> bool:
         """
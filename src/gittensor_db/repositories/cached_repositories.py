@@ -0,0 +1,183 @@
+"""
+Opt-in read-through caching for the miner and repository lookups that are hit on
+every scoring pass but almost never change within a tempo.
+
+Use CachedMinersRepository / CachedRepositoriesRepository in place of the plain
+repositories. Writes made through the cached instance invalidate the affected
+entries; writes made elsewhere (another process, another repository instance)
+become visible once the entry's TTL expires.
+"""
+import copy
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from ..models.domain_models import Miner, Repository
+from ..utils.cache import MISSING, CacheStats, TTLCache
+from .base_repository import BULK_METHOD_VALUES
+from .miners_repository import MinersRepository
+from .repositories_repository import RepositoriesRepository
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_TTL = 300.0  # seconds
+
+
+class _ReadThroughCacheMixin:
+    """Shared read-through helpers; the cache stores copies so callers can't mutate cached objects"""
+
+    cache: TTLCache
+
+    def _cached(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        value = self.cache.get(key)
+        if value is MISSING:
+            value = load()
+            self.cache.set(key, copy.copy(value))
+            return value
+        return copy.copy(value)
+
+    def _cached_many(self, namespace: str, keys: Iterable[Hashable], load: Callable[[List[Hashable]], Dict]) -> Dict:
+        results = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.cache.get((namespace, key))
+            if value is MISSING:
+                missing.append(key)
+            else:
+                results[key] = copy.copy(value)
+        if missing:
+            for key, value in load(missing).items():
+                self.cache.set((namespace, key), copy.copy(value))
+                results[key] = value
+        return results
+
+    def cache_stats(self) -> CacheStats:
+        """Return hit, miss and eviction counters for this repository's cache"""
+        return self.cache.stats()
+
+    def clear_cache(self) -> None:
+        """Drop all cached entries"""
+        self.cache.clear()
+
+
+class CachedMinersRepository(_ReadThroughCacheMixin, MinersRepository):
+    """MinersRepository with an LRU+TTL cache in front of the uid, hotkey and GitHub ID lookups"""
+
+    def __init__(
+        self,
+        db_connection,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        cache: Optional[TTLCache] = None
+    ):
+        """
+        Args:
+            db_connection: A database connection or ConnectionPool
+            maxsize: Maximum number of cached lookups
+            ttl: Seconds a cached lookup stays valid
+            cache: Existing cache to use instead of creating one (e.g. to share it between instances)
+        """
+        super().__init__(db_connection)
+        self.cache = cache if cache is not None else TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _invalidate_miners(self, miners: Iterable[Miner]) -> None:
+        """Drop every cached lookup a write of these miners could have changed"""
+        keys = []
+        for miner in miners:
+            keys.extend((('uid', int(miner.uid)), ('hotkey', miner.hotkey), ('github_id', miner.github_id)))
+        self.cache.invalidate(keys)
+
+    def get_miner_by_uid(self, uid: int) -> Optional[Miner]:
+        uid = int(uid)
+        return self._cached(('uid', uid), lambda: super(CachedMinersRepository, self).get_miner_by_uid(uid))
+
+    def get_miner_by_hotkey(self, hotkey: str) -> Optional[Miner]:
+        return self._cached(('hotkey', hotkey), lambda: super(CachedMinersRepository, self).get_miner_by_hotkey(hotkey))
+
+    def get_miner_by_github_id(self, github_id: str) -> Optional[Miner]:
+        return self._cached(
+            ('github_id', github_id), lambda: super(CachedMinersRepository, self).get_miner_by_github_id(github_id)
+        )
+
+    def get_miners_by_uids(self, uids: Iterable[int]) -> Dict[int, Optional[Miner]]:
+        return self._cached_many('uid', [int(uid) for uid in uids], super().get_miners_by_uids)
+
+    def get_miners_by_hotkeys(self, hotkeys: Iterable[str]) -> Dict[str, Optional[Miner]]:
+        return self._cached_many('hotkey', hotkeys, super().get_miners_by_hotkeys)
+
+    def get_miners_by_github_ids(self, github_ids: Iterable[str]) -> Dict[str, Optional[Miner]]:
+        return self._cached_many('github_id', github_ids, super().get_miners_by_github_ids)
+
+    def set_miner(self, miner: Miner) -> bool:
+        try:
+            return super().set_miner(miner)
+        finally:
+            self._invalidate_miners([miner])
+
+    def upsert_miner(self, miner: Miner) -> bool:
+        try:
+            return super().upsert_miner(miner)
+        finally:
+            self._invalidate_miners([miner])
+
+    def store_miners_bulk(self, miners: List[Miner], method: str = BULK_METHOD_VALUES) -> int:
+        try:
+            return super().store_miners_bulk(miners, method)
+        finally:
+            self._invalidate_miners(miners)
+
+    def write_miners_bulk(self, cursor, miners: List[Miner], method: str = BULK_METHOD_VALUES) -> int:
+        # Invalidated again after commit by store_miners_bulk; callers running their own
+        # transaction should call clear_cache() if a concurrent reader may have refilled it
+        try:
+            return super().write_miners_bulk(cursor, miners, method)
+        finally:
+            self._invalidate_miners(miners)
+
+
+class CachedRepositoriesRepository(_ReadThroughCacheMixin, RepositoriesRepository):
+    """RepositoriesRepository with an LRU+TTL cache in front of the full name lookups"""
+
+    def __init__(
+        self,
+        db_connection,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        cache: Optional[TTLCache] = None
+    ):
+        """
+        Args:
+            db_connection: A database connection or ConnectionPool
+            maxsize: Maximum number of cached lookups
+            ttl: Seconds a cached lookup stays valid
+            cache: Existing cache to use instead of creating one (e.g. to share it between instances)
+        """
+        super().__init__(db_connection)
+        self.cache = cache if cache is not None else TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _invalidate_repositories(self, repository_full_names: Iterable[str]) -> None:
+        self.cache.invalidate([('full_name', full_name) for full_name in repository_full_names])
+
+    def get_repository(self, repository_full_name: str) -> Optional[Repository]:
+        return self._cached(
+            ('full_name', repository_full_name),
+            lambda: super(CachedRepositoriesRepository, self).get_repository(repository_full_name)
+        )
+
+    def get_repositories(self, repository_full_names: Iterable[str]) -> Dict[str, Optional[Repository]]:
+        return self._cached_many('full_name', repository_full_names, super().get_repositories)
+
+    def set_repository(self, repository: Repository) -> bool:
+        try:
+            return super().set_repository(repository)
+        finally:
+            self._invalidate_repositories([repository.full_name])
+
+    def store_repositories_bulk(self, repository_full_names: Set[str]) -> int:
+        try:
+            return super().store_repositories_bulk(repository_full_names)
+        finally:
+            self._invalidate_repositories(repository_full_names)
+
+    def write_repositories_bulk(self, cursor, repository_full_names: Set[str]) -> int:
+        try:
+            return super().write_repositories_bulk(cursor, repository_full_names)
+        finally:
+            self._invalidate_repositories(repository_full_names)
@@ -0,0 +1,97 @@
+"""
+Unit of work that persists complete miner evaluations in a single transaction
+"""
+from typing import Dict, List, Set
+from ..models.domain_models import Miner, MinerEvaluation, PullRequest, Issue, FileChange
+from .base_repository import BaseRepository, BULK_METHOD_VALUES
+from .miners_repository import MinersRepository
+from .repositories_repository import RepositoriesRepository
+from .pull_requests_repository import PullRequestsRepository
+from .issues_repository import IssuesRepository
+from .file_changes_repository import FileChangesRepository
+from .miner_evaluations_repository import MinerEvaluationsRepository
+
+# Tables in foreign key order, as reported by EvaluationUnitOfWork.store_evaluations
+EVALUATION_TABLES = (
+    'miners',
+    'repositories',
+    'pull_requests',
+    'issues',
+    'file_changes',
+    'miner_evaluations',
+)
+
+
+class EvaluationUnitOfWork(BaseRepository):
+    """
+    Stores miner evaluations together with their nested pull requests, issues and
+    file changes using one transaction and one commit.
+    """
+
+    def __init__(self, db_connection):
+        super().__init__(db_connection)
+        self.miners = MinersRepository(db_connection)
+        self.repositories = RepositoriesRepository(db_connection)
+        self.pull_requests = PullRequestsRepository(db_connection)
+        self.issues = IssuesRepository(db_connection)
+        self.file_changes = FileChangesRepository(db_connection)
+        self.evaluations = MinerEvaluationsRepository(db_connection)
+
+    def _collect_miners(self, evaluations: List[MinerEvaluation]) -> List[Miner]:
+        """Distinct miners referenced by the evaluations and their pull requests"""
+        miners: Dict[tuple, Miner] = {}
+        for evaluation in evaluations:
+            miners.setdefault(
+                (evaluation.uid, evaluation.hotkey, evaluation.github_id),
+                Miner(uid=evaluation.uid, hotkey=evaluation.hotkey, github_id=evaluation.github_id)
+            )
+            for pr in evaluation.pull_requests:
+                miners.setdefault(
+                    (pr.uid, pr.hotkey, pr.github_id),
+                    Miner(uid=pr.uid, hotkey=pr.hotkey, github_id=pr.github_id)
+                )
+        return list(miners.values())
+
+    def store_evaluations(self, evaluations: List[MinerEvaluation], method: str = BULK_METHOD_VALUES) -> Dict[str, int]:
+        """
+        Persist evaluations and everything nested under them atomically.
+
+        Miners and repositories are derived from the evaluations and their pull
+        requests, then rows are written in foreign key order (miners, repositories,
+        pull_requests, issues, file_changes, miner_evaluations) and committed once.
+        Either the whole batch is stored or none of it is.
+
+        Args:
+            evaluations: MinerEvaluation objects with nested PullRequests, Issues and FileChanges
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+                for the miners, pull request, issue and file change writes
+
+        Returns:
+            Count of rows written per table (all zero if the transaction failed)
+        """
+        counts = {table: 0 for table in EVALUATION_TABLES}
+        if not evaluations:
+            return counts
+
+        miners = self._collect_miners(evaluations)
+        pull_requests: List[PullRequest] = [pr for evaluation in evaluations for pr in evaluation.pull_requests]
+        repository_full_names: Set[str] = {pr.repository_full_name for pr in pull_requests}
+        issues: List[Issue] = [issue for pr in pull_requests for issue in (pr.issues or [])]
+        file_changes: List[FileChange] = [
+            file_change for pr in pull_requests for file_change in (pr.file_changes or [])
+        ]
+
+        try:
+            with self.transaction() as cursor:
+                written = {
+                    'miners': self.miners.write_miners_bulk(cursor, miners, method),
+                    'repositories': self.repositories.write_repositories_bulk(cursor, repository_full_names),
+                    'pull_requests': self.pull_requests.write_pull_requests_bulk(cursor, pull_requests, method),
+                    'issues': self.issues.write_issues_bulk(cursor, issues, method),
+                    'file_changes': self.file_changes.write_file_changes_bulk(cursor, file_changes, method),
+                    'miner_evaluations': self.evaluations.write_miner_evaluations_bulk(cursor, evaluations),
+                }
+            return written
+        except Exception as e:
+            self.logger.error(f"Error storing {len(evaluations)} miner evaluations: {e}")
+            return counts
@@ -1,21 +1,101 @@
 """
 Repository for handling database operations for FileChange entities
+
+Patches are stored compressed and deduplicated in patch_blobs (see
+utils/patch_codec.py); FileChange.patch is always the plain text. Reads with
+metadata_only=True skip the patches and return LazyFileChanges, whose patches are
+fetched per pull request the first time one of them is read.
 """
-from typing import Optional, List, Dict, Any
-from ..models.domain_models import FileChange
-from .base_repository import BaseRepository
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
+from ..models.domain_models import FileChange, LazyFileChange
+from ..models.batches import FileChangeBatch
+from ..utils.patch_codec import compress_patch, patch_from_columns, patch_from_row, patch_hash
+from .base_repository import BaseRepository, BULK_METHOD_VALUES, LOOKUP_BATCH_SIZE, UpsertCounts, unique_rows
+from .row_mapping import RowMapper, as_dicts, column, uses_row_mapper
+from .. import prepared_statements
+from ..instrumentation import instrument, OPERATION_COMMAND
 from ..queries import (
     GET_FILE_CHANGE,
     GET_FILE_CHANGES_BY_PR,
+    GET_FILE_CHANGES_FOR_PULL_REQUESTS,
+    GET_FILE_CHANGES_BY_PR_METADATA,
+    GET_FILE_CHANGES_FOR_PULL_REQUESTS_METADATA,
+    GET_FILE_CHANGE_PATCHES,
     SET_FILE_CHANGES_FOR_PR,
-    BULK_UPSERT_FILE_CHANGES
+    BULK_UPSERT_FILE_CHANGES,
+    BULK_UPSERT_CHANGED_FILE_CHANGES,
+    CREATE_FILE_CHANGES_STAGING,
+    COPY_FILE_CHANGES_STAGING,
+    INSERT_FILE_CHANGES_FROM_STAGING,
+    UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING,
+    GET_EXISTING_PATCH_HASHES,
+    BULK_INSERT_PATCH_BLOBS,
+    GET_INLINE_PATCHES,
+    MOVE_INLINE_PATCHES_TO_BLOBS,
+    DELETE_ORPHANED_PATCH_BLOBS
+)
+
+# Legacy inline patches moved to patch_blobs per transaction by backfill_patch_blobs
+BACKFILL_BATCH_SIZE = 500
+
+_FILE_CHANGE_COLUMNS = (
+    'pr_number',
+    'repository_full_name',
+    'filename',
+    'changes',
+    'additions',
+    'deletions',
+    'status',
 )
+FILE_CHANGE_ROW = RowMapper(
+    FileChange,
+    *_FILE_CHANGE_COLUMNS,
+    column('patch', 'patch_compression', 'patch_data', 'patch', convert=patch_from_columns, default=None),
+    column('file_extension', default=None),
+    column('id', default=None)
+)
+LAZY_FILE_CHANGE_ROW = RowMapper(
+    LazyFileChange,
+    *_FILE_CHANGE_COLUMNS,
+    column('file_extension', default=None),
+    column('id', default=None)
+)
+
+
+class PatchBatchLoader:
+    """
+    Loads the patches of a group of LazyFileChanges (one pull request's) with a
+    single query the first time any of them is read
+    """
+
+    def __init__(self, repository: 'FileChangesRepository'):
+        self.repository = repository
+        self.pending: Dict[int, LazyFileChange] = {}
+
+    def attach(self, file_changes: List[LazyFileChange]) -> List[LazyFileChange]:
+        """Make this loader responsible for the patches of file_changes"""
+        for file_change in file_changes:
+            file_change._patch_loader = self
+            self.pending[file_change.id] = file_change
+        return file_changes
+
+    def load(self) -> None:
+        """Fetch every outstanding patch; on failure they stay pending and read as None"""
+        if not self.pending:
+            return
+        patches = self.repository.get_patches(list(self.pending))
+        if patches is None:
+            return
+        pending, self.pending = self.pending, {}
+        for file_change_id, file_change in pending.items():
+            file_change.patch = patches.get(file_change_id)
 
 
 class FileChangesRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
+    @uses_row_mapper(FILE_CHANGE_ROW)
     def _map_to_file_change(self, row: Dict[str, Any]) -> FileChange:
         """Map database row to FileChange object"""
         return FileChange(
@@ -26,11 +106,118 @@ class FileChangesRepository(BaseRepository):
             additions=row['additions'],
             deletions=row['deletions'],
             status=row['status'],
-            patch=row['patch'],
+            patch=patch_from_row(row),
+            file_extension=row.get('file_extension'),
+            id=row.get('id')
+        )
+
+    @uses_row_mapper(LAZY_FILE_CHANGE_ROW)
+    def _map_to_lazy_file_change(self, row: Dict[str, Any]) -> LazyFileChange:
+        """Map a metadata-only database row to a LazyFileChange (patch_loader attached later)"""
+        return LazyFileChange(
+            pr_number=row['pr_number'],
+            repository_full_name=row['repository_full_name'],
+            filename=row['filename'],
+            changes=row['changes'],
+            additions=row['additions'],
+            deletions=row['deletions'],
+            status=row['status'],
             file_extension=row.get('file_extension'),
             id=row.get('id')
         )
 
+    def lazy_patches(self, file_changes: List[LazyFileChange]) -> List[LazyFileChange]:
+        """Attach one PatchBatchLoader to file_changes so their patches load together"""
+        return PatchBatchLoader(self).attach(file_changes)
+
+    def _file_change_params(
+        self,
+        pr_number: int,
+        repository_full_name: str,
+        file_change: FileChange,
+        patches: Dict[bytes, bytes]
+    ) -> tuple:
+        """
+        Build the insert parameter tuple for a FileChange belonging to the given PR,
+        adding its patch to patches (hash -> UTF-8 bytes) for _patch_blob_rows
+        """
+        blob_hash = None
+        if file_change.patch is not None:
+            blob_hash, raw = patch_hash(file_change.patch)
+            patches.setdefault(blob_hash, raw)
+        return (
+            pr_number,
+            repository_full_name,
+            file_change.filename,
+            file_change.changes,
+            file_change.additions,
+            file_change.deletions,
+            file_change.status,
+            blob_hash,
+            file_change.file_extension or file_change._calculate_file_extension()
+        )
+
+    def _bulk_params(
+        self,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        patches: Dict[bytes, bytes]
+    ) -> List[tuple]:
+        """Insert parameter tuples for a list or batch of file changes, collecting their patches"""
+        if not isinstance(file_changes, FileChangeBatch):
+            return [
+                self._file_change_params(file_change.pr_number, file_change.repository_full_name, file_change, patches)
+                for file_change in file_changes
+            ]
+
+        values = []
+        for row in file_changes.iter_values():
+            patch = row[7]
+            if patch is not None:
+                blob_hash, raw = patch_hash(patch)
+                patches.setdefault(blob_hash, raw)
+                row = row[:7] + (blob_hash, row[8])
+            values.append(row)
+        return values
+
+    @staticmethod
+    def _patch_blob_rows(patches: Dict[bytes, bytes], existing: Iterable[Any] = ()) -> List[tuple]:
+        """
+        Compress the patches not already stored, as (hash, compression, size, data) rows
+        ordered by hash so concurrent writers lock blobs in the same order
+        """
+        stored = {bytes(blob_hash) for blob_hash in existing}
+        rows = []
+        for blob_hash in sorted(patches):
+            if blob_hash in stored:
+                continue
+            raw = patches[blob_hash]
+            compression, data = compress_patch(raw)
+            rows.append((blob_hash, compression, len(raw), data))
+        return rows
+
+    def write_patch_blobs(self, cursor, patches: Dict[bytes, bytes]) -> int:
+        """
+        Store the patches that patch_blobs doesn't have yet, on an open cursor.
+        Patches already present are neither compressed nor sent again; they stay
+        locked (FOR KEY SHARE) until the transaction ends, so they can't be deleted
+        as orphans before the rows referencing them commit.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            patches: Patch hash -> UTF-8 patch bytes
+
+        Returns:
+            Count of blobs sent for insertion
+        """
+        if not patches:
+            return 0
+        cursor.execute(GET_EXISTING_PATCH_HASHES, (list(patches),))
+        existing = as_dicts(cursor.description, cursor.fetchall())
+        rows = self._patch_blob_rows(patches, (row['hash'] for row in existing))
+        if rows:
+            self.execute_bulk(cursor, rows, BULK_INSERT_PATCH_BLOBS)
+        return len(rows)
+
     def get_file_change(self, file_change_id: int) -> Optional[FileChange]:
         """
         Get a file change by its ID
@@ -43,19 +230,121 @@ class FileChangesRepository(BaseRepository):
         """
         return self.query_single(GET_FILE_CHANGE, (file_change_id,), self._map_to_file_change)
 
-    def get_file_changes_by_pr(self, pr_number: int, repository_full_name: str) -> List[FileChange]:
+    def get_file_changes_by_pr(
+        self,
+        pr_number: int,
+        repository_full_name: str,
+        metadata_only: bool = False
+    ) -> List[FileChange]:
         """
         Get all file changes for a specific pull request
 
         Args:
             pr_number: Pull request number
             repository_full_name: Repository full name
+            metadata_only: Skip the patches; they are loaded for the whole PR on first access
 
         Returns:
-            List of FileChange objects
+            List of FileChange objects (LazyFileChange if metadata_only)
         """
+        if metadata_only:
+            return self.lazy_patches(self.query_multiple(
+                GET_FILE_CHANGES_BY_PR_METADATA, (pr_number, repository_full_name), self._map_to_lazy_file_change
+            ))
         return self.query_multiple(GET_FILE_CHANGES_BY_PR, (pr_number, repository_full_name), self._map_to_file_change)
 
+    def get_file_changes_for_pull_requests(
+        self,
+        pr_keys: Iterable[Tuple[int, str]],
+        batch_size: int = LOOKUP_BATCH_SIZE,
+        metadata_only: bool = False
+    ) -> Dict[Tuple[int, str], List[FileChange]]:
+        """
+        Get the file changes of many pull requests with one query per batch of PRs
+
+        Args:
+            pr_keys: (pr_number, repository_full_name) pairs
+            batch_size: Pull requests per query
+            metadata_only: Skip the patches; each PR's are loaded together on first access
+
+        Returns:
+            File changes ordered by filename per input (pr_number, repository_full_name),
+            an empty list for pull requests without file changes
+        """
+        if not metadata_only:
+            return self.query_grouped(
+                GET_FILE_CHANGES_FOR_PULL_REQUESTS,
+                pr_keys,
+                lambda row: (row['pr_number'], row['repository_full_name']),
+                self._map_to_file_change,
+                batch_size
+            )
+
+        grouped = self.query_grouped(
+            GET_FILE_CHANGES_FOR_PULL_REQUESTS_METADATA,
+            pr_keys,
+            lambda row: (row['pr_number'], row['repository_full_name']),
+            self._map_to_lazy_file_change,
+            batch_size
+        )
+        for file_changes in grouped.values():
+            self.lazy_patches(file_changes)
+        return grouped
+
+    def get_file_change_batch(
+        self,
+        pr_keys: Iterable[Tuple[int, str]],
+        batch_size: int = LOOKUP_BATCH_SIZE,
+        include_patches: bool = True
+    ) -> FileChangeBatch:
+        """
+        Get the file changes of many pull requests as one columnar FileChangeBatch,
+        without building a FileChange per row
+
+        Args:
+            pr_keys: (pr_number, repository_full_name) pairs
+            batch_size: Pull requests per query
+            include_patches: Fetch patches too (None in the batch otherwise)
+
+        Returns:
+            FileChangeBatch ordered by repository, PR number and filename
+        """
+        query = GET_FILE_CHANGES_FOR_PULL_REQUESTS if include_patches else GET_FILE_CHANGES_FOR_PULL_REQUESTS_METADATA
+        batch = FileChangeBatch()
+        for row in self._iter_lookup_rows(query, list(dict.fromkeys(pr_keys)), batch_size):
+            batch.append_row(
+                row['pr_number'],
+                row['repository_full_name'],
+                row['filename'],
+                row['changes'],
+                row['additions'],
+                row['deletions'],
+                row['status'],
+                patch_from_row(row) if include_patches else None,
+                row['file_extension'],
+                row['id']
+            )
+        return batch
+
+    def get_patches(self, file_change_ids: List[int]) -> Optional[Dict[int, Optional[str]]]:
+        """
+        Get the patch text of file changes by ID
+
+        Args:
+            file_change_ids: Primary keys of the file changes
+
+        Returns:
+            Mapping of ID to patch (None for file changes without one), or None on error
+        """
+        if not file_change_ids:
+            return {}
+        try:
+            rows = self.execute_query(GET_FILE_CHANGE_PATCHES, (file_change_ids,))
+        except Exception as e:
+            self.logger.error(f"Error loading patches for {len(file_change_ids)} file changes: {e}")
+            return None
+        return {row['id']: patch_from_row(row) for row in rows}
+
     def set_file_changes_for_pr(self, pr_number: int, repository_full_name: str, file_changes: List[FileChange]) -> bool:
         """
         Set file changes for a specific pull request.
@@ -77,25 +366,19 @@ class FileChangesRepository(BaseRepository):
         query = SET_FILE_CHANGES_FOR_PR
 
         try:
-            with self.get_cursor() as cursor:
-                for file_change in file_changes:
-                    params = (
-                        pr_number,
-                        repository_full_name,
-                        file_change.filename,
-                        file_change.changes,
-                        file_change.additions,
-                        file_change.deletions,
-                        file_change.status,
-                        file_change.patch,
-                        file_change.file_extension or file_change._calculate_file_extension()
-                    )
-                    cursor.execute(query, params)
-
-                self.db.commit()
-                return True
+            patches = {}
+            rows = [
+                self._file_change_params(pr_number, repository_full_name, file_change, patches)
+                for file_change in file_changes
+            ]
+            with instrument(query, OPERATION_COMMAND) as event, self.transaction() as cursor:
+                self.write_patch_blobs(cursor, patches)
+                for params in rows:
+                    prepared_statements.execute(cursor, query, params)
+                if event is not None:
+                    event.rows = len(file_changes)
+            return True
         except Exception as e:
-            self.db.rollback()
             self.logger.error(f"Error storing file changes for PR {pr_number} in {repository_full_name}: {e}")
             return False
 
@@ -113,12 +396,17 @@ class FileChangesRepository(BaseRepository):
         """
         return self.set_file_changes_for_pr(pr_number, repository_full_name, [file_change])
 
-    def store_file_changes_bulk(self, file_changes: List[FileChange]) -> int:
+    def store_file_changes_bulk(
+        self,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> int:
         """
         Bulk insert/update file changes with efficient SQL conflict resolution
 
         Args:
-            file_changes: List of FileChange objects to store (must include pr_number and repository_full_name)
+            file_changes: FileChange objects or a FileChangeBatch to store (must include pr_number and repository_full_name)
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
 
         Returns:
             Count of successfully stored file changes
@@ -126,35 +414,156 @@ class FileChangesRepository(BaseRepository):
         if not file_changes:
             return 0
 
+        try:
+            with self.transaction() as cursor:
+                return self.write_file_changes_bulk(cursor, file_changes, method)
+        except Exception as e:
+            self.logger.error(f"Error in bulk file change storage: {e}")
+            return 0
+
+    def write_file_changes_bulk(
+        self,
+        cursor,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> int:
+        """
+        Write file changes on an open cursor without committing, so callers can combine
+        several bulk writes into one transaction.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            file_changes: FileChange objects or a FileChangeBatch to store (must include pr_number and repository_full_name)
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of written file changes
+        """
+        if not file_changes:
+            return 0
+
         # Prepare data for bulk insert
-        values = []
-        for file_change in file_changes:
-            values.append((
-                file_change.pr_number,
-                file_change.repository_full_name,
-                file_change.filename,
-                file_change.changes,
-                file_change.additions,
-                file_change.deletions,
-                file_change.status,
-                file_change.patch,
-                file_change.file_extension or file_change._calculate_file_extension()
-            ))
+        patches = {}
+        values = self._bulk_params(file_changes, patches)
+
+        self.write_patch_blobs(cursor, patches)
+        self.execute_bulk(
+            cursor,
+            values,
+            BULK_UPSERT_FILE_CHANGES,
+            (CREATE_FILE_CHANGES_STAGING, COPY_FILE_CHANGES_STAGING, INSERT_FILE_CHANGES_FROM_STAGING),
+            method
+        )
+        return len(values)
+
+    def upsert_file_changes_bulk(
+        self,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Bulk insert file changes and update stored ones whose values or patch changed,
+        leaving identical rows untouched
+
+        Args:
+            file_changes: FileChange objects or a FileChangeBatch to store (must include pr_number and repository_full_name)
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (all zero if the transaction failed)
+        """
+        if not file_changes:
+            return UpsertCounts()
 
         try:
-            with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_FILE_CHANGES.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
-                self.db.commit()
-                return len(values)
+            with self.transaction() as cursor:
+                return self.write_file_changes_upsert(cursor, file_changes, method)
         except Exception as e:
-            self.db.rollback()
-            self.logger.error(f"Error in bulk file change storage: {e}")
-            return 0
\ No newline at end of file
+            self.logger.error(f"Error in bulk file change upsert: {e}")
+            return UpsertCounts()
+
+    def write_file_changes_upsert(
+        self,
+        cursor,
+        file_changes: Union[List[FileChange], FileChangeBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Change-aware upsert of file changes on an open cursor without committing
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            file_changes: FileChange objects or a FileChangeBatch to store (must include pr_number and repository_full_name)
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (a file given twice for a pull request counts once, with its last values)
+        """
+        if not file_changes:
+            return UpsertCounts()
+
+        # Key is (pr_number, repository_full_name, filename)
+        patches = {}
+        values = unique_rows(self._bulk_params(file_changes, patches), 3)
+
+        self.write_patch_blobs(cursor, patches)
+        return self.execute_bulk_upsert(
+            cursor,
+            values,
+            BULK_UPSERT_CHANGED_FILE_CHANGES,
+            (CREATE_FILE_CHANGES_STAGING, COPY_FILE_CHANGES_STAGING, UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING),
+            method
+        )
+
+    def backfill_patch_blobs(self, batch_size: int = BACKFILL_BATCH_SIZE, max_batches: Optional[int] = None) -> int:
+        """
+        Move patches stored inline in file_changes.patch (rows written before
+        patch_blobs existed) into patch_blobs, one committed batch at a time
+
+        Args:
+            batch_size: Rows moved per transaction
+            max_batches: Stop after this many batches (None runs until no inline patches remain)
+
+        Returns:
+            Count of file changes moved
+        """
+        moved = 0
+        batches = 0
+        try:
+            while max_batches is None or batches < max_batches:
+                with self.transaction() as cursor:
+                    cursor.execute(GET_INLINE_PATCHES, (batch_size,))
+                    rows = as_dicts(cursor.description, cursor.fetchall())
+                    if not rows:
+                        break
+                    patches = {}
+                    ids, hashes = [], []
+                    for row in rows:
+                        blob_hash, raw = patch_hash(row['patch'])
+                        patches.setdefault(blob_hash, raw)
+                        ids.append(row['id'])
+                        hashes.append(blob_hash)
+                    self.write_patch_blobs(cursor, patches)
+                    cursor.execute(MOVE_INLINE_PATCHES_TO_BLOBS, (ids, hashes))
+                moved += len(rows)
+                batches += 1
+        except Exception as e:
+            self.logger.error(f"Error moving inline patches to patch_blobs after {moved} rows: {e}")
+        return moved
+
+    def delete_orphaned_patch_blobs(self) -> int:
+        """
+        Delete patch blobs no file change references any more
+
+        Returns:
+            Count of blobs deleted
+        """
+        try:
+            with instrument(DELETE_ORPHANED_PATCH_BLOBS, OPERATION_COMMAND) as event, self.transaction() as cursor:
+                cursor.execute(DELETE_ORPHANED_PATCH_BLOBS)
+                if event is not None:
+                    event.rows = cursor.rowcount
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"Error deleting orphaned patch blobs: {e}")
+            return 0
@@ -0,0 +1,419 @@
+"""
+Streaming ingest of GitHub API pages with bounded memory
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..models.domain_models import Miner, PullRequest, Issue, FileChange, IngestWatermark
+from .base_repository import BaseRepository, BULK_METHOD_VALUES
+from .miners_repository import MinersRepository
+from .repositories_repository import RepositoriesRepository
+from .pull_requests_repository import PullRequestsRepository
+from .issues_repository import IssuesRepository
+from .file_changes_repository import FileChangesRepository
+from .watermarks_repository import WatermarksRepository, advance_watermark
+
+# Tables in foreign key order, as reported by IngestPipeline.flush
+INGEST_TABLES = (
+    'miners',
+    'repositories',
+    'pull_requests',
+    'issues',
+    'file_changes',
+)
+
+DEFAULT_INGEST_MAX_ROWS = 5000            # buffered rows per table before a flush
+DEFAULT_INGEST_MAX_BYTES = 32 * 1024 * 1024  # approximate buffered bytes, all tables, before a flush
+
+# Rough per-row cost of the fixed-width columns and object overhead
+_ROW_OVERHEAD_BYTES = 128
+
+
+def page_nodes(page: Union[List[Any], Dict[str, Any]]) -> List[Any]:
+    """
+    Nodes of one GitHub API page
+
+    Args:
+        page: A list of nodes (REST pages, e.g. /pulls/{number}/files), a connection
+            ({'nodes': [...]}) or a full GraphQL response; the first 'nodes' list
+            found depth first is used
+
+    Returns:
+        The page's nodes (empty if there are none)
+    """
+    if isinstance(page, list):
+        return page
+    if not isinstance(page, dict):
+        return []
+    nodes = page.get('nodes')
+    if isinstance(nodes, list):
+        return nodes
+    for value in page.values():
+        if isinstance(value, dict):
+            nodes = page_nodes(value)
+            if nodes:
+                return nodes
+    return []
+
+
+def iter_pull_requests(pages: Iterable[Any], uid: int, hotkey: str, github_id: str) -> Iterator[PullRequest]:
+    """
+    Parse GraphQL pull request pages lazily, one node at a time
+
+    Args:
+        pages: GraphQL pages (see page_nodes), e.g. a generator fetching them
+        uid, hotkey, github_id: Miner the pull requests belong to
+
+    Yields:
+        PullRequest objects with their closing issues
+    """
+    for page in pages:
+        for pr_data in page_nodes(page):
+            yield PullRequest.from_graphql_response(pr_data, uid, hotkey, github_id)
+
+
+def iter_file_changes(pages: Iterable[Any], pr_number: int, repository_full_name: str) -> Iterator[FileChange]:
+    """
+    Parse pull request file pages (GET /pulls/{number}/files) lazily
+
+    Args:
+        pages: File pages (see page_nodes), e.g. a generator fetching them
+        pr_number: Pull request the files belong to
+        repository_full_name: Repository of the pull request
+
+    Yields:
+        FileChange objects
+    """
+    for page in pages:
+        for file_diff in page_nodes(page):
+            yield FileChange.from_github_response(pr_number, repository_full_name, file_diff)
+
+
+def _text_bytes(*values: Optional[str]) -> int:
+    return _ROW_OVERHEAD_BYTES + sum(len(value) for value in values if value)
+
+
+class IngestPipeline(BaseRepository):
+    """
+    Writes streamed pull requests, issues and file changes in bounded batches.
+
+    Rows are buffered per table and the buffers are flushed together, in foreign key
+    order and in one transaction, as soon as any table holds max_rows rows or all of
+    them hold about max_bytes. Adding rows blocks while a flush runs and pages are
+    only pulled from the iterables as they are parsed, so a producer fetching pages
+    lazily (a generator) is held back until the database has caught up and memory
+    stays at about one page plus the buffers however much is ingested. A pull request
+    is buffered together with all of its issues and file changes before the budget is
+    checked, so they go out in the same flush.
+
+    When a flush fails, issues and file changes of its pull requests that are added
+    later are dropped and counted in failed, rather than breaking the next flush on
+    their foreign key.
+
+    With skip_ingested, pull requests at or below the miner's watermark in their
+    repository (see WatermarksRepository) are dropped before buffering, together with
+    their issues and file changes, and counted in skipped. Watermarks are advanced on
+    close for the repositories whose rows were all written.
+
+        with IngestPipeline(db) as pipeline:
+            for miner in miners:
+                pipeline.ingest_pull_request_pages(
+                    fetch_pr_pages(miner), miner.uid, miner.hotkey, miner.github_id,
+                    file_pages=fetch_file_pages,  # only called for pull requests not yet ingested
+                )
+        pipeline.written, pipeline.skipped  # rows per table
+    """
+
+    def __init__(
+        self,
+        db_connection,
+        max_rows: int = DEFAULT_INGEST_MAX_ROWS,
+        max_bytes: int = DEFAULT_INGEST_MAX_BYTES,
+        method: str = BULK_METHOD_VALUES,
+        skip_ingested: bool = True
+    ):
+        """
+        Args:
+            db_connection: Connection or ConnectionPool
+            max_rows: Rows buffered per table before a flush
+            max_bytes: Approximate bytes buffered across all tables before a flush
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+                for the miner, pull request, issue and file change writes
+            skip_ingested: Skip pull requests covered by the stored ingest watermarks
+        """
+        super().__init__(db_connection)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.method = method
+        self.skip_ingested = skip_ingested
+        self.miners = MinersRepository(db_connection)
+        self.repositories = RepositoriesRepository(db_connection)
+        self.pull_requests = PullRequestsRepository(db_connection)
+        self.issues = IssuesRepository(db_connection)
+        self.file_changes = FileChangesRepository(db_connection)
+        self.watermarks = WatermarksRepository(db_connection)
+
+        # Keyed by primary key, so a row seen twice before a flush is written once (last wins)
+        self._miners: Dict[Tuple, Miner] = {}
+        self._repositories: set = set()
+        self._pull_requests: Dict[Tuple, PullRequest] = {}
+        self._issues: Dict[Tuple, Issue] = {}
+        self._file_changes: Dict[Tuple, FileChange] = {}
+        self._buffered_bytes = 0
+        # Parents already written, so they aren't sent again every flush
+        self._stored_miners: set = set()
+        self._stored_repositories: set = set()
+        # Stored watermarks per miner (loaded on first use), and the newest pull requests written
+        self._miner_watermarks: Dict[Tuple, Dict[str, IngestWatermark]] = {}
+        self._written_watermarks: Dict[Tuple, IngestWatermark] = {}
+        self._failed_repositories: set = set()
+        # (number, repository_full_name) of pull requests lost in a failed flush
+        self._failed_pull_requests: set = set()
+
+        self.written: Dict[str, int] = {table: 0 for table in INGEST_TABLES}
+        self.failed: Dict[str, int] = {table: 0 for table in INGEST_TABLES}
+        self.skipped: Dict[str, int] = {'pull_requests': 0, 'issues': 0, 'file_changes': 0}
+        self.watermarks_advanced = 0
+        self.flush_count = 0
+        self.peak_buffered_bytes = 0
+
+    def __enter__(self) -> 'IngestPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+    @property
+    def buffered_rows(self) -> Dict[str, int]:
+        """Rows waiting for the next flush, per table"""
+        return {
+            'miners': len(self._miners),
+            'repositories': len(self._repositories),
+            'pull_requests': len(self._pull_requests),
+            'issues': len(self._issues),
+            'file_changes': len(self._file_changes),
+        }
+
+    def ingest_pull_request_pages(
+        self,
+        pages: Iterable[Any],
+        uid: int,
+        hotkey: str,
+        github_id: str,
+        file_pages: Optional[Callable[[PullRequest], Iterable[Any]]] = None
+    ) -> int:
+        """
+        Parse and buffer a miner's GraphQL pull request pages (see iter_pull_requests)
+
+        Args:
+            pages: GraphQL pull request pages
+            uid, hotkey, github_id: Miner the pull requests belong to
+            file_pages: Returns the file pages of a pull request (see iter_file_changes);
+                called only for pull requests that are buffered, not skipped
+
+        Returns:
+            Count of pull requests read
+        """
+        return self.add_pull_requests(iter_pull_requests(pages, uid, hotkey, github_id), file_pages)
+
+    def ingest_file_change_pages(self, pages: Iterable[Any], pr_number: int, repository_full_name: str) -> int:
+        """
+        Parse and buffer a pull request's file pages (see iter_file_changes)
+
+        The pull request must already be stored or added to this pipeline.
+
+        Returns:
+            Count of file changes read
+        """
+        return self.add_file_changes(iter_file_changes(pages, pr_number, repository_full_name))
+
+    def add_pull_requests(
+        self,
+        pull_requests: Iterable[PullRequest],
+        file_pages: Optional[Callable[[PullRequest], Iterable[Any]]] = None
+    ) -> int:
+        """
+        Buffer pull requests with their miners, repositories, issues and file changes
+
+        Args:
+            pull_requests: PullRequest objects, consumed lazily
+            file_pages: Returns the file pages of a pull request (see ingest_pull_request_pages)
+
+        Returns:
+            Count of pull requests read
+        """
+        count = 0
+        for pr in pull_requests:
+            count += 1
+            if self.skip_ingested and self._is_ingested(pr):
+                self.skipped['pull_requests'] += 1
+                self.skipped['issues'] += len(pr.issues or ())
+                self.skipped['file_changes'] += len(pr.file_changes or ())
+                continue
+
+            miner_key = (pr.uid, pr.hotkey, pr.github_id)
+            if miner_key not in self._stored_miners and miner_key not in self._miners:
+                self._miners[miner_key] = Miner(uid=pr.uid, hotkey=pr.hotkey, github_id=pr.github_id)
+                self._buffered_bytes += _text_bytes(pr.hotkey, pr.github_id)
+            if pr.repository_full_name not in self._stored_repositories and pr.repository_full_name not in self._repositories:
+                self._repositories.add(pr.repository_full_name)
+                self._buffered_bytes += _text_bytes(pr.repository_full_name)
+
+            self._pull_requests[(pr.number, pr.repository_full_name)] = pr
+            self._buffered_bytes += _text_bytes(
+                pr.repository_full_name, pr.hotkey, pr.github_id, pr.title, pr.author_login, pr.merged_by_login
+            )
+            for issue in pr.issues or ():
+                self._add_issue(issue)
+            for file_change in pr.file_changes or ():
+                self._add_file_change(file_change)
+            if file_pages is not None:
+                for file_change in iter_file_changes(file_pages(pr), pr.number, pr.repository_full_name):
+                    self._add_file_change(file_change)
+            self._flush_if_full()
+        return count
+
+    def add_file_changes(self, file_changes: Iterable[FileChange]) -> int:
+        """
+        Buffer file changes of pull requests already stored or added to this pipeline
+
+        Args:
+            file_changes: FileChange objects, consumed lazily
+
+        Returns:
+            Count of file changes read
+        """
+        count = 0
+        for file_change in file_changes:
+            self._add_file_change(file_change)
+            count += 1
+            self._flush_if_full()
+        return count
+
+    def _is_ingested(self, pr: PullRequest) -> bool:
+        """Whether pr is covered by its miner's stored watermark in its repository"""
+        miner_key = (pr.uid, pr.hotkey, pr.github_id)
+        watermarks = self._miner_watermarks.get(miner_key)
+        if watermarks is None:
+            watermarks = self._miner_watermarks[miner_key] = self.watermarks.get_watermarks(*miner_key)
+        watermark = watermarks.get(pr.repository_full_name)
+        return watermark is not None and watermark.covers(pr)
+
+    def _add_issue(self, issue: Issue) -> None:
+        self._issues[(issue.number, issue.repository_full_name)] = issue
+        self._buffered_bytes += _text_bytes(issue.repository_full_name, issue.title)
+
+    def _add_file_change(self, file_change: FileChange) -> None:
+        self._file_changes[(file_change.pr_number, file_change.repository_full_name, file_change.filename)] = file_change
+        self._buffered_bytes += _text_bytes(file_change.repository_full_name, file_change.filename, file_change.patch)
+
+    def _flush_if_full(self) -> None:
+        self.peak_buffered_bytes = max(self.peak_buffered_bytes, self._buffered_bytes)
+        if (
+            self._buffered_bytes >= self.max_bytes
+            or len(self._pull_requests) >= self.max_rows
+            or len(self._issues) >= self.max_rows
+            or len(self._file_changes) >= self.max_rows
+            or len(self._miners) >= self.max_rows
+            or len(self._repositories) >= self.max_rows
+        ):
+            self.flush()
+
+    def flush(self) -> Dict[str, int]:
+        """
+        Write everything buffered, in foreign key order, in one transaction
+
+        The buffers are cleared either way; rows of a failed flush are counted in
+        failed and logged, like the store_*_bulk methods.
+
+        Returns:
+            Count of rows written per table by this flush (all zero if it failed)
+        """
+        counts = {table: 0 for table in INGEST_TABLES}
+        buffered = self.buffered_rows
+        if not any(buffered.values()):
+            return counts
+
+        miners = list(self._miners.values())
+        repository_full_names = set(self._repositories)
+        pull_requests = list(self._pull_requests.values())
+        issues = self._drop_orphans('issues', self._issues.values(), buffered)
+        file_changes = self._drop_orphans('file_changes', self._file_changes.values(), buffered)
+        self._clear()
+        self.flush_count += 1
+
+        try:
+            with self.transaction() as cursor:
+                written = {
+                    'miners': self.miners.write_miners_bulk(cursor, miners, self.method) if miners else 0,
+                    'repositories': (
+                        self.repositories.write_repositories_bulk(cursor, repository_full_names)
+                        if repository_full_names else 0
+                    ),
+                    'pull_requests': self.pull_requests.write_pull_requests_bulk(cursor, pull_requests, self.method),
+                    'issues': self.issues.write_issues_bulk(cursor, issues, self.method),
+                    'file_changes': self.file_changes.write_file_changes_bulk(cursor, file_changes, self.method),
+                }
+        except Exception as e:
+            self.logger.error(f"Error flushing ingest buffers {buffered}: {e}")
+            for table, rows in buffered.items():
+                self.failed[table] += rows
+            # Their watermarks must not move past the rows that were lost
+            self._failed_repositories.update(repository_full_names)
+            self._failed_repositories.update(pr.repository_full_name for pr in pull_requests)
+            self._failed_repositories.update(issue.repository_full_name for issue in issues)
+            self._failed_repositories.update(file_change.repository_full_name for file_change in file_changes)
+            self._failed_pull_requests.update((pr.number, pr.repository_full_name) for pr in pull_requests)
+            return counts
+
+        self._failed_pull_requests.difference_update((pr.number, pr.repository_full_name) for pr in pull_requests)
+
+        self._stored_miners.update((miner.uid, miner.hotkey, miner.github_id) for miner in miners)
+        self._stored_repositories.update(repository_full_names)
+        for pr in pull_requests:
+            advance_watermark(self._written_watermarks, pr)
+        for table, rows in written.items():
+            self.written[table] += rows
+        return written
+
+    def _drop_orphans(self, table: str, rows: Iterable[Any], buffered: Dict[str, int]) -> List[Any]:
+        """
+        rows without those whose pull request was lost in a failed flush (and isn't
+        buffered again), counted in failed and taken out of buffered
+        """
+        kept = []
+        for row in rows:
+            key = (row.pr_number, row.repository_full_name)
+            if key in self._failed_pull_requests and key not in self._pull_requests:
+                self.failed[table] += 1
+                buffered[table] -= 1
+            else:
+                kept.append(row)
+        return kept
+
+    def _clear(self) -> None:
+        self._miners = {}
+        self._repositories = set()
+        self._pull_requests = {}
+        self._issues = {}
+        self._file_changes = {}
+        self._buffered_bytes = 0
+
+    def close(self) -> Dict[str, int]:
+        """
+        Flush what is left and advance the ingest watermarks
+
+        Watermarks move only for repositories without failed flushes, and after all of a
+        run's rows are written, since pull requests don't arrive in merge order.
+
+        Returns:
+            Count of rows written per table by the final flush
+        """
+        counts = self.flush()
+        watermarks = [
+            watermark for watermark in self._written_watermarks.values()
+            if watermark.repository_full_name not in self._failed_repositories
+        ]
+        self.watermarks_advanced += self.watermarks.advance_watermarks(watermarks)
+        self._written_watermarks = {}
+        return counts
@@ -1,21 +1,35 @@
 """
 Repository for handling database operations for Issue entities
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from ..models.domain_models import Issue
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, BULK_METHOD_VALUES, UpsertCounts
+from .pagination import Page, DEFAULT_PAGE_SIZE
+from .row_mapping import RowMapper, uses_row_mapper
 from ..queries import (
     GET_ISSUE,
+    GET_ISSUES_BY_KEYS,
     GET_ISSUES_BY_REPOSITORY,
+    GET_ISSUES_BY_REPOSITORY_PAGE,
+    GET_ISSUES_BY_REPOSITORY_NEXT_PAGE,
     SET_ISSUE,
-    BULK_UPSERT_ISSUES
+    BULK_UPSERT_ISSUES,
+    BULK_UPSERT_CHANGED_ISSUES,
+    CREATE_ISSUES_STAGING,
+    COPY_ISSUES_STAGING,
+    INSERT_ISSUES_FROM_STAGING,
+    UPSERT_CHANGED_ISSUES_FROM_STAGING
 )
 
 
+ISSUE_ROW = RowMapper(Issue, 'number', 'pr_number', 'repository_full_name', 'title', 'created_at', 'closed_at')
+
+
 class IssuesRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
+    @uses_row_mapper(ISSUE_ROW)
     def _map_to_issue(self, row: Dict[str, Any]) -> Issue:
         """Map database row to Issue object"""
         return Issue(
@@ -27,6 +41,17 @@ class IssuesRepository(BaseRepository):
             closed_at=row['closed_at']
         )
 
+    def _issue_params(self, issue: Issue) -> tuple:
+        """Build the insert parameter tuple for an Issue"""
+        return (
+            issue.number,
+            issue.pr_number,
+            issue.repository_full_name,
+            issue.title,
+            issue.created_at,
+            issue.closed_at
+        )
+
     def get_issue(self, number: int, repository_full_name: str) -> Optional[Issue]:
         """
         Get an issue by its number and repository
@@ -40,6 +65,23 @@ class IssuesRepository(BaseRepository):
         """
         return self.query_single(GET_ISSUE, (number, repository_full_name), self._map_to_issue)
 
+    def get_issues(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], Optional[Issue]]:
+        """
+        Get many issues by number and repository in one round trip per batch
+
+        Args:
+            keys: (number, repository_full_name) tuples
+
+        Returns:
+            Issue per input key, None for keys that were not found
+        """
+        return self.query_many(
+            GET_ISSUES_BY_KEYS,
+            keys,
+            lambda row: (row['number'], row['repository_full_name']),
+            self._map_to_issue
+        )
+
     def get_issues_by_repository(self, repository_full_name: str) -> List[Issue]:
         """
         Get all issues for a given repository
@@ -52,6 +94,36 @@ class IssuesRepository(BaseRepository):
         """
         return self.query_multiple(GET_ISSUES_BY_REPOSITORY, (repository_full_name,), self._map_to_issue)
 
+    def get_issues_by_repository_page(
+        self,
+        repository_full_name: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        page_token: Optional[str] = None
+    ) -> Page[Issue]:
+        """
+        Get one page of a repository's issues, newest first
+
+        Args:
+            repository_full_name: Full repository name (owner/name)
+            page_size: Maximum number of issues per page
+            page_token: next_page_token of the previous page, or None for the first page
+
+        Returns:
+            Page of Issue objects
+
+        Raises:
+            InvalidPageTokenError: If page_token was not issued by this listing
+        """
+        return self.query_page(
+            GET_ISSUES_BY_REPOSITORY_PAGE,
+            GET_ISSUES_BY_REPOSITORY_NEXT_PAGE,
+            (repository_full_name,),
+            ('created_at', 'number'),
+            self._map_to_issue,
+            page_size,
+            page_token
+        )
+
     def set_issue(self, issue: Issue) -> bool:
         """
         Insert or update an issue
@@ -62,22 +134,15 @@ class IssuesRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
-        params = (
-            issue.number,
-            issue.pr_number,
-            issue.repository_full_name,
-            issue.title,
-            issue.created_at,
-            issue.closed_at
-        )
-        return self.set_entity(SET_ISSUE, params)
+        return self.set_entity(SET_ISSUE, self._issue_params(issue))
 
-    def store_issues_bulk(self, issues: List[Issue]) -> int:
+    def store_issues_bulk(self, issues: List[Issue], method: str = BULK_METHOD_VALUES) -> int:
         """
         Bulk insert/update issues with efficient SQL conflict resolution
 
         Args:
             issues: List of Issue objects to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
 
         Returns:
             Count of successfully stored issues
@@ -85,32 +150,84 @@ class IssuesRepository(BaseRepository):
         if not issues:
             return 0
 
+        try:
+            with self.transaction() as cursor:
+                return self.write_issues_bulk(cursor, issues, method)
+        except Exception as e:
+            self.logger.error(f"Error in bulk issue storage: {e}")
+            return 0
+
+    def write_issues_bulk(self, cursor, issues: List[Issue], method: str = BULK_METHOD_VALUES) -> int:
+        """
+        Write issues on an open cursor without committing, so callers can combine
+        several bulk writes into one transaction.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            issues: List of Issue objects to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of written issues
+        """
+        if not issues:
+            return 0
+
         # Prepare data for bulk insert
-        values = []
-        for issue in issues:
-            values.append((
-                issue.number,
-                issue.pr_number,
-                issue.repository_full_name,
-                issue.title,
-                issue.created_at,
-                issue.closed_at
-            ))
+        values = [self._issue_params(issue) for issue in issues]
+
+        self.execute_bulk(
+            cursor,
+            values,
+            BULK_UPSERT_ISSUES,
+            (CREATE_ISSUES_STAGING, COPY_ISSUES_STAGING, INSERT_ISSUES_FROM_STAGING),
+            method
+        )
+        return len(values)
+
+    def upsert_issues_bulk(self, issues: List[Issue], method: str = BULK_METHOD_VALUES) -> UpsertCounts:
+        """
+        Bulk insert issues and update stored ones whose values changed, leaving identical
+        rows untouched
+
+        Args:
+            issues: List of Issue objects to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (all zero if the transaction failed)
+        """
+        if not issues:
+            return UpsertCounts()
 
         try:
-            with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_ISSUES.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
-                self.db.commit()
-                return len(values)
+            with self.transaction() as cursor:
+                return self.write_issues_upsert(cursor, issues, method)
         except Exception as e:
-            self.db.rollback()
-            self.logger.error(f"Error in bulk issue storage: {e}")
-            return 0
\ No newline at end of file
+            self.logger.error(f"Error in bulk issue upsert: {e}")
+            return UpsertCounts()
+
+    def write_issues_upsert(self, cursor, issues: List[Issue], method: str = BULK_METHOD_VALUES) -> UpsertCounts:
+        """
+        Change-aware upsert of issues on an open cursor without committing
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            issues: List of Issue objects to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (an issue given twice counts once, with its last values)
+        """
+        if not issues:
+            return UpsertCounts()
+
+        # One row per (number, repository_full_name), keeping the last
+        values = list({(issue.number, issue.repository_full_name): self._issue_params(issue) for issue in issues}.values())
+        return self.execute_bulk_upsert(
+            cursor,
+            values,
+            BULK_UPSERT_CHANGED_ISSUES,
+            (CREATE_ISSUES_STAGING, COPY_ISSUES_STAGING, UPSERT_CHANGED_ISSUES_FROM_STAGING),
+            method
+        )
\ No newline at end of file
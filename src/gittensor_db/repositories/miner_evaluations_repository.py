@@ -1,21 +1,44 @@
 """
 Repository for handling database operations for MinerEvaluation entities
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from datetime import datetime
 from ..models.domain_models import MinerEvaluation
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, DEFAULT_ITERSIZE
+from .pagination import Page, DEFAULT_PAGE_SIZE
+from .row_mapping import RowMapper, column, float_or_zero, or_zero, uses_row_mapper
 from ..queries import (
     GET_MINER_EVALUATION,
     GET_LATEST_MINER_EVALUATION,
     SET_MINER_EVALUATION,
-    GET_EVALUATIONS_BY_TIMEFRAME
+    GET_EVALUATIONS_BY_TIMEFRAME,
+    GET_EVALUATIONS_BY_TIMEFRAME_PAGE,
+    GET_EVALUATIONS_BY_TIMEFRAME_NEXT_PAGE,
+    BULK_INSERT_MINER_EVALUATIONS
 )
 
+
+MINER_EVALUATION_ROW = RowMapper(
+    MinerEvaluation,
+    'uid',
+    'hotkey',
+    'id',
+    column('total_score', convert=float_or_zero),
+    column('total_lines_changed', convert=or_zero),
+    column('total_open_prs', convert=or_zero),
+    column('unique_repos_count', convert=or_zero),
+    'github_id',
+    'failed_reason',
+    'evaluation_timestamp',
+    column('stored_total_prs', 'total_prs', default=None)
+)
+
+
 class MinerEvaluationsRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
+    @uses_row_mapper(MINER_EVALUATION_ROW)
     def _map_to_miner_evaluation(self, row: Dict[str, Any]) -> MinerEvaluation:
         """Map database row to MinerEvaluation object"""
         return MinerEvaluation(
@@ -32,6 +55,20 @@ class MinerEvaluationsRepository(BaseRepository):
             stored_total_prs=row['total_prs'] if 'total_prs' in row else None  # Map DB total_prs
         )
 
+    def _miner_evaluation_params(self, evaluation: MinerEvaluation) -> tuple:
+        """Build the insert parameter tuple for a MinerEvaluation"""
+        return (
+            evaluation.uid,
+            evaluation.hotkey,
+            evaluation.github_id,
+            evaluation.failed_reason,
+            evaluation.total_score,
+            evaluation.total_lines_changed,
+            evaluation.total_open_prs,
+            evaluation.total_prs,
+            evaluation.unique_repos_count
+        )
+
     def get_miner_evaluation(self, evaluation_id: int) -> Optional[MinerEvaluation]:
         """
         Get a miner evaluation by its ID
@@ -67,19 +104,49 @@ class MinerEvaluationsRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
-        query = SET_MINER_EVALUATION
-        params = (
-            evaluation.uid,
-            evaluation.hotkey,
-            evaluation.github_id,
-            evaluation.failed_reason,
-            evaluation.total_score,
-            evaluation.total_lines_changed,
-            evaluation.total_open_prs,
-            evaluation.total_prs,
-            evaluation.unique_repos_count
-        )
-        return self.set_entity(query, params)
+        return self.set_entity(SET_MINER_EVALUATION, self._miner_evaluation_params(evaluation))
+
+    def store_miner_evaluations_bulk(self, evaluations: List[MinerEvaluation]) -> int:
+        """
+        Bulk insert miner evaluations
+
+        Args:
+            evaluations: List of MinerEvaluation objects to store
+
+        Returns:
+            Count of successfully stored evaluations
+        """
+        if not evaluations:
+            return 0
+
+        try:
+            with self.transaction() as cursor:
+                return self.write_miner_evaluations_bulk(cursor, evaluations)
+        except Exception as e:
+            self.logger.error(f"Error in bulk miner evaluation storage: {e}")
+            return 0
+
+    def write_miner_evaluations_bulk(self, cursor, evaluations: List[MinerEvaluation]) -> int:
+        """
+        Write miner evaluations on an open cursor without committing, so callers can
+        combine several bulk writes into one transaction.
+
+        Evaluations written in the same transaction share its timestamp, so each
+        (uid, hotkey) may appear only once per call.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            evaluations: List of MinerEvaluation objects to store
+
+        Returns:
+            Count of written evaluations
+        """
+        if not evaluations:
+            return 0
+
+        values = [self._miner_evaluation_params(evaluation) for evaluation in evaluations]
+        self.execute_bulk(cursor, values, BULK_INSERT_MINER_EVALUATIONS)
+        return len(values)
 
     def get_evaluations_by_timeframe(self, start_time: datetime, end_time: datetime) -> List[MinerEvaluation]:
         """
@@ -92,4 +159,58 @@ class MinerEvaluationsRepository(BaseRepository):
         Returns:
             List of MinerEvaluation objects
         """
-        return self.query_multiple(GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation)
\ No newline at end of file
+        return self.query_multiple(GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation)
+
+    def get_evaluations_by_timeframe_page(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        page_token: Optional[str] = None
+    ) -> Page[MinerEvaluation]:
+        """
+        Get one page of miner evaluations within a timeframe, newest first, then by
+        total score descending
+
+        Args:
+            start_time: Start of time range
+            end_time: End of time range
+            page_size: Maximum number of evaluations per page
+            page_token: next_page_token of the previous page, or None for the first page
+
+        Returns:
+            Page of MinerEvaluation objects
+
+        Raises:
+            InvalidPageTokenError: If page_token was not issued by this listing
+        """
+        return self.query_page(
+            GET_EVALUATIONS_BY_TIMEFRAME_PAGE,
+            GET_EVALUATIONS_BY_TIMEFRAME_NEXT_PAGE,
+            (start_time, end_time),
+            ('evaluation_timestamp', 'total_score', 'id'),
+            self._map_to_miner_evaluation,
+            page_size,
+            page_token
+        )
+
+    def iter_evaluations_by_timeframe(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> Iterator[MinerEvaluation]:
+        """
+        Stream miner evaluations within a specific timeframe through a server-side cursor
+
+        Args:
+            start_time: Start of time range
+            end_time: End of time range
+            itersize: Rows fetched from the server per round trip
+
+        Yields:
+            MinerEvaluation objects
+        """
+        return self.stream_multiple(
+            GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation, itersize
+        )
\ No newline at end of file
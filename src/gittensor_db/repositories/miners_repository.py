@@ -1,26 +1,38 @@
 """
 Repository for handling database operations for Miner entities
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from ..models.domain_models import Miner
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, BULK_METHOD_VALUES
+from .row_mapping import RowMapper, uses_row_mapper
 from ..queries import (
     GET_MINER,
     GET_MINER_BY_UID,
     GET_MINER_BY_HOTKEY,
     GET_MINER_BY_GITHUB_ID,
     GET_MINER_BY_HOTKEY_AND_GITHUB_ID,
+    GET_MINERS_BY_KEYS,
+    GET_MINERS_BY_UIDS,
+    GET_MINERS_BY_HOTKEYS,
+    GET_MINERS_BY_GITHUB_IDS,
+    GET_MINERS_BY_HOTKEYS_AND_GITHUB_IDS,
     SET_MINER,
     UPSERT_MINER,
     GET_ALL_MINERS,
-    BULK_UPSERT_MINERS
+    BULK_UPSERT_MINERS,
+    CREATE_MINERS_STAGING,
+    COPY_MINERS_STAGING,
+    INSERT_MINERS_FROM_STAGING
 )
 
+MINER_ROW = RowMapper(Miner, 'uid', 'hotkey', 'github_id')
+
 
 class MinersRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
+    @uses_row_mapper(MINER_ROW)
     def _map_to_miner(self, row: Dict[str, Any]) -> Miner:
         """Map database row to Miner object"""
         return Miner(
@@ -29,6 +41,10 @@ class MinersRepository(BaseRepository):
             github_id=row['github_id']
         )
 
+    def _miner_params(self, miner: Miner) -> tuple:
+        """Build the (uid, hotkey, github_id) parameter tuple for a Miner"""
+        return (miner.uid, miner.hotkey, miner.github_id)
+
     def get_miner(self, uid: int, hotkey: str, github_id: str) -> Optional[Miner]:
         """
         Get a miner by their composite primary key
@@ -92,6 +108,79 @@ class MinersRepository(BaseRepository):
         """
         return self.query_single(GET_MINER_BY_HOTKEY_AND_GITHUB_ID, (hotkey, github_id), self._map_to_miner)
 
+    def get_miners(self, keys: Iterable[Tuple[int, str, str]]) -> Dict[Tuple[int, str, str], Optional[Miner]]:
+        """
+        Get many miners by their composite primary keys in one round trip per batch
+
+        Args:
+            keys: (uid, hotkey, github_id) tuples
+
+        Returns:
+            Miner per input key, None for keys that were not found
+        """
+        keys = [(int(uid), hotkey, github_id) for uid, hotkey, github_id in keys]
+        return self.query_many(
+            GET_MINERS_BY_KEYS, keys, lambda row: (row['uid'], row['hotkey'], row['github_id']), self._map_to_miner
+        )
+
+    def get_miners_by_uids(self, uids: Iterable[int]) -> Dict[int, Optional[Miner]]:
+        """
+        Get many miners by UID in one round trip per batch
+
+        Args:
+            uids: Miner UIDs
+
+        Returns:
+            Miner per input key, None for keys that were not found
+        """
+        # numpy integers (e.g. from the metagraph) cannot be adapted inside an array
+        uids = [int(uid) for uid in uids]
+        return self.query_many(GET_MINERS_BY_UIDS, uids, lambda row: row['uid'], self._map_to_miner)
+
+    def get_miners_by_hotkeys(self, hotkeys: Iterable[str]) -> Dict[str, Optional[Miner]]:
+        """
+        Get many miners by hotkey in one round trip per batch
+
+        Args:
+            hotkeys: Miner hotkeys
+
+        Returns:
+            Miner per input key, None for keys that were not found
+        """
+        return self.query_many(GET_MINERS_BY_HOTKEYS, hotkeys, lambda row: row['hotkey'], self._map_to_miner)
+
+    def get_miners_by_github_ids(self, github_ids: Iterable[str]) -> Dict[str, Optional[Miner]]:
+        """
+        Get many miners by GitHub ID in one round trip per batch
+
+        Args:
+            github_ids: Miner GitHub IDs
+
+        Returns:
+            Miner per input key, None for keys that were not found
+        """
+        return self.query_many(GET_MINERS_BY_GITHUB_IDS, github_ids, lambda row: row['github_id'], self._map_to_miner)
+
+    def get_miners_by_hotkeys_and_github_ids(
+        self,
+        keys: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[Miner]]:
+        """
+        Get many miners by hotkey and GitHub ID in one round trip per batch
+
+        Args:
+            keys: (hotkey, github_id) tuples
+
+        Returns:
+            Miner per input key, None for keys that were not found
+        """
+        return self.query_many(
+            GET_MINERS_BY_HOTKEYS_AND_GITHUB_IDS,
+            keys,
+            lambda row: (row['hotkey'], row['github_id']),
+            self._map_to_miner
+        )
+
     def set_miner(self, miner: Miner) -> bool:
         """
         Insert a miner (ignore conflicts)
@@ -102,12 +191,7 @@ class MinersRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
-        params = (
-            miner.uid,
-            miner.hotkey,
-            miner.github_id
-        )
-        return self.set_entity(SET_MINER, params)
+        return self.set_entity(SET_MINER, self._miner_params(miner))
 
     def upsert_miner(self, miner: Miner) -> bool:
         """
@@ -119,12 +203,7 @@ class MinersRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
-        params = (
-            miner.uid,
-            miner.hotkey,
-            miner.github_id
-        )
-        return self.set_entity(UPSERT_MINER, params)
+        return self.set_entity(UPSERT_MINER, self._miner_params(miner))
 
     def get_all_miners(self) -> List[Miner]:
         """
@@ -135,12 +214,13 @@ class MinersRepository(BaseRepository):
         """
         return self.query_multiple(GET_ALL_MINERS, (), self._map_to_miner)
 
-    def store_miners_bulk(self, miners: List[Miner]) -> int:
+    def store_miners_bulk(self, miners: List[Miner], method: str = BULK_METHOD_VALUES) -> int:
         """
         Bulk upsert miners using efficient SQL
 
         Args:
             miners: List of Miner objects to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
 
         Returns:
             Count of successfully stored miners
@@ -148,23 +228,37 @@ class MinersRepository(BaseRepository):
         if not miners:
             return 0
 
-        # Prepare data for bulk insert
-        values = [(miner.uid, miner.hotkey, miner.github_id) for miner in miners]
-
         try:
-            with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_MINERS.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
-                self.db.commit()
-                return len(values)
+            with self.transaction() as cursor:
+                return self.write_miners_bulk(cursor, miners, method)
         except Exception as e:
-            self.db.rollback()
             self.logger.error(f"Error in bulk miner storage: {e}")
-            return 0
\ No newline at end of file
+            return 0
+
+    def write_miners_bulk(self, cursor, miners: List[Miner], method: str = BULK_METHOD_VALUES) -> int:
+        """
+        Write miners on an open cursor without committing, so callers can combine
+        several bulk writes into one transaction.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            miners: List of Miner objects to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of written miners
+        """
+        if not miners:
+            return 0
+
+        # Prepare data for bulk insert
+        values = [self._miner_params(miner) for miner in miners]
+
+        self.execute_bulk(
+            cursor,
+            values,
+            BULK_UPSERT_MINERS,
+            (CREATE_MINERS_STAGING, COPY_MINERS_STAGING, INSERT_MINERS_FROM_STAGING),
+            method
+        )
+        return len(values)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Keyset (cursor-based) pagination support for repository listings.
+
+A page token is an opaque, URL-safe encoding of the ORDER BY key of the last row
+on the previous page. The next page is fetched with a row-value comparison
+against that key, so every page is an index range scan and deep pages cost the
+same as the first one.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10000
+
+
+class InvalidPageTokenError(ValueError):
+    """Raised when a page token is malformed or was issued for a different listing"""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results plus the token for the next page (None on the last page)"""
+    items: List[T] = field(default_factory=list)
+    next_page_token: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_page_token is not None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        raise InvalidPageTokenError("Unknown value in page token")
+    return value
+
+
+def encode_page_token(scope: str, key: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row on a page.
+
+    Args:
+        scope: Name of the listing the token belongs to
+        key: ORDER BY column values of the last row
+
+    Returns:
+        Opaque URL-safe token
+    """
+    payload = json.dumps({'s': scope, 'k': [_encode_value(value) for value in key]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_page_token(token: str, scope: str, key_length: int) -> List[Any]:
+    """
+    Decode a page token back into sort key values.
+
+    Args:
+        token: Token returned by a previous page
+        scope: Name of the listing the token must belong to
+        key_length: Number of ORDER BY columns in the key
+
+    Returns:
+        Sort key values of the last row on the previous page
+
+    Raises:
+        InvalidPageTokenError: If the token is malformed or belongs to another listing
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key = [_decode_value(value) for value in payload['k']]
+        token_scope = payload['s']
+    except InvalidPageTokenError:
+        raise
+    except (ValueError, TypeError, KeyError, binascii.Error) as e:
+        raise InvalidPageTokenError(f"Malformed page token: {e}") from e
+
+    if token_scope != scope or len(key) != key_length:
+        raise InvalidPageTokenError(f"Page token was not issued for {scope}")
+    return key
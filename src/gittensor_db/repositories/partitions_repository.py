@@ -0,0 +1,251 @@
+"""
+Repository for maintaining the monthly range partitions of time-partitioned tables.
+
+miner_evaluations is partitioned on evaluation_timestamp (migration 0008). Each month
+lives in {table}_pYYYYMM and anything outside the existing months lands in
+{table}_default, so writes never fail when maintenance falls behind. Run
+maintain_partitions periodically (the migrator runs ensure_partitions on every
+migrate) to keep future months created and, optionally, expire old ones.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from psycopg2 import sql
+
+from .base_repository import BaseRepository
+from .row_mapping import as_dicts
+from ..queries import (
+    GET_PARTITIONED_TABLE,
+    GET_PARTITIONS,
+    GET_PARTITION_CLOCK,
+    GET_DEFAULT_PARTITION_MONTHS,
+    CREATE_PARTITION_TABLE,
+    MOVE_ROWS_FROM_DEFAULT_PARTITION,
+    ATTACH_PARTITION,
+    DETACH_PARTITION,
+    DROP_PARTITION
+)
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    'miner_evaluations': 'evaluation_timestamp',
+}
+
+# Months created ahead of the current one
+DEFAULT_PREMAKE_MONTHS = 3
+
+_RANGE_BOUND = re.compile(r"FROM \('([^']*)'\) TO \('([^']*)'\)")
+
+
+@dataclass
+class Partition:
+    """One partition of a time-partitioned table"""
+    name: str
+    lower: Optional[datetime] = None  # inclusive; None for the default partition
+    upper: Optional[datetime] = None  # exclusive; None for the default partition
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None and self.upper is None
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of value's month"""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months"""
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of the partition holding month"""
+    return f"{table}_p{month:%Y%m}"
+
+
+class PartitionsRepository(BaseRepository):
+    def __init__(self, db_connection):
+        super().__init__(db_connection)
+
+    def _partition_column(self, table: str) -> str:
+        column = PARTITIONED_TABLES.get(table)
+        if column is None:
+            raise ValueError(f"{table} is not a time-partitioned table (expected one of {sorted(PARTITIONED_TABLES)})")
+        return column
+
+    def _compose(self, template: str, table: str, partition: Optional[str] = None) -> sql.Composed:
+        return sql.SQL(template).format(
+            table=sql.Identifier(table),
+            partition=sql.Identifier(partition or ''),
+            default=sql.Identifier(f"{table}_default"),
+            column=sql.Identifier(self._partition_column(table))
+        )
+
+    def is_partitioned(self, table: str) -> bool:
+        """True if table exists and is a partitioned table"""
+        row = self.execute_single_query(GET_PARTITIONED_TABLE, (table,))
+        return bool(row and row['partitioned'])
+
+    def get_partitions(self, table: str) -> List[Partition]:
+        """
+        List the partitions of a time-partitioned table
+
+        Args:
+            table: Partitioned table name
+
+        Returns:
+            Partitions ordered by lower bound, the default partition last
+        """
+        partitions = []
+        for row in self.execute_query(GET_PARTITIONS, (table,)):
+            match = _RANGE_BOUND.search(row['partition_bound'] or '')
+            if match:
+                partitions.append(Partition(
+                    name=row['partition_name'],
+                    lower=datetime.fromisoformat(match.group(1)),
+                    upper=datetime.fromisoformat(match.group(2))
+                ))
+            else:
+                partitions.append(Partition(name=row['partition_name']))
+        return sorted(partitions, key=lambda p: (p.is_default, p.lower or datetime.min))
+
+    def _database_now(self) -> datetime:
+        row = self.execute_single_query(GET_PARTITION_CLOCK)
+        return row['now']
+
+    def create_partition(self, table: str, month: datetime) -> str:
+        """
+        Create the partition for one month, moving any rows for that month out of the
+        default partition first so attaching it cannot fail.
+
+        Args:
+            table: Partitioned table name
+            month: Any instant in the month to create
+
+        Returns:
+            Name of the created partition
+        """
+        lower = month_start(month)
+        upper = add_months(lower, 1)
+        name = partition_name(table, lower)
+        with self.transaction() as cursor:
+            cursor.execute(self._compose(CREATE_PARTITION_TABLE, table, name))
+            cursor.execute(self._compose(MOVE_ROWS_FROM_DEFAULT_PARTITION, table, name), (lower, upper))
+            cursor.execute(self._compose(ATTACH_PARTITION, table, name), (lower, upper))
+        self.logger.info(f"Created partition {name} [{lower:%Y-%m-%d}, {upper:%Y-%m-%d})")
+        return name
+
+    def ensure_partitions(
+        self,
+        table: str,
+        months_ahead: int = DEFAULT_PREMAKE_MONTHS,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create missing monthly partitions from the current month through months_ahead,
+        plus a partition for every month that has rows stranded in the default partition
+
+        Args:
+            table: Partitioned table name
+            months_ahead: Future months to create beyond the current one
+            now: Reference time (defaults to the database clock)
+
+        Returns:
+            Names of the partitions created
+        """
+        self._partition_column(table)
+        if not self.is_partitioned(table):
+            return []
+
+        existing = {p.lower for p in self.get_partitions(table) if not p.is_default}
+        current = month_start(now or self._database_now())
+        wanted = {add_months(current, offset) for offset in range(months_ahead + 1)}
+        with self.get_cursor() as cursor:
+            cursor.execute(self._compose(GET_DEFAULT_PARTITION_MONTHS, table))
+            wanted.update(row['month'] for row in as_dicts(cursor.description, cursor.fetchall()))
+
+        created = []
+        for month in sorted(wanted - existing):
+            try:
+                created.append(self.create_partition(table, month))
+            except Exception as e:
+                self.logger.error(f"Error creating {table} partition for {month:%Y-%m}: {e}")
+        return created
+
+    def expire_partitions(
+        self,
+        table: str,
+        retention_months: int,
+        drop: bool = False,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Detach the monthly partitions that end before the retention window, which
+        removes them from every query without deleting rows one by one
+
+        Args:
+            table: Partitioned table name
+            retention_months: Whole months kept before the current one
+            drop: Drop the detached partitions instead of keeping them as standalone
+                tables (e.g. for archiving)
+            now: Reference time (defaults to the database clock)
+
+        Returns:
+            Names of the partitions detached (and dropped if drop is set)
+        """
+        self._partition_column(table)
+        if retention_months < 0:
+            raise ValueError("retention_months must be >= 0")
+        if not self.is_partitioned(table):
+            return []
+
+        cutoff = add_months(month_start(now or self._database_now()), -retention_months)
+        expired = []
+        for partition in self.get_partitions(table):
+            if partition.is_default or partition.upper > cutoff:
+                continue
+            try:
+                with self.transaction() as cursor:
+                    cursor.execute(self._compose(DETACH_PARTITION, table, partition.name))
+                    if drop:
+                        cursor.execute(self._compose(DROP_PARTITION, table, partition.name))
+                expired.append(partition.name)
+                self.logger.info(f"{'Dropped' if drop else 'Detached'} partition {partition.name}")
+            except Exception as e:
+                self.logger.error(f"Error expiring partition {partition.name}: {e}")
+        return expired
+
+    def maintain_partitions(
+        self,
+        months_ahead: int = DEFAULT_PREMAKE_MONTHS,
+        retention_months: Optional[int] = None,
+        drop: bool = False,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Create future partitions and, if retention_months is set, expire old ones for
+        every time-partitioned table
+
+        Args:
+            months_ahead: Future months to create beyond the current one
+            retention_months: Whole months kept before the current one, or None to keep all
+            drop: Drop expired partitions instead of only detaching them
+            now: Reference time (defaults to the database clock)
+
+        Returns:
+            {table: {'created': [...], 'expired': [...]}}
+        """
+        results = {}
+        for table in PARTITIONED_TABLES:
+            results[table] = {
+                'created': self.ensure_partitions(table, months_ahead, now),
+                'expired': (
+                    self.expire_partitions(table, retention_months, drop, now)
+                    if retention_months is not None else []
+                )
+            }
+        return results
@@ -1,25 +1,75 @@
 """
 Repository for handling database operations for PullRequest entities
 """
-from typing import Optional, List, Dict, Any
-from ..models.domain_models import PullRequest, FileChange
-from .base_repository import BaseRepository
+from itertools import groupby
+from numbers import Integral
+from typing import Optional, List, Dict, Any, Iterator, Iterable, Tuple, Union
+from ..models.domain_models import PullRequest, FileChange, LazyFileChange, MinerAggregate
+from ..models.batches import PullRequestBatch
+from ..utils.patch_codec import patch_from_row
+from .base_repository import BaseRepository, BULK_METHOD_VALUES, DEFAULT_ITERSIZE, UpsertCounts, unique_rows
+from .pagination import Page, DEFAULT_PAGE_SIZE
+from .row_mapping import RowMapper, column, int_or_zero, float_or_zero, or_zero, uses_row_mapper
+from .file_changes_repository import FileChangesRepository
 from ..queries import (
     GET_PULL_REQUEST,
+    GET_PULL_REQUESTS_BY_KEYS,
     SET_PULL_REQUEST,
     GET_PULL_REQUESTS_BY_REPOSITORY,
     GET_PULL_REQUESTS_BY_MINER,
+    GET_PULL_REQUESTS_BY_REPOSITORY_PAGE,
+    GET_PULL_REQUESTS_BY_REPOSITORY_NEXT_PAGE,
+    GET_PULL_REQUESTS_BY_MINER_PAGE,
+    GET_PULL_REQUESTS_BY_MINER_NEXT_PAGE,
     GET_PULL_REQUEST_WITH_FILE_CHANGES,
-    BULK_UPSERT_PULL_REQUESTS
+    GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY,
+    GET_PULL_REQUEST_WITH_FILE_CHANGE_METADATA,
+    GET_MINER_AGGREGATE,
+    GET_MINER_AGGREGATES,
+    BULK_UPSERT_PULL_REQUESTS,
+    BULK_UPSERT_CHANGED_PULL_REQUESTS,
+    CREATE_PULL_REQUESTS_STAGING,
+    COPY_PULL_REQUESTS_STAGING,
+    INSERT_PULL_REQUESTS_FROM_STAGING,
+    UPSERT_CHANGED_PULL_REQUESTS_FROM_STAGING
 )
 
-import numpy as np
+
+PULL_REQUEST_ROW = RowMapper(
+    PullRequest,
+    'number',
+    'repository_full_name',
+    'uid',
+    'hotkey',
+    'github_id',
+    'title',
+    'author_login',
+    'merged_at',
+    column('created_at', 'pr_created_at'),
+    column('earned_score', convert=float, default=0.0),
+    column('additions', convert=or_zero),
+    column('deletions', convert=or_zero),
+    column('commits', default=0),
+    'merged_by_login'
+)
+MINER_AGGREGATE_ROW = RowMapper(
+    MinerAggregate,
+    'uid',
+    'hotkey',
+    'github_id',
+    'pr_count',
+    column('total_lines_changed', convert=int_or_zero),
+    'unique_repos_count',
+    column('total_score', convert=float_or_zero)
+)
 
 
 class PullRequestsRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
+        self.file_changes = FileChangesRepository(db_connection)
 
+    @uses_row_mapper(PULL_REQUEST_ROW)
     def _map_to_pull_request(self, row: Dict[str, Any]) -> PullRequest:
         """Map database row to PullRequest object"""
         return PullRequest(
@@ -40,7 +90,10 @@ class PullRequestsRepository(BaseRepository):
         )
 
     def _map_to_pull_request_with_file_changes(self, rows: List[Dict[str, Any]]) -> Optional[PullRequest]:
-        """Map database rows to PullRequest with nested FileChanges"""
+        """
+        Map database rows to PullRequest with nested FileChanges (LazyFileChanges
+        sharing one patch loader for metadata-only rows)
+        """
         if not rows:
             return None
 
@@ -66,8 +119,21 @@ class PullRequestsRepository(BaseRepository):
         # Create nested FileChanges if they exist
         if first_row.get('filename'):  # Check if file changes exist
             file_changes = []
+            metadata_only = 'file_change_id' in first_row
             for row in rows:
-                if row['filename']:  # Skip rows without file changes
+                if row['filename'] and metadata_only:
+                    file_changes.append(LazyFileChange(
+                        pr_number=row['number'],
+                        repository_full_name=row['repository_full_name'],
+                        filename=row['filename'],
+                        changes=row['changes'],
+                        additions=row['file_additions'],
+                        deletions=row['file_deletions'],
+                        status=row['status'],
+                        file_extension=row['file_extension'],
+                        id=row['file_change_id']
+                    ))
+                elif row['filename']:  # Skip rows without file changes
                     file_change = FileChange(
                         pr_number=row['number'],
                         repository_full_name=row['repository_full_name'],
@@ -76,16 +142,83 @@ class PullRequestsRepository(BaseRepository):
                         additions=row['file_additions'],
                         deletions=row['file_deletions'],
                         status=row['status'],
-                        patch=row['patch'],
+                        patch=patch_from_row(row),
                         file_extension=row['file_extension']
                     )
                     file_changes.append(file_change)
 
+            if metadata_only:
+                self.file_changes.lazy_patches(file_changes)
+
             # Attach file_changes as a list attribute to the pull_request
             pull_request.file_changes = file_changes
 
         return pull_request
 
+    @uses_row_mapper(MINER_AGGREGATE_ROW)
+    def _map_to_miner_aggregate(self, row: Dict[str, Any]) -> MinerAggregate:
+        """Map an aggregate row to MinerAggregate"""
+        return MinerAggregate(
+            uid=row['uid'],
+            hotkey=row['hotkey'],
+            github_id=row['github_id'],
+            pr_count=row['pr_count'],
+            total_lines_changed=int(row['total_lines_changed'] or 0),  # SUM of integers is NUMERIC
+            unique_repos_count=row['unique_repos_count'],
+            total_score=float(row['total_score'] or 0.0)
+        )
+
+    def _pull_request_params(self, pull_request: PullRequest) -> tuple:
+        """Build the insert parameter tuple for a PullRequest"""
+        # uid is causing issues bc it keeps remaining as an np.int64 (numpy registers it as numbers.Integral)
+        if not isinstance(pull_request.uid, int) and isinstance(pull_request.uid, Integral):
+            pull_request.uid = int(pull_request.uid)  # Converts numpy int to Python int
+
+        return (
+            pull_request.number,
+            pull_request.repository_full_name,
+            pull_request.uid,
+            pull_request.hotkey,
+            pull_request.github_id,
+            pull_request.earned_score,
+            pull_request.title,
+            pull_request.merged_at,
+            pull_request.created_at,
+            pull_request.additions,
+            pull_request.deletions,
+            pull_request.commits,
+            pull_request.author_login,
+            pull_request.merged_by_login
+        )
+
+    def _bulk_params(self, pull_requests: Union[List[PullRequest], PullRequestBatch]) -> List[tuple]:
+        """Insert parameter tuples for a list or batch of pull requests"""
+        if isinstance(pull_requests, PullRequestBatch):
+            return list(pull_requests.iter_values())
+        return [self._pull_request_params(pr) for pr in pull_requests]
+
+    def _collect_batch(self, rows: Iterable[Dict[str, Any]]) -> PullRequestBatch:
+        """Append pull request rows to a new PullRequestBatch"""
+        batch = PullRequestBatch()
+        for row in rows:
+            batch.append_row(
+                row['number'],
+                row['repository_full_name'],
+                row['uid'],
+                row['hotkey'],
+                row['github_id'],
+                row['title'],
+                row['author_login'],
+                row['merged_at'],
+                row['pr_created_at'],
+                row['earned_score'],
+                row['additions'],
+                row['deletions'],
+                row['commits'],
+                row['merged_by_login']
+            )
+        return batch
+
     def get_pull_request(self, pr_number: int, repository_full_name: str) -> Optional[PullRequest]:
         """
         Get a pull request by its number and repository
@@ -99,6 +232,23 @@ class PullRequestsRepository(BaseRepository):
         """
         return self.query_single(GET_PULL_REQUEST, (pr_number, repository_full_name), self._map_to_pull_request)
 
+    def get_pull_requests(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], Optional[PullRequest]]:
+        """
+        Get many pull requests by number and repository in one round trip per batch
+
+        Args:
+            keys: (pr_number, repository_full_name) tuples
+
+        Returns:
+            PullRequest per input key, None for keys that were not found
+        """
+        return self.query_many(
+            GET_PULL_REQUESTS_BY_KEYS,
+            keys,
+            lambda row: (row['number'], row['repository_full_name']),
+            self._map_to_pull_request
+        )
+
     def set_pull_request(self, pull_request: PullRequest) -> bool:
         """
         Insert or update a pull request
@@ -109,29 +259,7 @@ class PullRequestsRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
-
-        # uid is causing issues bc it keeps remaining as an np.int64
-        if isinstance(pull_request.uid, np.integer):
-            pull_request.uid = pull_request.uid.item()  # Converts numpy int to Python int
-            
-        query = SET_PULL_REQUEST
-        params = (
-            pull_request.number,
-            pull_request.repository_full_name,
-            pull_request.uid,
-            pull_request.hotkey,
-            pull_request.github_id,
-            pull_request.earned_score,
-            pull_request.title,
-            pull_request.merged_at,
-            pull_request.created_at,
-            pull_request.additions,
-            pull_request.deletions,
-            pull_request.commits,
-            pull_request.author_login,
-            pull_request.merged_by_login
-        )
-        return self.set_entity(query, params)
+        return self.set_entity(SET_PULL_REQUEST, self._pull_request_params(pull_request))
 
     def get_pull_requests_by_repository(self, repository_full_name: str) -> List[PullRequest]:
         """
@@ -159,7 +287,142 @@ class PullRequestsRepository(BaseRepository):
         """
         return self.query_multiple(GET_PULL_REQUESTS_BY_MINER, (uid, hotkey, github_id), self._map_to_pull_request)
 
-    def get_pull_request_with_file_changes(self, pr_number: int, repository_full_name: str) -> Optional[PullRequest]:
+    def get_pull_requests_by_repository_page(
+        self,
+        repository_full_name: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        page_token: Optional[str] = None
+    ) -> Page[PullRequest]:
+        """
+        Get one page of a repository's pull requests, most recently merged first
+        (unmerged pull requests first of all), then by number descending.
+
+        Args:
+            repository_full_name: Full repository name
+            page_size: Maximum number of pull requests per page
+            page_token: next_page_token of the previous page, or None for the first page
+
+        Returns:
+            Page of PullRequest objects
+
+        Raises:
+            InvalidPageTokenError: If page_token was not issued by this listing
+        """
+        return self.query_page(
+            GET_PULL_REQUESTS_BY_REPOSITORY_PAGE,
+            GET_PULL_REQUESTS_BY_REPOSITORY_NEXT_PAGE,
+            (repository_full_name,),
+            ('merged_at', 'number'),
+            self._map_to_pull_request,
+            page_size,
+            page_token
+        )
+
+    def get_pull_requests_by_miner_page(
+        self,
+        uid: int,
+        hotkey: str,
+        github_id: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        page_token: Optional[str] = None
+    ) -> Page[PullRequest]:
+        """
+        Get one page of a miner's pull requests, highest earned score first, then most
+        recently merged. Repository and number break ties so the order is total.
+
+        Args:
+            uid: Miner UID
+            hotkey: Miner hotkey
+            github_id: Miner GitHub ID
+            page_size: Maximum number of pull requests per page
+            page_token: next_page_token of the previous page, or None for the first page
+
+        Returns:
+            Page of PullRequest objects
+
+        Raises:
+            InvalidPageTokenError: If page_token was not issued by this listing
+        """
+        return self.query_page(
+            GET_PULL_REQUESTS_BY_MINER_PAGE,
+            GET_PULL_REQUESTS_BY_MINER_NEXT_PAGE,
+            (uid, hotkey, github_id),
+            ('earned_score', 'merged_at', 'repository_full_name', 'number'),
+            self._map_to_pull_request,
+            page_size,
+            page_token
+        )
+
+    def get_pull_request_batch_by_repository(
+        self,
+        repository_full_name: str,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> PullRequestBatch:
+        """
+        Get all pull requests for a repository as one columnar PullRequestBatch,
+        streamed through a server-side cursor without building a PullRequest per row
+
+        Args:
+            repository_full_name: Full repository name
+            itersize: Rows fetched from the server per round trip
+
+        Returns:
+            PullRequestBatch (file changes via FileChangesRepository.get_file_change_batch(batch.keys()))
+        """
+        return self._collect_batch(self.iter_query(GET_PULL_REQUESTS_BY_REPOSITORY, (repository_full_name,), itersize))
+
+    def get_pull_request_batch_by_miner(
+        self,
+        uid: int,
+        hotkey: str,
+        github_id: str,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> PullRequestBatch:
+        """
+        Get all pull requests for a miner as one columnar PullRequestBatch
+
+        Args:
+            uid: Miner UID
+            hotkey: Miner hotkey
+            github_id: Miner GitHub ID
+            itersize: Rows fetched from the server per round trip
+
+        Returns:
+            PullRequestBatch ordered by earned score, highest first
+        """
+        return self._collect_batch(self.iter_query(GET_PULL_REQUESTS_BY_MINER, (uid, hotkey, github_id), itersize))
+
+    def get_miner_aggregate(self, uid: int, hotkey: str, github_id: str) -> MinerAggregate:
+        """
+        Get a miner's pull request totals (lines changed, distinct repositories, earned
+        score, pull request count) computed in a single aggregate query
+
+        Args:
+            uid: Miner UID
+            hotkey: Miner hotkey
+            github_id: Miner GitHub ID
+
+        Returns:
+            MinerAggregate, with zero totals if the miner has no pull requests
+        """
+        aggregate = self.query_single(GET_MINER_AGGREGATE, (uid, hotkey, github_id), self._map_to_miner_aggregate)
+        return aggregate or MinerAggregate(uid, hotkey, github_id, 0, 0, 0, 0.0)
+
+    def get_miner_aggregates(self) -> List[MinerAggregate]:
+        """
+        Get the pull request totals of every miner with pull requests in one GROUP BY query
+
+        Returns:
+            List of MinerAggregate ordered by uid, hotkey, github_id
+        """
+        return self.query_multiple(GET_MINER_AGGREGATES, (), self._map_to_miner_aggregate)
+
+    def get_pull_request_with_file_changes(
+        self,
+        pr_number: int,
+        repository_full_name: str,
+        metadata_only: bool = False
+    ) -> Optional[PullRequest]:
         """
         Get a pull request with its associated file changes.
 
@@ -169,57 +432,95 @@ class PullRequestsRepository(BaseRepository):
         Args:
             pr_number: PR number
             repository_full_name: Full repository name
+            metadata_only: Skip the patches; they are loaded for the whole PR on first access
 
         Returns:
             PullRequest object with nested FileChanges, or None if not found
         """
-        results = self.execute_query(GET_PULL_REQUEST_WITH_FILE_CHANGES, (pr_number, repository_full_name))
+        query = GET_PULL_REQUEST_WITH_FILE_CHANGE_METADATA if metadata_only else GET_PULL_REQUEST_WITH_FILE_CHANGES
+        results = self.execute_query(query, (pr_number, repository_full_name))
         return self._map_to_pull_request_with_file_changes(results)
 
-    def get_pull_requests_by_repository_with_file_changes(self, repository_full_name: str) -> List[PullRequest]:
+    def get_pull_requests_by_repository_with_file_changes(
+        self,
+        repository_full_name: str,
+        metadata_only: bool = False
+    ) -> List[PullRequest]:
         """
         Get all pull requests for a repository with their associated file changes.
 
+        Pull requests are fetched once and their file changes are fetched in batched
+        follow-up queries, so PR columns are not repeated on every file change row.
+
         Note: This can be memory intensive for repositories with many PRs and large file changes.
-        Consider pagination for production use.
+        Consider get_pull_requests_by_repository_page with load_file_changes for production use.
 
         Args:
             repository_full_name: Full repository name
+            metadata_only: Skip the patches; each PR's are loaded together on first access
 
         Returns:
             List of PullRequest objects with nested file changes
         """
-        # Modify query to get all PRs for repository
-        query = GET_PULL_REQUEST_WITH_FILE_CHANGES.replace(
-            "WHERE pr.number = %s AND pr.repository_full_name = %s",
-            "WHERE pr.repository_full_name = %s ORDER BY pr.merged_at DESC"
+        pull_requests = self.get_pull_requests_by_repository(repository_full_name)
+        return self.load_file_changes(pull_requests, metadata_only)
+
+    def load_file_changes(self, pull_requests: List[PullRequest], metadata_only: bool = False) -> List[PullRequest]:
+        """
+        Eager load file changes onto already fetched pull requests.
+
+        Args:
+            pull_requests: PullRequest objects to populate
+            metadata_only: Skip the patches; each PR's are loaded together on first access
+
+        Returns:
+            The same PullRequest objects; file_changes is left as None for PRs without any
+        """
+        file_changes = self.file_changes.get_file_changes_for_pull_requests(
+            ((pr.number, pr.repository_full_name) for pr in pull_requests),
+            metadata_only=metadata_only
         )
+        for pr in pull_requests:
+            pr_file_changes = file_changes.get((pr.number, pr.repository_full_name))
+            if pr_file_changes:
+                pr.file_changes = pr_file_changes
+        return pull_requests
 
-        results = self.execute_query(query, (repository_full_name,))
+    def iter_pull_requests_by_repository_with_file_changes(
+        self,
+        repository_full_name: str,
+        itersize: int = DEFAULT_ITERSIZE
+    ) -> Iterator[PullRequest]:
+        """
+        Stream pull requests for a repository with their file changes, one PR at a time.
 
-        # Group results by PR number to handle multiple file changes per PR
-        pr_groups = {}
-        for result in results:
-            pr_key = result['number']
-            if pr_key not in pr_groups:
-                pr_groups[pr_key] = []
-            pr_groups[pr_key].append(result)
+        Rows are read through a server-side cursor and only one PR's file changes
+        are held in memory at once, so this is safe for very large repositories.
 
-        # Map each group to a PullRequest with nested data
-        pull_requests = []
-        for pr_results in pr_groups.values():
-            pr = self._map_to_pull_request_with_file_changes(pr_results)
-            if pr:
-                pull_requests.append(pr)
+        Args:
+            repository_full_name: Full repository name
+            itersize: Rows fetched from the server per round trip
 
-        return pull_requests
+        Yields:
+            PullRequest objects with nested file changes
+        """
+        rows = self.iter_query(GET_PULL_REQUESTS_WITH_FILE_CHANGES_BY_REPOSITORY, (repository_full_name,), itersize)
+        for _, pr_rows in groupby(rows, key=lambda row: row['number']):
+            pr = self._map_to_pull_request_with_file_changes(list(pr_rows))
+            if pr:
+                yield pr
 
-    def store_pull_requests_bulk(self, pull_requests: List[PullRequest]) -> int:
+    def store_pull_requests_bulk(
+        self,
+        pull_requests: Union[List[PullRequest], PullRequestBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> int:
         """
         Bulk insert/update pull requests with efficient SQL conflict resolution
 
         Args:
-            pull_requests: List of PullRequest objects to store
+            pull_requests: PullRequest objects or a PullRequestBatch to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
 
         Returns:
             Count of successfully stored pull requests
@@ -227,45 +528,98 @@ class PullRequestsRepository(BaseRepository):
         if not pull_requests:
             return 0
 
+        try:
+            with self.transaction() as cursor:
+                return self.write_pull_requests_bulk(cursor, pull_requests, method)
+        except Exception as e:
+            self.logger.error(f"Error in bulk pull request storage: {e}")
+            return 0
+
+    def write_pull_requests_bulk(
+        self,
+        cursor,
+        pull_requests: Union[List[PullRequest], PullRequestBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> int:
+        """
+        Write pull requests on an open cursor without committing, so callers can combine
+        several bulk writes into one transaction.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            pull_requests: PullRequest objects or a PullRequestBatch to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            Count of written pull requests
+        """
+        if not pull_requests:
+            return 0
+
         # Prepare data for bulk insert
-        values = []
-        for pr in pull_requests:
+        values = self._bulk_params(pull_requests)
+
+        self.execute_bulk(
+            cursor,
+            values,
+            BULK_UPSERT_PULL_REQUESTS,
+            (CREATE_PULL_REQUESTS_STAGING, COPY_PULL_REQUESTS_STAGING, INSERT_PULL_REQUESTS_FROM_STAGING),
+            method
+        )
+        return len(values)
 
-            # uid is causing issues bc it keeps remaining as an np.int64
-            if isinstance(pr.uid, np.integer):
-                pr.uid = pr.uid.item()  # Converts numpy int to Python int
-                
-            values.append((
-                pr.number,
-                pr.repository_full_name,
-                pr.uid,
-                pr.hotkey,
-                pr.github_id,
-                pr.earned_score,
-                pr.title,
-                pr.merged_at,
-                pr.created_at,
-                pr.additions,
-                pr.deletions,
-                pr.commits,
-                pr.author_login,
-                pr.merged_by_login
-            ))
+    def upsert_pull_requests_bulk(
+        self,
+        pull_requests: Union[List[PullRequest], PullRequestBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Bulk insert pull requests and update stored ones whose values changed (e.g. a
+        recalculated earned_score), leaving identical rows untouched
+
+        Args:
+            pull_requests: PullRequest objects or a PullRequestBatch to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (all zero if the transaction failed)
+        """
+        if not pull_requests:
+            return UpsertCounts()
 
         try:
-            with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_PULL_REQUESTS.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
-                self.db.commit()
-                return len(values)
+            with self.transaction() as cursor:
+                return self.write_pull_requests_upsert(cursor, pull_requests, method)
         except Exception as e:
-            self.db.rollback()
-            self.logger.error(f"Error in bulk pull request storage: {e}")
-            return 0
\ No newline at end of file
+            self.logger.error(f"Error in bulk pull request upsert: {e}")
+            return UpsertCounts()
+
+    def write_pull_requests_upsert(
+        self,
+        cursor,
+        pull_requests: Union[List[PullRequest], PullRequestBatch],
+        method: str = BULK_METHOD_VALUES
+    ) -> UpsertCounts:
+        """
+        Change-aware upsert of pull requests on an open cursor without committing
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            pull_requests: PullRequest objects or a PullRequestBatch to store
+            method: 'values' (execute_values) or 'copy' (COPY into a staging table)
+
+        Returns:
+            UpsertCounts (a pull request given twice counts once, with its last values)
+        """
+        if not pull_requests:
+            return UpsertCounts()
+
+        # Key is (number, repository_full_name)
+        values = unique_rows(self._bulk_params(pull_requests), 2)
+        return self.execute_bulk_upsert(
+            cursor,
+            values,
+            BULK_UPSERT_CHANGED_PULL_REQUESTS,
+            (CREATE_PULL_REQUESTS_STAGING, COPY_PULL_REQUESTS_STAGING, UPSERT_CHANGED_PULL_REQUESTS_FROM_STAGING),
+            method
+        )
\ No newline at end of file
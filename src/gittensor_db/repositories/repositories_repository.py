@@ -1,21 +1,27 @@
 """
 Repository for handling database operations for Repository entities
 """
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Set, Iterable
 from ..models.domain_models import Repository
 from .base_repository import BaseRepository
+from .row_mapping import RowMapper, uses_row_mapper
 from ..queries import (
     GET_REPOSITORY,
+    GET_REPOSITORIES_BY_FULL_NAMES,
     SET_REPOSITORY,
     GET_ALL_REPOSITORIES,
     BULK_UPSERT_REPOSITORIES
 )
 
 
+REPOSITORY_ROW = RowMapper(Repository, 'name', 'owner')
+
+
 class RepositoriesRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
+    @uses_row_mapper(REPOSITORY_ROW)
     def _map_to_repository(self, row: Dict[str, Any]) -> Repository:
         """Map database row to Repository object"""
         return Repository(
@@ -23,6 +29,19 @@ class RepositoriesRepository(BaseRepository):
             owner=row['owner']
         )
 
+    def _repository_params(self, repository: Repository) -> tuple:
+        """Build the (full_name, name, owner) parameter tuple for a Repository"""
+        return (repository.full_name, repository.name, repository.owner)
+
+    def _repository_values(self, repository_full_names: Set[str]) -> List[tuple]:
+        """Build (full_name, name, owner) tuples from "owner/name" strings, skipping malformed names"""
+        values = []
+        for full_name in repository_full_names:
+            parts = full_name.split('/')
+            if len(parts) == 2:
+                values.append((full_name, parts[1], parts[0]))  # (full_name, name, owner)
+        return values
+
     def get_repository(self, repository_full_name: str) -> Optional[Repository]:
         """
         Get a repository by its full name
@@ -35,6 +54,23 @@ class RepositoriesRepository(BaseRepository):
         """
         return self.query_single(GET_REPOSITORY, (repository_full_name,), self._map_to_repository)
 
+    def get_repositories(self, repository_full_names: Iterable[str]) -> Dict[str, Optional[Repository]]:
+        """
+        Get many repositories by full name in one round trip per batch
+
+        Args:
+            repository_full_names: Full repository names (owner/name)
+
+        Returns:
+            Repository per input key, None for keys that were not found
+        """
+        return self.query_many(
+            GET_REPOSITORIES_BY_FULL_NAMES,
+            repository_full_names,
+            lambda row: row['full_name'],
+            self._map_to_repository
+        )
+
     def set_repository(self, repository: Repository) -> bool:
         """
         Insert or update a repository
@@ -45,12 +81,7 @@ class RepositoriesRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
-        params = (
-            repository.full_name,
-            repository.name,
-            repository.owner
-        )
-        return self.set_entity(SET_REPOSITORY, params)
+        return self.set_entity(SET_REPOSITORY, self._repository_params(repository))
 
     def get_all_repositories(self) -> List[Repository]:
         """
@@ -74,30 +105,30 @@ class RepositoriesRepository(BaseRepository):
         if not repository_full_names:
             return 0
 
+        try:
+            with self.transaction() as cursor:
+                return self.write_repositories_bulk(cursor, repository_full_names)
+        except Exception as e:
+            self.logger.error(f"Error in bulk repository storage: {e}")
+            return 0
+
+    def write_repositories_bulk(self, cursor, repository_full_names: Set[str]) -> int:
+        """
+        Write repositories on an open cursor without committing, so callers can combine
+        several bulk writes into one transaction.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            repository_full_names: Set of strings like {"owner/repo", "other/owner"}
+
+        Returns:
+            Count of written repositories
+        """
         # Prepare data for bulk insert
-        values = []
-        for full_name in repository_full_names:
-            parts = full_name.split('/')
-            if len(parts) == 2:
-                values.append((full_name, parts[1], parts[0]))  # (full_name, name, owner)
+        values = self._repository_values(repository_full_names)
 
         if not values:
             return 0
 
-        try:
-            with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_REPOSITORIES.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
-                self.db.commit()
-                return len(values)
-        except Exception as e:
-            self.db.rollback()
-            self.logger.error(f"Error in bulk repository storage: {e}")
-            return 0
\ No newline at end of file
+        self.execute_bulk(cursor, values, BULK_UPSERT_REPOSITORIES)
+        return len(values)
\ No newline at end of file
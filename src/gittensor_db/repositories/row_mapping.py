@@ -0,0 +1,175 @@
+"""
+Positional mapping of tuple rows to domain objects.
+
+Repositories work with plain tuple cursors as well as dict cursors (RealDictCursor,
+psycopg's dict_row). A RowMapper declares which result columns feed which model
+fields; for each column layout (cursor.description) it compiles, once, a function
+that builds the model from a tuple row by position, with no per-row dict or column
+name lookups. The dict-keyed _map_to_* methods stay the reference implementation and
+are used for dict rows; uses_row_mapper links one to its RowMapper.
+
+    PULL_REQUEST_ROW = RowMapper(PullRequest, 'number', column('created_at', 'pr_created_at'), ...)
+
+    @uses_row_mapper(PULL_REQUEST_ROW)
+    def _map_to_pull_request(self, row): ...
+"""
+import inspect
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+T = TypeVar('T')
+
+_REQUIRED = object()
+
+
+@dataclass(frozen=True)
+class Column:
+    """How one model field is read from a result row"""
+    field: str                                  # model constructor argument
+    columns: Tuple[str, ...]                    # result columns passed to convert (or the value itself)
+    convert: Optional[Callable[..., Any]] = None
+    default: Any = _REQUIRED                    # value when a column is missing from the result
+
+
+def column(field: str, *columns: str, convert: Optional[Callable[..., Any]] = None, default: Any = _REQUIRED) -> Column:
+    """
+    Declare a mapped field
+
+    Args:
+        field: Model constructor argument
+        *columns: Result columns it is read from (default: the column named like the field)
+        convert: Called with the column values; without it the single column value is used
+        default: Used when a column is absent from the result (like row.get); by default
+            a missing column raises KeyError, like row[...]
+    """
+    return Column(field, columns or (field,), convert, default)
+
+
+def float_or_zero(value) -> float:
+    """NUMERIC / NULL to float (0.0 for NULL)"""
+    return float(value) if value is not None else 0.0
+
+
+def int_or_zero(value) -> int:
+    """NUMERIC / NULL to int (0 for NULL)"""
+    return int(value) if value is not None else 0
+
+
+def or_zero(value):
+    """NULL to 0, other values unchanged"""
+    return value or 0
+
+
+def column_names(description) -> Tuple[str, ...]:
+    """Result column names from a DB-API cursor.description"""
+    return tuple(item[0] for item in description)
+
+
+def _constructor_parameters(model) -> List[str]:
+    if is_dataclass(model):
+        return [f.name for f in fields(model) if f.init]
+    try:
+        signature = inspect.signature(model)
+    except (TypeError, ValueError):
+        return []  # no introspectable signature (builtins): keyword arguments only
+    return [
+        name for name, parameter in signature.parameters.items()
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+    ]
+
+
+class RowMapper:
+    """Builds one model type from tuple rows by column position (see module docstring)"""
+
+    def __init__(self, model: Callable[..., T], *columns: Union[str, Column]):
+        """
+        Args:
+            model: Class (or factory) the rows become
+            *columns: Mapped fields, as Column or a plain name for a same-named column
+        """
+        self.model = model
+        self.columns = tuple(column(spec) if isinstance(spec, str) else spec for spec in columns)
+        self._compiled: Dict[Tuple[str, ...], Callable[[Sequence[Any]], T]] = {}
+
+    def compile(self, names: Tuple[str, ...]) -> Callable[[Sequence[Any]], T]:
+        """Row -> model function for rows with these column names (cached per layout)"""
+        mapper = self._compiled.get(names)
+        if mapper is None:
+            mapper = self._compiled[names] = self._build(names)
+        return mapper
+
+    def _build(self, names: Tuple[str, ...]) -> Callable[[Sequence[Any]], T]:
+        # Later duplicates win, as in a dict row
+        positions = {name: index for index, name in enumerate(names)}
+        namespace: Dict[str, Any] = {'_model': self.model}
+        expressions: Dict[str, str] = {}
+        for index, spec in enumerate(self.columns):
+            if all(name in positions for name in spec.columns):
+                values = [f"row[{positions[name]}]" for name in spec.columns]
+                if spec.convert is None:
+                    expressions[spec.field] = values[0]
+                else:
+                    namespace[f"_convert{index}"] = spec.convert
+                    expressions[spec.field] = f"_convert{index}({', '.join(values)})"
+            elif spec.default is _REQUIRED:
+                raise KeyError(next(name for name in spec.columns if name not in positions))
+            else:
+                namespace[f"_default{index}"] = spec.default
+                expressions[spec.field] = f"_default{index}"
+
+        # Positional arguments for the leading constructor parameters, keywords after the first gap
+        arguments = []
+        parameters = _constructor_parameters(self.model)
+        for parameter in parameters:
+            if parameter not in expressions:
+                break
+            arguments.append(expressions.pop(parameter))
+        arguments.extend(f"{field}={expression}" for field, expression in expressions.items())
+
+        source = f"def map_row(row):\n    return _model({', '.join(arguments)})\n"
+        exec(source, namespace)
+        return namespace['map_row']
+
+
+def uses_row_mapper(row_mapper: RowMapper):
+    """Decorator linking a dict-keyed _map_to_* method to the RowMapper used for tuple rows"""
+    def decorate(function):
+        function.row_mapper = row_mapper
+        return function
+    return decorate
+
+
+def resolve_mapper(
+    mapper: Callable[[Any], T],
+    description,
+    row: Any
+) -> Callable[[Any], T]:
+    """
+    The mapper to apply to rows shaped like row
+
+    Dict-like rows (and anything that isn't a tuple) go to mapper unchanged. Tuple
+    rows use mapper's RowMapper compiled for this column layout, or are turned into
+    dicts for mappers without one.
+    """
+    if row is None or not isinstance(row, tuple):
+        return mapper
+    names = column_names(description)
+    row_mapper: Optional[RowMapper] = getattr(mapper, 'row_mapper', None)
+    if row_mapper is not None:
+        return row_mapper.compile(names)
+    return lambda values: mapper(dict(zip(names, values)))
+
+
+def as_dicts(description, rows: Sequence[Any]) -> Sequence[Any]:
+    """rows as column name -> value dicts (dict-like rows are returned unchanged)"""
+    if not rows or not isinstance(rows[0], tuple):
+        return rows
+    names = column_names(description)
+    return [dict(zip(names, row)) for row in rows]
+
+
+def as_dict(description, row: Any) -> Any:
+    """row as a column name -> value dict (dict-like rows and None are returned unchanged)"""
+    if row is None or not isinstance(row, tuple):
+        return row
+    return dict(zip(column_names(description), row))
@@ -0,0 +1,169 @@
+"""
+Repository for handling database operations for IngestWatermark entities
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from ..models.domain_models import IngestWatermark, PullRequest
+from .base_repository import BaseRepository
+from .row_mapping import RowMapper, uses_row_mapper
+from ..queries import (
+    GET_INGEST_WATERMARK,
+    GET_INGEST_WATERMARKS_BY_MINER,
+    BULK_ADVANCE_INGEST_WATERMARKS,
+    DELETE_INGEST_WATERMARKS_BY_MINER
+)
+
+
+INGEST_WATERMARK_ROW = RowMapper(
+    IngestWatermark, 'uid', 'hotkey', 'github_id', 'repository_full_name', 'last_merged_at', 'last_pr_number'
+)
+
+
+def advance_watermark(watermarks: Dict[Tuple, IngestWatermark], pr: PullRequest) -> None:
+    """
+    Move the watermark of pr's miner and repository up to pr if pr is newer
+
+    Args:
+        watermarks: (uid, hotkey, github_id, repository_full_name) -> IngestWatermark, updated in place
+        pr: PullRequest (ignored when unmerged)
+    """
+    if pr.merged_at is None:
+        return
+    key = (pr.uid, pr.hotkey, pr.github_id, pr.repository_full_name)
+    watermark = watermarks.get(key)
+    if watermark is None or not watermark.covers(pr):
+        watermarks[key] = IngestWatermark(
+            uid=pr.uid,
+            hotkey=pr.hotkey,
+            github_id=pr.github_id,
+            repository_full_name=pr.repository_full_name,
+            last_merged_at=pr.merged_at,
+            last_pr_number=pr.number
+        )
+
+
+def watermarks_for(pull_requests: Iterable[PullRequest]) -> List[IngestWatermark]:
+    """
+    Newest merged pull request per miner and repository, as watermarks
+
+    Args:
+        pull_requests: PullRequest objects (unmerged ones are ignored)
+
+    Returns:
+        One IngestWatermark per (miner, repository) with a merged pull request
+    """
+    watermarks: Dict[Tuple, IngestWatermark] = {}
+    for pr in pull_requests:
+        advance_watermark(watermarks, pr)
+    return list(watermarks.values())
+
+
+class WatermarksRepository(BaseRepository):
+    def __init__(self, db_connection):
+        super().__init__(db_connection)
+
+    @uses_row_mapper(INGEST_WATERMARK_ROW)
+    def _map_to_watermark(self, row: Dict[str, Any]) -> IngestWatermark:
+        """Map database row to IngestWatermark object"""
+        return IngestWatermark(
+            uid=row['uid'],
+            hotkey=row['hotkey'],
+            github_id=row['github_id'],
+            repository_full_name=row['repository_full_name'],
+            last_merged_at=row['last_merged_at'],
+            last_pr_number=row['last_pr_number']
+        )
+
+    def _watermark_params(self, watermark: IngestWatermark) -> tuple:
+        return (
+            watermark.uid,
+            watermark.hotkey,
+            watermark.github_id,
+            watermark.repository_full_name,
+            watermark.last_merged_at,
+            watermark.last_pr_number
+        )
+
+    def get_watermark(self, uid: int, hotkey: str, github_id: str, repository_full_name: str) -> Optional[IngestWatermark]:
+        """
+        Get a miner's watermark in one repository
+
+        Args:
+            uid: Miner's UID
+            hotkey: Miner's hotkey
+            github_id: Miner's GitHub ID
+            repository_full_name: Repository full name
+
+        Returns:
+            IngestWatermark if anything was ingested there, None otherwise
+        """
+        return self.query_single(
+            GET_INGEST_WATERMARK, (uid, hotkey, github_id, repository_full_name), self._map_to_watermark
+        )
+
+    def get_watermarks(self, uid: int, hotkey: str, github_id: str) -> Dict[str, IngestWatermark]:
+        """
+        Get a miner's watermarks in all repositories
+
+        Args:
+            uid: Miner's UID
+            hotkey: Miner's hotkey
+            github_id: Miner's GitHub ID
+
+        Returns:
+            Dict mapping repository full name to IngestWatermark
+        """
+        watermarks = self.query_multiple(GET_INGEST_WATERMARKS_BY_MINER, (uid, hotkey, github_id), self._map_to_watermark)
+        return {watermark.repository_full_name: watermark for watermark in watermarks}
+
+    def advance_watermarks(self, watermarks: List[IngestWatermark]) -> int:
+        """
+        Move watermarks forward (older ones than stored are ignored)
+
+        Args:
+            watermarks: IngestWatermark objects, at most one per miner and repository
+
+        Returns:
+            Count of watermarks written
+        """
+        if not watermarks:
+            return 0
+
+        try:
+            with self.transaction() as cursor:
+                return self.write_watermarks(cursor, watermarks)
+        except Exception as e:
+            self.logger.error(f"Error advancing ingest watermarks: {e}")
+            return 0
+
+    def write_watermarks(self, cursor, watermarks: List[IngestWatermark]) -> int:
+        """
+        Advance watermarks on an open cursor without committing, so they can be moved
+        in the same transaction as the rows they cover.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            watermarks: IngestWatermark objects, at most one per miner and repository
+
+        Returns:
+            Count of watermarks written
+        """
+        if not watermarks:
+            return 0
+
+        values = [self._watermark_params(watermark) for watermark in watermarks]
+        self.execute_bulk(cursor, values, BULK_ADVANCE_INGEST_WATERMARKS)
+        return len(values)
+
+    def reset_watermarks(self, uid: int, hotkey: str, github_id: str) -> bool:
+        """
+        Forget a miner's watermarks so the next ingest sends all of their pull requests
+
+        Args:
+            uid: Miner's UID
+            hotkey: Miner's hotkey
+            github_id: Miner's GitHub ID
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.execute_command(DELETE_INGEST_WATERMARKS_BY_MINER, (uid, hotkey, github_id))
@@ -0,0 +1,69 @@
+"""
+Content-addressed, compressed encoding of file change patches.
+
+Each distinct patch is stored once in patch_blobs, keyed by the SHA-256 of its UTF-8
+text, so identical diffs (forks, rebases, re-ingested PRs) share one row. Blobs are
+zlib-compressed unless that doesn't make them smaller; file_changes.patch_hash points
+at the blob and readers get the original text back from decode_patch.
+"""
+import hashlib
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_ZLIB = 'zlib'
+
+ZLIB_LEVEL = 6
+
+# Patches shorter than this are stored uncompressed (zlib overhead outweighs the gain)
+MIN_COMPRESS_SIZE = 128
+
+
+def patch_hash(patch: str) -> Tuple[bytes, bytes]:
+    """
+    Hash a patch for content addressing
+
+    Returns:
+        (SHA-256 digest, UTF-8 encoded patch) so callers can compress without re-encoding
+    """
+    raw = patch.encode('utf-8')
+    return hashlib.sha256(raw).digest(), raw
+
+
+def compress_patch(raw: bytes) -> Tuple[str, bytes]:
+    """
+    Compress UTF-8 patch bytes
+
+    Returns:
+        (compression name, stored bytes)
+    """
+    if len(raw) >= MIN_COMPRESS_SIZE:
+        compressed = zlib.compress(raw, ZLIB_LEVEL)
+        if len(compressed) < len(raw):
+            return COMPRESSION_ZLIB, compressed
+    return COMPRESSION_NONE, raw
+
+
+def decode_patch(compression: str, data: Any) -> str:
+    """Return the patch text stored as data with the given compression"""
+    data = bytes(data)  # psycopg2 returns bytea as memoryview
+    if compression == COMPRESSION_ZLIB:
+        data = zlib.decompress(data)
+    elif compression != COMPRESSION_NONE:
+        raise ValueError(f"Unknown patch compression {compression!r}")
+    return data.decode('utf-8')
+
+
+def patch_from_row(row: Dict[str, Any]) -> Optional[str]:
+    """
+    Patch text of a file_changes row joined to patch_blobs (patch_compression,
+    patch_data), falling back to the legacy inline patch column
+    """
+    return patch_from_columns(row.get('patch_compression'), row.get('patch_data'), row.get('patch'))
+
+
+def patch_from_columns(compression: Optional[str], data: Any, patch: Optional[str]) -> Optional[str]:
+    """patch_from_row for the patch_compression, patch_data and patch column values"""
+    if data is not None:
+        return decode_patch(compression, data)
+    return patch
@@ -0,0 +1,152 @@
+"""
+Async repository layer tests
+File: tests/test_aio.py
+"""
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from src.gittensor_db import aio
+from src.gittensor_db.aio.base_repository import expand_values_query
+from src.gittensor_db.models import PullRequest, Issue, FileChange
+from src.gittensor_db.queries import (
+    GET_EXISTING_PATCH_HASHES,
+    GET_FILE_CHANGES_FOR_PULL_REQUESTS,
+    GET_PULL_REQUESTS_BY_REPOSITORY,
+    UPSERT_CHANGED_ISSUES_FROM_STAGING
+)
+from src.gittensor_db.repositories import MinersRepository, UpsertCounts
+
+
+def test_expand_values_query():
+    query = "INSERT INTO miners (uid, hotkey, github_id)\nVALUES %s\nON CONFLICT DO NOTHING"
+    expanded = expand_values_query(query, row_width=3, row_count=2)
+    assert "VALUES (%s, %s, %s), (%s, %s, %s)\n" in expanded
+
+
+def test_async_repositories_share_sync_mappers():
+    assert aio.MinersRepository._map_to_miner is MinersRepository._map_to_miner
+
+
+def test_async_query_single_maps_row():
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.close = AsyncMock()
+    cursor.fetchone = AsyncMock(return_value={'uid': 7, 'hotkey': 'hk', 'github_id': 'gh'})
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+
+    miner = asyncio.run(aio.MinersRepository(connection).get_miner_by_uid(7))
+
+    assert miner.uid == 7
+    cursor.close.assert_awaited_once()
+
+
+def test_async_store_file_changes_bulk_writes_patch_blobs():
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.close = AsyncMock()
+    cursor.fetchall = AsyncMock(return_value=[])
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    connection.commit = AsyncMock()
+    file_changes = [FileChange(1, 'o/r', 'a.py', 1, 1, 0, 'added', patch='@@ -0,0 +1 @@\n+x')]
+
+    stored = asyncio.run(aio.FileChangesRepository(connection).store_file_changes_bulk(file_changes))
+
+    assert stored == 1
+    queries = [call.args[0] for call in cursor.execute.await_args_list]
+    assert queries[0] == GET_EXISTING_PATCH_HASHES
+    assert [query.split('(')[0].strip() for query in queries[1:]] == ['INSERT INTO patch_blobs', 'INSERT INTO file_changes']
+
+
+def async_connection(fetchone=None, fetchall=()):
+    """Mock AsyncConnection whose cursor returns the given rows"""
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.close = AsyncMock()
+    cursor.fetchone = AsyncMock(side_effect=fetchone)
+    cursor.fetchall = AsyncMock(return_value=list(fetchall))
+    copy = MagicMock()
+    copy.write_row = AsyncMock()
+    cursor.copy.return_value.__aenter__.return_value = copy
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    connection.commit = AsyncMock()
+    connection.rollback = AsyncMock()
+    return connection
+
+
+def executed(connection):
+    return [call.args[0] for call in connection.cursor.return_value.execute.await_args_list]
+
+
+def test_async_store_issues_bulk_executes_insert():
+    connection = async_connection()
+    issues = [Issue(number=n, pr_number=1, repository_full_name='o/r', title='Bug') for n in (7, 8)]
+
+    stored = asyncio.run(aio.IssuesRepository(connection).store_issues_bulk(issues))
+
+    assert stored == 2
+    assert [query.split('(')[0].strip() for query in executed(connection)] == ['INSERT INTO issues']
+    connection.commit.assert_awaited_once()
+
+
+def test_async_upsert_sums_count_rows_per_page():
+    connection = async_connection(fetchone=[{'inserted': 100, 'updated': 0}, {'inserted': 20, 'updated': 5}])
+    pull_requests = [
+        PullRequest(n, 'o/r', 1, 'hk', 'gh', 't', 'a', datetime(2024, 1, 1), datetime(2024, 1, 1))
+        for n in range(150)
+    ]
+
+    counts = asyncio.run(aio.PullRequestsRepository(connection).upsert_pull_requests_bulk(pull_requests))
+
+    assert counts == UpsertCounts(inserted=120, updated=5, unchanged=25)
+    assert len(executed(connection)) == 2
+    connection.commit.assert_awaited_once()
+
+
+def test_async_issue_upsert_copy_reads_the_count_row():
+    connection = async_connection(fetchone=[{'inserted': 1, 'updated': 0}])
+    issues = [Issue(number=n, pr_number=1, repository_full_name='o/r', title='Bug') for n in (7, 8, 7)]
+
+    counts = asyncio.run(aio.IssuesRepository(connection).upsert_issues_bulk(issues, method='copy'))
+
+    assert counts == UpsertCounts(inserted=1, updated=0, unchanged=1)
+    assert executed(connection)[-1] == UPSERT_CHANGED_ISSUES_FROM_STAGING
+    copy = connection.cursor.return_value.copy.return_value.__aenter__.return_value
+    assert copy.write_row.await_count == 2
+
+
+def test_async_file_change_upsert_counts_rows():
+    connection = async_connection(fetchone=[{'inserted': 0, 'updated': 1}])
+    file_changes = [FileChange(1, 'o/r', name, 1, 1, 0, 'added') for name in ('a.py', 'b.py')]
+
+    counts = asyncio.run(aio.FileChangesRepository(connection).upsert_file_changes_bulk(file_changes))
+
+    assert counts == UpsertCounts(inserted=0, updated=1, unchanged=1)
+    assert executed(connection)[0].lstrip().startswith('WITH upserted AS (\n    INSERT INTO file_changes')
+    connection.commit.assert_awaited_once()
+
+
+def test_async_repository_pull_requests_load_file_changes_in_a_second_query():
+    pr_rows = [
+        {'number': n, 'repository_full_name': 'o/r', 'uid': 1, 'hotkey': 'hk', 'github_id': 'gh', 'title': 't',
+         'author_login': 'a', 'merged_at': None, 'pr_created_at': None, 'earned_score': 1.0, 'additions': 1,
+         'deletions': 0, 'commits': 1, 'merged_by_login': None}
+        for n in (1, 2)
+    ]
+    file_rows = [
+        {'id': 10, 'pr_number': 2, 'repository_full_name': 'o/r', 'filename': 'a.py', 'changes': 1,
+         'additions': 1, 'deletions': 0, 'status': 'added', 'patch': '@@ a', 'file_extension': 'py'}
+    ]
+    connection = async_connection()
+    connection.cursor.return_value.fetchall = AsyncMock(side_effect=[pr_rows, file_rows])
+
+    pull_requests = asyncio.run(
+        aio.PullRequestsRepository(connection).get_pull_requests_by_repository_with_file_changes('o/r')
+    )
+
+    assert executed(connection) == [GET_PULL_REQUESTS_BY_REPOSITORY, GET_FILE_CHANGES_FOR_PULL_REQUESTS]
+    assert connection.cursor.return_value.execute.await_args_list[1].args[1] == ([1, 2], ['o/r', 'o/r'])
+    assert [pr.file_changes for pr in pull_requests][0] is None
+    assert [fc.patch for fc in pull_requests[1].file_changes] == ['@@ a']
@@ -0,0 +1,68 @@
+"""
+Slotted model and columnar batch tests
+File: tests/test_batches.py
+"""
+import pickle
+from datetime import datetime
+import numpy as np
+from src.gittensor_db.models import (
+    FileChange,
+    PullRequest,
+    SlottedFileChange,
+    SlottedMinerEvaluation,
+    FileChangeBatch,
+    PullRequestBatch,
+)
+from src.gittensor_db.repositories import FileChangesRepository, PullRequestsRepository
+
+
+def test_slotted_variants_keep_fields_defaults_and_methods():
+    file_change = SlottedFileChange(1, "o/r", "src/App.TSX", 3, 2, 1, "modified")
+
+    assert not hasattr(file_change, '__dict__')
+    assert file_change.file_extension == "tsx"
+    assert pickle.loads(pickle.dumps(file_change)) == file_change
+
+    evaluation = SlottedMinerEvaluation(uid=1, hotkey="hk")
+    assert evaluation.pull_requests == [] and evaluation.total_prs == 0
+    assert SlottedMinerEvaluation(uid=2, hotkey="hk").pull_requests is not evaluation.pull_requests
+
+
+def test_file_change_batch_round_trips_and_shares_repeated_strings():
+    file_changes = [
+        FileChange(pr, ''.join("o/r"), f"f{pr}_{n}.py", 3, 2, 1, ''.join("modified"), f"+{n}" if n else None, id=n or None)
+        for pr in (1, 2) for n in range(3)
+    ]
+
+    batch = FileChangeBatch(file_changes)
+
+    assert len(batch) == 6
+    assert list(batch) == file_changes
+    assert batch.to_file_changes(SlottedFileChange)[1].patch == "+1"
+    assert batch.repository_full_names[0] is batch.repository_full_names[5]
+    assert batch.statuses[0] is batch.statuses[5]
+    assert batch.pr_keys() == [(1, "o/r"), (2, "o/r")]
+    assert np.frombuffer(batch.additions, dtype=np.int32).sum() == 12
+
+
+def test_bulk_params_from_batches_match_object_params(mock_db_connection):
+    file_changes = [FileChange(1, "o/r", "a.py", 3, 2, 1, "modified", "+x"), FileChange(1, "o/r", "b", 1, 1, 0, "added")]
+    pull_requests = [
+        PullRequest(
+            number=7, repository_full_name="o/r", uid=np.int64(5), hotkey="hk", github_id="gh", title="t",
+            author_login="a", merged_at=datetime(2024, 1, 2), created_at=datetime(2024, 1, 1), earned_score=1.5
+        )
+    ]
+    file_changes_repo = FileChangesRepository(mock_db_connection)
+    pull_requests_repo = PullRequestsRepository(mock_db_connection)
+
+    object_patches, batch_patches = {}, {}
+    assert (
+        file_changes_repo._bulk_params(FileChangeBatch(file_changes), batch_patches)
+        == file_changes_repo._bulk_params(file_changes, object_patches)
+    )
+    assert batch_patches == object_patches
+    assert (
+        pull_requests_repo._bulk_params(PullRequestBatch(pull_requests))
+        == pull_requests_repo._bulk_params(pull_requests)
+    )
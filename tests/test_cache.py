@@ -0,0 +1,48 @@
+"""
+Read-through cache tests
+File: tests/test_cache.py
+"""
+from src.gittensor_db.utils.cache import MISSING, TTLCache
+from src.gittensor_db.repositories import CachedMinersRepository
+from src.gittensor_db.models.domain_models import Miner
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_evicts_lru_and_expires():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', None)
+    assert cache.get('a') == 1          # 'a' becomes most recently used
+    cache.set('c', 3)                   # evicts 'b'
+    assert cache.get('b') is MISSING
+
+    clock.now = 11
+    assert cache.get('a') is MISSING
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (1, 2, 1, 1)
+
+
+def test_cached_miners_repository_reads_through_and_invalidates_on_write(mock_db_connection):
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchone.return_value = {'uid': 1, 'hotkey': 'hk', 'github_id': 'gh'}
+    repo = CachedMinersRepository(mock_db_connection, maxsize=8, ttl=60)
+
+    assert repo.get_miner_by_uid(1).hotkey == 'hk'
+    assert repo.get_miner_by_uid(1).hotkey == 'hk'
+    assert cursor.execute.call_count == 1
+
+    repo.upsert_miner(Miner(uid=1, hotkey='hk2', github_id='gh'))
+    cursor.fetchone.return_value = {'uid': 1, 'hotkey': 'hk2', 'github_id': 'gh'}
+    assert repo.get_miner_by_uid(1).hotkey == 'hk2'
+
+    stats = repo.cache_stats()
+    assert (stats.hits, stats.misses, stats.invalidations) == (1, 2, 1)
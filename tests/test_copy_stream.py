@@ -0,0 +1,27 @@
+"""
+COPY ingest helper tests
+File: tests/test_copy_stream.py
+"""
+from datetime import datetime
+from src.gittensor_db.utils.copy_stream import CopyRowStream, format_copy_row
+
+
+def test_format_copy_row_escapes_delimiters_and_nulls():
+    row = (1, None, "tab\there", "line\nbreak\\", datetime(2024, 1, 15, 10, 30))
+    assert format_copy_row(row) == "1\t\\N\ttab\\there\tline\\nbreak\\\\\t2024-01-15T10:30:00\n"
+
+
+def test_copy_row_stream_reads_in_chunks():
+    rows = [(i, "x" * 10) for i in range(100)]
+    expected = "".join(format_copy_row(row) for row in rows)
+
+    stream = CopyRowStream(rows)
+    chunks = []
+    while True:
+        chunk = stream.read(7)
+        if not chunk:
+            break
+        assert len(chunk) <= 7
+        chunks.append(chunk)
+
+    assert "".join(chunks) == expected
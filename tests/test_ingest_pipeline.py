@@ -0,0 +1,94 @@
+"""
+Streaming ingest pipeline tests
+File: tests/test_ingest_pipeline.py
+"""
+from unittest.mock import patch
+
+from src.gittensor_db.models import FileChange
+from src.gittensor_db.repositories import IngestPipeline
+from src.gittensor_db.repositories.ingest_pipeline import page_nodes
+
+
+def pr_node(number, repo='repo'):
+    return {
+        'number': number, 'title': f'PR {number}', 'author': {'login': 'dev'},
+        'repository': {'name': repo, 'owner': {'login': 'owner'}},
+        'mergedAt': '2024-01-02T00:00:00Z', 'createdAt': '2024-01-01T00:00:00Z',
+        'additions': 3, 'deletions': 1, 'commits': {'totalCount': 2}, 'mergedBy': None,
+        'closingIssuesReferences': {'nodes': [
+            {'number': 100 + number, 'title': 'Bug', 'createdAt': '2024-01-01T00:00:00Z', 'closedAt': '2024-01-02T00:00:00Z'},
+        ]},
+    }
+
+
+def graphql_page(*numbers):
+    return {'data': {'node': {'pullRequests': {'nodes': [pr_node(number) for number in numbers]}}}}
+
+
+def test_page_nodes_accepts_graphql_connections_and_rest_lists():
+    assert [node['number'] for node in page_nodes(graphql_page(1, 2))] == [1, 2]
+    assert page_nodes({'nodes': [1]}) == [1]
+    assert page_nodes([{'filename': 'a.py'}]) == [{'filename': 'a.py'}]
+    assert page_nodes({'data': {'rateLimit': {'cost': 1}}}) == []
+
+
+def test_pages_are_pulled_lazily_and_flushed_in_fk_order_when_a_buffer_fills(mock_db_connection):
+    pulled = []
+
+    def pages():
+        for numbers in ((1, 2), (3, 4), (5,)):
+            pulled.append(numbers)
+            yield graphql_page(*numbers)
+
+    mock_db_connection.cursor.return_value.fetchall.return_value = []  # no watermarks stored yet
+    pipeline = IngestPipeline(mock_db_connection, max_rows=2)
+    with patch('psycopg2.extras.execute_values') as execute_values:
+        assert pipeline.ingest_pull_request_pages(pages(), 7, 'hk', 'gh') == 5
+        assert pipeline.flush_count == 2 and pulled == [(1, 2), (3, 4), (5,)]
+        assert pipeline.buffered_rows['pull_requests'] == 1
+
+        pipeline.flush()
+
+    tables = [call.args[1].split()[2] for call in execute_values.call_args_list]
+    # miners and repositories only go out with the first flush
+    assert tables == ['miners', 'repositories', 'pull_requests', 'issues'] + ['pull_requests', 'issues'] * 2
+    assert pipeline.written == {'miners': 1, 'repositories': 1, 'pull_requests': 5, 'issues': 5, 'file_changes': 0}
+    assert mock_db_connection.commit.call_count == 3
+
+
+def test_byte_budget_flushes_large_patches_and_failures_are_counted(mock_db_connection):
+    files = [{'filename': f'f{n}.py', 'changes': 1, 'additions': 1, 'deletions': 0, 'status': 'added', 'patch': 'x' * 1000}
+             for n in range(4)]
+    pipeline = IngestPipeline(mock_db_connection, max_bytes=2000)
+
+    with patch('psycopg2.extras.execute_values', side_effect=RuntimeError('down')):
+        assert pipeline.ingest_file_change_pages([files[:2], files[2:]], 1, 'owner/repo') == 4
+
+    assert pipeline.flush_count == 2
+    assert pipeline.failed['file_changes'] == 4 and pipeline.written['file_changes'] == 0
+    assert pipeline.peak_buffered_bytes < 2 * 2000
+
+
+def test_failed_flush_does_not_orphan_file_changes_into_later_flushes(mock_db_connection):
+    def file_pages(pr):
+        return [[{'filename': f'{pr.number}-{n}.py', 'changes': 1, 'additions': 1, 'deletions': 0, 'status': 'added'}
+                 for n in range(2)]]
+
+    calls = []
+
+    def execute_values(cursor, query, values, **kwargs):
+        calls.append((query.split()[2], values))
+        if len(calls) == 1:
+            raise RuntimeError('down')
+
+    pipeline = IngestPipeline(mock_db_connection, max_rows=1, skip_ingested=False)
+    with patch('psycopg2.extras.execute_values', side_effect=execute_values):
+        pipeline.ingest_pull_request_pages([graphql_page(1)], 7, 'hk', 'gh', file_pages)
+        # A late file of the lost pull request is dropped instead of failing the next flush
+        pipeline.add_file_changes([FileChange(1, 'owner/repo', 'late.py', 1, 1, 0, 'added')])
+        pipeline.ingest_pull_request_pages([graphql_page(2)], 7, 'hk', 'gh', file_pages)
+
+    assert pipeline.failed == {'miners': 1, 'repositories': 1, 'pull_requests': 1, 'issues': 1, 'file_changes': 3}
+    assert pipeline.written == {'miners': 1, 'repositories': 1, 'pull_requests': 1, 'issues': 1, 'file_changes': 2}
+    written_files = [row[2] for table, values in calls[1:] if table == 'file_changes' for row in values]
+    assert written_files == ['2-0.py', '2-1.py']
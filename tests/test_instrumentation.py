@@ -0,0 +1,61 @@
+"""
+Query instrumentation tests
+File: tests/test_instrumentation.py
+"""
+import pytest
+from src.gittensor_db.instrumentation import (
+    QueryStatsRecorder,
+    add_query_hook,
+    instrument,
+    remove_query_hook,
+)
+from src.gittensor_db.queries import GET_ALL_MINERS
+
+
+@pytest.fixture
+def recorder():
+    hook = add_query_hook(QueryStatsRecorder())
+    yield hook
+    remove_query_hook(hook)
+
+
+def test_disabled_instrumentation_yields_no_event():
+    with instrument(GET_ALL_MINERS, 'select') as event:
+        assert event is None
+
+
+def test_query_multiple_records_rows_bytes_and_mapping_by_query_name(mock_db_connection, recorder):
+    from src.gittensor_db.repositories import MinersRepository
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'uid': 1, 'hotkey': 'hk1', 'github_id': 'gh1'},
+        {'uid': 2, 'hotkey': 'hk2', 'github_id': 'gh2'},
+    ]
+
+    assert len(MinersRepository(mock_db_connection).get_all_miners()) == 2
+
+    stats = recorder.snapshot()['GET_ALL_MINERS']
+    assert stats.count == 1
+    assert stats.rows == 2
+    assert stats.bytes_fetched == 2 * (8 + 3 + 3)
+    assert stats.mapping_time > 0
+    assert sum(stats.bucket_counts) == 1
+
+
+def test_failing_query_and_failing_hook_do_not_hide_each_other(mock_db_connection, recorder):
+    from src.gittensor_db.repositories import MinersRepository
+
+    def broken_hook(event):
+        raise RuntimeError("exporter down")
+
+    add_query_hook(broken_hook)
+    try:
+        cursor = mock_db_connection.cursor.return_value
+        cursor.execute.side_effect = ValueError("boom")
+        with pytest.raises(ValueError):
+            MinersRepository(mock_db_connection).execute_query(GET_ALL_MINERS)
+    finally:
+        remove_query_hook(broken_hook)
+
+    assert recorder.snapshot()['GET_ALL_MINERS'].errors == 1
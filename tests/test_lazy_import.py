@@ -0,0 +1,46 @@
+"""
+Lazy import tests
+File: tests/test_lazy_import.py
+"""
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def test_import_does_not_load_heavy_dependencies():
+    probe = (
+        "import sys, gittensor_db; "
+        "print(sorted(m for m in ('bittensor', 'numpy', 'psycopg2') if m in sys.modules)); "
+        "gittensor_db.MinersRepository; "
+        "print('bittensor' in sys.modules)"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC)
+    output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, env=env, check=True)
+    assert output.stdout.split('\n')[:2] == ['[]', 'False']
+
+
+def test_lazy_exports_resolve_and_unknown_names_raise():
+    import src.gittensor_db as gittensor_db
+    from src.gittensor_db.repositories.miners_repository import MinersRepository
+
+    assert gittensor_db.MinersRepository is MinersRepository
+    assert set(gittensor_db.__all__) <= set(dir(gittensor_db))
+    with pytest.raises(AttributeError):
+        gittensor_db.NotAnExport
+
+
+def test_log_messages_go_to_the_configured_logger(caplog):
+    from src.gittensor_db import log
+
+    log.set_logger(logging.getLogger('gittensor_db.test'))
+    try:
+        with caplog.at_level(logging.INFO, logger='gittensor_db.test'):
+            log.success("pool created")
+        assert caplog.records[-1].getMessage() == "pool created"
+    finally:
+        log.set_logger(None)
@@ -0,0 +1,87 @@
+"""
+Migration engine tests
+File: tests/test_migrations.py
+"""
+import itertools
+from src.gittensor_db.migrations.migrator import RECORD_MIGRATION, DatabaseMigrator, Migration
+from src.gittensor_db.migrations.sql_parser import split_sql_statements
+
+
+def test_split_sql_statements_ignores_semicolons_in_quotes_and_comments():
+    sql = """
+    -- leading comment; not a statement
+    CREATE TABLE t (note TEXT DEFAULT 'a;b', "odd;name" INT);
+    /* block; /* nested; */ still comment; */
+    INSERT INTO t (note) VALUES (E'it\\'s;here');
+    CREATE FUNCTION f() RETURNS trigger AS $body$
+    BEGIN
+        NEW.note := 'x;y';
+        RETURN NEW;
+    END;
+    $body$ LANGUAGE plpgsql;
+    -- trailing comment only
+    """
+    statements = split_sql_statements(sql)
+
+    assert len(statements) == 3
+    assert statements[0].endswith('"odd;name" INT)')
+    assert statements[1].endswith("VALUES (E'it\\'s;here')")
+    assert statements[2].startswith('CREATE FUNCTION') and statements[2].endswith('LANGUAGE plpgsql')
+
+
+def test_migration_files_are_versioned_and_ordered():
+    files = DatabaseMigrator(None).get_migration_files()
+
+    assert files[0] == '0001_repositories.sql'
+    versions = [int(name.split('_', 1)[0]) for name in files]
+    assert versions == sorted(versions)
+
+
+def test_migrate_skips_versions_recorded_in_ledger(mock_db_connection):
+    migrator = DatabaseMigrator(mock_db_connection)
+    migrations = migrator.get_migrations()
+    applied = [(m.version, m.name, m.checksum) for m in migrations[:-1]]
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchone.return_value = (True,)  # advisory lock acquired
+    cursor.fetchall.side_effect = itertools.chain([applied], itertools.repeat([]))  # ledger, then no INVALID indexes
+
+    assert migrator.migrate() is True
+
+    recorded = [call.args[1] for call in cursor.execute.call_args_list if call.args[0] == RECORD_MIGRATION]
+    assert [row[0] for row in recorded] == [migrations[-1].version]
+
+
+def test_migrate_refuses_edited_migration(mock_db_connection):
+    migrator = DatabaseMigrator(mock_db_connection)
+    first = migrator.get_migrations()[0]
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchone.return_value = (True,)
+    cursor.fetchall.return_value = [(first.version, first.name, '0' * 64)]
+
+    assert migrator.migrate() is False
+    assert not any(call.args[0] == RECORD_MIGRATION for call in cursor.execute.call_args_list)
+
+
+def test_no_transaction_migration_rebuilds_invalid_index(mock_db_connection):
+    """Concurrent builds run in autocommit mode and drop an INVALID leftover before rebuilding"""
+    sql = (
+        "-- Add index\n-- migrate: no-transaction\n"
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_example ON pull_requests (merged_at);"
+    )
+    migration = Migration(version=99, name='example', filename='0099_example.sql', sql=sql)
+    assert migration.transactional is False
+    assert Migration(1, 'other', '0001_other.sql', 'SELECT 1; -- migrate: no-transaction').transactional is True
+
+    mock_db_connection.autocommit = False
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [('idx_example', 'pull_requests')]
+
+    DatabaseMigrator(mock_db_connection).apply_migration(migration)
+
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    drop = statements.index('DROP INDEX CONCURRENTLY IF EXISTS "idx_example"')
+    assert 'CREATE INDEX CONCURRENTLY' in statements[drop + 1]
+    assert statements[-1] == RECORD_MIGRATION
+    assert mock_db_connection.autocommit is False
@@ -0,0 +1,51 @@
+"""
+Keyset pagination tests
+File: tests/test_pagination.py
+"""
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from src.gittensor_db.repositories.pagination import (
+    InvalidPageTokenError,
+    decode_page_token,
+    encode_page_token,
+)
+
+
+def test_page_token_round_trip():
+    key = [Decimal('1.500000'), datetime(2024, 1, 15, 10, 30), None, 'owner/repo', 42]
+    token = encode_page_token('scope', key)
+    assert decode_page_token(token, 'scope', len(key)) == key
+
+
+def test_page_token_rejects_other_listing_and_garbage():
+    token = encode_page_token('scope', [1, 2])
+    with pytest.raises(InvalidPageTokenError):
+        decode_page_token(token, 'other', 2)
+    with pytest.raises(InvalidPageTokenError):
+        decode_page_token('not-a-token!', 'scope', 2)
+
+
+def test_query_page_fetches_one_extra_row_and_resumes_from_key(mock_db_connection):
+    """The extra row only signals another page; the token carries the last returned key"""
+    from src.gittensor_db.repositories import IssuesRepository
+
+    rows = [
+        {'number': n, 'pr_number': n, 'repository_full_name': 'o/r', 'title': 't',
+         'created_at': datetime(2024, 1, n), 'closed_at': None}
+        for n in (3, 2, 1)
+    ]
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = rows
+    repo = IssuesRepository(mock_db_connection)
+
+    page = repo.get_issues_by_repository_page('o/r', page_size=2)
+    assert [issue.number for issue in page] == [3, 2]
+    assert page.has_more
+    assert cursor.execute.call_args.args[1] == ('o/r', 3)
+
+    cursor.fetchall.return_value = rows[2:]
+    last = repo.get_issues_by_repository_page('o/r', page_size=2, page_token=page.next_page_token)
+    assert [issue.number for issue in last] == [1]
+    assert not last.has_more
+    assert cursor.execute.call_args.args[1] == ('o/r', datetime(2024, 1, 2), 2, 3)
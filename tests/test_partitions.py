@@ -0,0 +1,64 @@
+"""
+Time partition maintenance tests
+File: tests/test_partitions.py
+"""
+from datetime import datetime
+import pytest
+from src.gittensor_db.repositories.partitions_repository import (
+    PartitionsRepository,
+    add_months,
+    month_start,
+    partition_name,
+)
+
+
+def test_month_arithmetic_crosses_year_boundaries():
+    month = month_start(datetime(2024, 11, 17, 8, 30))
+    assert month == datetime(2024, 11, 1)
+    assert add_months(month, 2) == datetime(2025, 1, 1)
+    assert add_months(month, -11) == datetime(2023, 12, 1)
+    assert partition_name('miner_evaluations', add_months(month, 2)) == 'miner_evaluations_p202501'
+
+
+def test_get_partitions_parses_range_bounds(mock_db_connection):
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'partition_name': 'miner_evaluations_default', 'partition_bound': 'DEFAULT'},
+        {
+            'partition_name': 'miner_evaluations_p202402',
+            'partition_bound': "FOR VALUES FROM ('2024-02-01 00:00:00') TO ('2024-03-01 00:00:00')"
+        },
+        {
+            'partition_name': 'miner_evaluations_p202401',
+            'partition_bound': "FOR VALUES FROM ('2024-01-01 00:00:00') TO ('2024-02-01 00:00:00')"
+        },
+    ]
+
+    partitions = PartitionsRepository(mock_db_connection).get_partitions('miner_evaluations')
+
+    assert [p.name for p in partitions] == [
+        'miner_evaluations_p202401', 'miner_evaluations_p202402', 'miner_evaluations_default'
+    ]
+    assert partitions[0].upper == datetime(2024, 2, 1)
+    assert partitions[-1].is_default
+
+
+def test_expire_partitions_detaches_months_before_retention_window(mock_db_connection):
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchone.return_value = {'partitioned': True}
+    cursor.fetchall.return_value = [
+        {'partition_name': f'miner_evaluations_p2024{month:02d}',
+         'partition_bound': f"FOR VALUES FROM ('2024-{month:02d}-01 00:00:00') TO ('2024-{month + 1:02d}-01 00:00:00')"}
+        for month in (1, 2, 3)
+    ]
+
+    expired = PartitionsRepository(mock_db_connection).expire_partitions(
+        'miner_evaluations', retention_months=1, now=datetime(2024, 3, 20)
+    )
+
+    assert expired == ['miner_evaluations_p202401']
+
+
+def test_unknown_table_is_rejected(mock_db_connection):
+    with pytest.raises(ValueError):
+        PartitionsRepository(mock_db_connection).ensure_partitions('pull_requests')
@@ -0,0 +1,34 @@
+"""
+Patch blob encoding tests
+File: tests/test_patch_codec.py
+"""
+from src.gittensor_db.utils.patch_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    compress_patch,
+    decode_patch,
+    patch_from_row,
+    patch_hash,
+)
+
+
+def test_patches_round_trip_through_compression():
+    short = "@@ -1 +1 @@\n-a\n+b"
+    long = "@@ -1,40 +1,40 @@\n" + "".join(f"-old line {i}\n+new line {i} ü\n" for i in range(40))
+
+    for patch in (short, long):
+        digest, raw = patch_hash(patch)
+        compression, data = compress_patch(raw)
+        assert len(digest) == 32
+        assert decode_patch(compression, memoryview(data)) == patch
+
+    assert compress_patch(patch_hash(short)[1])[0] == COMPRESSION_NONE
+    assert compress_patch(patch_hash(long)[1])[0] == COMPRESSION_ZLIB
+
+
+def test_patch_from_row_prefers_blob_and_falls_back_to_inline_patch():
+    compression, data = compress_patch(b"+blob")
+
+    assert patch_from_row({'patch_compression': compression, 'patch_data': data, 'patch': None}) == "+blob"
+    assert patch_from_row({'patch_compression': None, 'patch_data': None, 'patch': "+inline"}) == "+inline"
+    assert patch_from_row({'patch_compression': None, 'patch_data': None}) is None
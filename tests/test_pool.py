@@ -0,0 +1,134 @@
+"""
+Connection pool tests
+File: tests/test_pool.py
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+from src.gittensor_db.connection.pool import ConnectionPool, PoolTimeoutError
+from src.gittensor_db.repositories import RepositoriesRepository
+
+
+class FakeConnection:
+    """Minimal stand-in for a psycopg2 connection"""
+
+    def __init__(self):
+        self.closed = 0
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.commits = 0
+
+    def cursor(self):
+        return Mock()
+
+    def get_transaction_status(self):
+        return 2 if self.in_transaction else 0
+
+    def commit(self):
+        self.commits += 1
+        self.in_transaction = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory():
+        connection = FakeConnection()
+        created.append(connection)
+        return connection
+
+    pool = ConnectionPool(connection_factory=factory, db_config={}, **kwargs)
+    return pool, created
+
+
+def test_pool_fills_to_min_size_and_reuses_connections():
+    """Checkouts reuse returned connections instead of opening new ones"""
+    pool, created = make_pool(min_size=2, max_size=4)
+    assert len(created) == 2
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    stats = pool.stats()
+    assert stats.size == 2
+    assert stats.checkouts == 2
+    assert stats.in_use == 0
+
+
+def test_pool_rolls_back_open_transaction_on_return():
+    pool, created = make_pool(min_size=1, max_size=1)
+    with pool.connection() as connection:
+        connection.in_transaction = True
+    assert connection.rollbacks == 1
+
+
+def test_pool_times_out_when_saturated():
+    pool, _ = make_pool(min_size=0, max_size=1, timeout=0.05)
+    held = pool.getconn()
+    assert pool.stats().saturation == 1.0
+
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+
+    pool.putconn(held)
+    assert pool.stats().timeouts == 1
+
+
+def test_pool_waiter_receives_returned_connection():
+    pool, created = make_pool(min_size=0, max_size=1, timeout=2.0)
+    held = pool.getconn()
+    result = {}
+
+    def borrow():
+        with pool.connection() as connection:
+            result['connection'] = connection
+
+    worker = threading.Thread(target=borrow)
+    worker.start()
+    pool.putconn(held)
+    worker.join(timeout=2.0)
+
+    assert result['connection'] is held
+    assert len(created) == 1
+    assert pool.stats().max_wait_time > 0
+
+
+def test_pool_discards_closed_and_expired_connections():
+    pool, created = make_pool(min_size=1, max_size=2, max_lifetime=None)
+    connection = pool.getconn()
+    connection.close()
+    pool.putconn(connection)
+
+    with pool.connection() as replacement:
+        assert replacement is not connection
+    assert pool.stats().connections_closed == 1
+
+
+def test_pool_reaps_idle_connections_above_min_size():
+    pool, created = make_pool(min_size=1, max_size=3, max_idle=0.0)
+    first = pool.getconn()
+    second = pool.getconn()
+    pool.putconn(first)
+    pool.putconn(second)
+
+    assert pool.stats().size == 1
+
+
+def test_repository_borrows_connection_per_operation():
+    """Repositories commit on the borrowed connection and hand it back"""
+    pool, created = make_pool(min_size=1, max_size=1)
+    repo = RepositoriesRepository(pool)
+
+    assert repo.set_entity("SELECT 1", ()) is True
+    assert created[0].commits == 1
+    assert pool.stats().in_use == 0
@@ -0,0 +1,64 @@
+"""
+Prepared statement registry tests
+File: tests/test_prepared_statements.py
+"""
+import pytest
+from src.gittensor_db import prepared_statements
+from src.gittensor_db.queries import GET_MINER_BY_UID
+from src.gittensor_db.repositories import MinersRepository
+
+
+class StaleStatement(Exception):
+    pgcode = '26000'
+
+
+@pytest.fixture
+def prepared_db(mock_db_connection):
+    mock_db_connection.get_backend_pid.return_value = 101
+    mock_db_connection.get_transaction_status.return_value = 0  # idle
+    cursor = mock_db_connection.cursor.return_value
+    cursor.connection = mock_db_connection
+    cursor.fetchone.return_value = {'uid': 7, 'hotkey': 'hk', 'github_id': 'gh'}
+    prepared_statements.enable_prepared_statements([GET_MINER_BY_UID])
+    yield mock_db_connection, cursor
+    prepared_statements.disable_prepared_statements()
+
+
+def executed(cursor):
+    return [call.args[0].split()[0] for call in cursor.execute.call_args_list]
+
+
+def test_to_positional_numbers_placeholders_and_unescapes_percent():
+    assert prepared_statements.to_positional("SELECT %s, '5%%' WHERE a = %s") == ("SELECT $1, '5%' WHERE a = $2", 2)
+    assert prepared_statements.to_positional("SELECT %(uid)s") is None
+
+
+def test_query_is_prepared_once_per_connection_and_again_after_reconnect(prepared_db):
+    connection, cursor = prepared_db
+    repo = MinersRepository(connection)
+
+    assert repo.get_miner_by_uid(7).uid == 7
+    repo.get_miner_by_uid(8)
+    assert executed(cursor) == ['PREPARE', 'EXECUTE', 'EXECUTE']
+    assert cursor.execute.call_args.args[1] == (8,)
+
+    connection.get_backend_pid.return_value = 202
+    repo.get_miner_by_uid(9)
+    assert executed(cursor)[3:] == ['PREPARE', 'EXECUTE']
+
+
+def test_stale_statement_is_prepared_again_and_retried_when_first_in_transaction(prepared_db):
+    connection, cursor = prepared_db
+    repo = MinersRepository(connection)
+    repo.get_miner_by_uid(7)
+
+    cursor.execute.side_effect = [StaleStatement(), None, None]
+    assert repo.get_miner_by_uid(7).uid == 7
+    assert executed(cursor)[2:] == ['EXECUTE', 'PREPARE', 'EXECUTE']
+    connection.rollback.assert_called_once()
+
+
+def test_disabled_queries_run_as_plain_sql(mock_db_connection):
+    mock_db_connection.cursor.return_value.fetchone.return_value = None
+    MinersRepository(mock_db_connection).get_miner_by_uid(7)
+    mock_db_connection.cursor.return_value.execute.assert_called_once_with(GET_MINER_BY_UID, (7,))
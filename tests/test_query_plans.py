@@ -0,0 +1,201 @@
+"""
+Query plan tests: every lookup in queries/queries.py must be served by an index
+File: tests/test_query_plans.py
+
+Runs the migrations into a scratch schema on the test database, seeds it with a few
+hundred thousand rows, and checks EXPLAIN for each query. Requires TEST_DB_HOST,
+TEST_DB_USER and TEST_DB_NAME (TEST_DB_PASSWORD / TEST_DB_PORT optional).
+"""
+import os
+import re
+from datetime import datetime
+import pytest
+from src.gittensor_db import queries as q
+from src.gittensor_db.migrations.migrator import DatabaseMigrator
+from src.gittensor_db.repositories.partitions_repository import PartitionsRepository
+
+psycopg2 = pytest.importorskip('psycopg2')
+from psycopg2.extras import RealDictCursor  # noqa: E402
+
+SCHEMA = 'query_plan_check'
+
+INDEX_SCANS = {'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan'}
+INDEX_ONLY = {'Index Only Scan'}
+
+SEED = """
+INSERT INTO repositories (full_name, name, owner)
+SELECT 'owner' || (i % 50) || '/repo' || i, 'repo' || i, 'owner' || (i % 50)
+FROM generate_series(0, 4999) i;
+
+INSERT INTO miners (uid, hotkey, github_id)
+SELECT i % 256, 'hotkey' || i, 'github' || i
+FROM generate_series(0, 4999) i;
+
+INSERT INTO pull_requests (
+    number, repository_full_name, uid, hotkey, github_id, earned_score, title,
+    merged_at, pr_created_at, additions, deletions, commits, author_login
+)
+SELECT i, 'owner' || (i % 500 % 50) || '/repo' || (i % 500),
+       (i % 5000) % 256, 'hotkey' || (i % 5000), 'github' || (i % 5000),
+       (i * 7919 % 1000) / 10.0, 'PR ' || i,
+       CASE WHEN i % 10 = 0 THEN NULL ELSE TIMESTAMP '2025-01-01' + i * INTERVAL '5 minutes' END,
+       TIMESTAMP '2025-01-01' + i * INTERVAL '5 minutes', i % 300, i % 200, 1 + i % 5, 'author' || (i % 5000)
+FROM generate_series(1, 100000) i;
+
+INSERT INTO issues (number, pr_number, repository_full_name, title, created_at)
+SELECT i, i * 5, 'owner' || (i * 5 % 500 % 50) || '/repo' || (i * 5 % 500), 'Issue ' || i,
+       TIMESTAMP '2025-01-01' + i * INTERVAL '25 minutes'
+FROM generate_series(1, 20000) i;
+
+INSERT INTO file_changes (pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension)
+SELECT pr.number, pr.repository_full_name, 'src/file' || f || '.py', 10, 5, 5, 'modified', repeat('+line', 20), 'py'
+FROM pull_requests pr, generate_series(1, 2) f;
+
+INSERT INTO miner_evaluations (uid, hotkey, github_id, total_score, evaluation_timestamp)
+SELECT (i % 5000) % 256, 'hotkey' || (i % 5000), 'github' || (i % 5000), (i * 31 % 1000) / 10.0,
+       TIMESTAMP '2026-01-01' + i * INTERVAL '2 minutes'
+FROM generate_series(1, 60000) i
+"""
+
+# name -> (query, params, {table: allowed scan node types}, must not sort)
+# Only LIMITed listings are required to read in index order; for the unbounded ones the
+# planner may rightly prefer a bitmap scan plus an in-memory sort.
+PR_KEY = (4242, 'owner42/repo242')
+MINER = (1, 'hotkey1', 'github1')
+WINDOW = (datetime(2026, 1, 20), datetime(2026, 1, 25))
+CASES = {
+    'GET_MINER': (q.GET_MINER, MINER, {'miners': INDEX_SCANS}, False),
+    'GET_MINER_BY_UID': (q.GET_MINER_BY_UID, (7,), {'miners': INDEX_ONLY}, False),
+    'GET_MINER_BY_HOTKEY': (q.GET_MINER_BY_HOTKEY, ('hotkey7',), {'miners': INDEX_ONLY}, False),
+    'GET_MINER_BY_GITHUB_ID': (q.GET_MINER_BY_GITHUB_ID, ('github7',), {'miners': INDEX_ONLY}, False),
+    'GET_MINER_BY_HOTKEY_AND_GITHUB_ID': (
+        q.GET_MINER_BY_HOTKEY_AND_GITHUB_ID, ('hotkey7', 'github7'), {'miners': INDEX_ONLY}, False
+    ),
+    'GET_MINERS_BY_KEYS': (
+        q.GET_MINERS_BY_KEYS, ([1, 2], ['hotkey1', 'hotkey2'], ['github1', 'github2']), {'miners': INDEX_SCANS}, False
+    ),
+    'GET_MINERS_BY_UIDS': (q.GET_MINERS_BY_UIDS, ([1, 2, 3],), {'miners': INDEX_SCANS}, False),
+    'GET_MINERS_BY_HOTKEYS': (q.GET_MINERS_BY_HOTKEYS, (['hotkey1', 'hotkey2'],), {'miners': INDEX_SCANS}, False),
+    'GET_MINERS_BY_GITHUB_IDS': (q.GET_MINERS_BY_GITHUB_IDS, (['github1', 'github2'],), {'miners': INDEX_SCANS}, False),
+    'GET_MINERS_BY_HOTKEYS_AND_GITHUB_IDS': (
+        q.GET_MINERS_BY_HOTKEYS_AND_GITHUB_IDS, (['hotkey1'], ['github1']), {'miners': INDEX_SCANS}, False
+    ),
+    'GET_REPOSITORY': (q.GET_REPOSITORY, ('owner42/repo242',), {'repositories': INDEX_SCANS}, False),
+    'GET_REPOSITORIES_BY_FULL_NAMES': (
+        q.GET_REPOSITORIES_BY_FULL_NAMES, (['owner42/repo242', 'owner1/repo1'],), {'repositories': INDEX_SCANS}, False
+    ),
+    'GET_PULL_REQUEST': (q.GET_PULL_REQUEST, PR_KEY, {'pull_requests': INDEX_SCANS}, False),
+    'GET_PULL_REQUESTS_BY_KEYS': (
+        q.GET_PULL_REQUESTS_BY_KEYS, ([PR_KEY[0]], [PR_KEY[1]]), {'pull_requests': INDEX_SCANS}, False
+    ),
+    'GET_PULL_REQUESTS_BY_REPOSITORY': (
+        q.GET_PULL_REQUESTS_BY_REPOSITORY, (PR_KEY[1],), {'pull_requests': INDEX_SCANS}, False
+    ),
+    'GET_PULL_REQUESTS_BY_MINER': (q.GET_PULL_REQUESTS_BY_MINER, MINER, {'pull_requests': INDEX_SCANS}, False),
+    'GET_MINER_AGGREGATE': (q.GET_MINER_AGGREGATE, MINER, {'pull_requests': INDEX_SCANS}, False),
+    'GET_PULL_REQUEST_WITH_FILE_CHANGES': (
+        q.GET_PULL_REQUEST_WITH_FILE_CHANGES, PR_KEY, {'pull_requests': INDEX_SCANS, 'file_changes': INDEX_SCANS}, False
+    ),
+    'GET_FILE_CHANGE': (q.GET_FILE_CHANGE, (17,), {'file_changes': INDEX_SCANS}, False),
+    'GET_FILE_CHANGES_BY_PR': (q.GET_FILE_CHANGES_BY_PR, PR_KEY, {'file_changes': INDEX_SCANS}, False),
+    'GET_FILE_CHANGES_FOR_PULL_REQUESTS': (
+        q.GET_FILE_CHANGES_FOR_PULL_REQUESTS, ([PR_KEY[0]], [PR_KEY[1]]), {'file_changes': INDEX_SCANS}, False
+    ),
+    'GET_MINER_EVALUATION': (q.GET_MINER_EVALUATION, (17,), {'miner_evaluations': INDEX_SCANS}, False),
+    'GET_LATEST_MINER_EVALUATION': (
+        q.GET_LATEST_MINER_EVALUATION, MINER[:2], {'miner_evaluations': INDEX_SCANS}, True
+    ),
+    'GET_EVALUATIONS_BY_TIMEFRAME': (
+        q.GET_EVALUATIONS_BY_TIMEFRAME, WINDOW, {'miner_evaluations': INDEX_SCANS}, False
+    ),
+    'GET_ISSUE': (q.GET_ISSUE, (17, 'owner35/repo85'), {'issues': INDEX_SCANS}, False),
+    'GET_ISSUES_BY_KEYS': (q.GET_ISSUES_BY_KEYS, ([17], ['owner35/repo85']), {'issues': INDEX_SCANS}, False),
+    'GET_ISSUES_BY_REPOSITORY': (q.GET_ISSUES_BY_REPOSITORY, ('owner35/repo85',), {'issues': INDEX_SCANS}, False),
+    'GET_PULL_REQUESTS_BY_REPOSITORY_PAGE': (
+        q.GET_PULL_REQUESTS_BY_REPOSITORY_PAGE, (PR_KEY[1], 50), {'pull_requests': INDEX_SCANS}, True
+    ),
+    'GET_PULL_REQUESTS_BY_MINER_PAGE': (
+        q.GET_PULL_REQUESTS_BY_MINER_PAGE, MINER + (50,), {'pull_requests': INDEX_SCANS}, True
+    ),
+    'GET_ISSUES_BY_REPOSITORY_PAGE': (
+        q.GET_ISSUES_BY_REPOSITORY_PAGE, ('owner35/repo85', 50), {'issues': INDEX_SCANS}, True
+    ),
+    'GET_EVALUATIONS_BY_TIMEFRAME_PAGE': (
+        q.GET_EVALUATIONS_BY_TIMEFRAME_PAGE, WINDOW + (50,), {'miner_evaluations': INDEX_SCANS}, True
+    ),
+}
+
+
+def _table_of(relation: str) -> str:
+    """Map a partition name back to its partitioned table"""
+    return re.sub(r'_(p\d{6}|default)$', '', relation)
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from _walk(child)
+
+
+@pytest.fixture(scope='module')
+def seeded_db():
+    if not all(os.getenv(name) for name in ('TEST_DB_HOST', 'TEST_DB_USER', 'TEST_DB_NAME')):
+        pytest.skip("Test database not configured")
+    try:
+        connection = psycopg2.connect(
+            host=os.getenv('TEST_DB_HOST'),
+            user=os.getenv('TEST_DB_USER'),
+            password=os.getenv('TEST_DB_PASSWORD', ''),
+            dbname=os.getenv('TEST_DB_NAME'),
+            port=os.getenv('TEST_DB_PORT', '5432'),
+            cursor_factory=RealDictCursor
+        )
+    except psycopg2.Error as e:
+        pytest.skip(f"Could not connect to test database: {e}")
+
+    cursor = connection.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"SET search_path TO {SCHEMA}")
+    connection.commit()
+    try:
+        assert DatabaseMigrator(connection).migrate()
+        cursor.execute(SEED)
+        connection.commit()
+        PartitionsRepository(connection).ensure_partitions('miner_evaluations')  # move seeded months out of default
+        connection.autocommit = True
+        cursor.execute("VACUUM ANALYZE")  # visibility map for index-only scans, statistics for the planner
+        connection.autocommit = False
+        cursor.execute(
+            "SELECT relname FROM pg_class WHERE relnamespace = %s::regnamespace AND relkind = 'r' AND relpages = 0",
+            (SCHEMA,)
+        )
+        # Empty partitions (future months, the default) are trivially sequentially scanned
+        empty = {row['relname'] for row in cursor.fetchall()}
+        connection.commit()
+        yield connection, empty
+    finally:
+        connection.rollback()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        connection.commit()
+        connection.close()
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_query_is_served_by_index(seeded_db, name):
+    query, params, expected, ordered = CASES[name]
+    connection, empty_relations = seeded_db
+    cursor = connection.cursor()
+    cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    plan = cursor.fetchone()['QUERY PLAN'][0]['Plan']
+    cursor.close()
+    nodes = list(_walk(plan))
+
+    scans = {}
+    for node in nodes:
+        if 'Relation Name' in node and node['Relation Name'] not in empty_relations:
+            scans.setdefault(_table_of(node['Relation Name']), set()).add(node['Node Type'])
+    for table, allowed in expected.items():
+        assert scans.get(table), f"{name} does not read {table}"
+        assert scans[table] <= allowed, f"{name} scans {table} with {sorted(scans[table])}"
+    if ordered:
+        assert not any(node['Node Type'] in ('Sort', 'Incremental Sort') for node in nodes), f"{name} sorts"
@@ -2,6 +2,7 @@
 Basic repository tests
 """
 import pytest
+from unittest.mock import Mock
 from src.gittensor_db.repositories import RepositoriesRepository
 from src.gittensor_db.models.domain_models import Repository
 
@@ -15,4 +16,178 @@ def test_repository_model():
     repo = Repository(name="test-repo", owner="test-owner")
     assert repo.full_name == "test-owner/test-repo"
     assert repo.name == "test-repo"
-    assert repo.owner == "test-owner"
\ No newline at end of file
+    assert repo.owner == "test-owner"
+
+def test_stream_multiple_uses_named_cursor_and_maps_lazily(mock_db_connection):
+    """Streaming reads go through a named server-side cursor with the requested itersize"""
+    from src.gittensor_db.repositories import MinersRepository
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.__iter__ = Mock(return_value=iter([
+        {'uid': 1, 'hotkey': 'hk1', 'github_id': 'gh1'},
+        {'uid': 2, 'hotkey': 'hk2', 'github_id': 'gh2'},
+    ]))
+    repo = MinersRepository(mock_db_connection)
+
+    stream = repo.stream_multiple("SELECT 1", (), repo._map_to_miner, itersize=50)
+    mock_db_connection.cursor.assert_not_called()
+
+    first = next(stream)
+    assert first.uid == 1
+    assert 'name' in mock_db_connection.cursor.call_args.kwargs
+    assert cursor.itersize == 50
+
+    assert [miner.uid for miner in stream] == [2]
+    cursor.close.assert_called_once()
+
+
+def test_unit_of_work_commits_once_in_fk_order(mock_db_connection):
+    """A full evaluation is written in foreign key order with a single commit"""
+    from unittest.mock import patch
+    from datetime import datetime
+    from src.gittensor_db.repositories import EvaluationUnitOfWork
+    from src.gittensor_db.models.domain_models import MinerEvaluation, PullRequest, FileChange, Issue
+
+    pr = PullRequest(
+        number=1, repository_full_name="owner/repo", uid=5, hotkey="hk", github_id="gh",
+        title="Fix", author_login="dev", merged_at=datetime(2024, 1, 2), created_at=datetime(2024, 1, 1),
+        file_changes=[FileChange(1, "owner/repo", "a.py", 3, 2, 1, "modified")],
+        issues=[Issue(number=9, pr_number=1, repository_full_name="owner/repo", title="Bug")],
+    )
+    evaluation = MinerEvaluation(uid=5, hotkey="hk", github_id="gh", pull_requests=[pr])
+
+    with patch('psycopg2.extras.execute_values') as execute_values:
+        counts = EvaluationUnitOfWork(mock_db_connection).store_evaluations([evaluation])
+
+    assert counts == {
+        'miners': 1, 'repositories': 1, 'pull_requests': 1,
+        'issues': 1, 'file_changes': 1, 'miner_evaluations': 1,
+    }
+    tables = [call.args[1].split()[2] for call in execute_values.call_args_list]
+    assert tables == ['miners', 'repositories', 'pull_requests', 'issues', 'file_changes', 'miner_evaluations']
+    mock_db_connection.commit.assert_called_once()
+
+
+def test_load_file_changes_batches_lookup_and_stitches_by_pr(mock_db_connection):
+    """File changes for many PRs come from one query keyed by (pr_number, repository)"""
+    from src.gittensor_db.repositories import PullRequestsRepository
+    from src.gittensor_db.models.domain_models import PullRequest
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'id': n, 'pr_number': pr_number, 'repository_full_name': 'o/r', 'filename': f'f{n}.py',
+         'changes': 1, 'additions': 1, 'deletions': 0, 'status': 'added', 'patch': None, 'file_extension': 'py'}
+        for n, pr_number in enumerate([1, 1, 2])
+    ]
+    pull_requests = [
+        PullRequest(number=number, repository_full_name='o/r', uid=1, hotkey='hk', github_id='gh',
+                    title='t', author_login='a', merged_at=None, created_at=None)
+        for number in (1, 2, 3)
+    ]
+
+    PullRequestsRepository(mock_db_connection).load_file_changes(pull_requests)
+
+    cursor.execute.assert_called_once()
+    assert cursor.execute.call_args.args[1] == ([1, 2, 3], ['o/r', 'o/r', 'o/r'])
+    assert [len(pr.file_changes or []) for pr in pull_requests] == [2, 1, 0]
+    assert pull_requests[2].file_changes is None
+
+
+def test_query_many_batches_keys_and_keys_results_by_input(mock_db_connection):
+    """Multi-key lookups send each batch as one array parameter and key results by input"""
+    from src.gittensor_db.repositories import MinersRepository
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.side_effect = [
+        [{'uid': 1, 'hotkey': 'hk1', 'github_id': 'gh1'}],
+        [{'uid': 3, 'hotkey': 'hk3', 'github_id': 'gh3'}],
+    ]
+    repo = MinersRepository(mock_db_connection)
+
+    miners = repo.query_many('SELECT', [1, 2, 2, 3], lambda row: row['uid'], repo._map_to_miner, batch_size=2)
+
+    assert [call.args[1] for call in cursor.execute.call_args_list] == [([1, 2],), ([3],)]
+    assert miners[1].hotkey == 'hk1'
+    assert miners[2] is None
+    assert miners[3].hotkey == 'hk3'
+
+
+def test_file_changes_store_each_distinct_patch_once_before_rows(mock_db_connection):
+    """Identical patches share one blob, written before the file_changes rows that reference it"""
+    from unittest.mock import patch
+    from src.gittensor_db.repositories import FileChangesRepository
+    from src.gittensor_db.models.domain_models import FileChange
+    from src.gittensor_db.utils.patch_codec import patch_hash
+
+    diff = "@@ -1 +1 @@\n-a\n+b"
+    file_changes = [
+        FileChange(1, "o/r", "a.py", 2, 1, 1, "modified", diff),
+        FileChange(2, "o/r", "a.py", 2, 1, 1, "modified", diff),
+        FileChange(2, "o/r", "b.py", 1, 1, 0, "added", None),
+    ]
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = []  # no blobs stored yet
+
+    with patch('psycopg2.extras.execute_values') as execute_values:
+        FileChangesRepository(mock_db_connection).store_file_changes_bulk(file_changes)
+
+    # Reused blobs are locked against delete_orphaned_patch_blobs until the rows commit
+    assert cursor.execute.call_args_list[0].args[0].split()[-3:] == ['FOR', 'KEY', 'SHARE']
+    (blobs_call, rows_call) = execute_values.call_args_list
+    assert blobs_call.args[1].split()[2] == 'patch_blobs'
+    assert [blob[0] for blob in blobs_call.args[2]] == [patch_hash(diff)[0]]
+    assert [row[7] for row in rows_call.args[2]] == [patch_hash(diff)[0], patch_hash(diff)[0], None]
+
+
+def test_metadata_only_file_changes_load_patches_together_on_first_access(mock_db_connection):
+    """Metadata-only reads skip patches; touching one loads the whole PR's in one query"""
+    from src.gittensor_db.repositories import FileChangesRepository
+    from src.gittensor_db.queries import GET_FILE_CHANGE_PATCHES
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'id': n, 'pr_number': 1, 'repository_full_name': 'o/r', 'filename': f'f{n}.py',
+         'changes': 1, 'additions': 1, 'deletions': 0, 'status': 'added', 'file_extension': 'py'}
+        for n in (10, 11)
+    ]
+    file_changes = FileChangesRepository(mock_db_connection).get_file_changes_by_pr(1, 'o/r', metadata_only=True)
+    assert not any(fc.patch_loaded for fc in file_changes)
+
+    cursor.fetchall.return_value = [
+        {'id': 10, 'patch': None, 'patch_compression': 'none', 'patch_data': b'+a'},
+        {'id': 11, 'patch': '+b', 'patch_compression': None, 'patch_data': None},
+    ]
+    assert file_changes[1].patch == '+b'
+    assert file_changes[0].patch == '+a'
+
+    patch_queries = [call for call in cursor.execute.call_args_list if call.args[0] == GET_FILE_CHANGE_PATCHES]
+    assert len(patch_queries) == 1
+    assert patch_queries[0].args[1] == ([10, 11],)
+
+
+def test_miner_aggregates_come_from_one_query_and_apply_to_evaluations(mock_db_connection):
+    """Miner totals are read as one aggregate row per miner, zeros when there are no pull requests"""
+    from decimal import Decimal
+    from src.gittensor_db.repositories import PullRequestsRepository
+    from src.gittensor_db.models.domain_models import MinerEvaluation
+    from src.gittensor_db.queries import GET_MINER_AGGREGATES
+
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [{
+        'uid': 5, 'hotkey': 'hk', 'github_id': 'gh', 'pr_count': 3,
+        'total_lines_changed': Decimal(120), 'unique_repos_count': 2, 'total_score': Decimal('4.500000')
+    }]
+    repo = PullRequestsRepository(mock_db_connection)
+
+    [aggregate] = repo.get_miner_aggregates()
+    assert cursor.execute.call_args.args[0] == GET_MINER_AGGREGATES
+    assert (aggregate.total_lines_changed, aggregate.total_score) == (120, 4.5)
+    assert isinstance(aggregate.total_lines_changed, int) and isinstance(aggregate.total_score, float)
+
+    evaluation = MinerEvaluation(uid=5, hotkey='hk', github_id='gh')
+    aggregate.apply_to(evaluation)
+    assert (evaluation.total_prs, evaluation.total_lines_changed, evaluation.unique_repos_count) == (3, 120, 2)
+
+    cursor.fetchone.return_value = None
+    empty = repo.get_miner_aggregate(6, 'hk6', 'gh6')
+    assert (empty.uid, empty.pr_count, empty.total_lines_changed, empty.total_score) == (6, 0, 0, 0.0)
@@ -0,0 +1,129 @@
+"""
+Positional row mapping tests
+File: tests/test_row_mapping.py
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from src.gittensor_db.repositories import (
+    FileChangesRepository,
+    IssuesRepository,
+    MinerEvaluationsRepository,
+    MinersRepository,
+    PullRequestsRepository,
+    RepositoriesRepository,
+    WatermarksRepository
+)
+from src.gittensor_db.repositories.file_changes_repository import FILE_CHANGE_ROW, LAZY_FILE_CHANGE_ROW
+from src.gittensor_db.repositories.issues_repository import ISSUE_ROW
+from src.gittensor_db.repositories.miner_evaluations_repository import MINER_EVALUATION_ROW
+from src.gittensor_db.repositories.miners_repository import MINER_ROW
+from src.gittensor_db.repositories.pull_requests_repository import PULL_REQUEST_ROW, MINER_AGGREGATE_ROW
+from src.gittensor_db.repositories.repositories_repository import REPOSITORY_ROW
+from src.gittensor_db.repositories.row_mapping import RowMapper, column, float_or_zero
+from src.gittensor_db.repositories.watermarks_repository import INGEST_WATERMARK_ROW
+from src.gittensor_db.utils.patch_codec import compress_patch
+
+
+def description(*names):
+    return [(name, None, None, None, None, None, None) for name in names]
+
+
+NOW = datetime(2024, 1, 2, tzinfo=timezone.utc)
+PATCH_COMPRESSION, PATCH_DATA = compress_patch('@@ -1 +1 @@\n-a\n+b'.encode())
+PR_ROW = {
+    'number': 5, 'repository_full_name': 'o/r', 'uid': 1, 'hotkey': 'hk', 'github_id': 'gh', 'earned_score': 2.5,
+    'title': 'Fix', 'merged_at': NOW, 'pr_created_at': None, 'additions': None, 'deletions': 7,
+    'author_login': 'dev', 'merged_by_login': None,
+}
+FILE_ROW = {
+    'id': 9, 'pr_number': 5, 'repository_full_name': 'o/r', 'filename': 'a.py', 'changes': 2, 'additions': 1,
+    'deletions': 1, 'status': 'modified', 'file_extension': 'py',
+}
+EVALUATION_ROW = {
+    'id': 3, 'uid': 1, 'hotkey': 'hk', 'github_id': 'gh', 'total_score': Decimal('1.5'), 'total_lines_changed': None,
+    'total_open_prs': 2, 'unique_repos_count': None, 'failed_reason': None, 'evaluation_timestamp': NOW,
+}
+
+# (repository, dict-keyed mapper, RowMapper it declares, row as a dict cursor returns it)
+MAPPER_CASES = [
+    (MinersRepository, '_map_to_miner', MINER_ROW, {'uid': 1, 'hotkey': 'hk', 'github_id': 'gh'}),
+    (RepositoriesRepository, '_map_to_repository', REPOSITORY_ROW, {'full_name': 'o/r', 'name': 'r', 'owner': 'o'}),
+    (PullRequestsRepository, '_map_to_pull_request', PULL_REQUEST_ROW, PR_ROW),
+    (PullRequestsRepository, '_map_to_pull_request', PULL_REQUEST_ROW, dict(PR_ROW, commits=4, earned_score=Decimal('3.25'))),
+    (IssuesRepository, '_map_to_issue', ISSUE_ROW, {
+        'number': 8, 'pr_number': 5, 'repository_full_name': 'o/r', 'title': 'Bug', 'created_at': NOW, 'closed_at': None,
+    }),
+    (FileChangesRepository, '_map_to_file_change', FILE_CHANGE_ROW,
+     dict(FILE_ROW, patch=None, patch_compression=PATCH_COMPRESSION, patch_data=PATCH_DATA)),
+    (FileChangesRepository, '_map_to_file_change', FILE_CHANGE_ROW,
+     dict(FILE_ROW, patch='@@ inline', patch_compression=None, patch_data=None)),
+    (FileChangesRepository, '_map_to_lazy_file_change', LAZY_FILE_CHANGE_ROW, FILE_ROW),
+    (MinerEvaluationsRepository, '_map_to_miner_evaluation', MINER_EVALUATION_ROW, EVALUATION_ROW),
+    (MinerEvaluationsRepository, '_map_to_miner_evaluation', MINER_EVALUATION_ROW, dict(EVALUATION_ROW, total_prs=6)),
+    (PullRequestsRepository, '_map_to_miner_aggregate', MINER_AGGREGATE_ROW, {
+        'uid': 1, 'hotkey': 'hk', 'github_id': 'gh', 'pr_count': 3, 'total_lines_changed': Decimal('40'),
+        'unique_repos_count': 2, 'total_score': None,
+    }),
+    (WatermarksRepository, '_map_to_watermark', INGEST_WATERMARK_ROW, {
+        'uid': 1, 'hotkey': 'hk', 'github_id': 'gh', 'repository_full_name': 'o/r', 'last_merged_at': NOW,
+        'last_pr_number': 5,
+    }),
+]
+
+
+@pytest.mark.parametrize('repository, method, row_mapper, row', MAPPER_CASES)
+def test_compiled_mapper_matches_dict_mapper(repository, method, row_mapper, row):
+    dict_mapper = getattr(repository(None), method)
+    names = tuple(row)
+
+    assert dict_mapper.row_mapper is row_mapper
+    mapped = row_mapper.compile(names)(tuple(row.values()))
+    expected = dict_mapper(row)
+    assert type(mapped) is type(expected)
+    assert mapped == expected
+
+
+def test_compiled_mapper_fills_defaults_and_is_cached_per_layout():
+    names = tuple(PR_ROW)
+
+    mapped = PULL_REQUEST_ROW.compile(names)(tuple(PR_ROW.values()))
+    assert mapped.additions == 0 and mapped.deletions == 7 and mapped.commits == 0
+    assert PULL_REQUEST_ROW.compile(names) is PULL_REQUEST_ROW.compile(names)
+
+
+def test_compiled_mapper_converts_and_rejects_missing_required_columns():
+    mapper = RowMapper(dict, column('score', 'raw_score', convert=float_or_zero), column('note', default='-'))
+    assert mapper.compile(('raw_score',))((None,)) == {'score': 0.0, 'note': '-'}
+
+    with pytest.raises(KeyError, match='raw_score'):
+        mapper.compile(('score',))
+
+
+def test_repositories_map_tuple_rows_by_position(mock_db_connection):
+    cursor = mock_db_connection.cursor.return_value
+    cursor.description = description('uid', 'hotkey', 'github_id')
+    cursor.fetchall.return_value = [(1, 'hk1', 'gh1'), (2, 'hk2', 'gh2')]
+    cursor.fetchone.return_value = (3, 'hk3', 'gh3')
+    repo = MinersRepository(mock_db_connection)
+
+    assert [(m.uid, m.hotkey) for m in repo.get_all_miners()] == [(1, 'hk1'), (2, 'hk2')]
+    assert repo.get_miner_by_uid(3).github_id == 'gh3'
+    assert repo.execute_query("SELECT 1") == [
+        {'uid': 1, 'hotkey': 'hk1', 'github_id': 'gh1'},
+        {'uid': 2, 'hotkey': 'hk2', 'github_id': 'gh2'},
+    ]
+
+
+def test_iter_query_yields_dicts_from_tuple_rows(mock_db_connection):
+    cursor = mock_db_connection.cursor.return_value
+    cursor.description = description('uid', 'hotkey')
+    cursor.__iter__ = Mock(return_value=iter([(1, 'hk1'), (2, 'hk2')]))
+    repo = MinersRepository(mock_db_connection)
+
+    assert list(repo.iter_query("SELECT uid, hotkey FROM miners")) == [
+        {'uid': 1, 'hotkey': 'hk1'},
+        {'uid': 2, 'hotkey': 'hk2'},
+    ]
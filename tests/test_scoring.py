@@ -0,0 +1,83 @@
+"""
+Vectorized evaluation scoring tests
+File: tests/test_scoring.py
+"""
+import copy
+import random
+import numpy as np
+import pytest
+from src.gittensor_db.models import MinerEvaluation, PullRequest, PullRequestBatch
+from src.gittensor_db.models.scoring import SpamPenalty, score_evaluations
+
+PENALTY = SpamPenalty(threshold=5, min_weight=0.4, penalty_slope=0.05)
+
+
+def build_evaluations(seed=3):
+    rng = random.Random(seed)
+    evaluations = []
+    for uid in range(40):
+        evaluation = MinerEvaluation(uid=uid, hotkey=f"hk{uid}", total_open_prs=rng.randint(0, 20))
+        evaluation.total_lines_changed = 11  # kept when there are no pull requests
+        for number in range(rng.choice([0, 1, 3, 12])):
+            evaluation.pull_requests.append(PullRequest(
+                number=number, repository_full_name=f"o/r{rng.randint(0, 6)}", uid=uid, hotkey=f"hk{uid}",
+                github_id="gh", title="t", author_login="a", merged_at=None, created_at=None,
+                earned_score=rng.random() * 5, additions=rng.randint(0, 400), deletions=rng.randint(0, 90)
+            ))
+        evaluations.append(evaluation)
+    return evaluations
+
+
+def per_object(evaluations):
+    for evaluation in evaluations:
+        evaluation.calculate_metric_totals()
+        evaluation.calculate_score_total()
+        evaluation.apply_open_pr_spam_penalty(PENALTY.threshold, PENALTY.min_weight, PENALTY.penalty_slope)
+    return evaluations
+
+
+def assert_same_results(expected, actual):
+    for want, got in zip(expected, actual):
+        assert got.total_lines_changed == want.total_lines_changed
+        assert got.unique_repos_count == want.unique_repos_count
+        assert got.unique_repos_contributed_to == want.unique_repos_contributed_to
+        assert got.total_score == pytest.approx(want.total_score, rel=1e-12, abs=1e-12)
+
+
+def test_score_evaluations_matches_per_object_methods():
+    evaluations = build_evaluations()
+    expected = per_object(copy.deepcopy(evaluations))
+
+    scores = score_evaluations(evaluations, PENALTY)
+    scores.apply(evaluations)
+
+    assert_same_results(expected, evaluations)
+    assert list(scores.uids) == list(range(40))
+    penalized = [e.total_open_prs > PENALTY.threshold for e in evaluations]
+    assert [weight < 1.0 for weight in scores.penalty_weights] == penalized
+
+
+def test_score_evaluations_from_batch_matches_and_ignores_unknown_miners():
+    evaluations = build_evaluations()
+    expected = per_object(copy.deepcopy(evaluations))
+    batch = PullRequestBatch(pr for evaluation in evaluations for pr in evaluation.pull_requests)
+    batch.append_row(1, "o/other", 2, "old-hotkey", "gh", "t", "a", None, None, 50.0, 10, 10)
+    batch.append_row(2, "o/other", 999, "hk999", "gh", "t", "a", None, None, 50.0, 10, 10)
+
+    score_evaluations(evaluations, PENALTY, pull_requests=batch).apply(evaluations)
+
+    assert_same_results(expected, evaluations)
+
+
+def test_score_evaluations_handles_no_evaluations_and_no_pull_requests():
+    assert len(score_evaluations([]).total_scores) == 0
+
+    evaluation = MinerEvaluation(uid=1, hotkey="hk", total_lines_changed=4)
+    score_evaluations([evaluation]).apply([evaluation])
+    assert (evaluation.total_score, evaluation.total_lines_changed) == (0.0, 4)
+
+    evaluations = [MinerEvaluation(uid=uid, hotkey="hk", total_open_prs=9) for uid in (1, 2)]
+    scores = score_evaluations(evaluations, spam_penalty=PENALTY)
+    assert scores.total_scores.dtype == np.float64
+    scores.apply(evaluations)
+    assert [type(evaluation.total_score) for evaluation in evaluations] == [float, float]
@@ -0,0 +1,69 @@
+"""
+Change-aware upsert tests
+File: tests/test_upserts.py
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+from src.gittensor_db.models import PullRequest, Issue, FileChange
+from src.gittensor_db.queries import (
+    BULK_UPSERT_CHANGED_PULL_REQUESTS,
+    UPSERT_CHANGED_ISSUES_FROM_STAGING,
+    BULK_UPSERT_CHANGED_FILE_CHANGES,
+    UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING
+)
+from src.gittensor_db.repositories import PullRequestsRepository, IssuesRepository, FileChangesRepository, UpsertCounts
+
+
+def pr(number, earned_score=1.0):
+    return PullRequest(
+        number=number, repository_full_name='o/r', uid=1, hotkey='hk', github_id='gh', title='t',
+        author_login='a', merged_at=datetime(2024, 1, 1), created_at=datetime(2024, 1, 1), earned_score=earned_score
+    )
+
+
+def test_pull_request_upsert_counts_unchanged_rows_and_dedups_keys(mock_db_connection):
+    repo = PullRequestsRepository(mock_db_connection)
+    pages = [{'inserted': 1, 'updated': 1}]
+
+    with patch('psycopg2.extras.execute_values', return_value=pages) as execute_values:
+        counts = repo.upsert_pull_requests_bulk([pr(1), pr(2), pr(3), pr(1, earned_score=2.0)])
+
+    assert counts == UpsertCounts(inserted=1, updated=1, unchanged=1)
+    assert counts.written == 2
+    query, values = execute_values.call_args.args[1:3]
+    assert query == BULK_UPSERT_CHANGED_PULL_REQUESTS
+    assert [(row[0], row[5]) for row in values] == [(1, 2.0), (2, 1.0), (3, 1.0)]
+    mock_db_connection.commit.assert_called_once()
+
+
+def test_issue_upsert_copy_reads_the_count_row(mock_db_connection):
+    repo = IssuesRepository(mock_db_connection)
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchone.return_value = {'inserted': 0, 'updated': 1}
+    issues = [Issue(number=n, pr_number=1, repository_full_name='o/r', title='Bug') for n in (7, 8)]
+
+    counts = repo.upsert_issues_bulk(issues, method='copy')
+
+    assert counts == UpsertCounts(inserted=0, updated=1, unchanged=1)
+    assert cursor.execute.call_args.args[0] == UPSERT_CHANGED_ISSUES_FROM_STAGING
+    assert cursor.copy_expert.called
+
+
+def test_file_change_upsert_failure_returns_zero_counts(mock_db_connection):
+    repo = FileChangesRepository(mock_db_connection)
+    file_changes = [FileChange(1, 'o/r', 'a.py', 1, 1, 0, 'added')]
+
+    with patch('psycopg2.extras.execute_values', side_effect=RuntimeError('down')) as execute_values:
+        counts = repo.upsert_file_changes_bulk(file_changes)
+
+    assert counts == UpsertCounts()
+    assert execute_values.call_args.args[1] == BULK_UPSERT_CHANGED_FILE_CHANGES
+    mock_db_connection.rollback.assert_called_once()
+    assert repo.upsert_file_changes_bulk([]) == UpsertCounts()
+
+
+def test_file_change_upserts_clear_the_legacy_inline_patch():
+    for query in (BULK_UPSERT_CHANGED_FILE_CHANGES, UPSERT_CHANGED_FILE_CHANGES_FROM_STAGING):
+        assert 'patch = NULL,' in query
+        assert 'WHERE file_changes.patch IS NOT NULL OR (' in query
@@ -0,0 +1,72 @@
+"""
+Ingest watermark tests
+File: tests/test_watermarks.py
+"""
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from src.gittensor_db.models import IngestWatermark, PullRequest, Issue
+from src.gittensor_db.repositories import IngestPipeline
+from src.gittensor_db.repositories.watermarks_repository import watermarks_for
+
+
+def pr(number, merged_at, repo='o/r'):
+    return PullRequest(
+        number=number, repository_full_name=repo, uid=1, hotkey='hk', github_id='gh', title='t',
+        author_login='a', merged_at=merged_at, created_at=None,
+        issues=[Issue(number=100 + number, pr_number=number, repository_full_name=repo, title='Bug')],
+    )
+
+
+def watermark(merged_at, number, repo='o/r'):
+    return IngestWatermark(1, 'hk', 'gh', repo, merged_at, number)
+
+
+def test_watermark_covers_older_and_equal_pull_requests_only():
+    mark = watermark(datetime(2024, 1, 2), 5)
+
+    assert mark.covers(pr(5, datetime(2024, 1, 2)))
+    assert mark.covers(pr(9, datetime(2024, 1, 1)))
+    assert not mark.covers(pr(6, datetime(2024, 1, 2)))
+    assert not mark.covers(pr(1, None))
+    # Stored TIMESTAMPTZ values against naive timestamps compare as wall-clock times
+    assert watermark(datetime(2024, 1, 2, tzinfo=timezone.utc), 5).covers(pr(4, datetime(2024, 1, 2)))
+
+    newest = watermarks_for([pr(3, datetime(2024, 1, 3)), pr(8, datetime(2024, 1, 1)), pr(2, datetime(2024, 1, 3))])
+    assert [(w.last_merged_at.day, w.last_pr_number) for w in newest] == [(3, 3)]
+
+
+def test_pipeline_skips_ingested_pull_requests_and_advances_watermarks(mock_db_connection):
+    pipeline = IngestPipeline(mock_db_connection)
+    pipeline.watermarks.get_watermarks = Mock(return_value={'o/r': watermark(datetime(2024, 1, 2), 5)})
+    pipeline.watermarks.advance_watermarks = Mock(return_value=2)
+    file_pages = Mock(return_value=[[]])
+
+    with patch('psycopg2.extras.execute_values'):
+        with pipeline:
+            pipeline.add_pull_requests([
+                pr(4, datetime(2024, 1, 1)),
+                pr(6, datetime(2024, 1, 3)),
+                pr(7, datetime(2024, 1, 3), repo='o/new'),
+            ], file_pages)
+
+    pipeline.watermarks.get_watermarks.assert_called_once_with(1, 'hk', 'gh')
+    assert [call.args[0].number for call in file_pages.call_args_list] == [6, 7]
+    assert pipeline.skipped == {'pull_requests': 1, 'issues': 1, 'file_changes': 0}
+    assert pipeline.written['pull_requests'] == 2
+    advanced = pipeline.watermarks.advance_watermarks.call_args.args[0]
+    assert sorted((w.repository_full_name, w.last_pr_number) for w in advanced) == [('o/new', 7), ('o/r', 6)]
+
+
+def test_failed_flush_holds_back_watermarks_of_its_repositories(mock_db_connection):
+    pipeline = IngestPipeline(mock_db_connection, max_rows=1)
+    pipeline.watermarks.get_watermarks = Mock(return_value={})
+    pipeline.watermarks.advance_watermarks = Mock(return_value=1)
+
+    with patch('psycopg2.extras.execute_values', side_effect=[None] * 4 + [RuntimeError('down')] + [None] * 10):
+        pipeline.add_pull_requests([pr(1, datetime(2024, 1, 1), repo='o/a'), pr(2, datetime(2024, 1, 1), repo='o/b')])
+        pipeline.close()
+
+    assert pipeline.failed['pull_requests'] == 1
+    advanced = pipeline.watermarks.advance_watermarks.call_args.args[0]
+    assert [w.repository_full_name for w in advanced] == ['o/a']